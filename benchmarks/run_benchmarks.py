@@ -0,0 +1,332 @@
+"""
+Benchmarks de carga, exportación e insights con datos sintéticos.
+
+Genera una exportación de flota por cada tamaño, la procesa con el motor
+(tiempo por etapa según ``Diagnostics.profile``, con una caché en disco
+nueva: la primera carga procesa y guarda, la segunda se lee desde la caché)
+y mide las funciones más
+pesadas de la interfaz: ``generate_insights``, ``create_heatmap``,
+``plot_time_series`` y ``export_to_excel``.
+
+El arranque de la aplicación se mide en procesos nuevos: la importación de
+``analisis_combustible`` (arranque en frío), la primera ejecución del script
+hasta la pantalla de inicio y la primera ejecución del dashboard con datos
+ya procesados. Ni la importación ni la pantalla de inicio pueden cargar las
+dependencias pesadas de ``DIFERIDOS``.
+
+Los tiempos se comparan con ``baselines.json`` y el script termina con
+código 1 si alguna etapa supera la línea base por más de la tolerancia.
+
+Uso:
+    python benchmarks/run_benchmarks.py                      # 10k, 100k y 1M filas
+    python benchmarks/run_benchmarks.py --filas 10000 --guardar
+    python benchmarks/run_benchmarks.py --filas 100000 --omitir export_to_excel
+    python benchmarks/run_benchmarks.py --solo-arranque
+"""
+import argparse
+import json
+import logging
+import os
+import pickle
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from types import SimpleNamespace
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from combustible import PIPELINE_VERSION, DatasetCache, ProcessingOptions, process_file  # noqa: E402
+from combustible.synthetic import FleetSpec, generate_fleet_data, write_export  # noqa: E402
+
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+TAMANOS_DEFAULT = [10_000, 100_000, 1_000_000]
+
+# Las etapas más rápidas que esto no se comparan: el ruido domina
+PISO_SEGUNDOS = 0.05
+
+FUNCIONES_UI = ['generate_insights', 'create_heatmap', 'plot_time_series', 'export_to_excel']
+
+APP = os.path.join(RAIZ, 'analisis_combustible.py')
+
+# Filas de los datos con que se mide el primer dashboard
+FILAS_ARRANQUE = 10_000
+
+# Dependencias que la aplicación importa recién cuando una función las usa
+DIFERIDOS = ['sklearn', 'scipy', 'matplotlib', 'seaborn', 'plotly.express', 'openpyxl']
+
+# Proceso nuevo que importa la aplicación y lista las dependencias diferidas cargadas
+_IMPORTACION = f"""
+import json, sys, warnings
+warnings.simplefilter('ignore')
+import analisis_combustible
+print(json.dumps({{'modulos': [m for m in {DIFERIDOS!r} if m in sys.modules]}}))
+"""
+
+# Proceso nuevo que ejecuta un script de Streamlit una vez (sys.argv: script y datos de la sesión)
+_EJECUCION = f"""
+import json, logging, pickle, sys, time, warnings
+warnings.simplefilter('ignore')
+from streamlit.testing.v1 import AppTest
+logging.getLogger('streamlit').setLevel(logging.CRITICAL)
+at = AppTest.from_file(sys.argv[1], default_timeout=600)
+if len(sys.argv) > 2:
+    with open(sys.argv[2], 'rb') as f:
+        for clave, valor in pickle.load(f).items():
+            at.session_state[clave] = valor
+inicio = time.perf_counter()
+at.run()
+print(json.dumps({{
+    'segundos': time.perf_counter() - inicio,
+    'errores': [str(e.value) for e in at.exception],
+    'modulos': [m for m in {DIFERIDOS!r} if m in sys.modules],
+}}))
+"""
+
+# Lo que ejecuta main() con los datos ya procesados y el dashboard seleccionado
+_DASHBOARD = """
+import streamlit as st
+
+import analisis_combustible  # noqa: F401  (configuración de la página)
+from interfaz.datos import get_cube, get_day_index
+from interfaz.hallazgos import generate_insights
+from interfaz.paginas import render_section
+from interfaz.tema import apply_css
+
+apply_css()
+df = st.session_state['data']
+st.session_state['insights'] = generate_insights(df, get_cube(df))
+render_section("Dashboard Principal", df, get_cube(df), get_day_index(df))
+"""
+
+
+def _spec(filas, semilla):
+    # Flota proporcional al tamaño: ~90 días y una carga diaria por bus
+    buses = max(50, filas // 90)
+    return FleetSpec(
+        rows=filas, buses=buses, terminals=max(4, buses // 250), models=6,
+        drivers=max(100, buses * 3 // 2), planilleros=max(20, buses // 20), days=90, seed=semilla
+    )
+
+
+def _cargar_ui():
+    import pandas as pd
+
+    # La interfaz se importa en modo "bare" de Streamlit; se silencian sus avisos
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    # Igual que en analisis_combustible.py, las funciones se miden con copy-on-write
+    pd.set_option('mode.copy_on_write', True)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        from interfaz import exportacion, graficos, hallazgos
+    return SimpleNamespace(
+        generate_insights=hallazgos.generate_insights, create_heatmap=graficos.create_heatmap,
+        plot_time_series=graficos.plot_time_series, export_to_excel=exportacion.export_to_excel,
+    )
+
+
+def _medir(funcion, *args, **kwargs):
+    inicio = time.perf_counter()
+    resultado = funcion(*args, **kwargs)
+    return time.perf_counter() - inicio, resultado
+
+
+def _proceso(codigo, *args):
+    # Ejecuta ``codigo`` en un intérprete nuevo; devuelve (segundos, JSON de la última línea)
+    entorno = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [RAIZ, os.environ.get('PYTHONPATH')])))
+    inicio = time.perf_counter()
+    salida = subprocess.run([sys.executable, '-c', codigo, *args], capture_output=True, text=True, cwd=RAIZ, env=entorno)
+    segundos = time.perf_counter() - inicio
+    if salida.returncode != 0:
+        raise RuntimeError(f"El proceso de medición falló:\n{salida.stderr[-2000:]}")
+    return segundos, json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def bench_startup(directorio, repeticiones=3, semilla=0):
+    """
+    Mide el arranque de la aplicación en procesos nuevos.
+
+    Returns:
+        Tupla ``(tiempos, problemas)``. ``tiempos`` tiene la mediana de
+        ``repeticiones`` mediciones de ``arranque.importacion`` (intérprete
+        más importación de la aplicación), ``arranque.bienvenida`` (primera
+        ejecución del script sin datos) y ``arranque.dashboard`` (primera
+        ejecución del dashboard con datos procesados de ``FILAS_ARRANQUE``
+        filas). ``problemas`` lista las excepciones de la interfaz y las
+        dependencias diferidas que se cargaron antes de tiempo.
+    """
+    ruta = os.path.join(directorio, 'arranque.csv')
+    write_export(generate_fleet_data(_spec(FILAS_ARRANQUE, semilla)), ruta)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        result = process_file(ruta, options=ProcessingOptions(cache=None, detectors=None, profile_log=None))
+    sesion = os.path.join(directorio, 'sesion.pkl')
+    with open(sesion, 'wb') as f:
+        pickle.dump({'data': result.df, **result.kpis}, f)
+    dashboard = os.path.join(directorio, 'dashboard.py')
+    with open(dashboard, 'w', encoding='utf-8') as f:
+        f.write(_DASHBOARD)
+
+    mediciones = {'arranque.importacion': [], 'arranque.bienvenida': [], 'arranque.dashboard': []}
+    problemas = set()
+    for _ in range(repeticiones):
+        segundos, datos = _proceso(_IMPORTACION)
+        mediciones['arranque.importacion'].append(segundos)
+        problemas.update(f"la importación carga {m}" for m in datos['modulos'])
+
+        for etapa, args in (('arranque.bienvenida', [APP]), ('arranque.dashboard', [dashboard, sesion])):
+            _, datos = _proceso(_EJECUCION, *args)
+            mediciones[etapa].append(datos['segundos'])
+            problemas.update(f"{etapa}: {error[:200]}" for error in datos['errores'])
+            if etapa == 'arranque.bienvenida':
+                problemas.update(f"la pantalla de inicio carga {m}" for m in datos['modulos'])
+    return {etapa: statistics.median(valores) for etapa, valores in mediciones.items()}, sorted(problemas)
+
+
+def bench_size(filas, formato, directorio, ui=None, omitir=(), semilla=0):
+    """
+    Mide un tamaño de archivo; devuelve ``{etapa: segundos}``.
+
+    Las etapas del motor llevan el prefijo ``motor.`` y las funciones de la
+    interfaz el prefijo ``ui.``.
+    """
+    tiempos = {}
+    tiempos['generacion'], df = _medir(generate_fleet_data, _spec(filas, semilla))
+    ruta = os.path.join(directorio, f"flota_{filas}.{formato}")
+    tiempos['escritura'], _ = _medir(write_export, df, ruta)
+    del df
+
+    # Caché vacía (sin detectores ni log): la primera carga mide el procesamiento
+    # completo y el guardado, la segunda la lectura desde la caché
+    cache = DatasetCache(os.path.join(directorio, f"cache_{filas}"))
+    options = ProcessingOptions(cache=cache, detectors=None, profile_log=None)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        tiempos['motor.total'], result = _medir(process_file, ruta, options=options)
+        tiempos['motor.desde_cache'], cacheado = _medir(process_file, ruta, options=options)
+    for resultado in (result, cacheado):
+        if not resultado.ok:
+            errores = [texto for nivel, texto in resultado.diagnostics.messages if nivel == 'error']
+            raise RuntimeError(f"El procesamiento de {ruta} falló: {errores}")
+    del cacheado
+    for etapa in result.diagnostics.profile.stages:
+        tiempos[f"motor.{etapa.name}"] = etapa.seconds
+
+    if ui is not None:
+        procesado = result.df
+        llamadas = {
+            'generate_insights': lambda: ui.generate_insights(procesado, result.kpis.get('cubo')),
+            'create_heatmap': lambda: ui.create_heatmap(procesado, 'Cantidad litros'),
+            'plot_time_series': lambda: ui.plot_time_series(procesado, 'Cantidad litros', 'Evolución del Consumo Diario'),
+            'export_to_excel': lambda: ui.export_to_excel(procesado),
+        }
+        for nombre in FUNCIONES_UI:
+            if nombre in omitir:
+                continue
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                tiempos[f"ui.{nombre}"], _ = _medir(llamadas[nombre])
+    return tiempos
+
+
+def _maquina():
+    return {
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'procesador': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def _mostrar(tiempos, base):
+    for etapa, segundos in tiempos.items():
+        referencia = base.get(etapa)
+        comparacion = f"  (base {referencia:.3f}s, x{segundos / referencia:.2f})" if referencia else ''
+        print(f"{etapa:<28}{segundos:>10.3f}s{comparacion}")
+
+
+def comparar(clave, tiempos, base, tolerancia):
+    """Lista de ``(etapa, actual, base)`` con las etapas más lentas que la tolerancia."""
+    regresiones = []
+    for etapa, segundos in tiempos.items():
+        referencia = base.get(etapa)
+        if referencia is None or referencia < PISO_SEGUNDOS:
+            continue
+        if segundos > referencia * tolerancia:
+            regresiones.append((f"{clave} {etapa}", segundos, referencia))
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del procesamiento de cargas con datos sintéticos.")
+    parser.add_argument('--filas', type=int, nargs='+', default=TAMANOS_DEFAULT, help="Tamaños a medir")
+    parser.add_argument('--formato', choices=['csv', 'xlsx', 'xls'], default='csv', help="Formato del archivo generado")
+    parser.add_argument('--omitir', nargs='*', default=[], choices=FUNCIONES_UI, help="Funciones de la interfaz a omitir")
+    parser.add_argument('--sin-ui', action='store_true', help="Medir solo el motor (sin interfaz ni arranque)")
+    parser.add_argument('--solo-arranque', action='store_true', help="Medir solo el arranque de la aplicación")
+    parser.add_argument('--guardar', action='store_true', help="Guardar los tiempos como nuevas líneas base")
+    parser.add_argument('--tolerancia', type=float, default=1.25, help="Factor sobre la línea base que se considera regresión")
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    ui = None if args.sin_ui or args.solo_arranque else _cargar_ui()
+
+    bases = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES, encoding='utf-8') as f:
+            bases = json.load(f)
+    resultados = bases.get('resultados', {})
+
+    regresiones = []
+    problemas = []
+    with tempfile.TemporaryDirectory() as directorio:
+        if not args.sin_ui:
+            print("\n== arranque ==")
+            tiempos, problemas = bench_startup(directorio, semilla=args.semilla)
+            base = resultados.get('arranque', {})
+            _mostrar(tiempos, base)
+            regresiones += comparar('arranque', tiempos, base, args.tolerancia)
+            if args.guardar:
+                resultados['arranque'] = {etapa: round(segundos, 4) for etapa, segundos in tiempos.items()}
+
+        for filas in ([] if args.solo_arranque else args.filas):
+            clave = f"{args.formato}-{filas}"
+            print(f"\n== {clave} ==")
+            tiempos = bench_size(filas, args.formato, directorio, ui=ui, omitir=args.omitir, semilla=args.semilla)
+            base = resultados.get(clave, {})
+            _mostrar(tiempos, base)
+            regresiones += comparar(clave, tiempos, base, args.tolerancia)
+            if args.guardar:
+                resultados[clave] = {etapa: round(segundos, 4) for etapa, segundos in tiempos.items()}
+
+    if args.guardar:
+        bases = {'maquina': _maquina(), 'pipeline_version': PIPELINE_VERSION, 'resultados': resultados}
+        with open(BASELINES, 'w', encoding='utf-8') as f:
+            json.dump(bases, f, indent=2, ensure_ascii=False, sort_keys=True)
+            f.write('\n')
+        print(f"\nLíneas base guardadas en {BASELINES}")
+        return 0
+
+    if bases and bases.get('maquina') != _maquina():
+        print("\n⚠️ Las líneas base se midieron en otra máquina; la comparación es solo referencial.")
+    if problemas:
+        print(f"\n❌ {len(problemas)} problemas en el arranque de la aplicación:")
+        for problema in problemas:
+            print(f"   {problema}")
+    if regresiones:
+        print(f"\n❌ {len(regresiones)} etapas superan la línea base por más de x{args.tolerancia}:")
+        for etapa, segundos, referencia in regresiones:
+            print(f"   {etapa}: {segundos:.3f}s (base {referencia:.3f}s)")
+    if problemas or regresiones:
+        return 1
+    print("\n✅ Sin regresiones")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
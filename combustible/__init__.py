@@ -0,0 +1,51 @@
+"""
+Motor de análisis de combustible de Smart Fuel Analytics.
+
+Este paquete no depende de Streamlit: puede usarse desde la aplicación web,
+desde procesos batch o desde benchmarks.
+"""
+from combustible.cache import DatasetCache
+from combustible.chunked import ChunkedResult, process_file_chunked
+from combustible.detectors import DetectorStore
+from combustible.engine import (
+    COLUMNAS_ESPERADAS,
+    COLUMNAS_NUMERICAS,
+    COLUMNAS_TEXTO,
+    PIPELINE_VERSION,
+    STAGES,
+    Diagnostics,
+    ProcessingError,
+    ProcessingOptions,
+    ProcessingResult,
+    process_file,
+    process_files,
+    read_file,
+    read_sources,
+    run_pipeline,
+)
+from combustible.incremental import append_file
+from combustible.profiling import ProfileReport, StageProfile
+
+__all__ = [
+    'COLUMNAS_ESPERADAS',
+    'COLUMNAS_NUMERICAS',
+    'COLUMNAS_TEXTO',
+    'PIPELINE_VERSION',
+    'STAGES',
+    'ChunkedResult',
+    'DatasetCache',
+    'DetectorStore',
+    'Diagnostics',
+    'ProcessingError',
+    'ProcessingOptions',
+    'ProcessingResult',
+    'ProfileReport',
+    'StageProfile',
+    'append_file',
+    'process_file',
+    'process_file_chunked',
+    'process_files',
+    'read_file',
+    'read_sources',
+    'run_pipeline',
+]
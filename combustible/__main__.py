@@ -0,0 +1,78 @@
+"""
+Procesamiento batch sin navegador.
+
+Uso:
+    python -m combustible archivo1.xlsx archivo2.csv ...
+    python -m combustible --acumular enero.xlsx febrero.xlsx marzo.xlsx
+    python -m combustible --combinar terminales.zip junio.xlsx
+    python -m combustible --bloques resultados/ historico_2023.csv
+"""
+import argparse
+import os
+import sys
+
+from combustible.chunked import process_file_chunked
+from combustible.engine import ProcessingOptions, process_file, process_files
+from combustible.incremental import append_file
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Procesa archivos de cargas de combustible sin Streamlit.")
+    parser.add_argument('archivos', nargs='+', help="Archivos Excel, CSV o zip a procesar")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Mostrar todos los mensajes del motor")
+    parser.add_argument('--refit', action='store_true', help="Reentrenar los detectores de outliers guardados")
+    parser.add_argument('--perfil', action='store_true',
+                        help="Mostrar el tiempo y la memoria de cada etapa (activa tracemalloc)")
+    parser.add_argument('--acumular', action='store_true',
+                        help="Anexar cada archivo al resultado del anterior en vez de procesarlos por separado")
+    parser.add_argument('--combinar', action='store_true',
+                        help="Leer todos los archivos en paralelo y procesarlos como un solo dataset")
+    parser.add_argument('--bloques', metavar='DIRECTORIO',
+                        help="Procesar cada CSV por bloques y escribir el resultado como Parquet en DIRECTORIO/<archivo>")
+    args = parser.parse_args(argv)
+
+    options = ProcessingOptions(refit_detectors=args.refit, trace_memory=args.perfil)
+
+    errores = 0
+    anterior = None
+    lotes = [args.archivos] if args.combinar else [[archivo] for archivo in args.archivos]
+    for lote in lotes:
+        archivo = ' + '.join(lote)
+        if args.bloques:
+            salida = os.path.join(args.bloques, os.path.splitext(os.path.basename(lote[0]))[0])
+            result = process_file_chunked(lote[0], salida, options=options)
+        elif args.combinar:
+            result = process_files(lote, options=options)
+        elif args.acumular and anterior is not None:
+            result = append_file(anterior, lote[0], options=options)
+        else:
+            result = process_file(lote[0], options=options)
+        diag = result.diagnostics
+
+        if args.verbose:
+            for nivel, mensaje in diag.messages:
+                print(f"[{nivel}] {mensaje.strip()}")
+
+        if args.perfil:
+            print(diag.profile.to_frame().to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+            if diag.memory is not None:
+                print(diag.memory.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+        if result.ok and args.bloques:
+            df = result.read(columns=['Mala Carga', 'Sobreconsumo'])
+            print(f"{archivo}: {result.rows} registros en {result.output_dir}, {df['Mala Carga'].sum()} malas cargas, "
+                  f"{df['Sobreconsumo'].sum()} sobreconsumos ({diag.execution_time:.2f} s)")
+        elif result.ok:
+            df = result.df
+            print(f"{archivo}: {len(df)} registros, {df['Mala Carga'].sum()} malas cargas, "
+                  f"{df['Sobreconsumo'].sum()} sobreconsumos ({diag.execution_time:.2f} s)")
+            anterior = result
+        else:
+            errores += 1
+            print(f"{archivo}: ERROR - {' | '.join(diag.errors)}", file=sys.stderr)
+
+    return 1 if errores else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
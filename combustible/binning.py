@@ -0,0 +1,84 @@
+"""
+Clasificación vectorizada por tramos.
+
+Las categorías del análisis (eficiencia, llenado, conducta de conductores y
+planilleros, uso de buses y severidad de sobreconsumos) se definen como
+tablas de tramos y se asignan con una búsqueda binaria sobre la columna
+completa (``np.searchsorted``), en lugar de llamar a una función de Python
+por registro.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class BinTable:
+    """
+    Tramos de una clasificación.
+
+    Attributes:
+        edges: Límites entre tramos, en orden creciente
+        labels: Etiqueta de cada tramo (una más que ``edges``), de menor a mayor
+        right: ``False`` para tramos ``[a, b)`` (``valor < límite``) y ``True``
+            para ``(a, b]`` (``valor <= límite``)
+        missing: Etiqueta de los valores NaN (``None``: quedan sin categoría)
+    """
+    edges: tuple
+    labels: tuple
+    right: bool = False
+    missing: str = None
+
+
+# Desviación del rendimiento respecto al promedio del modelo (%)
+EFICIENCIA = BinTable((-15, -5, 5, 15), ('Baja', 'Regular', 'Normal', 'Buena', 'Excelente'))
+
+# Porcentaje del estanque cargado
+LLENADO = BinTable((25, 50, 75, 90), ('Muy Bajo', 'Bajo', 'Medio', 'Alto', 'Completo'))
+
+# Tasa de sobreconsumo por conductor (%)
+CONDUCTOR = BinTable((2, 5, 10), ('Excelente', 'Bueno', 'Regular', 'Atención Requerida'))
+
+# Tasa de malas cargas por planillero (%)
+PLANILLERO = BinTable((1, 3, 7), ('Excelente', 'Bueno', 'Regular', 'Atención Requerida'))
+
+# Cargas por bus en el período
+USO_BUS = BinTable((15, 30), ('Bajo Uso', 'Uso Medio', 'Alto Uso'))
+
+# Z-Score de los sobreconsumos; sin Z-Score se cuenta como extremo
+SEVERIDAD = BinTable(
+    (2.5, 3, 4),
+    ('Leve (2-2.5σ)', 'Moderado (2.5-3σ)', 'Alto (3-4σ)', 'Extremo (>4σ)'),
+    right=True,
+    missing='Extremo (>4σ)',
+)
+
+
+def categorize(values, table, categorical=True):
+    """
+    Clasifica ``values`` según los tramos de ``table``.
+
+    Args:
+        values: Serie o arreglo numérico
+        table: BinTable con los límites y etiquetas
+        categorical: Devolver ``Categorical`` (categorías en el orden de
+            ``table.labels``) o, con ``False``, texto con ``None`` para los
+            valores sin categoría
+
+    Returns:
+        Serie con el índice de ``values`` (o un arreglo si ``values`` no es Serie)
+    """
+    numeros = np.asarray(values, dtype=np.float64)
+    # Tramo = cantidad de límites que el valor ya superó
+    codigos = np.searchsorted(np.asarray(table.edges, dtype=np.float64), numeros, side='left' if table.right else 'right')
+    nulos = np.isnan(numeros)
+    codigos[nulos] = -1 if table.missing is None else table.labels.index(table.missing)
+
+    if categorical:
+        resultado = pd.Categorical.from_codes(codigos, categories=list(table.labels))
+    else:
+        # El código -1 toma el último elemento: None
+        etiquetas = np.array(list(table.labels) + [None], dtype=object)
+        resultado = etiquetas.take(codigos)
+    return pd.Series(resultado, index=values.index) if isinstance(values, pd.Series) else resultado
@@ -0,0 +1,157 @@
+"""
+Caché en disco de datasets procesados.
+
+El DataFrame enriquecido se guarda en Parquet y los KPIs y mensajes de
+diagnóstico en un archivo auxiliar, bajo una clave formada por el hash SHA-256
+del contenido del archivo subido, la versión del pipeline y las opciones de
+lectura que cambian las columnas del resultado. Volver a subir el
+mismo archivo (o reiniciar el servidor) carga el resultado sin ejecutar las
+etapas. Cuando el directorio supera el tamaño máximo se eliminan las entradas
+usadas hace más tiempo.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+
+import pandas as pd
+
+
+# Variables de entorno para configurar la caché
+CACHE_DIR_ENV = 'COMBUSTIBLE_CACHE_DIR'
+CACHE_MAX_MB_ENV = 'COMBUSTIBLE_CACHE_MAX_MB'
+
+CACHE_DIR_DEFAULT = os.path.join(os.path.expanduser('~'), '.cache', 'combustible', 'datasets')
+CACHE_MAX_MB_DEFAULT = 2048
+
+# Tamaño de bloque para calcular el hash de archivos en disco
+BLOQUE_HASH = 1 << 20
+
+
+def content_hash(source):
+    """
+    Hash SHA-256 del contenido de una ruta o archivo tipo file-like.
+
+    Los archivos file-like (como el ``UploadedFile`` de Streamlit) quedan
+    posicionados al inicio para que puedan leerse después.
+    """
+    h = hashlib.sha256()
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            for bloque in iter(lambda: f.read(BLOQUE_HASH), b''):
+                h.update(bloque)
+    elif hasattr(source, 'getvalue'):
+        h.update(source.getvalue())
+    else:
+        source.seek(0)
+        for bloque in iter(lambda: source.read(BLOQUE_HASH), b''):
+            h.update(bloque)
+        source.seek(0)
+    return h.hexdigest()
+
+
+def sources_hash(sources):
+    """
+    Hash de varias fuentes procesadas juntas.
+
+    Con una sola fuente es ``content_hash``; con varias, el hash de sus hashes
+    en orden (el orden define qué copia de una carga repetida se conserva).
+    """
+    hashes = [content_hash(source) for source in sources]
+    if len(hashes) == 1:
+        return hashes[0]
+    return hashlib.sha256('\n'.join(hashes).encode()).hexdigest()
+
+
+class DatasetCache:
+    """Directorio con un par ``<clave>.parquet`` / ``<clave>.pkl`` por dataset."""
+
+    def __init__(self, directory, max_bytes=CACHE_MAX_MB_DEFAULT * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_env(cls):
+        """Caché en ``COMBUSTIBLE_CACHE_DIR`` (o ``~/.cache``) con límite ``COMBUSTIBLE_CACHE_MAX_MB``."""
+        directory = os.environ.get(CACHE_DIR_ENV) or CACHE_DIR_DEFAULT
+        max_mb = float(os.environ.get(CACHE_MAX_MB_ENV) or CACHE_MAX_MB_DEFAULT)
+        return cls(directory, max_bytes=int(max_mb * 1024 * 1024))
+
+    @staticmethod
+    def key(digest, version, prune_columns=True):
+        # Sin poda de columnas el resultado trae más columnas: es otra entrada
+        return f"{digest}-v{version}" + ('' if prune_columns else '-completo')
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + '.parquet', base + '.pkl'
+
+    def get(self, key):
+        """
+        Devuelve ``(df, extra)`` si la clave está en caché, o ``None``.
+
+        ``extra`` es el diccionario guardado junto al DataFrame (KPIs, mensajes).
+        """
+        ruta_df, ruta_extra = self._paths(key)
+        if not (os.path.exists(ruta_df) and os.path.exists(ruta_extra)):
+            return None
+        try:
+            df = pd.read_parquet(ruta_df)
+            with open(ruta_extra, 'rb') as f:
+                extra = pickle.load(f)
+        except Exception:
+            # Entrada corrupta o incompleta: se descarta
+            self._remove(key)
+            return None
+
+        # Marcar como usada recientemente para la política de desalojo
+        for ruta in (ruta_df, ruta_extra):
+            os.utime(ruta)
+        return df, extra
+
+    def put(self, key, df, extra):
+        """Guarda el DataFrame y su información auxiliar y aplica el límite de tamaño."""
+        os.makedirs(self.directory, exist_ok=True)
+        ruta_df, ruta_extra = self._paths(key)
+
+        # Escribir en temporales y renombrar para no dejar entradas a medias
+        fd, tmp_df = tempfile.mkstemp(dir=self.directory, suffix='.parquet.tmp')
+        os.close(fd)
+        fd, tmp_extra = tempfile.mkstemp(dir=self.directory, suffix='.pkl.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(extra, f, protocol=pickle.HIGHEST_PROTOCOL)
+            df.to_parquet(tmp_df)
+            os.replace(tmp_df, ruta_df)
+            os.replace(tmp_extra, ruta_extra)
+        finally:
+            for tmp in (tmp_df, tmp_extra):
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+
+        self.evict()
+
+    def _remove(self, key):
+        for ruta in self._paths(key):
+            if os.path.exists(ruta):
+                os.remove(ruta)
+
+    def evict(self):
+        """Elimina las entradas usadas hace más tiempo hasta respetar ``max_bytes``."""
+        if not os.path.isdir(self.directory):
+            return
+        entradas = {}
+        for archivo in os.listdir(self.directory):
+            clave, ext = os.path.splitext(archivo)
+            if ext not in ('.parquet', '.pkl'):
+                continue
+            stat = os.stat(os.path.join(self.directory, archivo))
+            tamano, usado = entradas.get(clave, (0, 0))
+            entradas[clave] = (tamano + stat.st_size, max(usado, stat.st_mtime))
+
+        total = sum(tamano for tamano, _ in entradas.values())
+        for clave, (tamano, _) in sorted(entradas.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            self._remove(clave)
+            total -= tamano
@@ -0,0 +1,704 @@
+"""
+Modo por bloques para exportaciones CSV más grandes que la memoria.
+
+El CSV se lee una sola vez por bloques (``iter_csv``). Cada bloque pasa por
+las etapas por registro (columnas, fechas, horas y números) y se guarda en
+Parquet temporal repartido en cubetas por bus: todas las cargas de un bus
+quedan en la misma cubeta, así la cadena de odómetros es exacta. Mientras
+tanto se acumulan las estadísticas que el pipeline en memoria calcula sobre
+el DataFrame completo:
+
+- conteo, media y M2 de litros por modelo (Welford/Chan, ``merge_moments``);
+- cuartiles de litros y percentil 95 por modelo (estanque estimado) con
+  ``QuantileSketch``;
+- conteo y consumo por terminal;
+- una muestra aleatoria por modelo para entrenar los Isolation Forest.
+
+Luego cada cubeta se recorre dos veces. En la primera se aplican las
+banderas (``Mala Carga``, ``Z-Score``, ``Sobreconsumo``, ``Outlier
+Extremo``), la cadena de odómetros, terminales y llenado, y se acumulan los
+percentiles 10/90 de rendimiento y las tasas por conductor y planillero. En
+la segunda se marca ``Rendimiento Anómalo``, se agregan las tasas del
+personal y el resultado se escribe como Parquet particionado por ``Mes``,
+junto con el cubo de agregados diarios de cada cubeta (``ChunkedResult.cube``
+los combina al leerlos). La memoria depende del tamaño del bloque y de la
+cubeta, no del archivo.
+"""
+import math
+import os
+import shutil
+import tempfile
+import time
+import traceback
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from combustible.cube import DailyCube, build_cube, merge_cubes
+from combustible.detectors import MIN_REGISTROS, fit_detectors
+from combustible.dtypes import optimize_dtypes
+from combustible.engine import (
+    COLUMNAS_NUMERICAS,
+    COLUMNAS_TEXTO,
+    Diagnostics,
+    ProcessingError,
+    EXCLUIDAS_TEXTO,
+    ProcessingOptions,
+    apply_model_stats,
+    chain_odometer,
+    compute_rendimiento_from_km,
+    consumption_kpis,
+    detect_csv_dialect,
+    distance_kpis,
+    enrich_llenado,
+    enrich_personal,
+    enrich_terminals,
+    flag_litros_extremos,
+    litros_upper_bound,
+    log_profile,
+    raw_rendimiento,
+    rendimiento_bounds,
+    scan_text_column,
+    text_flags,
+)
+from combustible.incremental import ROW_STAGES
+from combustible.normalization import (
+    normalize_column,
+    normalizar_modelo,
+    normalizar_nombre,
+    normalizar_terminal,
+)
+from combustible.parsing import month_labels, week_labels
+from combustible.readers import SAMPLE_BYTES, iter_csv, read_sample
+from combustible.stats import QuantileSketch, group_moments, merge_moments, moments_to_stats
+
+
+# Filas por bloque de lectura (y filas aproximadas por cubeta)
+CHUNK_ROWS = 250_000
+
+# Registros por modelo con que se entrena cada Isolation Forest
+MUESTRA_DETECTOR = 50_000
+
+# Prefijo de las columnas auxiliares guardadas en las cubetas
+AUXILIAR = '__'
+
+# Columna del resultado con el número de fila original (el índice de ``process_file``)
+COLUMNA_FILA = 'Fila'
+
+# Subdirectorio del resultado con el cubo parcial de cada cubeta (el prefijo
+# "_" lo deja fuera del dataset particionado)
+DIRECTORIO_CUBO = '_cubo'
+
+
+@dataclass
+class ChunkedResult:
+    """
+    Resultado del modo por bloques.
+
+    Attributes:
+        output_dir: Directorio del Parquet particionado por ``Mes``, o
+            ``None`` si el procesamiento falló
+        rows: Registros escritos
+        kpis: Métricas agregadas, con las mismas claves que ``process_file``
+            salvo ``cubo``, que se lee con ``cube()``
+        diagnostics: Mensajes y perfil por pasada
+        stats: Estadísticas acumuladas (ver ``running_stats``)
+    """
+    output_dir: str = None
+    rows: int = 0
+    kpis: dict = field(default_factory=dict)
+    diagnostics: Diagnostics = field(default_factory=Diagnostics)
+    stats: dict = field(default_factory=dict)
+
+    @property
+    def ok(self):
+        return self.output_dir is not None
+
+    def read(self, columns=None, filters=None):
+        """Lee el resultado (o parte de él) como DataFrame, indexado por la fila original y con el plan de tipos."""
+        if columns is not None:
+            columns = [COLUMNA_FILA] + [col for col in columns if col != COLUMNA_FILA]
+        df = pd.read_parquet(self.output_dir, columns=columns, filters=filters)
+        df, _ = optimize_dtypes(df.set_index(COLUMNA_FILA).rename_axis(None).sort_index())
+        return df
+
+    def cube(self, filters=None):
+        """
+        Cubo de agregados diarios del resultado (``build_cube`` del DataFrame completo).
+
+        Cada cubeta guardó su cubo parcial en ``DIRECTORIO_CUBO``; las partes
+        se combinan recién aquí, así el procesamiento nunca tiene en memoria
+        un cubo del tamaño del archivo. ``filters`` se aplica a las celdas
+        (por ejemplo ``[('Terminal', '==', 'El Roble')]``).
+        """
+        directorio = os.path.join(self.output_dir, DIRECTORIO_CUBO)
+        partes = [
+            DailyCube(pd.read_parquet(os.path.join(directorio, archivo), filters=filters))
+            for archivo in sorted(os.listdir(directorio))
+        ]
+        return merge_cubes(partes)
+
+
+def _tamano(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    if hasattr(source, 'getbuffer'):
+        return source.getbuffer().nbytes
+    posicion = source.seek(0, os.SEEK_END)
+    source.seek(0)
+    return posicion
+
+
+def _cantidad_cubetas(source, chunk_rows):
+    # Filas estimadas a partir del largo promedio de línea de la muestra
+    muestra = read_sample(source, SAMPLE_BYTES)
+    bytes_por_fila = len(muestra) / max(1, muestra.count(b'\n'))
+    return max(1, math.ceil(_tamano(source) / bytes_por_fila / chunk_rows))
+
+
+def _esquema(df):
+    import pyarrow as pa
+
+    # Las columnas vacías en el primer bloque se fijan como texto
+    esquema = pa.Schema.from_pandas(_sin_categorias(df), preserve_index=False)
+    for i, campo in enumerate(esquema):
+        if pa.types.is_null(campo.type):
+            esquema = esquema.set(i, pa.field(campo.name, pa.string()))
+    return esquema
+
+
+def _sin_categorias(df):
+    # Las categorías cambian entre bloques: se guardan como texto
+    categoricas = df.select_dtypes('category').columns
+    return df.astype({col: object for col in categoricas}) if len(categoricas) else df
+
+
+def _tabla(df, esquema):
+    import pyarrow as pa
+
+    return pa.Table.from_pandas(_sin_categorias(df).reindex(columns=esquema.names), schema=esquema, preserve_index=False)
+
+
+def _leer(ruta):
+    import pyarrow.parquet as pq
+
+    return pq.read_table(ruta).to_pandas()
+
+
+def _copiar_avisos(origen, diag):
+    # Avisos de un bloque o cubeta, sin repetir los ya registrados
+    registrados = set(diag.messages)
+    for nivel, texto in origen.messages:
+        if nivel in ('warning', 'error') and (nivel, texto) not in registrados:
+            diag.messages.append((nivel, texto))
+            registrados.add((nivel, texto))
+
+
+def _sumar(acumulado, parcial):
+    return parcial if acumulado is None else acumulado.add(parcial, fill_value=0)
+
+
+class _Estadisticas:
+    """Estadísticas globales acumuladas durante la lectura por bloques."""
+
+    def __init__(self, semilla):
+        self.filas = 0
+        self.columnas_mencion = set()
+        self.litros = QuantileSketch()
+        self.litros_por_modelo = None
+        self.litros_total = None
+        self.estanque_por_modelo = {}
+        self.filas_por_modelo = None
+        self.terminal_count = None
+        self.terminal_litros = None
+        self.terminal_cargas_litros = None
+        self.muestra = None
+        self.rng = np.random.default_rng(semilla)
+
+    @staticmethod
+    def _momentos(acumulado, df, por):
+        momentos = group_moments(df, 'Cantidad litros', por)
+        return momentos if acumulado is None else merge_moments(acumulado, momentos)
+
+    def update(self, df):
+        self.filas += len(df)
+        if 'Terminal' in df.columns:
+            _, terminal = normalize_column(df['Terminal'], normalizar_terminal)
+            self.terminal_count = _sumar(self.terminal_count, terminal.value_counts().rename(index=str))
+            if 'Cantidad litros' in df.columns:
+                por_terminal = df['Cantidad litros'].groupby(terminal, observed=True)
+                self.terminal_litros = _sumar(self.terminal_litros, por_terminal.sum().rename(index=str))
+                self.terminal_cargas_litros = _sumar(self.terminal_cargas_litros, por_terminal.count().rename(index=str))
+
+        if 'Cantidad litros' not in df.columns:
+            return
+        self.litros.update(df['Cantidad litros'].to_numpy())
+        self.litros_total = self._momentos(self.litros_total, df, np.zeros(len(df), dtype=int))
+
+        if 'Modelo Normalizado' in df.columns:
+            self.litros_por_modelo = self._momentos(self.litros_por_modelo, df, 'Modelo Normalizado')
+            self.filas_por_modelo = _sumar(self.filas_por_modelo, df['Modelo Normalizado'].value_counts().rename(index=str))
+            for modelo, grupo in df.groupby('Modelo Normalizado', observed=True)['Cantidad litros']:
+                self.estanque_por_modelo.setdefault(modelo, QuantileSketch()).update(grupo.to_numpy())
+            self._muestrear(df)
+
+    def _muestrear(self, df):
+        # Muestra aleatoria uniforme por modelo: las claves aleatorias más bajas
+        validos = df['Cantidad litros'].notna()
+        nueva = pd.DataFrame({
+            'modelo': df.loc[validos, 'Modelo Normalizado'].astype(str),
+            'litros': df.loc[validos, 'Cantidad litros'],
+            'fecha': df.loc[validos, 'Fecha'] if 'Fecha' in df.columns else pd.NaT,
+            'fila': df.index[validos],
+            'clave': self.rng.random(int(validos.sum())),
+        })
+        muestra = nueva if self.muestra is None else pd.concat([self.muestra, nueva], ignore_index=True)
+        self.muestra = muestra.sort_values('clave').groupby('modelo').head(MUESTRA_DETECTOR)
+
+    def grupos_detector(self):
+        """``modelo -> (litros, fechas)`` de la muestra, en el orden del archivo."""
+        grupos = {}
+        if self.muestra is None:
+            return grupos
+        for modelo, muestra in self.muestra.sort_values('fila').groupby('modelo'):
+            if len(muestra) >= MIN_REGISTROS:
+                fechas = muestra['fecha'].to_numpy() if pd.api.types.is_datetime64_any_dtype(muestra['fecha']) else None
+                grupos[modelo] = (muestra['litros'].to_numpy().reshape(-1, 1), fechas)
+        return grupos
+
+
+class _Personal:
+    """Tasas de sobreconsumo por conductor y de malas cargas por planillero."""
+
+    def __init__(self):
+        self.conductor = None
+        self.planillero = None
+
+    def update(self, df):
+        if 'Nombre conductor' in df.columns and 'Sobreconsumo' in df.columns:
+            _, conductor = normalize_column(df['Nombre conductor'], normalizar_nombre)
+            grupos = df['Sobreconsumo'].groupby(conductor, observed=True)
+            parcial = pd.DataFrame({'suma': grupos.sum(), 'n': grupos.count()}).rename(index=str)
+            self.conductor = _sumar(self.conductor, parcial)
+        if 'Nombre Planillero' in df.columns and 'Mala Carga' in df.columns:
+            _, planillero = normalize_column(df['Nombre Planillero'], normalizar_nombre)
+            grupos = df['Mala Carga'].groupby(planillero, observed=True)
+            parcial = pd.DataFrame({'suma': grupos.sum(), 'n': grupos.count()}).rename(index=str)
+            self.planillero = _sumar(self.planillero, parcial)
+
+    def tasas(self):
+        """Tupla ``(conductor_stats, planillero_stats)`` en porcentaje, como ``enrich_personal``."""
+        tasa = lambda acumulado: None if acumulado is None else acumulado['suma'] / acumulado['n'] * 100
+        return tasa(self.conductor), tasa(self.planillero)
+
+
+class _Kpis:
+    """Agregados parciales para calcular los KPIs sin el DataFrame completo."""
+
+    def __init__(self):
+        self.por_dia = self.por_semana = self.por_mes = None
+        self.dia_semana = None
+        self.km_por_bus = []
+        self.fechas_por_bus = []
+        self.correlacion = np.zeros(6)  # n, Σx, Σy, Σx², Σy², Σxy
+        self.finde = None
+        self.con_fechas = False
+        self.columnas = set()
+
+    def update(self, df):
+        self.columnas.update(df.columns)
+        if 'Cantidad litros' in df.columns and 'Fecha' in df.columns and df['Fecha'].notna().any():
+            self.con_fechas = True
+            litros = df['Cantidad litros']
+            self.por_dia = _sumar(self.por_dia, litros.groupby(df['Fecha'].dt.date).sum())
+            self.por_semana = _sumar(self.por_semana, df.groupby('Semana')['Cantidad litros'].sum())
+            self.por_mes = _sumar(self.por_mes, df.groupby('Mes', observed=True)['Cantidad litros'].sum())
+            if 'Día Semana' in df.columns:
+                grupos = df.groupby('Día Semana', observed=True)['Cantidad litros']
+                self.dia_semana = _sumar(self.dia_semana, pd.DataFrame({'suma': grupos.sum(), 'n': grupos.count()}))
+
+        if 'Kilómetros Recorridos' in df.columns and 'Número interno' in df.columns:
+            # Cada bus está en una sola cubeta: los agregados por bus se concatenan
+            self.km_por_bus.append(df.groupby('Número interno')['Kilómetros Recorridos'].sum())
+            if 'Fecha' in df.columns:
+                self.fechas_por_bus.append(df.groupby('Número interno')['Fecha'].agg(['min', 'max']))
+
+        if 'Cantidad litros' in df.columns and 'Hora Numérica' in df.columns:
+            pares = df[['Hora Numérica', 'Cantidad litros']].dropna()
+            x, y = pares['Cantidad litros'].to_numpy(), pares['Hora Numérica'].to_numpy()
+            self.correlacion += [len(x), x.sum(), y.sum(), (x * x).sum(), (y * y).sum(), (x * y).sum()]
+            if 'Es Fin de Semana' in df.columns:
+                grupos = df.groupby('Es Fin de Semana')['Cantidad litros']
+                self.finde = _sumar(self.finde, pd.DataFrame({'suma': grupos.sum(), 'n': grupos.count()}))
+
+    def compute(self, diag):
+        """KPIs con las mismas claves que ``compute_kpis`` (salvo ``cubo``)."""
+        kpis = {}
+        if self.con_fechas:
+            try:
+                dia_semana = None
+                if self.dia_semana is not None:
+                    dia_semana = (self.dia_semana['suma'] / self.dia_semana['n']).to_dict()
+                consumption_kpis(kpis, self.por_dia.sort_index(), self.por_semana.sort_index(), self.por_mes.sort_index(), dia_semana)
+            except Exception as e:
+                diag.warning(f"⚠️ No se pudieron calcular algunos KPIs de consumo diario: {e}")
+
+        if self.km_por_bus:
+            try:
+                fechas = pd.concat(self.fechas_por_bus).sort_index() if self.fechas_por_bus else None
+                distance_kpis(kpis, pd.concat(self.km_por_bus).sort_index(), fechas)
+            except Exception as e:
+                diag.warning(f"⚠️ Error en análisis de distancia: {e}")
+
+        if {'Cantidad litros', 'Hora Numérica'} <= self.columnas:
+            n, sx, sy, sxx, syy, sxy = self.correlacion
+            with np.errstate(invalid='ignore', divide='ignore'):
+                kpis['correlacion_hora_litros'] = (n * sxy - sx * sy) / np.sqrt((n * sxx - sx ** 2) * (n * syy - sy ** 2))
+            if self.finde is not None:
+                medias = self.finde['suma'] / self.finde['n']
+                kpis['promedio_laboral'] = medias.get(False, np.nan)
+                kpis['promedio_finde'] = medias.get(True, np.nan)
+                kpis['diff_finde_laboral'] = (kpis['promedio_finde'] / kpis['promedio_laboral'] - 1) * 100
+        return kpis
+
+
+def _preparar_bloque(df, inicio, diag, options):
+    """Etapas por registro sobre un bloque crudo, con el número de fila global como índice."""
+    df.index = pd.RangeIndex(inicio, inicio + len(df))
+    for _, stage in ROW_STAGES:
+        df = stage(df, diag, options)
+
+    # Método 1 de malas cargas; el 2 depende de las columnas que mencionan
+    # "Carga Masiva" en todo el archivo y se guarda por columna
+    marcas, _, _ = text_flags(df, columnas=[])
+    menciones = []
+    auxiliares = {f"{AUXILIAR}texto": marcas}
+    for col in df.columns:
+        if df[col].dtype == 'object' and col not in EXCLUIDAS_TEXTO:
+            coincide, menciona = scan_text_column(df[col])
+            if menciona:
+                menciones.append(col)
+            auxiliares[f"{AUXILIAR}masiva {col}"] = coincide
+
+    if 'Modelo chasis' in df.columns and 'Cantidad litros' in df.columns:
+        _, auxiliares['Modelo Normalizado'] = normalize_column(df['Modelo chasis'], normalizar_modelo)
+    if all(col in df.columns for col in ['Número interno', 'Odómetro', 'Cantidad litros']):
+        df['Número interno'] = df['Número interno'].astype(str).str.strip().str.upper()
+    for col in COLUMNAS_NUMERICAS:
+        if col in df.columns:
+            df[col] = df[col].astype('float64')
+    return df.assign(**auxiliares), menciones
+
+
+def _cubeta(df, n_cubetas):
+    if 'Número interno' in df.columns:
+        claves = pd.util.hash_array(df['Número interno'].astype(str).to_numpy(dtype=object))
+    else:
+        claves = df.index.to_numpy(dtype='uint64')
+    return (claves % np.uint64(n_cubetas)).astype(np.int64)
+
+
+def _leer_bloques(source, diag, options, chunk_rows, staging, n_cubetas):
+    """Primera pasada: lee el CSV, acumula estadísticas y reparte los registros en cubetas."""
+    import pyarrow.parquet as pq
+
+    dialecto = detect_csv_dialect(source, diag)
+    resumen = {}
+    stats = _Estadisticas(semilla=0)
+    escritores = {}
+    esquema = None
+    columnas = None
+    inicio = 0
+    try:
+        for i, bloque in enumerate(iter_csv(source, dialecto, COLUMNAS_TEXTO, COLUMNAS_NUMERICAS, chunk_rows, resumen)):
+            filas_crudas = len(bloque)
+            d = diag if i == 0 else Diagnostics()
+            df, menciones = _preparar_bloque(bloque, inicio, d, options)
+            inicio += filas_crudas
+            _copiar_avisos(d, diag)
+            stats.columnas_mencion.update(menciones)
+            stats.update(df)
+            if columnas is None:
+                columnas = list(df.columns)
+
+            df = df.drop(columns='Modelo Normalizado', errors='ignore')
+            df[f"{AUXILIAR}fila"] = df.index
+            if esquema is None:
+                esquema = _esquema(df)
+            cubetas = _cubeta(df, n_cubetas)
+            for k in np.unique(cubetas):
+                if k not in escritores:
+                    escritores[k] = pq.ParquetWriter(os.path.join(staging, f"cubeta_{k:04d}.parquet"), esquema)
+                escritores[k].write_table(_tabla(df[cubetas == k], esquema))
+    finally:
+        for escritor in escritores.values():
+            escritor.close()
+
+    if resumen.get('descartadas'):
+        diag.warning(f"⚠️ Se omitieron {resumen['descartadas']} filas con un número de campos distinto al encabezado")
+    diag.info(f"📦 {stats.filas} registros leídos con {resumen.get('motor')} en bloques de {chunk_rows} filas, "
+              f"repartidos en {len(escritores)} cubetas por bus")
+    if stats.filas == 0:
+        diag.error("❌ El archivo está vacío o no contiene datos válidos.")
+        raise ProcessingError('empty')
+
+    # Columnas que habilitan el método 2, en el orden del archivo (define el motivo)
+    stats.columnas_mencion = [col for col in columnas if col in stats.columnas_mencion]
+    return stats, sorted(escritores)
+
+
+def _globales(stats, diag, options):
+    """Límites y estadísticas globales a partir de la primera pasada."""
+    globales = {'columnas_carga_masiva': list(stats.columnas_mencion)}
+    if stats.litros_total is None:
+        return globales
+
+    globales['upper_bound'] = litros_upper_bound(stats.litros.quantile(0.25), stats.litros.quantile(0.75))
+
+    if stats.litros_por_modelo is not None:
+        modelo_stats = moments_to_stats(stats.litros_por_modelo)
+        modelo_stats = modelo_stats[modelo_stats['count'] >= 5]
+        globales['promedio_por_modelo'] = modelo_stats['mean'].to_dict()
+        globales['std_por_modelo'] = modelo_stats['std'].to_dict()
+
+        # Capacidad de estanque por modelo: percentil 95 con al menos 10 registros
+        globales['estanque_estimado'] = pd.Series({
+            modelo: sketch.quantile(0.95) for modelo, sketch in stats.estanque_por_modelo.items()
+            if stats.filas_por_modelo.get(modelo, 0) >= 10
+        }, dtype='float64')
+
+        diag.info("🔄 Detectando outliers extremos...")
+        detectores, resumen = fit_detectors(
+            stats.grupos_detector(), store=options.detectors, refit=options.refit_detectors, n_jobs=options.n_jobs
+        )
+        for modelo, detector in list(detectores.items()):
+            if isinstance(detector, Exception):
+                diag.warning(f"⚠️ No se pudo calcular outliers para el modelo {modelo}: {detector}")
+                del detectores[modelo]
+        globales['detectores'] = detectores
+        if options.detectors is not None:
+            diag.info(
+                f"🧠 Detectores por modelo: {resumen['reutilizados']} reutilizados, "
+                f"{resumen['entrenados']} entrenados, {resumen['deriva']} reentrenados por deriva"
+            )
+    else:
+        total = moments_to_stats(stats.litros_total).iloc[0]
+        globales['media_litros'], globales['std_litros'] = total['mean'], total['std']
+
+    if stats.terminal_count is not None:
+        globales['terminal_count'] = stats.terminal_count.astype('int64').to_dict()
+        globales['terminal_avg_consumo'] = (stats.terminal_litros / stats.terminal_cargas_litros).to_dict()
+    return globales
+
+
+def _banderas(df, globales, diag, options):
+    """Segunda pasada sobre una cubeta: banderas, odómetros, terminales y llenado."""
+    df.index = df.pop(f"{AUXILIAR}fila").to_numpy()
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+
+    # Malas cargas por texto (métodos 1 y 2) y por litros extremos; el motivo
+    # es "Tipo" o la primera columna con coincidencia
+    marcas = df[f"{AUXILIAR}texto"].copy()
+    motivo = pd.Series(None, index=df.index, dtype=object).mask(marcas, 'Tipo')
+    for col in globales['columnas_carga_masiva']:
+        coincide = df[f"{AUXILIAR}masiva {col}"]
+        motivo = motivo.mask(coincide & ~marcas, col)
+        marcas = marcas | coincide
+    df = df.drop(columns=[col for col in df.columns if col.startswith(AUXILIAR)])
+    df['Mala Carga'] = marcas
+    df['Mala Carga Texto'] = marcas.copy()
+    df['Motivo Mala Carga'] = motivo
+    flag_litros_extremos(df, diag, upper_bound=globales.get('upper_bound'))
+
+    # Z-Score y sobreconsumo con las estadísticas por modelo del archivo completo
+    df['Outlier Extremo'] = False
+    if 'promedio_por_modelo' in globales:
+        df['Modelo chasis'], df['Modelo Normalizado'] = normalize_column(df['Modelo chasis'], normalizar_modelo)
+        apply_model_stats(df, globales['promedio_por_modelo'], globales['std_por_modelo'])
+        validos = df['Cantidad litros'].notna()
+        for modelo, detector in globales['detectores'].items():
+            seleccion = validos & (df['Modelo Normalizado'] == modelo)
+            if seleccion.any():
+                litros = df.loc[seleccion, 'Cantidad litros'].to_numpy().reshape(-1, 1)
+                df.loc[seleccion, 'Outlier Extremo'] = detector.predict(litros) == -1
+    elif 'media_litros' in globales:
+        media, std = globales['media_litros'], globales['std_litros']
+        if not pd.isna(media) and not pd.isna(std) and std > 0:
+            df['Umbral Sobreconsumo'] = media + 2 * std
+            df['Sobreconsumo'] = (df['Cantidad litros'] > df['Umbral Sobreconsumo']) & (~df['Mala Carga'])
+        else:
+            df['Sobreconsumo'] = False
+    else:
+        df['Sobreconsumo'] = False
+
+    # Cadena de odómetros: la cubeta tiene todas las cargas de sus buses
+    if all(col in df.columns for col in ['Número interno', 'Odómetro', 'Cantidad litros']):
+        df = chain_odometer(df)
+        df['Rendimiento'] = raw_rendimiento(df)
+
+    df = enrich_terminals(df, diag, options, globales.get('terminal_count'), globales.get('terminal_avg_consumo'))
+    df = enrich_llenado(df, diag, options, estanque_estimado=globales.get('estanque_estimado'))
+    return df
+
+
+def _finalizar(df, globales, diag, options):
+    """Tercera pasada sobre una cubeta: rendimiento, personal y columnas de período."""
+    if 'Kilómetros Recorridos' in df.columns:
+        df = compute_rendimiento_from_km(df, diag, globales['rendimiento_bounds'], globales['rendimiento_por_modelo'])
+    df = enrich_personal(df, diag, options, globales.get('conductor_stats'), globales.get('planillero_stats'))
+    if 'Cantidad litros' in df.columns and 'Fecha' in df.columns:
+        df['Semana'] = week_labels(df['Fecha'])
+        df['Mes'] = month_labels(df['Fecha'])
+    return df
+
+
+def _process_chunked(source, output_dir, options, chunk_rows, result):
+    import pyarrow.parquet as pq
+
+    diag = result.diagnostics
+    start_time = time.time()
+    staging = tempfile.mkdtemp(prefix='combustible-bloques-')
+    try:
+        n_cubetas = _cantidad_cubetas(source, chunk_rows)
+        with diag.profile.stage('lectura_bloques') as etapa:
+            stats, cubetas = _leer_bloques(source, diag, options, chunk_rows, staging, n_cubetas)
+            etapa.rows_out = stats.filas
+        with diag.profile.stage('estadisticas', rows_in=stats.filas):
+            globales = _globales(stats, diag, options)
+
+        # Banderas por cubeta; se acumulan el rendimiento y las tasas del personal
+        rendimiento = QuantileSketch()
+        rendimiento_modelo = {}
+        personal = _Personal()
+        n_malas = n_sobreconsumo = n_outliers = 0
+        with diag.profile.stage('banderas', rows_in=stats.filas) as etapa:
+            etapa.rows_out = 0
+            for k in cubetas:
+                ruta = os.path.join(staging, f"cubeta_{k:04d}.parquet")
+                d = Diagnostics()
+                df = _banderas(_leer(ruta), globales, d, options)
+                _copiar_avisos(d, diag)
+                if 'Rendimiento' in df.columns:
+                    rendimiento.update(df['Rendimiento'].to_numpy())
+                    if 'Modelo Normalizado' in df.columns:
+                        for modelo, grupo in df.groupby('Modelo Normalizado', observed=True)['Rendimiento']:
+                            rendimiento_modelo.setdefault(modelo, QuantileSketch()).update(grupo.to_numpy())
+                personal.update(df)
+                n_malas += int(df['Mala Carga'].sum())
+                n_sobreconsumo += int(df['Sobreconsumo'].sum())
+                n_outliers += int(df['Outlier Extremo'].sum())
+                etapa.rows_out += len(df)
+                df.to_parquet(ruta, index=True)
+
+        filas = etapa.rows_out
+        diag.info(f"🛑 Total de malas cargas detectadas: {n_malas} ({n_malas/filas*100:.2f}%)")
+        diag.info(f"⚠️ Anomalías detectadas: {n_sobreconsumo} sobreconsumos, {n_outliers} outliers extremos")
+
+        if len(rendimiento):
+            globales['rendimiento_bounds'] = bounds = rendimiento_bounds(rendimiento.quantile(0.10), rendimiento.quantile(0.90))
+            globales['rendimiento_por_modelo'] = {
+                modelo: sketch.mean_between(*bounds) for modelo, sketch in rendimiento_modelo.items()
+            }
+        else:
+            globales['rendimiento_bounds'], globales['rendimiento_por_modelo'] = (np.nan, np.nan), {}
+        globales['conductor_stats'], globales['planillero_stats'] = personal.tasas()
+
+        # Rendimiento, personal y escritura particionada por mes
+        kpis = _Kpis()
+        esquema = None
+        validos = 0
+        os.makedirs(os.path.join(output_dir, DIRECTORIO_CUBO), exist_ok=True)
+        with diag.profile.stage('escritura', rows_in=filas) as etapa:
+            etapa.rows_out = 0
+            for k in cubetas:
+                d = Diagnostics()
+                df = _finalizar(_leer(os.path.join(staging, f"cubeta_{k:04d}.parquet")), globales, d, options)
+                _copiar_avisos(d, diag)
+                kpis.update(df)
+                # Cubo parcial de la cubeta: se combina con los demás al leerlo
+                cubo = _sin_categorias(build_cube(df).cells)
+                cubo.to_parquet(os.path.join(output_dir, DIRECTORIO_CUBO, f"cubeta_{k:04d}.parquet"), index=False)
+                df = df.reset_index(names=COLUMNA_FILA)
+                if 'Rendimiento' in df.columns:
+                    validos += int(df['Rendimiento'].notna().sum())
+                if esquema is None:
+                    esquema = _esquema(df)
+                particiones = ['Mes'] if 'Mes' in df.columns else None
+                pq.write_to_dataset(
+                    _tabla(df, esquema), output_dir, partition_cols=particiones,
+                    basename_template=f"cubeta_{k:04d}_{{i}}.parquet", existing_data_behavior='overwrite_or_ignore'
+                )
+                etapa.rows_out += len(df)
+
+        if len(rendimiento):
+            diag.info(f"🚌 Rendimiento: {validos / filas * 100:.1f}% de registros con rendimiento válido")
+        with diag.profile.stage('kpis', rows_in=filas):
+            result.kpis = kpis.compute(diag)
+    except ProcessingError:
+        return
+    except Exception as e:
+        diag.error(f"❌ Error al procesar el archivo por bloques: {e}")
+        diag.error(f"Detalles adicionales: {traceback.format_exc()}")
+        return
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    diag.execution_time = time.time() - start_time
+    diag.success(f"""
+        ✅ Archivo procesado por bloques en {diag.execution_time:.2f} segundos:
+        - {filas} registros escritos en {output_dir}
+        - {n_malas} malas cargas detectadas
+        - {n_sobreconsumo + n_outliers} anomalías identificadas
+        """)
+    result.rows = filas
+    result.stats = {'columnas_carga_masiva': globales['columnas_carga_masiva']}
+    if stats.litros_por_modelo is not None:
+        result.stats['litros_por_modelo'] = stats.litros_por_modelo
+    result.output_dir = output_dir
+
+
+def process_file_chunked(source, output_dir, name=None, options=None, chunk_rows=CHUNK_ROWS):
+    """
+    Procesa un CSV por bloques y escribe el resultado como Parquet particionado por mes.
+
+    Usa las mismas etapas y columnas que ``process_file``, con estadísticas
+    globales acumuladas por bloques: los cuartiles de litros y el percentil
+    95 por modelo son exactos mientras haya menos de 100.000 valores
+    distintos, y los percentiles de rendimiento quedan con un error relativo
+    menor a 0,1 %. Los Isolation Forest se entrenan con una muestra de hasta
+    ``MUESTRA_DETECTOR`` registros por modelo (todos los registros si el
+    modelo tiene menos).
+
+    Args:
+        source: Ruta o archivo tipo file-like (CSV o ``.txt``)
+        output_dir: Directorio donde se escribe el resultado; debe estar vacío
+            o no existir
+        name: Nombre del archivo (opcional, se usa para detectar la extensión)
+        options: ProcessingOptions (opcional; la caché no se usa)
+        chunk_rows: Filas por bloque; define la memoria usada
+
+    Returns:
+        ChunkedResult con el directorio, los KPIs y el diagnóstico. Si falla,
+        ``result.output_dir`` es ``None`` y el motivo queda en el diagnóstico.
+    """
+    result = ChunkedResult()
+    options = options or ProcessingOptions()
+    diag = result.diagnostics
+    profile = diag.profile
+    profile.trace_memory = options.trace_memory
+    name = name or getattr(source, 'name', None) or os.fspath(source)
+
+    if os.path.splitext(name)[1].lower() not in ('.csv', '.txt'):
+        diag.error("❌ El modo por bloques lee archivos CSV; los Excel (máximo 1.048.576 filas por hoja) se procesan en memoria.")
+        return result
+    if os.path.isdir(output_dir) and os.listdir(output_dir):
+        diag.error(f"❌ El directorio de salida {output_dir} no está vacío.")
+        return result
+
+    with profile.tracing():
+        _process_chunked(source, output_dir, options, chunk_rows, result)
+
+    log_profile(result, options, name, modo='bloques')
+    return result
@@ -0,0 +1,403 @@
+"""
+Cubo de agregados diarios.
+
+Las secciones de la aplicación agrupan el mismo conjunto de datos una y otra
+vez (por terminal, modelo, bus, conductor, día o período). El cubo resume los
+registros una sola vez por día × terminal × modelo × bus × conductor ×
+período con medidas aditivas (conteos, sumas y sumas de cuadrados), de modo
+que cualquier agrupación sobre esas dimensiones se obtiene sumando celdas del
+cubo en lugar de recorrer los registros.
+
+Cada combinación de dimensiones consultada se suma una vez sobre las celdas y
+queda guardada por día: las consultas siguientes (otro rango de fechas, otra
+vista semanal o mensual) solo recorren esa tabla chica.
+
+Para las tarjetas de KPI de un rango de fechas, ``DayIndex`` guarda sumas
+acumuladas por día (del total y de cada terminal o bus): el rango se ubica
+con ``searchsorted`` y los totales son la diferencia de dos sumas
+acumuladas, sin comparar la fecha de cada registro. El mismo índice entrega
+las posiciones de los registros de un bus, conductor o terminal en orden
+cronológico, para las vistas de detalle y sus selectores.
+"""
+import numpy as np
+import pandas as pd
+
+from combustible.heatmap import heatmap_matrix, weekday_hour_codes
+from combustible.parsing import combine_timestamp
+
+
+# Dimensiones del cubo; 'Fecha' se trunca al día
+DIMENSIONES = ['Fecha', 'Terminal', 'Modelo chasis', 'Número interno', 'Nombre conductor', 'Período']
+
+# Medidas aditivas (todas se combinan sumando)
+MEDIDAS = [
+    'Cargas',
+    'Cargas con Litros',
+    'Litros',
+    'Litros²',
+    'Malas Cargas',
+    'Litros Malas Cargas',
+    'Sobreconsumos',
+    'Litros Sobreconsumo',
+    'Kilómetros',
+    'Cargas con Rendimiento',
+    'Rendimiento Suma',
+]
+
+# Medidas de las sumas acumuladas de DayIndex (las que usan las tarjetas de KPI)
+MEDIDAS_DIARIAS = [
+    'Cargas',
+    'Cargas con Litros',
+    'Litros',
+    'Malas Cargas',
+    'Sobreconsumos',
+    'Cargas con Rendimiento',
+    'Rendimiento Suma',
+]
+
+
+def _medidas(df):
+    medidas = {'Cargas': np.ones(len(df), dtype=np.int64)}
+    litros = df['Cantidad litros'].astype('float64') if 'Cantidad litros' in df.columns else None
+    if litros is not None:
+        medidas['Cargas con Litros'] = litros.notna().astype(np.int64)
+        medidas['Litros'] = litros
+        medidas['Litros²'] = litros ** 2
+    for bandera, conteo, suma in [('Mala Carga', 'Malas Cargas', 'Litros Malas Cargas'),
+                                  ('Sobreconsumo', 'Sobreconsumos', 'Litros Sobreconsumo')]:
+        if bandera in df.columns:
+            marcas = df[bandera].fillna(False).astype(bool)
+            medidas[conteo] = marcas.astype(np.int64)
+            if litros is not None:
+                medidas[suma] = litros.where(marcas)
+    if 'Kilómetros Recorridos' in df.columns:
+        medidas['Kilómetros'] = df['Kilómetros Recorridos'].astype('float64')
+    if 'Rendimiento' in df.columns:
+        rendimiento = df['Rendimiento'].astype('float64')
+        medidas['Cargas con Rendimiento'] = rendimiento.notna().astype(np.int64)
+        medidas['Rendimiento Suma'] = rendimiento
+    return pd.DataFrame(medidas, index=df.index)
+
+
+def _total(medidas):
+    # Una fila con las sumas, conservando los conteos como enteros
+    return pd.DataFrame([medidas.sum()]).astype(medidas.dtypes)
+
+
+def _sin_categorias(indice):
+    # Claves como texto (en el orden de las categorías), igual que al agrupar los registros
+    if isinstance(indice, pd.MultiIndex):
+        return indice.set_levels([_sin_categorias(nivel) for nivel in indice.levels])
+    return indice.astype(object) if isinstance(indice, pd.CategoricalIndex) else indice
+
+
+def _derivadas(tabla):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if 'Litros' in tabla.columns:
+            n = tabla['Cargas con Litros']
+            tabla['Promedio Litros'] = (tabla['Litros'] / n).where(n > 0)
+        if 'Litros²' in tabla.columns:
+            # Varianza muestral a partir de la suma y la suma de cuadrados
+            varianza = (tabla['Litros²'] - tabla['Litros'] ** 2 / n) / (n - 1)
+            tabla['Desviación Litros'] = np.sqrt(varianza.clip(lower=0)).where(n > 1)
+        if 'Malas Cargas' in tabla.columns:
+            tabla['% Malas Cargas'] = tabla['Malas Cargas'] / tabla['Cargas'] * 100
+        if 'Sobreconsumos' in tabla.columns:
+            tabla['% Sobreconsumo'] = tabla['Sobreconsumos'] / tabla['Cargas'] * 100
+        if 'Rendimiento Suma' in tabla.columns:
+            n = tabla['Cargas con Rendimiento']
+            tabla['Rendimiento Promedio'] = (tabla['Rendimiento Suma'] / n).where(n > 0)
+    return tabla
+
+
+class DailyCube:
+    """
+    Cubo de agregados diarios de un dataset procesado.
+
+    Attributes:
+        cells: Una fila por celda con las dimensiones presentes de
+            ``DIMENSIONES`` (texto como ``category``) y las medidas de ``MEDIDAS``
+    """
+
+    def __init__(self, cells):
+        self.cells = cells
+        self._bases = {}
+
+    def __getstate__(self):
+        # Las sumas guardadas se recalculan al consultar; no viajan a la caché
+        return {'cells': self.cells}
+
+    def __setstate__(self, state):
+        self.cells = state['cells']
+        self._bases = {}
+
+    def __len__(self):
+        return len(self.cells)
+
+    @property
+    def registros(self):
+        """Cantidad de registros resumidos en el cubo."""
+        return int(self.cells['Cargas'].sum())
+
+    def _base(self, claves):
+        # Sumas por ``claves`` (los grupos con clave NaN se omiten, como en ``groupby``)
+        if claves not in self._bases:
+            medidas = [col for col in MEDIDAS if col in self.cells.columns]
+            if claves:
+                base = self.cells.groupby(list(claves), observed=True)[medidas].sum().reset_index()
+            else:
+                base = _total(self.cells[medidas])
+            self._bases[claves] = base
+        return self._bases[claves]
+
+    def rollup(self, by=None, desde=None, hasta=None):
+        """
+        Suma las medidas por ``by`` y agrega promedios y porcentajes.
+
+        Args:
+            by: Dimensión o lista de dimensiones; también una función que
+                recibe la Serie de días (``Fecha``) y devuelve la clave de
+                cada día (por ejemplo ``lambda f: f.dt.strftime('%Y-%m')``).
+                ``None`` para el total
+            desde, hasta: Fechas límite (inclusive) sobre ``Fecha``
+
+        Returns:
+            DataFrame indexado por ``by`` con las medidas y las columnas
+            derivadas ``Promedio Litros``, ``Desviación Litros``,
+            ``% Malas Cargas``, ``% Sobreconsumo`` y ``Rendimiento Promedio``
+        """
+        por_fecha = callable(by)
+        dimensiones = [] if by is None or por_fecha else [by] if isinstance(by, str) else list(by)
+        con_fecha = (por_fecha or desde is not None or hasta is not None) and 'Fecha' not in dimensiones
+        base = self._base(tuple((['Fecha'] if con_fecha else []) + dimensiones))
+
+        if desde is not None:
+            base = base[base['Fecha'] >= pd.Timestamp(desde)]
+        if hasta is not None:
+            base = base[base['Fecha'] <= pd.Timestamp(hasta)]
+
+        medidas = [col for col in MEDIDAS if col in base.columns]
+        if por_fecha:
+            tabla = base.groupby(by(base['Fecha']))[medidas].sum()
+        elif dimensiones:
+            tabla = base.groupby(dimensiones, observed=True)[medidas].sum()
+            tabla.index = _sin_categorias(tabla.index)
+        else:
+            tabla = _total(base[medidas])
+        return _derivadas(tabla)
+
+
+def _celdas(medidas, claves):
+    # NaN en las claves forma su propia celda para que los totales no pierdan registros
+    if not claves:
+        return _total(medidas)
+    cells = medidas.groupby(claves, dropna=False, observed=True).sum().reset_index()
+    # Dimensiones de texto como códigos: el cubo ocupa menos y se agrupa más rápido
+    for clave in claves:
+        if not pd.api.types.is_datetime64_any_dtype(cells[clave.name]):
+            cells[clave.name] = cells[clave.name].astype('category')
+    return cells
+
+
+def build_cube(df):
+    """
+    Agrega ``df`` al grano día × terminal × modelo × bus × conductor × período.
+
+    Las dimensiones ausentes en ``df`` se omiten. Las sumas ignoran los NaN
+    (como ``Series.sum``) y los conteos ``Cargas con ...`` cuentan los valores
+    presentes, para obtener promedios iguales a ``Series.mean``.
+
+    Returns:
+        DailyCube
+    """
+    claves = []
+    for col in DIMENSIONES:
+        if col in df.columns:
+            clave = df[col].dt.normalize() if col == 'Fecha' else df[col]
+            claves.append(clave.rename(col))
+    return DailyCube(_celdas(_medidas(df), claves))
+
+
+def merge_cubes(cubos):
+    """Combina cubos de partes disjuntas de un dataset en el cubo del conjunto."""
+    cells = pd.concat([cubo.cells for cubo in cubos], ignore_index=True)
+    dimensiones = [col for col in DIMENSIONES if col in cells.columns]
+    medidas = cells[[col for col in MEDIDAS if col in cells.columns]]
+    return DailyCube(_celdas(medidas, [cells[col] for col in dimensiones]))
+
+
+# Ordinal de NaT: queda antes de cualquier día
+_SIN_FECHA = np.iinfo(np.int64).min
+
+
+def _ordinales(fechas):
+    # Día de cada registro como entero (días desde 1970)
+    return fechas.to_numpy('datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+
+
+def _marcas(df):
+    # Fecha y hora de cada registro (ns desde 1970); sin hora, al final de su día
+    if 'Marca Tiempo' in df.columns:
+        return df['Marca Tiempo'].to_numpy(dtype=np.int64, copy=True)
+    if 'Hora' in df.columns:
+        return combine_timestamp(df['Fecha'], df['Hora']).to_numpy(copy=True)
+    return df['Fecha'].to_numpy('datetime64[ns]').view(np.int64).copy()
+
+
+def _ordinal(fecha):
+    return pd.Timestamp(fecha).to_datetime64().astype('datetime64[D]').astype(np.int64)
+
+
+class DayIndex:
+    """
+    Índice de posiciones y sumas acumuladas por día de un DataFrame procesado.
+
+    Para cada dimensión (todos los registros, terminal, bus, conductor, ...)
+    los registros se ordenan por grupo y fecha y hora, de modo que
+    los registros de un grupo en un rango de fechas son un tramo contiguo
+    que se ubica con dos ``searchsorted``. Cada día de cada grupo es una
+    celda con las sumas de ``MEDIDAS_DIARIAS`` y su suma acumulada: los
+    totales del rango son la resta de dos sumas acumuladas.
+
+    Cada dimensión se indexa la primera vez que se consulta (las sumas
+    acumuladas, la primera vez que se piden totales). Los registros sin fecha
+    solo se incluyen si no se piden límites de fecha, igual que al filtrar por
+    fecha; si ``df`` no tiene ``Fecha``, los límites de fecha se ignoran.
+
+    Attributes:
+        df: DataFrame indexado (las posiciones se refieren a sus filas)
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._con_fecha = 'Fecha' in df.columns
+        self._valores = None
+        self._ordenes = {}
+        self._acumulados = {}
+        self._codigos_horario = None
+        self._mapas = {}
+
+    def __len__(self):
+        return len(self.df)
+
+    def _orden(self, dimension):
+        # (posiciones, días, grupos, inicios, etiquetas) de ``dimension`` (None: total)
+        if dimension not in self._ordenes:
+            df = self.df
+            if dimension is None:
+                codigos, etiquetas = np.zeros(len(df), dtype=np.int64), np.array([None], dtype=object)
+            else:
+                codigos, etiquetas = pd.factorize(df[dimension], sort=True)
+            if self._con_fecha:
+                dias = _ordinales(df['Fecha'])
+                tiempos = _marcas(df)
+                # Sin fecha (NaT) se ordena primero dentro de cada grupo
+                tiempos[dias == _SIN_FECHA] = _SIN_FECHA
+            else:
+                tiempos = dias = np.zeros(len(df), dtype=np.int64)
+            # Orden estable por grupo y fecha y hora
+            posiciones = np.lexsort((tiempos, codigos))
+            dias, codigos = dias[posiciones], codigos[posiciones]
+
+            # Una celda por grupo y día; ``inicios`` es su primera fila en ``posiciones``
+            cambio = np.ones(len(posiciones), dtype=bool)
+            cambio[1:] = (dias[1:] != dias[:-1]) | (codigos[1:] != codigos[:-1])
+            inicios = np.flatnonzero(cambio)
+
+            # Grupo -> tramo de celdas (los valores nulos, con código -1, quedan fuera)
+            limites = np.searchsorted(codigos[inicios], np.arange(len(etiquetas) + 1))
+            grupos = {etiqueta: (limites[i], limites[i + 1]) for i, etiqueta in enumerate(etiquetas)}
+            self._ordenes[dimension] = (posiciones, dias[inicios], grupos,
+                                        np.append(inicios, len(posiciones)), etiquetas)
+        return self._ordenes[dimension]
+
+    def _suma_acumulada(self, dimension):
+        # Suma acumulada de las medidas por celda (una fila más: el cero inicial)
+        if dimension not in self._acumulados:
+            if self._valores is None:
+                medidas = _medidas(self.df)
+                medidas = medidas[[col for col in MEDIDAS_DIARIAS if col in medidas.columns]]
+                self._valores = medidas.fillna(0).astype('float64')
+            posiciones, _, _, inicios, _ = self._orden(dimension)
+            valores = self._valores.to_numpy()[posiciones]
+            sumas = np.add.reduceat(valores, inicios[:-1], axis=0) if len(posiciones) else valores
+            self._acumulados[dimension] = np.vstack([np.zeros((1, valores.shape[1])), np.cumsum(sumas, axis=0)])
+        return self._acumulados[dimension]
+
+    def _tramo(self, desde, hasta, dimension, valor):
+        # Celdas [a, b) del grupo dentro del rango de fechas
+        _, dias, grupos, _, _ = self._orden(dimension)
+        primera, ultima = grupos.get(valor, (0, 0))
+        if not self._con_fecha or (desde is None and hasta is None):
+            return primera, ultima
+        # Con cualquier límite de fecha se excluyen los registros sin fecha
+        inicio = _SIN_FECHA + 1 if desde is None else _ordinal(desde)
+        a = primera + np.searchsorted(dias[primera:ultima], inicio, 'left')
+        b = ultima if hasta is None else primera + np.searchsorted(dias[primera:ultima], _ordinal(hasta), 'right')
+        return a, max(b, a)
+
+    def entities(self, dimension):
+        """Valores distintos (sin nulos) de ``dimension``, ordenados; para los selectores."""
+        return list(self._orden(dimension)[4])
+
+    def totals(self, desde=None, hasta=None, dimension=None, valor=None):
+        """
+        Totales de un rango de fechas, del conjunto o de un grupo.
+
+        Args:
+            desde, hasta: Fechas límite (inclusive); ``None`` sin límite
+            dimension: Columna del grupo (por ejemplo ``'Terminal'``);
+                ``None`` para todos los registros
+            valor: Grupo de ``dimension`` a sumar
+
+        Returns:
+            Serie con las medidas de ``MEDIDAS_DIARIAS`` presentes y las
+            derivadas ``Promedio Litros``, ``% Malas Cargas``,
+            ``% Sobreconsumo`` y ``Rendimiento Promedio``
+        """
+        a, b = self._tramo(desde, hasta, dimension, valor)
+        acumulados = self._suma_acumulada(dimension)
+        tabla = pd.DataFrame([acumulados[b] - acumulados[a]], columns=self._valores.columns)
+        return _derivadas(tabla).iloc[0]
+
+    def positions(self, desde=None, hasta=None, dimension=None, valor=None, cronologico=False):
+        """
+        Posiciones (para ``iloc``) de los registros de un rango de fechas.
+
+        Acepta los mismos argumentos que ``totals``. Las posiciones quedan en
+        el orden original del DataFrame o, con ``cronologico=True``, por
+        fecha y hora.
+        """
+        a, b = self._tramo(desde, hasta, dimension, valor)
+        posiciones, _, _, inicios, _ = self._orden(dimension)
+        tramo = posiciones[inicios[a]:inicios[b]]
+        return tramo if cronologico else np.sort(tramo)
+
+    def rows(self, desde=None, hasta=None, dimension=None, valor=None, cronologico=False):
+        """
+        Registros de un rango de fechas como DataFrame (``df.iloc`` de ``positions``).
+
+        Si son todos los registros en su orden original se devuelve una copia
+        superficial de ``df``: con copy-on-write comparte los datos en lugar
+        de duplicar todas las columnas.
+        """
+        posiciones = self.positions(desde, hasta, dimension, valor, cronologico)
+        if len(posiciones) == len(self.df) and np.all(posiciones[1:] > posiciones[:-1]):
+            return self.df.copy(deep=False)
+        return self.df.iloc[posiciones]
+
+    def heatmap(self, value_column=None, aggfunc='count', desde=None, hasta=None, dimension=None, valor=None):
+        """
+        Matriz día × hora (``heatmap_matrix``) de los registros de un rango.
+
+        Los códigos día × hora se calculan una vez por dataset y cada matriz
+        queda guardada por columna, agregación y filtro.
+        """
+        clave = (value_column, aggfunc, desde, hasta, dimension, valor)
+        if clave not in self._mapas:
+            if self._codigos_horario is None:
+                self._codigos_horario = weekday_hour_codes(self.df)
+            posiciones = self.positions(desde, hasta, dimension, valor)
+            valores = None if value_column is None else self.df[value_column].to_numpy(dtype='float64', na_value=np.nan)[posiciones]
+            self._mapas[clave] = heatmap_matrix(self._codigos_horario[posiciones], valores, aggfunc)
+        return self._mapas[clave]
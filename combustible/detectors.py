@@ -0,0 +1,230 @@
+"""
+Detectores Isolation Forest por modelo de chasis, persistidos en disco.
+
+Cada detector se guarda con ``joblib`` bajo una clave formada por el modelo
+normalizado y la ventana de fechas con que se entrenó. En cargas posteriores
+los registros se evalúan contra el detector guardado y solo se reentrena
+cuando el usuario lo pide o cuando la distribución de litros del modelo se
+desplazó respecto a la de entrenamiento (deriva). Los entrenamientos
+pendientes se ejecutan en paralelo, un proceso por modelo. De cada modelo
+se conserva solo el detector de la ventana más reciente.
+"""
+import os
+import re
+from dataclasses import dataclass
+
+import joblib
+import numpy as np
+from joblib import Parallel, delayed
+
+
+# Variable de entorno con el directorio donde se guardan los detectores
+DETECTORS_DIR_ENV = 'COMBUSTIBLE_DETECTORS_DIR'
+DETECTORS_DIR_DEFAULT = os.path.join(os.path.expanduser('~'), '.cache', 'combustible', 'detectors')
+
+# Mínimo de registros válidos para entrenar un detector
+MIN_REGISTROS = 10
+
+# Parámetros del Isolation Forest (mismos que el análisis original)
+CONTAMINACION = 0.05
+SEMILLA = 42
+
+# Deriva: desplazamiento de la media (en desviaciones estándar de entrenamiento)
+# o cambio de dispersión a partir del cual se reentrena el detector
+UMBRAL_DERIVA_MEDIA = 0.5
+RANGO_DERIVA_STD = (0.5, 2.0)
+
+# Ventana de un detector entrenado sin fechas (más antigua que cualquier fecha)
+SIN_FECHA = 'sin-fecha'
+
+# Ventanas que se conservan por modelo (las más recientes)
+VENTANAS_GUARDADAS = 1
+
+
+@dataclass
+class DetectorRecord:
+    """Detector entrenado junto con la ventana y estadísticas de entrenamiento."""
+    modelo: str
+    desde: str
+    hasta: str
+    registros: int
+    media: float
+    std: float
+    detector: object  # sklearn.ensemble.IsolationForest
+
+    def drifted(self, litros):
+        """Indica si los litros nuevos se alejan de la distribución de entrenamiento."""
+        media = float(np.mean(litros))
+        std = float(np.std(litros))
+        if self.std > 0:
+            if abs(media - self.media) > UMBRAL_DERIVA_MEDIA * self.std:
+                return True
+            ratio = std / self.std
+            return not (RANGO_DERIVA_STD[0] <= ratio <= RANGO_DERIVA_STD[1])
+        return std > 0 or media != self.media
+
+
+def _slug(texto):
+    return re.sub(r'[^A-Z0-9]+', '_', str(texto).upper()).strip('_') or 'SIN_MODELO'
+
+
+class DetectorStore:
+    """Directorio con un archivo ``<modelo>__<desde>_<hasta>.joblib`` por modelo (su última ventana)."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    @classmethod
+    def from_env(cls):
+        """Store en ``COMBUSTIBLE_DETECTORS_DIR`` o, si no está definido, en ``~/.cache``."""
+        return cls(os.environ.get(DETECTORS_DIR_ENV) or DETECTORS_DIR_DEFAULT)
+
+    def _path(self, modelo, desde, hasta):
+        return os.path.join(self.directory, f"{_slug(modelo)}__{desde}_{hasta}.joblib")
+
+    def _records(self, modelo):
+        # (ruta, record) del modelo, del fin de ventana más reciente al más
+        # antiguo; las ventanas sin fecha van al final
+        if not os.path.isdir(self.directory):
+            return
+        prefijo = f"{_slug(modelo)}__"
+        archivos = [f for f in os.listdir(self.directory) if f.startswith(prefijo) and f.endswith('.joblib')]
+        hasta = lambda f: f[:-len('.joblib')].split('_')[-1]
+        for archivo in sorted(archivos, key=lambda f: (hasta(f) != SIN_FECHA, hasta(f)), reverse=True):
+            ruta = os.path.join(self.directory, archivo)
+            try:
+                record = joblib.load(ruta)
+            except Exception:
+                continue
+            # El slug puede agrupar nombres distintos; verificar el modelo exacto
+            if isinstance(record, DetectorRecord) and record.modelo == modelo:
+                yield ruta, record
+
+    def latest(self, modelo):
+        """Detector más reciente (por fin de ventana) del modelo, o ``None``."""
+        return next((record for _, record in self._records(modelo)), None)
+
+    def save(self, record):
+        """Guarda ``record`` y elimina las ventanas anteriores del mismo modelo."""
+        os.makedirs(self.directory, exist_ok=True)
+        joblib.dump(record, self._path(record.modelo, record.desde, record.hasta))
+        for i, (ruta, _) in enumerate(self._records(record.modelo)):
+            if i >= VENTANAS_GUARDADAS:
+                try:
+                    os.remove(ruta)
+                except OSError:
+                    pass
+
+
+def _ventana(fechas):
+    if fechas is None or len(fechas) == 0 or np.isnat(fechas).all():
+        return SIN_FECHA, SIN_FECHA
+    validas = fechas[~np.isnat(fechas)]
+    formato = lambda f: np.datetime_as_string(f, unit='D').replace('-', '')
+    return formato(validas.min()), formato(validas.max())
+
+
+def _fit(litros):
+    # Se ejecuta en un proceso aparte: devuelve el detector y sus etiquetas
+    from sklearn.ensemble import IsolationForest
+
+    detector = IsolationForest(contamination=CONTAMINACION, random_state=SEMILLA)
+    etiquetas = detector.fit_predict(litros)
+    return detector, etiquetas
+
+
+def _fit_seguro(litros):
+    try:
+        return _fit(litros)
+    except Exception as e:
+        return e
+
+
+def detect_outliers(grupos, store=None, refit=False, n_jobs=-1):
+    """
+    Marca outliers extremos de litros por modelo.
+
+    Args:
+        grupos: dict ``modelo -> (litros, fechas)``, con ``litros`` como matriz
+            ``(n, 1)`` sin NaN y ``fechas`` como ``datetime64`` (o ``None``)
+        store: DetectorStore donde buscar y guardar detectores (opcional)
+        refit: Reentrenar todos los modelos aunque exista un detector guardado
+        n_jobs: Procesos para los entrenamientos (``-1`` usa todos los núcleos)
+
+    Returns:
+        Tupla ``(outliers, resumen)``: ``outliers`` mapea cada modelo a un
+        arreglo booleano (o a la excepción si falló) y ``resumen`` cuenta los
+        modelos reutilizados, reentrenados por deriva, entrenados y los
+        detectores que no se pudieron guardar.
+    """
+    _, outliers, resumen = _detectar(grupos, store, refit, n_jobs)
+    return outliers, resumen
+
+
+def fit_detectors(grupos, store=None, refit=False, n_jobs=-1):
+    """
+    Detectores por modelo, reutilizados o entrenados como en ``detect_outliers``.
+
+    Sirven para evaluar registros que no participaron del entrenamiento (por
+    ejemplo, los bloques del modo por bloques, entrenando con una muestra).
+
+    Returns:
+        Tupla ``(detectores, resumen)``: ``detectores`` mapea cada modelo al
+        ``IsolationForest`` (o a la excepción si falló)
+    """
+    detectores, outliers, resumen = _detectar(grupos, store, refit, n_jobs)
+    for modelo, marcas in outliers.items():
+        if isinstance(marcas, Exception):
+            detectores[modelo] = marcas
+    return detectores, resumen
+
+
+def _detectar(grupos, store, refit, n_jobs):
+    detectores = {}
+    outliers = {}
+    resumen = {'reutilizados': 0, 'deriva': 0, 'entrenados': 0, 'no_guardados': 0}
+    pendientes = []
+    motivos = {}
+
+    for modelo, (litros, fechas) in grupos.items():
+        record = store.latest(modelo) if store is not None and not refit else None
+        if record is not None:
+            if not record.drifted(litros):
+                try:
+                    outliers[modelo] = record.detector.predict(litros) == -1
+                    detectores[modelo] = record.detector
+                    resumen['reutilizados'] += 1
+                    continue
+                except Exception:
+                    pass
+            else:
+                motivos[modelo] = 'deriva'
+        pendientes.append(modelo)
+
+    # Entrenar en paralelo los modelos sin detector válido
+    if len(pendientes) > 1 and n_jobs != 1:
+        resultados = Parallel(n_jobs=n_jobs)(delayed(_fit_seguro)(grupos[m][0]) for m in pendientes)
+    else:
+        resultados = [_fit_seguro(grupos[m][0]) for m in pendientes]
+
+    for modelo, resultado in zip(pendientes, resultados):
+        if isinstance(resultado, Exception):
+            outliers[modelo] = resultado
+            continue
+        detector, etiquetas = resultado
+        outliers[modelo] = etiquetas == -1
+        detectores[modelo] = detector
+        resumen[motivos.get(modelo, 'entrenados')] += 1
+
+        if store is not None:
+            litros, fechas = grupos[modelo]
+            desde, hasta = _ventana(fechas)
+            try:
+                store.save(DetectorRecord(
+                    modelo=modelo, desde=desde, hasta=hasta, registros=len(litros),
+                    media=float(np.mean(litros)), std=float(np.std(litros)), detector=detector
+                ))
+            except OSError:
+                resumen['no_guardados'] += 1
+
+    return detectores, outliers, resumen
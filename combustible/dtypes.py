@@ -0,0 +1,144 @@
+"""
+Plan de tipos del DataFrame enriquecido.
+
+Cada sesión de la aplicación guarda su propia copia del resultado, por lo que
+los tipos definen cuántos usuarios caben en un servidor. Las columnas que
+calcula el pipeline se compactan al terminar:
+
+- etiquetas repetidas (día, mes, período, categorías) como ``category`` con
+  las categorías en su orden natural;
+- campos de calendario como ``int8``/``int16`` (``Int8``/``Int16`` si hay
+  fechas inválidas);
+- métricas derivadas (Z-Score, rendimiento, tasas, porcentajes) como
+  ``float32``;
+- columnas de verdadero/falso que quedaron como ``object`` (al anexar
+  archivos sin alguna columna) como ``boolean``.
+
+Las columnas del archivo original no cambian: los litros y odómetros siguen
+en ``float64`` para que sumas y diferencias de kilometraje sean exactas, y los
+textos siguen como ``object`` porque la búsqueda de malas cargas y las
+agrupaciones de la interfaz dependen de ello.
+"""
+import numpy as np
+import pandas as pd
+
+from combustible.binning import CONDUCTOR, EFICIENCIA, LLENADO, PLANILLERO
+from combustible.parsing import NOMBRES_DIA, NOMBRES_MES
+
+
+# Columna -> categorías en su orden natural (``None``: orden alfabético)
+CATEGORICAS = {
+    'Mes Nombre': list(NOMBRES_MES),
+    'Día Semana': list(NOMBRES_DIA),
+    'Período': ['Madrugada', 'Mañana', 'Tarde', 'Noche'],
+    'Categoría Eficiencia': list(EFICIENCIA.labels),
+    'Nivel Llenado': list(LLENADO.labels),
+    'Categoría Conductor': list(CONDUCTOR.labels),
+    'Categoría Planillero': list(PLANILLERO.labels),
+    'Motivo Mala Carga': None,
+    'Semana': None,
+    'Mes': None,  # Etiqueta '%Y-%m' de compute_kpis
+}
+
+# Columna -> entero más chico que contiene sus valores
+ENTEROS = {
+    'Año': 'int16',
+    'Mes': 'int8',  # Antes de compute_kpis es el número de mes
+    'Día': 'int8',
+    'Semana del Año': 'int8',
+    'Trimestre': 'int8',
+    'Ranking Terminal': 'int16',
+    'Cargas Terminal': 'int32',
+}
+
+FLOTANTES = [
+    'Hora Numérica',
+    'Promedio Modelo',
+    'Desviación Modelo',
+    'Z-Score',
+    'Umbral Sobreconsumo',
+    'Rendimiento',
+    'Rendimiento Promedio Modelo',
+    'Desviación Rendimiento',
+    'Consumo Promedio Terminal',
+    'Estanque Estimado',
+    'Porcentaje Llenado',
+    'Tasa Sobreconsumo Conductor',
+    'Tasa Malas Cargas Planillero',
+]
+
+MB = 1024 * 1024
+
+
+def _categorica(serie, categorias):
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        presentes = serie.cat.categories
+    elif serie.dtype == object:
+        presentes = serie.dropna().unique()
+    else:
+        return serie
+    if categorias is None:
+        categorias = sorted(presentes)
+    else:
+        # Valores fuera del plan (por ejemplo, días en otro idioma) se agregan al final
+        categorias = categorias + sorted(set(presentes) - set(categorias))
+    return serie.astype(pd.CategoricalDtype(categorias))
+
+
+def _entera(serie, tipo):
+    if not pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+        return serie
+    valores = serie.dropna()
+    if pd.api.types.is_float_dtype(valores) and not np.array_equal(valores, np.round(valores)):
+        return serie
+    limites = np.iinfo(tipo)
+    if len(valores) and (valores.min() < limites.min or valores.max() > limites.max):
+        return serie
+    # Con fechas inválidas se usa el entero con soporte de nulos (Int8, Int16, ...)
+    return serie.astype(tipo.capitalize() if len(valores) < len(serie) else tipo)
+
+
+def _booleana(serie):
+    if serie.dtype != object or pd.api.types.infer_dtype(serie, skipna=True) != 'boolean':
+        return serie
+    return serie.astype('boolean')
+
+
+def _conversiones(df):
+    # (columna, serie convertida) de las columnas que cambian de tipo
+    for col in df.columns:
+        serie = df[col]
+        if col in CATEGORICAS and not pd.api.types.is_numeric_dtype(serie):
+            nueva = _categorica(serie, CATEGORICAS[col])
+        elif col in ENTEROS:
+            nueva = _entera(serie, ENTEROS[col])
+        elif col in FLOTANTES and pd.api.types.is_float_dtype(serie):
+            nueva = serie.astype('float32')
+        else:
+            nueva = _booleana(serie)
+        if nueva is not serie and nueva.dtype != serie.dtype:
+            yield col, nueva
+
+
+def optimize_dtypes(df):
+    """
+    Aplica el plan de tipos sobre ``df`` y mide la memoria antes y después.
+
+    Returns:
+        Tupla ``(df, reporte)``. ``reporte`` tiene una fila por columna
+        convertida (tipo y MB antes y después) y una fila ``Total`` con la
+        memoria de todo el DataFrame.
+    """
+    antes = df.memory_usage(deep=True, index=False)
+    despues = antes.copy()
+    filas = []
+    # Columna por columna, sin copiar el resto del DataFrame
+    for col, nueva in _conversiones(df):
+        filas.append((col, str(df[col].dtype), str(nueva.dtype)))
+        df[col] = nueva
+        despues[col] = nueva.memory_usage(deep=True, index=False)
+
+    reporte = pd.DataFrame(filas + [('Total', '', '')], columns=['columna', 'tipo_antes', 'tipo_despues'])
+    reporte['mb_antes'] = [antes[col] / MB for col, _, _ in filas] + [antes.sum() / MB]
+    reporte['mb_despues'] = [despues[col] / MB for col, _, _ in filas] + [despues.sum() / MB]
+    return df, reporte
@@ -0,0 +1,1444 @@
+"""
+Motor de procesamiento de cargas de combustible, independiente de Streamlit.
+
+El pipeline se ejecuta en etapas (lectura → limpieza → enriquecimiento →
+banderas de anomalías → KPIs) y devuelve el DataFrame procesado junto con un
+objeto de diagnóstico. La aplicación Streamlit solo muestra los mensajes
+acumulados y guarda los KPIs en la sesión, por lo que el mismo motor puede
+ejecutarse desde un proceso batch o en procesos paralelos.
+"""
+import os
+import re
+import tempfile
+import time
+import traceback
+import zipfile
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+from combustible.binning import CONDUCTOR, EFICIENCIA, LLENADO, PLANILLERO, categorize
+from combustible.cache import DatasetCache, sources_hash
+from combustible.cube import build_cube
+from combustible.detectors import DetectorStore, MIN_REGISTROS, detect_outliers
+from combustible.dtypes import optimize_dtypes
+from combustible.ingest import expand_sources, materialize, source_name
+from combustible.normalization import (
+    broadcast_by_category,
+    normalize_column,
+    normalizar_modelo,
+    normalizar_nombre,
+    normalizar_terminal,
+)
+from combustible.parsing import (
+    calendar_columns,
+    combine_timestamp,
+    month_labels,
+    parse_date_column,
+    parse_hour_column,
+    parse_numeric_column,
+    week_labels,
+)
+from combustible.profiling import PROFILE_LOG_DEFAULT, PROFILE_LOG_ENV, ProfileReport
+from combustible.readers import SAMPLE_BYTES, read_csv, read_sample, read_xlsx, sniff_csv
+from combustible.stats import group_moments
+
+
+# Versión del pipeline: cambiarla cuando cambie el resultado de alguna etapa
+# invalida los datasets guardados en la caché en disco
+PIPELINE_VERSION = '8'
+
+# Columnas mínimas que se esperan en las exportaciones de los terminales
+COLUMNAS_ESPERADAS = ['Fecha', 'Hora', 'Cantidad litros', 'Terminal', 'Número interno']
+
+# Columnas numéricas que se limpian durante la etapa de limpieza
+COLUMNAS_NUMERICAS = [
+    'Cantidad litros', 'Odómetro', 'Estanque',
+    'Valor', 'Precio unitario', 'Kilómetros'
+]
+
+# Columnas que se leen como texto desde CSV (identificadores con ceros a la
+# izquierda, nombres, y fechas y horas que se convierten en su propia etapa)
+COLUMNAS_TEXTO = [
+    'Número interno', 'Patente', 'Terminal', 'Modelo chasis', 'Turno', 'Tipo',
+    'Observación', 'Nombre conductor', 'Nombre Planillero', 'Nombre supervisor',
+    'Fecha', 'Hora'
+]
+
+# Columnas del archivo que usan el pipeline y la interfaz; las demás no se leen
+# de los .xlsx (salvo la última, que puede indicar "Carga Masiva")
+COLUMNAS_LECTURA = COLUMNAS_ESPERADAS + COLUMNAS_NUMERICAS + COLUMNAS_TEXTO
+
+# Columna con el archivo (y la hoja) de cada registro al leer varias fuentes
+COLUMNA_ORIGEN = 'Origen'
+
+# Una carga repetida entre archivos tiene el mismo bus, fecha, hora y litros
+CLAVE_DUPLICADOS = ['Número interno', 'Fecha', 'Hora', 'Cantidad litros']
+
+# Malas cargas por texto: la columna "Tipo" y las columnas de texto que
+# mencionan "Carga Masiva" en algún registro
+PATRON_MALA_CARGA = re.compile(r'masiva|masa|mala|carga\s*masiva|carga\s*mala', re.IGNORECASE)
+PATRON_CARGA_MASIVA = re.compile(r'carga\s*masiva|carga\s*mala', re.IGNORECASE)
+MENCION_CARGA_MASIVA = re.compile('carga masiva', re.IGNORECASE)
+
+# Columnas de texto donde no se buscan malas cargas
+EXCLUIDAS_TEXTO = ['Fecha', 'Hora', 'Mala Carga']
+
+# Motivo de las malas cargas que no se marcaron por texto
+MOTIVO_CANTIDAD = 'Cantidad extrema'
+
+
+class ProcessingError(Exception):
+    """Error que detiene el pipeline; el detalle queda en el diagnóstico."""
+
+
+@dataclass
+class Diagnostics:
+    """
+    Mensajes y metadatos generados durante el procesamiento.
+
+    Cada mensaje es una tupla ``(nivel, texto)`` donde ``nivel`` es uno de
+    ``'info'``, ``'success'``, ``'warning'`` o ``'error'``, de modo que la
+    interfaz pueda reproducirlos con la función equivalente de Streamlit.
+    ``profile`` guarda el tiempo, la memoria y los registros de cada etapa, y
+    ``memory`` la memoria del resultado por columna antes y después del plan
+    de tipos (ver ``combustible.dtypes``).
+    """
+    messages: list = field(default_factory=list)
+    detected_columns: list = field(default_factory=list)
+    execution_time: float = 0.0
+    profile: ProfileReport = field(default_factory=ProfileReport)
+    memory: pd.DataFrame = None
+
+    def info(self, texto):
+        self.messages.append(('info', texto))
+
+    def success(self, texto):
+        self.messages.append(('success', texto))
+
+    def warning(self, texto):
+        self.messages.append(('warning', texto))
+
+    def error(self, texto):
+        self.messages.append(('error', texto))
+
+    @property
+    def errors(self):
+        return [texto for nivel, texto in self.messages if nivel == 'error']
+
+
+@dataclass
+class ProcessingOptions:
+    """
+    Opciones del pipeline que no dependen de los datos.
+
+    Attributes:
+        detectors: DetectorStore donde se guardan los detectores de outliers
+            por modelo (ver ``DetectorStore.from_env``); con ``None`` los
+            detectores se entrenan en memoria y no se persisten
+        refit_detectors: Reentrenar los detectores aunque existan en disco
+        n_jobs: Procesos para entrenar detectores en paralelo (``-1`` = todos)
+        cache: DatasetCache con los datasets ya procesados (ver
+            ``DatasetCache.from_env``); con ``None`` no se usa caché
+        trace_memory: Medir la memoria asignada por etapa con ``tracemalloc``
+            (varias veces más lento)
+        profile_log: Archivo JSONL donde se agrega el perfil de cada
+            procesamiento (``COMBUSTIBLE_PROFILE_LOG``); con ``None`` no se registra
+        prune_columns: Leer de los ``.xlsx`` solo las columnas que usa el
+            análisis (``COLUMNAS_LECTURA``) y la última columna del archivo
+    """
+    detectors: DetectorStore = field(default_factory=DetectorStore.from_env)
+    refit_detectors: bool = False
+    n_jobs: int = -1
+    cache: DatasetCache = field(default_factory=DatasetCache.from_env)
+    trace_memory: bool = False
+    profile_log: str = field(default_factory=lambda: os.environ.get(PROFILE_LOG_ENV) or PROFILE_LOG_DEFAULT)
+    prune_columns: bool = True
+
+
+@dataclass
+class ProcessingResult:
+    """
+    Resultado del pipeline.
+
+    Attributes:
+        df: DataFrame enriquecido, o ``None`` si el procesamiento falló
+        kpis: Métricas agregadas (consumo diario, tendencias, km por bus, ...)
+        diagnostics: Mensajes y metadatos del procesamiento
+        stats: Estadísticas acumuladas para anexar archivos sin reprocesar
+            el histórico (ver ``running_stats``)
+    """
+    df: pd.DataFrame = None
+    kpis: dict = field(default_factory=dict)
+    diagnostics: Diagnostics = field(default_factory=Diagnostics)
+    stats: dict = field(default_factory=dict)
+
+    @property
+    def ok(self):
+        return self.df is not None
+
+    @property
+    def rows(self):
+        """Registros del resultado (0 si el procesamiento falló), como ``ChunkedResult.rows``."""
+        return 0 if self.df is None else len(self.df)
+
+
+# --- LECTURA ---
+
+def detect_csv_dialect(source, diag, header_row=2):
+    """Detecta codificación, separador y encabezado de un CSV sobre una muestra de bytes."""
+    muestra = read_sample(source, SAMPLE_BYTES)
+    dialecto = sniff_csv(muestra, header_row=header_row, complete=len(muestra) < SAMPLE_BYTES)
+    if dialecto is None:
+        diag.error("❌ No se pudo detectar el separador del archivo CSV (se esperaba el encabezado en la fila 3).")
+        raise ProcessingError('csv')
+    separador = '\\t' if dialecto.delimiter == '\t' else dialecto.delimiter
+    diag.info(f"🔍 CSV detectado: codificación {dialecto.encoding}, separador '{separador}', {len(dialecto.columns)} columnas")
+    return dialecto
+
+
+def read_file(source, diag, name=None, options=None, sheet=0, require_header=False):
+    """
+    Lee un archivo de cargas (Excel o CSV).
+
+    En los ``.xlsx`` el encabezado se busca en las primeras filas; en los CSV
+    y ``.xls`` se espera en la fila 3.
+
+    Args:
+        source: Ruta o archivo tipo file-like (por ejemplo un UploadedFile)
+        diag: Diagnostics donde se registran los mensajes
+        name: Nombre del archivo; si no se indica se toma de ``source``
+        options: ProcessingOptions (opcional)
+        sheet: Posición de la hoja en los libros Excel (0 = primera)
+        require_header: En los ``.xlsx``, tratar como vacía la hoja sin un
+            encabezado reconocible en lugar de usar la fila 3
+
+    Returns:
+        DataFrame con los datos crudos
+    """
+    options = options or ProcessingOptions()
+    name = source_name(source, name)
+
+    # Determina la extensión del archivo
+    file_extension = os.path.splitext(name)[1].lower()
+
+    # Mensaje de estado
+    diag.info(f"📂 Detectando formato de archivo: {file_extension}")
+
+    # Establecer parámetros comunes para leer el archivo
+    read_params = {'header': 2, 'sheet_name': sheet}
+    columnas_originales = None
+
+    # Manejo específico según el tipo de archivo
+    if file_extension == '.xlsx':
+        try:
+            # Importar explícitamente openpyxl para verificar que esté disponible
+            import openpyxl
+        except ImportError:
+            diag.error("❌ Falta la dependencia 'openpyxl'. Instálala con: pip install openpyxl")
+            raise ProcessingError('openpyxl')
+        try:
+            # Lectura en streaming de la hoja, solo con las columnas usadas
+            diag.info("🔍 Leyendo archivo Excel en modo streaming...")
+            keep = COLUMNAS_LECTURA if options.prune_columns else None
+            df, fila_encabezado, columnas_originales = read_xlsx(
+                source, COLUMNAS_ESPERADAS, keep, COLUMNAS_TEXTO, sheet=sheet, require_header=require_header
+            )
+            if fila_encabezado is not None:
+                diag.info(f"📋 Encabezado detectado en la fila {fila_encabezado + 1}")
+            omitidas = [col for col in columnas_originales if col not in df.columns]
+            if omitidas:
+                diag.info(f"✂️ Se omitieron {len(omitidas)} columnas que el análisis no usa: {', '.join(map(str, omitidas))}")
+        except Exception as e:
+            # Libro con una estructura que el lector en streaming no reconoce
+            diag.warning(f"⚠️ Lectura en streaming no disponible ({e}); se usa openpyxl")
+            columnas_originales = None
+            try:
+                if hasattr(source, 'seek'):
+                    source.seek(0)
+                df = pd.read_excel(source, engine='openpyxl', **read_params)
+            except Exception as e:
+                diag.error(f"❌ Error al leer archivo .xlsx: {e}")
+                raise ProcessingError(str(e))
+
+    elif file_extension == '.xls':
+        try:
+            # Importar explícitamente xlrd para verificar que esté disponible
+            import xlrd
+            # Verificar la versión de xlrd
+            if xlrd.__VERSION__ < '2.0.1':
+                diag.warning(f"⚠️ Versión de xlrd detectada: {xlrd.__VERSION__}. Se recomienda ≥2.0.1 para archivos .xls")
+
+            # Para archivos .xls usa xlrd
+            diag.info("🔍 Leyendo archivo Excel con xlrd...")
+            df = pd.read_excel(source, engine='xlrd', **read_params)
+        except ImportError:
+            diag.error("❌ Falta la dependencia 'xlrd'. Instálala con: pip install \"xlrd>=2.0.1\"")
+            raise ProcessingError('xlrd')
+        except Exception as e:
+            diag.error(f"❌ Error al leer archivo .xls: {e}")
+            diag.error("Si estás usando un archivo .xlsx con extensión .xls, renómbralo a .xlsx e intenta de nuevo.")
+            raise ProcessingError(str(e))
+
+    elif file_extension in ['.csv', '.txt']:
+        dialecto = detect_csv_dialect(source, diag, header_row=read_params['header'])
+        try:
+            df, motor, descartadas = read_csv(source, dialecto, COLUMNAS_TEXTO, COLUMNAS_NUMERICAS)
+        except Exception as e:
+            diag.error(f"❌ Error al leer archivo CSV: {e}")
+            raise ProcessingError(str(e))
+        if descartadas:
+            diag.warning(f"⚠️ Se omitieron {descartadas} filas con un número de campos distinto al encabezado")
+        diag.success(f"✅ Archivo CSV leído correctamente con {motor}")
+    else:
+        # Si la extensión no es conocida, intentar autodetectar
+        try:
+            diag.info("🔍 Intentando autodetectar formato de archivo...")
+            # Intenta primero con openpyxl
+            try:
+                import openpyxl
+                df = pd.read_excel(source, engine='openpyxl', **read_params)
+            except Exception:
+                # Si falla, intenta con xlrd
+                import xlrd
+                if hasattr(source, 'seek'):
+                    source.seek(0)
+                df = pd.read_excel(source, engine='xlrd', **read_params)
+        except Exception as e:
+            diag.error(f"❌ Formato de archivo no reconocido: {file_extension}")
+            diag.error(f"Error al intentar leer el archivo: {e}")
+            diag.error("Por favor, utiliza archivos Excel (.xlsx, .xls) o CSV (.csv)")
+            raise ProcessingError(str(e))
+
+    # Verificar si se cargaron datos
+    if df.empty:
+        diag.error("❌ El archivo está vacío o no contiene datos válidos.")
+        raise ProcessingError('empty')
+
+    # Mostrar estadísticas de carga preliminares
+    diag.info(f"📊 Datos cargados: {len(df)} filas, {len(df.columns)} columnas")
+
+    # Registrar las columnas detectadas (todas las del archivo, aunque no se hayan leído)
+    diag.detected_columns = list(columnas_originales or df.columns)
+
+    return df
+
+
+def _read_unit(unidad, prune_columns):
+    # Se ejecuta en un proceso de joblib: sin caché, detectores ni log de perfil
+    diag = Diagnostics()
+    options = ProcessingOptions(detectors=None, cache=None, profile_log=None, prune_columns=prune_columns)
+    try:
+        df = read_file(
+            unidad.source, diag, name=unidad.name, options=options,
+            sheet=unidad.sheet, require_header=unidad.require_header
+        )
+        # Columnas normalizadas y filas vacías descartadas antes de concatenar
+        df = match_columns(df, diag, options)
+    except ProcessingError:
+        df = None
+    except Exception as e:
+        diag.error(f"❌ {e}")
+        df = None
+    return df, diag.messages, diag.detected_columns
+
+
+def read_sources(sources, diag, names=None, options=None):
+    """
+    Lee uno o varios archivos de cargas (Excel, CSV o ``.zip``) como un solo DataFrame.
+
+    Un archivo con una sola hoja se lee igual que con ``read_file``. Si las
+    fuentes aportan varias unidades (archivos, archivos dentro de un zip u
+    hojas de un libro) cada una se lee en un proceso de ``joblib``, con las
+    columnas ya normalizadas, y los registros se concatenan con la columna
+    ``Origen`` al inicio (la última columna sigue siendo la del archivo, que
+    puede indicar "Carga Masiva"). Las hojas sin encabezado de cargas se
+    omiten; si ninguna hoja de un libro lo tiene se lee la primera como antes.
+
+    Args:
+        sources: Rutas o archivos tipo file-like
+        diag: Diagnostics donde se registran los mensajes
+        names: Nombres de los archivos (opcional, uno por fuente)
+        options: ProcessingOptions (opcional; ``n_jobs`` define los procesos)
+
+    Returns:
+        DataFrame con los datos crudos
+    """
+    options = options or ProcessingOptions()
+    with tempfile.TemporaryDirectory(prefix='combustible-') as directorio:
+        try:
+            unidades = expand_sources(sources, names, directorio)
+        except zipfile.BadZipFile as e:
+            diag.error(f"❌ No se pudo abrir el archivo comprimido: {e}")
+            raise ProcessingError(str(e))
+        if not unidades:
+            diag.error("❌ No se encontraron archivos de cargas (.xlsx, .xls, .csv) para leer.")
+            raise ProcessingError('empty')
+        if len(unidades) == 1:
+            unidad = unidades[0]
+            return read_file(unidad.source, diag, name=unidad.name, options=options)
+
+        diag.info(f"📚 Leyendo {len(unidades)} archivos u hojas en paralelo...")
+        materialize(unidades, directorio)
+        lecturas = Parallel(n_jobs=options.n_jobs)(
+            delayed(_read_unit)(unidad, options.prune_columns) for unidad in unidades
+        )
+
+        # Libros sin ninguna hoja de cargas: se lee la primera hoja como en un solo archivo
+        leidos = {unidad.name for unidad, (df, _, _) in zip(unidades, lecturas) if df is not None}
+        for i, unidad in enumerate(unidades):
+            if unidad.require_header and unidad.sheet == 0 and unidad.name not in leidos:
+                unidad.require_header = False
+                unidad.label = unidad.name
+                lecturas[i] = _read_unit(unidad, options.prune_columns)
+
+    partes, columnas = [], []
+    for unidad, (df, mensajes, detectadas) in zip(unidades, lecturas):
+        if df is None:
+            if unidad.require_header and unidad.name in leidos:
+                diag.info(f"⏭️ {unidad.label}: hoja sin encabezado de cargas, se omite")
+            else:
+                motivo = next((texto for nivel, texto in mensajes if nivel == 'error'), '')
+                diag.warning(f"⚠️ {unidad.label}: no se pudo leer ({motivo.lstrip('❌ ')})")
+            continue
+        for nivel, texto in mensajes:
+            if nivel == 'warning':
+                diag.warning(f"{unidad.label}: {texto}")
+        diag.info(f"📄 {unidad.label}: {len(df)} filas")
+        df.insert(0, COLUMNA_ORIGEN, unidad.label)
+        partes.append(df)
+        columnas += [col for col in detectadas if col not in columnas]
+
+    if not partes:
+        diag.error("❌ Ninguno de los archivos contiene datos válidos.")
+        raise ProcessingError('empty')
+
+    df = pd.concat(partes, ignore_index=True, sort=False)
+    df[COLUMNA_ORIGEN] = df[COLUMNA_ORIGEN].astype('category')
+    diag.info(f"📊 Datos combinados: {len(df)} filas de {len(partes)} fuentes, {len(df.columns)} columnas")
+    diag.detected_columns = columnas
+    return df
+
+
+# --- LIMPIEZA ---
+
+def match_columns(df, diag, options=None):
+    """Limpia los nombres de columnas y renombra coincidencias parciales."""
+    df.columns = [col.strip() if isinstance(col, str) else col for col in df.columns]
+
+    # Verificar la presencia de columnas clave
+    columnas_faltantes = [col for col in COLUMNAS_ESPERADAS if col not in df.columns]
+
+    if columnas_faltantes:
+        diag.warning(f"⚠️ Algunas columnas esperadas no fueron encontradas: {', '.join(columnas_faltantes)}")
+        # Intentar detectar columnas similares (por ejemplo, "Litros" en lugar de "Cantidad litros")
+        posibles_coincidencias = {}
+        for col_faltante in columnas_faltantes:
+            for col_existente in df.columns:
+                if isinstance(col_existente, str) and col_faltante.lower() in col_existente.lower():
+                    posibles_coincidencias[col_faltante] = col_existente
+
+        if posibles_coincidencias:
+            diag.info("🔄 Se encontraron posibles coincidencias para algunas columnas faltantes:")
+            for original, coincidencia in posibles_coincidencias.items():
+                diag.info(f"   • '{original}' podría ser '{coincidencia}'")
+                # Renombrar automáticamente
+                if coincidencia in df.columns:
+                    df = df.rename(columns={coincidencia: original})
+                    diag.success(f"✅ Se renombró '{coincidencia}' a '{original}'")
+
+    # Limpiar datos: eliminar filas completamente vacías
+    return df.dropna(how='all')
+
+
+def parse_dates(df, diag, options=None):
+    """Convierte ``Fecha`` y agrega las columnas de calendario derivadas."""
+    if 'Fecha' not in df.columns:
+        return df
+
+    # Detectar formato de fecha
+    diag.info("🔄 Procesando columna de Fecha...")
+
+    # Inferir los formatos sobre una muestra y convertir la columna una sola vez
+    df['Fecha'] = parse_date_column(df['Fecha'])
+
+    # Verificar si se convirtieron correctamente
+    pct_fechas_validas = df['Fecha'].notna().mean() * 100
+    diag.info(f"📅 Fechas convertidas: {pct_fechas_validas:.1f}% válidas")
+
+    # Agregar columnas derivadas de fecha, incluida la de día laboral vs fin de semana
+    for columna, valores in calendar_columns(df['Fecha']).items():
+        df[columna] = valores
+    return df
+
+
+def parse_hours(df, diag, options=None):
+    """Convierte ``Hora`` y clasifica período del día y hora pico."""
+    if 'Hora' not in df.columns:
+        return df
+
+    # Convertir hora a segundos del día (Int32) sobre los valores únicos
+    diag.info("🔄 Procesando columna de Hora...")
+    df['Hora'] = parse_hour_column(df['Hora'])
+
+    # Verificar si se convirtieron correctamente
+    pct_horas_validas = df['Hora'].notna().mean() * 100
+    diag.info(f"🕒 Horas convertidas: {pct_horas_validas:.1f}% válidas")
+
+    # Marca de tiempo combinada, usada también como clave de orden
+    if 'Fecha' in df.columns:
+        df['Marca Tiempo'] = combine_timestamp(df['Fecha'], df['Hora'])
+
+    segundos = df['Hora'].to_numpy(dtype=np.float64, na_value=np.nan)
+    hora_num = segundos // 3600
+    validas = ~np.isnan(segundos)
+
+    # Hora numérica (horas + minutos/60)
+    df['Hora Numérica'] = hora_num + (segundos % 3600 // 60) / 60
+
+    # Clasificar por período del día de forma más detallada
+    df['Período'] = np.select(
+        [hora_num < 6, hora_num < 12, hora_num < 18, validas],
+        ['Madrugada', 'Mañana', 'Tarde', 'Noche'],
+        default=None
+    ).astype(object)
+
+    # Clasificar en horas pico y no pico: 7-9 AM y 5-7 PM (personalizable según necesidades)
+    df['Hora Pico'] = ((hora_num >= 7) & (hora_num < 10)) | ((hora_num >= 17) & (hora_num < 20))
+    return df
+
+
+def clean_numeric_columns(df, diag, options=None):
+    """Convierte las columnas numéricas, tolerando formatos con separador de miles."""
+    for col in COLUMNAS_NUMERICAS:
+        if col in df.columns:
+            diag.info(f"🔄 Procesando columna numérica: {col}")
+            # Guardar valores originales
+            original_values = df[col]
+
+            # Intento inicial: conversión directa
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+            # Si hay demasiados NaN, limpiar formatos locales (1.234,56 → 1234.56)
+            if df[col].isna().mean() > 0.3:  # Si más del 30% son NaN
+                df[col] = parse_numeric_column(original_values)
+
+            # Estadísticas de conversión
+            pct_numeros_validos = df[col].notna().mean() * 100
+            diag.info(f"🔢 {col}: {pct_numeros_validos:.1f}% valores numéricos válidos")
+    return df
+
+
+def _clave_bus(series):
+    # "0137", " 137" y 137 son el mismo bus; se normaliza y se hashea una vez por valor único
+    codigos, unicos = pd.factorize(series)
+    limpios = pd.Index(unicos.astype(str)).str.strip().str.upper().str.lstrip('0')
+    claves = pd.util.hash_array(limpios.to_numpy(dtype=object))
+    # Los nulos (código -1) toman el 0 agregado al final
+    return np.append(claves, np.uint64(0))[codigos]
+
+
+def load_keys(df):
+    """
+    Clave hash (``uint64``) de cada carga según ``CLAVE_DUPLICADOS``.
+
+    La clave se calcula sobre los valores ya convertidos (fecha, segundos del
+    día y litros redondeados a 3 decimales) y no depende del resto de ``df``,
+    así sirve para comparar cargas de dos DataFrames distintos.
+    """
+    clave = pd.DataFrame({
+        'bus': _clave_bus(df['Número interno']),
+        'fecha': df['Fecha'].to_numpy(dtype='datetime64[ns]').view(np.int64),
+        'hora': df['Hora'].to_numpy(dtype=np.float64, na_value=np.nan),
+        'litros': df['Cantidad litros'].astype('float64').round(3).to_numpy(),
+    })
+    return pd.Series(pd.util.hash_pandas_object(clave, index=False).to_numpy(), index=df.index)
+
+
+def drop_duplicate_loads(df, diag, options=None):
+    """
+    Elimina las cargas repetidas entre archivos al combinar varias fuentes.
+
+    Solo actúa si los datos traen la columna ``Origen`` (ver ``read_sources``).
+    La clave ``CLAVE_DUPLICADOS`` se compara ya convertida (fecha, segundos
+    del día y litros numéricos), de modo que una misma carga exportada en CSV
+    y en Excel se reconoce; se conserva la primera aparición.
+    """
+    if COLUMNA_ORIGEN not in df.columns:
+        return df
+    faltantes = [col for col in CLAVE_DUPLICADOS if col not in df.columns]
+    if faltantes:
+        diag.warning(f"⚠️ No se buscaron cargas repetidas entre archivos: faltan las columnas {', '.join(faltantes)}")
+        return df
+
+    # Índice hash de la clave: un entero de 64 bits por registro
+    repetidas = load_keys(df).duplicated().to_numpy()
+    # Los registros sin fecha no se consideran la misma carga
+    repetidas &= df['Fecha'].notna().to_numpy()
+
+    n_repetidas = int(repetidas.sum())
+    if n_repetidas:
+        df = df[~repetidas].copy()
+        diag.info(f"🧹 Se eliminaron {n_repetidas} cargas repetidas entre archivos ({', '.join(CLAVE_DUPLICADOS)})")
+    else:
+        diag.info("🧹 Sin cargas repetidas entre archivos")
+    return df
+
+
+# --- BANDERAS DE ANOMALÍAS ---
+
+def flag_malas_cargas(df, diag, options=None):
+    """Marca ``Mala Carga`` por texto y por cantidades extremas."""
+    diag.info("🔄 Identificando malas cargas...")
+    marcas, motivo, df.attrs['columnas_carga_masiva'] = text_flags(df)
+
+    # Marcas por texto (métodos 1 y 2); permiten recalcular el método 3 al anexar datos
+    df['Mala Carga'] = marcas
+    df['Mala Carga Texto'] = marcas.copy()
+    df['Motivo Mala Carga'] = motivo
+
+    # Método 3: Detección por anomalía en cantidades
+    flag_litros_extremos(df, diag)
+
+    # Número total de malas cargas detectadas
+    n_malas_cargas = df['Mala Carga'].sum()
+    diag.info(f"🛑 Total de malas cargas detectadas: {n_malas_cargas} ({n_malas_cargas/len(df)*100:.2f}%)")
+    return df
+
+
+def text_flags(df, columnas=None):
+    """
+    Marcas de malas cargas por texto (métodos 1 y 2 de ``flag_malas_cargas``).
+
+    ``columnas`` se pasa a ``scan_carga_masiva``.
+
+    Returns:
+        Tupla ``(marcas, motivo, columnas)`` con la Serie booleana, la columna
+        que originó cada marca (``None`` sin marca) y las columnas revisadas
+        en el método 2
+    """
+    # Método 1: Detectar por texto en columna "Tipo"
+    if 'Tipo' in df.columns:
+        tipo = pd.Series(match_unique(df['Tipo'], PATRON_MALA_CARGA, as_text=False)[0], index=df.index)
+    else:
+        tipo = pd.Series(False, index=df.index)
+
+    # Método 2: Buscar en todas las columnas de texto
+    marcas, motivo, columnas = scan_carga_masiva(df, columnas)
+    return tipo | marcas, motivo.mask(tipo, 'Tipo'), columnas
+
+
+def match_unique(serie, patron, as_text=True):
+    """
+    Busca ``patron`` una sola vez por cada valor distinto de ``serie``.
+
+    Con ``as_text`` los valores se comparan como ``astype(str)``; sin él, los
+    valores que no son texto no coinciden (como ``Series.str.contains``).
+
+    Returns:
+        Tupla ``(marcas, valores)``: arreglo booleano por registro y los
+        valores distintos que coinciden
+    """
+    codigos, unicos = pd.factorize(serie)
+    if as_text:
+        coincide = [patron.search(str(v)) is not None for v in unicos]
+    else:
+        coincide = [isinstance(v, str) and patron.search(v) is not None for v in unicos]
+    # Los nulos (código -1) toman el último elemento: sin coincidencia
+    coincide = np.array(coincide + [False], dtype=bool)
+    return coincide[codigos], [v for v, c in zip(unicos, coincide) if c]
+
+
+def scan_text_column(serie):
+    """
+    Marcas de "carga masiva" o "carga mala" en una columna de texto.
+
+    Returns:
+        Tupla ``(marcas, menciona)``: arreglo booleano por registro y si algún
+        registro menciona "Carga Masiva" explícitamente
+    """
+    marcas, valores = match_unique(serie, PATRON_CARGA_MASIVA)
+    # Una mención explícita también coincide con el patrón: basta revisar esos valores
+    return marcas, any(MENCION_CARGA_MASIVA.search(str(v)) for v in valores)
+
+
+def scan_carga_masiva(df, columnas=None):
+    """
+    Busca "carga masiva" o "carga mala" en las columnas de texto.
+
+    Solo se revisan las columnas que mencionan "Carga Masiva" en algún
+    registro, salvo que se indiquen ``columnas`` explícitamente. Cada valor
+    distinto se revisa una sola vez.
+
+    Returns:
+        Tupla ``(marcas, motivo, columnas)`` con la Serie booleana, la primera
+        columna (en el orden de ``df``) con coincidencia en cada registro y
+        las columnas revisadas
+    """
+    marcas = np.zeros(len(df), dtype=bool)
+    motivo = np.full(len(df), None, dtype=object)
+    revisadas = []
+    for col in (df.columns if columnas is None else columnas):
+        if df[col].dtype == 'object' and col not in EXCLUIDAS_TEXTO:
+            coincide, menciona = scan_text_column(df[col])
+            if columnas is not None or menciona:
+                motivo[coincide & ~marcas] = col
+                marcas |= coincide
+                revisadas.append(col)
+    return pd.Series(marcas, index=df.index), pd.Series(motivo, index=df.index), revisadas
+
+
+def litros_upper_bound(q1, q3):
+    """Límite de cargas extremas a partir de los cuartiles de litros."""
+    iqr = q3 - q1
+    return q3 + 3 * iqr  # Umbral más conservador para evitar falsos positivos
+
+
+def flag_litros_extremos(df, diag, upper_bound=None):
+    """
+    Agrega a ``Mala Carga Texto`` las cargas extremas (sobre Q3 + 3·IQR) en ``Mala Carga``.
+
+    ``Motivo Mala Carga`` conserva la columna de texto de cada marca y agrega
+    ``MOTIVO_CANTIDAD`` a las nuevas. ``upper_bound`` reemplaza el límite
+    calculado sobre ``df`` (el modo por bloques lo calcula sobre el archivo
+    completo).
+    """
+    df['Mala Carga'] = df['Mala Carga Texto'].copy()
+    df['Motivo Mala Carga'] = df['Motivo Mala Carga'].astype(object).where(df['Mala Carga Texto'], None)
+    if 'Cantidad litros' in df.columns:
+        # Detectar valores extremadamente altos (outliers)
+        if upper_bound is None:
+            upper_bound = litros_upper_bound(df['Cantidad litros'].quantile(0.25), df['Cantidad litros'].quantile(0.75))
+
+        # Marcar como posibles malas cargas los valores extremos
+        df['Posible Mala Carga'] = df['Cantidad litros'] > upper_bound
+
+        # Contar cuántas posibles malas cargas se detectaron
+        n_nuevas_malas = df['Posible Mala Carga'].sum()
+        if n_nuevas_malas > 0:
+            diag.info(f"ℹ️ Se detectaron {n_nuevas_malas} posibles malas cargas adicionales por valores extremos.")
+
+            # Solo asignar a Mala Carga si no están ya marcadas
+            nuevas = df['Posible Mala Carga'] & ~df['Mala Carga']
+            df.loc[nuevas, 'Mala Carga'] = True
+            df.loc[nuevas, 'Motivo Mala Carga'] = MOTIVO_CANTIDAD
+
+
+def flag_consumption_anomalies(df, diag, options=None):
+    """Calcula estadísticas por modelo, Z-Score y sobreconsumo."""
+    if 'Modelo chasis' in df.columns and 'Cantidad litros' in df.columns:
+        diag.info("🔄 Analizando patrones de consumo por modelo...")
+
+        # Limpiar y agrupar modelos similares (sobre los valores únicos)
+        df['Modelo chasis'], df['Modelo Normalizado'] = normalize_column(df['Modelo chasis'], normalizar_modelo)
+
+        # Estadísticas por modelo normalizado
+        modelo_stats = df.groupby('Modelo Normalizado', observed=True)['Cantidad litros'].agg(['mean', 'std', 'count']).reset_index()
+        modelo_stats.columns = ['Modelo Normalizado', 'Promedio Litros', 'Desviación Estándar', 'Cantidad']
+
+        # Filtrar modelos con suficientes datos
+        modelo_stats = modelo_stats[modelo_stats['Cantidad'] >= 5]
+
+        # Crear diccionarios para mapear estadísticas a cada registro
+        promedio_por_modelo = dict(zip(modelo_stats['Modelo Normalizado'], modelo_stats['Promedio Litros']))
+        std_por_modelo = dict(zip(modelo_stats['Modelo Normalizado'], modelo_stats['Desviación Estándar']))
+
+        # Asignar estadísticas a cada registro
+        apply_model_stats(df, promedio_por_modelo, std_por_modelo)
+    else:
+        # Detección simple si no hay datos de modelo
+        if 'Cantidad litros' in df.columns:
+            try:
+                # Calcular estadísticas generales
+                mean_litros = df['Cantidad litros'].mean()
+                std_litros = df['Cantidad litros'].std()
+
+                # Evitar operaciones con NaN
+                if not pd.isna(mean_litros) and not pd.isna(std_litros) and std_litros > 0:
+                    # Definir umbral de sobreconsumo
+                    df['Umbral Sobreconsumo'] = mean_litros + 2 * std_litros
+                    df['Sobreconsumo'] = (df['Cantidad litros'] > df['Umbral Sobreconsumo']) & (~df['Mala Carga'])
+                else:
+                    df['Sobreconsumo'] = False
+            except Exception as e:
+                diag.warning(f"⚠️ Error en detección de anomalías: {e}")
+                df['Sobreconsumo'] = False
+        else:
+            df['Sobreconsumo'] = False
+    return df
+
+
+def flag_outliers(df, diag, options=None):
+    """Marca outliers extremos por modelo y resume las anomalías detectadas."""
+    df['Outlier Extremo'] = False  # Inicializar columna
+
+    # Sin modelo de chasis no se marcan outliers extremos
+    if 'Modelo Normalizado' in df.columns and 'Cantidad litros' in df.columns:
+        diag.info("🔄 Detectando outliers extremos...")
+        flag_extreme_outliers(df, diag, options)
+
+    # Conteo de anomalías detectadas
+    n_sobreconsumo = df['Sobreconsumo'].sum()
+    n_outliers = df['Outlier Extremo'].sum()
+    diag.info(f"⚠️ Anomalías detectadas: {n_sobreconsumo} sobreconsumos, {n_outliers} outliers extremos")
+    return df
+
+
+def apply_model_stats(df, promedio_por_modelo, std_por_modelo):
+    """Asigna promedio y desviación del modelo y calcula Z-Score y sobreconsumo."""
+    df['Promedio Modelo'] = broadcast_by_category(df['Modelo Normalizado'], promedio_por_modelo)
+    df['Desviación Modelo'] = broadcast_by_category(df['Modelo Normalizado'], std_por_modelo)
+
+    # Evitar divisiones por cero
+    df['Z-Score'] = np.where(
+        (df['Desviación Modelo'].notna()) & (df['Desviación Modelo'] > 0),
+        (df['Cantidad litros'] - df['Promedio Modelo']) / df['Desviación Modelo'],
+        np.nan
+    )
+
+    # Mejorar detección de sobreconsumo con umbrales adaptativos
+    df['Umbral Sobreconsumo'] = df['Promedio Modelo'] + 2 * df['Desviación Modelo']
+    df['Sobreconsumo'] = (df['Cantidad litros'] > df['Umbral Sobreconsumo']) & (~df['Mala Carga'])
+
+
+def flag_extreme_outliers(df, diag, options=None, modelos=None):
+    """
+    Marca ``Outlier Extremo`` con un Isolation Forest por modelo normalizado.
+
+    Con ``modelos`` solo se recalculan esos modelos y el resto de los registros
+    conserva su marca.
+    """
+    # Isolation Forest por modelo: se reutilizan los detectores guardados y
+    # los entrenamientos pendientes se ejecutan en paralelo
+    options = options or ProcessingOptions()
+    validos = df['Cantidad litros'].notna()
+    if modelos is not None:
+        seleccion = df['Modelo Normalizado'].isin(modelos)
+        df.loc[seleccion, 'Outlier Extremo'] = False
+        validos &= seleccion
+
+    # El entrenamiento depende del orden de los registros: usar el orden original
+    filas = df[validos]
+    if not filas.index.is_monotonic_increasing:
+        filas = filas.sort_index()
+
+    grupos = {}
+    indices = {}
+    for modelo, modelo_df in filas.groupby('Modelo Normalizado', observed=True):
+        if len(modelo_df) >= MIN_REGISTROS:
+            fechas = None
+            if 'Fecha' in modelo_df.columns and pd.api.types.is_datetime64_any_dtype(modelo_df['Fecha']):
+                fechas = modelo_df['Fecha'].to_numpy()
+            grupos[modelo] = (modelo_df['Cantidad litros'].to_numpy().reshape(-1, 1), fechas)
+            indices[modelo] = modelo_df.index
+
+    outliers, resumen = detect_outliers(
+        grupos, store=options.detectors, refit=options.refit_detectors, n_jobs=options.n_jobs
+    )
+    for modelo, marcas in outliers.items():
+        if isinstance(marcas, Exception):
+            diag.warning(f"⚠️ No se pudo calcular outliers para el modelo {modelo}: {marcas}")
+        else:
+            df.loc[indices[modelo][marcas], 'Outlier Extremo'] = True
+
+    if options.detectors is not None:
+        diag.info(
+            f"🧠 Detectores por modelo: {resumen['reutilizados']} reutilizados, "
+            f"{resumen['entrenados']} entrenados, {resumen['deriva']} reentrenados por deriva"
+        )
+        if resumen['no_guardados']:
+            diag.warning(f"⚠️ No se pudieron guardar {resumen['no_guardados']} detectores en {options.detectors.directory}")
+
+
+# --- ENRIQUECIMIENTO ---
+
+def compute_rendimiento(df, diag, options=None):
+    """Calcula kilómetros recorridos, rendimiento (km/l) y su desviación por modelo."""
+    if not ('Número interno' in df.columns and 'Odómetro' in df.columns and 'Cantidad litros' in df.columns):
+        return df
+
+    diag.info("🔄 Calculando métricas de rendimiento...")
+
+    # Limpiar y normalizar identificadores de buses
+    df['Número interno'] = df['Número interno'].astype(str).str.strip().str.upper()
+
+    df = chain_odometer(df)
+    return compute_rendimiento_from_km(df, diag)
+
+
+def orden_cargas(df):
+    """Columnas por las que se ordenan las cargas de cada bus."""
+    return ['Número interno', 'Marca Tiempo'] if 'Marca Tiempo' in df.columns else ['Número interno', 'Fecha', 'Hora']
+
+
+def chain_odometer(df):
+    """Ordena por bus y hora y calcula los kilómetros recorridos entre cargas del mismo bus."""
+    # Ordenar primero para calcular correctamente los cambios en odómetro
+    df = df.sort_values(orden_cargas(df))
+
+    # Calcular diferencias de odómetro entre cargas del mismo bus
+    df['Odómetro Anterior'] = df.groupby('Número interno')['Odómetro'].shift(1)
+    df['Kilómetros Recorridos'] = df['Odómetro'] - df['Odómetro Anterior']
+
+    # Filtrar valores no válidos con criterios más detallados
+    # Mínimo de kilómetros (para evitar errores de registro)
+    min_km = 5
+    # Máximo razonable de kilómetros entre cargas
+    max_km = 1200
+
+    # Identificar valores sospechosos
+    df['Km Sospechosos'] = (df['Kilómetros Recorridos'] < min_km) | (df['Kilómetros Recorridos'] > max_km)
+
+    # Aplicar filtros
+    df.loc[df['Km Sospechosos'], 'Kilómetros Recorridos'] = np.nan
+    return df
+
+
+def raw_rendimiento(df):
+    """Rendimiento (km/l) de cada carga antes de filtrar valores no razonables."""
+    return np.where(
+        (df['Cantidad litros'] > 0) & (df['Kilómetros Recorridos'].notna()),
+        df['Kilómetros Recorridos'] / df['Cantidad litros'],
+        np.nan
+    )
+
+
+def rendimiento_bounds(q1_rend, q3_rend):
+    """Límites razonables de rendimiento a partir de sus percentiles 10 y 90."""
+    iqr_rend = q3_rend - q1_rend
+    lower_bound_rend = max(0.5, q1_rend - 1.5 * iqr_rend)  # Mínimo de 0.5 km/l
+    upper_bound_rend = min(20, q3_rend + 1.5 * iqr_rend)  # Máximo de 20 km/l
+    return lower_bound_rend, upper_bound_rend
+
+
+def compute_rendimiento_from_km(df, diag, bounds=None, rendimiento_por_modelo=None):
+    """
+    Calcula el rendimiento (km/l), sus límites razonables y la desviación por modelo.
+
+    ``bounds`` (límites inferior y superior) y ``rendimiento_por_modelo``
+    reemplazan los valores calculados sobre ``df``.
+    """
+    # Cálculo avanzado de rendimiento (km/l)
+    df['Rendimiento'] = raw_rendimiento(df)
+
+    # Filtrar rendimientos no razonables (basados en distribución estadística)
+    if bounds is None:
+        bounds = rendimiento_bounds(df['Rendimiento'].quantile(0.10), df['Rendimiento'].quantile(0.90))
+    lower_bound_rend, upper_bound_rend = bounds
+
+    # Marcar valores anómalos
+    df['Rendimiento Anómalo'] = (df['Rendimiento'] < lower_bound_rend) | (df['Rendimiento'] > upper_bound_rend)
+
+    # Filtrar
+    df.loc[df['Rendimiento Anómalo'], 'Rendimiento'] = np.nan
+
+    # Estadísticas de cálculo
+    pct_rendimiento_valido = df['Rendimiento'].notna().mean() * 100
+    diag.info(f"🚌 Rendimiento: {pct_rendimiento_valido:.1f}% de registros con rendimiento válido")
+
+    if 'Modelo Normalizado' in df.columns:
+        # Calcular rendimiento promedio por modelo normalizado
+        if rendimiento_por_modelo is None:
+            rendimiento_por_modelo = df.groupby('Modelo Normalizado', observed=True)['Rendimiento'].mean().to_dict()
+        df['Rendimiento Promedio Modelo'] = broadcast_by_category(df['Modelo Normalizado'], rendimiento_por_modelo)
+
+        # Desviación de rendimiento (%); NaN sin rendimiento o con promedio cero
+        promedio = df['Rendimiento Promedio Modelo'].where(df['Rendimiento Promedio Modelo'] != 0)
+        df['Desviación Rendimiento'] = ((df['Rendimiento'] - promedio) / promedio) * 100
+
+        # Categorizar eficiencia basada en la desviación
+        df['Categoría Eficiencia'] = categorize(df['Desviación Rendimiento'], EFICIENCIA)
+    return df
+
+
+def enrich_terminals(df, diag, options=None, terminal_count=None, terminal_avg_consumo=None):
+    """
+    Normaliza terminales y agrega conteo, consumo promedio y ranking.
+
+    ``terminal_count`` y ``terminal_avg_consumo`` (por terminal normalizada)
+    reemplazan los valores calculados sobre ``df``.
+    """
+    if 'Terminal' not in df.columns:
+        return df
+
+    diag.info("🔄 Procesando información de terminales...")
+
+    # Limpiar y normalizar nombres de terminal
+    df['Terminal'], df['Terminal Normalizada'] = normalize_column(df['Terminal'], normalizar_terminal)
+
+    # Conteo y estadísticas por terminal
+    if terminal_count is None:
+        terminal_count = df.groupby('Terminal Normalizada', observed=True).size().to_dict()
+        terminal_avg_consumo = df.groupby('Terminal Normalizada', observed=True)['Cantidad litros'].mean().to_dict() if 'Cantidad litros' in df.columns else {}
+
+    df['Cargas Terminal'] = broadcast_by_category(df['Terminal Normalizada'], terminal_count)
+    df['Consumo Promedio Terminal'] = broadcast_by_category(df['Terminal Normalizada'], terminal_avg_consumo)
+
+    # Añadir ranking de terminales por volumen
+    terminal_ranking = pd.Series(terminal_count, dtype='int64').sort_index().sort_values(ascending=False)
+    terminal_ranking_dict = dict(zip(terminal_ranking.index, range(1, len(terminal_ranking) + 1)))
+    df['Ranking Terminal'] = broadcast_by_category(df['Terminal Normalizada'], terminal_ranking_dict)
+    return df
+
+
+def enrich_llenado(df, diag, options=None, estanque_estimado=None):
+    """
+    Estima el porcentaje de llenado del estanque y su nivel.
+
+    ``estanque_estimado`` (capacidad por modelo normalizado) reemplaza la
+    estimación calculada sobre ``df``.
+    """
+    if 'Cantidad litros' not in df.columns:
+        return df
+
+    diag.info("🔄 Analizando patrones de llenado...")
+
+    # Método 1: Si existe columna "Estanque" o similar
+    if 'Estanque' in df.columns and df['Estanque'].notna().any():
+        # Evitar divisiones por cero
+        df['Porcentaje Llenado'] = np.where(
+            df['Estanque'] > 0,
+            (df['Cantidad litros'] / df['Estanque']) * 100,
+            np.nan
+        )
+    # Método 2: Estimación por modelo
+    elif 'Modelo Normalizado' in df.columns:
+        # Estimar capacidad de estanque por modelo: percentil 95 de las cargas
+        # de los modelos con al menos 10 registros (una sola pasada agrupada)
+        if estanque_estimado is None:
+            por_modelo = df.groupby('Modelo Normalizado', observed=True)['Cantidad litros']
+            estanque_estimado = por_modelo.quantile(0.95)[por_modelo.size() >= 10]
+
+        df['Estanque Estimado'] = broadcast_by_category(df['Modelo Normalizado'], estanque_estimado)
+
+        # Calcular porcentaje relativo al estanque estimado
+        df['Porcentaje Llenado'] = np.where(
+            df['Estanque Estimado'].notna() & (df['Estanque Estimado'] > 0),
+            (df['Cantidad litros'] / df['Estanque Estimado']) * 100,
+            np.nan
+        )
+    # Método 3: Estimación por bus
+    elif 'Número interno' in df.columns:
+        # Estimar capacidad de estanque por bus: percentil 95 de las cargas
+        # de los buses con al menos 5 registros
+        por_bus = df.groupby('Número interno')['Cantidad litros']
+        estanque_por_bus = por_bus.quantile(0.95)[por_bus.size() >= 5]
+
+        df['Estanque Estimado'] = df['Número interno'].map(estanque_por_bus)
+
+        # Calcular porcentaje relativo al estanque estimado
+        df['Porcentaje Llenado'] = np.where(
+            df['Estanque Estimado'].notna() & (df['Estanque Estimado'] > 0),
+            (df['Cantidad litros'] / df['Estanque Estimado']) * 100,
+            np.nan
+        )
+
+    # Clasificar nivel de llenado si se pudo calcular
+    if 'Porcentaje Llenado' in df.columns:
+        df['Nivel Llenado'] = categorize(df['Porcentaje Llenado'], LLENADO)
+
+        # Patrón de llenado: completo vs parcial
+        df['Llenado Completo'] = df['Porcentaje Llenado'] >= 85
+    return df
+
+
+def enrich_personal(df, diag, options=None, conductor_stats=None, planillero_stats=None):
+    """
+    Normaliza conductores y planilleros y calcula sus tasas y categorías.
+
+    ``conductor_stats`` (tasa de sobreconsumo por conductor normalizado) y
+    ``planillero_stats`` (tasa de malas cargas por planillero normalizado)
+    reemplazan las tasas calculadas sobre ``df``.
+    """
+    if 'Nombre conductor' in df.columns:
+        diag.info("🔄 Analizando patrones de conductores...")
+
+        # Limpiar y normalizar nombres
+        df['Nombre conductor'], df['Conductor Normalizado'] = normalize_column(df['Nombre conductor'], normalizar_nombre)
+
+        # Tasa de sobreconsumo por conductor
+        if conductor_stats is None and 'Sobreconsumo' in df.columns:
+            conductor_stats = df.groupby('Conductor Normalizado', observed=True)['Sobreconsumo'].mean() * 100
+
+        df['Tasa Sobreconsumo Conductor'] = broadcast_by_category(df['Conductor Normalizado'], conductor_stats if conductor_stats is not None else {})
+
+        # Categorizando conductores
+        df['Categoría Conductor'] = categorize(df['Tasa Sobreconsumo Conductor'], CONDUCTOR)
+
+    # Análisis por planillero
+    if 'Nombre Planillero' in df.columns:
+        diag.info("🔄 Analizando patrones de planilleros...")
+
+        # Limpiar y normalizar nombres
+        df['Nombre Planillero'], df['Planillero Normalizado'] = normalize_column(df['Nombre Planillero'], normalizar_nombre)
+
+        # Tasa de malas cargas por planillero
+        if planillero_stats is None and 'Mala Carga' in df.columns:
+            planillero_stats = df.groupby('Planillero Normalizado', observed=True)['Mala Carga'].mean() * 100
+
+        df['Tasa Malas Cargas Planillero'] = broadcast_by_category(df['Planillero Normalizado'], planillero_stats if planillero_stats is not None else {})
+
+        # Categorizando planilleros
+        df['Categoría Planillero'] = categorize(df['Tasa Malas Cargas Planillero'], PLANILLERO)
+    return df
+
+
+# --- KPIs ---
+
+def consumption_kpis(kpis, litros_por_dia, litros_por_semana, litros_por_mes, consumo_por_dia_semana=None):
+    """
+    Agrega a ``kpis`` el consumo por día, semana y mes y su tendencia.
+
+    Recibe los litros totales como Series indexadas por fecha, semana y mes
+    (pueden venir de sumar varios bloques) y el promedio por día de semana.
+    """
+    litros_por_dia = litros_por_dia.reset_index()
+    litros_por_dia.columns = ['Fecha', 'Total Litros']
+
+    kpis['litros_por_dia'] = litros_por_dia
+    kpis['litros_por_semana'] = litros_por_semana.reset_index()
+    kpis['litros_por_mes'] = litros_por_mes.reset_index()
+
+    # Análisis de tendencia con regresión robusta
+    if len(litros_por_dia) > 7:
+        # scikit-learn se importa recién aquí: cargarlo toma más que el resto del motor
+        from sklearn.linear_model import HuberRegressor, LinearRegression
+
+        X = np.array(range(len(litros_por_dia))).reshape(-1, 1)
+        y = litros_por_dia['Total Litros'].values
+
+        # Regresión robusta (menos sensible a outliers)
+        try:
+            modelo_robusto = HuberRegressor()
+            modelo_robusto.fit(X, y)
+            kpis['tendencia_consumo_robusta'] = modelo_robusto.coef_[0]
+        except Exception:
+            # En caso de error, usar regresión lineal estándar
+            modelo = LinearRegression()
+            modelo.fit(X, y)
+            kpis['tendencia_consumo'] = modelo.coef_[0]
+
+        kpis['promedio_diario'] = litros_por_dia['Total Litros'].mean()
+
+        # Guardar información adicional para análisis
+        kpis['dias_analizados'] = len(litros_por_dia)
+        kpis['consumo_maximo'] = litros_por_dia['Total Litros'].max()
+        kpis['consumo_minimo'] = litros_por_dia['Total Litros'].min()
+        kpis['consumo_mediana'] = litros_por_dia['Total Litros'].median()
+        kpis['consumo_std'] = litros_por_dia['Total Litros'].std()
+
+        # Estacionalidad por día de semana
+        if consumo_por_dia_semana is not None:
+            kpis['consumo_por_dia_semana'] = consumo_por_dia_semana
+
+
+def distance_kpis(kpis, km_por_bus, fecha_min_max=None):
+    """
+    Agrega a ``kpis`` los buses con más kilómetros y los km diarios por bus.
+
+    ``km_por_bus`` son los km totales por bus (Series) y ``fecha_min_max`` la
+    primera y última fecha de cada bus (columnas ``min`` y ``max``).
+    """
+    # Kilometraje por bus
+    km_por_bus = km_por_bus.reset_index()
+    km_por_bus.columns = ['Número interno', 'Km Totales']
+
+    # Top buses por kilometraje
+    kpis['top_buses_km'] = km_por_bus.sort_values('Km Totales', ascending=False).head(20)
+
+    # Promedio de kilómetros diarios por bus
+    if fecha_min_max is not None:
+        # Calcular días entre primera y última fecha por bus
+        fecha_min_max = fecha_min_max.reset_index()
+        fecha_min_max['Dias'] = (fecha_min_max['max'] - fecha_min_max['min']).dt.days + 1
+        fecha_min_max['Dias'] = fecha_min_max['Dias'].replace(0, 1)  # Evitar división por cero
+
+        # Unir con km totales
+        km_diarios = pd.merge(km_por_bus, fecha_min_max[['Número interno', 'Dias']], on='Número interno')
+        km_diarios['Km Diarios'] = km_diarios['Km Totales'] / km_diarios['Dias']
+
+        kpis['km_diarios_por_bus'] = km_diarios
+
+
+def compute_kpis(df, diag):
+    """
+    Calcula los KPIs agregados del conjunto de datos.
+
+    Agrega además las columnas ``Semana`` y ``Mes`` (``'%Y-%m'``) usadas por
+    las secciones de análisis temporal. ``kpis['cubo']`` es el cubo de
+    agregados diarios de ``combustible.cube``.
+
+    Returns:
+        Tupla ``(df, kpis)``
+    """
+    kpis = {}
+
+    if 'Cantidad litros' in df.columns and 'Fecha' in df.columns and df['Fecha'].notna().any():
+        try:
+            # Agrupar por día para análisis temporal
+            litros_por_dia = df.groupby(df['Fecha'].dt.date)['Cantidad litros'].sum()
+
+            # Agrupar por semana para tendencias más estables
+            df['Semana'] = week_labels(df['Fecha'])
+            litros_por_semana = df.groupby('Semana')['Cantidad litros'].sum()
+
+            # Agrupar por mes para tendencias a largo plazo
+            df['Mes'] = month_labels(df['Fecha'])
+            litros_por_mes = df.groupby('Mes')['Cantidad litros'].sum()
+
+            consumo_por_dia_semana = None
+            if 'Día Semana' in df.columns:
+                consumo_por_dia_semana = df.groupby('Día Semana')['Cantidad litros'].mean().to_dict()
+            consumption_kpis(kpis, litros_por_dia, litros_por_semana, litros_por_mes, consumo_por_dia_semana)
+        except Exception as e:
+            diag.warning(f"⚠️ No se pudieron calcular algunos KPIs de consumo diario: {e}")
+
+    # Análisis de distancia recorrida y eficiencia
+    if 'Kilómetros Recorridos' in df.columns and 'Número interno' in df.columns:
+        try:
+            km_por_bus = df.groupby('Número interno')['Kilómetros Recorridos'].sum()
+            fecha_min_max = df.groupby('Número interno')['Fecha'].agg(['min', 'max']) if 'Fecha' in df.columns else None
+            distance_kpis(kpis, km_por_bus, fecha_min_max)
+        except Exception as e:
+            diag.warning(f"⚠️ Error en análisis de distancia: {e}")
+
+    # Detectar patrones y correlaciones adicionales
+    if 'Cantidad litros' in df.columns and 'Hora Numérica' in df.columns:
+        try:
+            # Correlación entre hora y cantidad de litros
+            kpis['correlacion_hora_litros'] = df['Cantidad litros'].corr(df['Hora Numérica'])
+
+            # Comparar cargas en días laborales vs fines de semana
+            if 'Es Fin de Semana' in df.columns:
+                promedio_laboral = df[~df['Es Fin de Semana']]['Cantidad litros'].mean()
+                promedio_finde = df[df['Es Fin de Semana']]['Cantidad litros'].mean()
+                kpis['promedio_laboral'] = promedio_laboral
+                kpis['promedio_finde'] = promedio_finde
+                kpis['diff_finde_laboral'] = (promedio_finde / promedio_laboral - 1) * 100
+        except Exception as e:
+            diag.warning(f"⚠️ Error en análisis de patrones: {e}")
+
+    # Cubo de agregados diarios que consultan las secciones de análisis
+    try:
+        kpis['cubo'] = build_cube(df)
+        diag.info(f"🧊 Cubo de agregados: {len(kpis['cubo'])} celdas para {len(df)} registros")
+    except Exception as e:
+        diag.warning(f"⚠️ No se pudo construir el cubo de agregados: {e}")
+
+    return df, kpis
+
+
+# Etapas que transforman el DataFrame, en orden de ejecución
+STAGES = [
+    ('columnas', match_columns),
+    ('fechas', parse_dates),
+    ('horas', parse_hours),
+    ('numericas', clean_numeric_columns),
+    ('duplicados', drop_duplicate_loads),
+    ('malas_cargas', flag_malas_cargas),
+    ('anomalias_modelo', flag_consumption_anomalies),
+    ('outliers', flag_outliers),
+    ('rendimiento', compute_rendimiento),
+    ('terminales', enrich_terminals),
+    ('llenado', enrich_llenado),
+    ('personal', enrich_personal),
+]
+
+
+def run_pipeline(df, diag, options=None):
+    """
+    Ejecuta las etapas de limpieza, banderas y enriquecimiento sobre datos crudos.
+
+    Args:
+        df: DataFrame tal como lo entrega ``read_file``
+        diag: Diagnostics donde se registran los mensajes
+        options: ProcessingOptions (opcional)
+
+    Returns:
+        Tupla ``(df, kpis)``
+    """
+    options = options or ProcessingOptions()
+    for nombre, stage in STAGES:
+        with diag.profile.stage(nombre, rows_in=len(df)) as etapa:
+            df = stage(df, diag, options)
+            etapa.rows_out = len(df)
+
+    with diag.profile.stage('kpis', rows_in=len(df)) as etapa:
+        df, kpis = compute_kpis(df, diag)
+        etapa.rows_out = len(df)
+
+    with diag.profile.stage('tipos', rows_in=len(df)) as etapa:
+        df = compact_dtypes(df, diag)
+        etapa.rows_out = len(df)
+    return df, kpis
+
+
+def compact_dtypes(df, diag, options=None):
+    """Aplica el plan de tipos al resultado y registra la memoria ahorrada."""
+    df, diag.memory = optimize_dtypes(df)
+    total = diag.memory.iloc[-1]
+    ahorro = (1 - total['mb_despues'] / total['mb_antes']) * 100 if total['mb_antes'] else 0.0
+    diag.info(f"🗜️ Memoria del resultado: {total['mb_antes']:.1f} MB → {total['mb_despues']:.1f} MB (−{ahorro:.0f}%)")
+    return df
+
+
+def running_stats(df):
+    """
+    Estadísticas que permiten anexar archivos nuevos sin reprocesar ``df``.
+
+    Incluye las columnas de texto en que se buscaron malas cargas y el conteo,
+    media y M2 de litros por modelo normalizado.
+    """
+    stats = {'columnas_carga_masiva': list(df.attrs.get('columnas_carga_masiva', []))}
+    if 'Modelo Normalizado' in df.columns and 'Cantidad litros' in df.columns:
+        stats['litros_por_modelo'] = group_moments(df, 'Cantidad litros', 'Modelo Normalizado')
+    return stats
+
+
+def process_file(source, name=None, options=None):
+    """
+    Lee y procesa un archivo de cargas de combustible sin depender de Streamlit.
+
+    Un ``.zip`` o un libro con varias hojas de cargas se procesa como
+    ``process_files`` con todas sus partes.
+
+    Args:
+        source: Ruta o archivo tipo file-like
+        name: Nombre del archivo (opcional, se usa para detectar la extensión)
+        options: ProcessingOptions (opcional)
+
+    Returns:
+        ProcessingResult con el DataFrame, los KPIs y el diagnóstico. Si el
+        procesamiento falla, ``result.df`` es ``None`` y el motivo queda en
+        ``result.diagnostics``. El perfil por etapa queda en
+        ``result.diagnostics.profile``.
+    """
+    return process_files([source], [name], options)
+
+
+def process_files(sources, names=None, options=None):
+    """
+    Lee y procesa varios archivos de cargas como un solo dataset.
+
+    Los archivos (y los ``.zip`` y hojas que contengan) se leen en paralelo
+    con ``read_sources``; el enriquecimiento se ejecuta una sola vez sobre
+    los registros combinados, sin las cargas repetidas entre archivos.
+
+    Args:
+        sources: Rutas o archivos tipo file-like
+        names: Nombres de los archivos (opcional, uno por fuente)
+        options: ProcessingOptions (opcional)
+
+    Returns:
+        ProcessingResult, como ``process_file``
+    """
+    result = ProcessingResult()
+    options = options or ProcessingOptions()
+    names = names or [None] * len(sources)
+    profile = result.diagnostics.profile
+    profile.trace_memory = options.trace_memory
+
+    with profile.tracing():
+        _process(sources, names, options, result)
+
+    log_profile(result, options, ', '.join(str(source_name(source, name)) for source, name in zip(sources, names)))
+    return result
+
+
+def log_profile(result, options, source, **extra):
+    """
+    Agrega el perfil por etapa de ``result`` a ``options.profile_log``.
+
+    Permite comparar ejecuciones; ``extra`` se agrega al registro (por ejemplo,
+    ``modo='anexado'``). Sirve también para ``ChunkedResult``. Si el archivo no
+    se puede escribir queda una advertencia.
+    """
+    if not options.profile_log:
+        return
+    try:
+        result.diagnostics.profile.append_jsonl(
+            options.profile_log,
+            source=source,
+            rows=result.rows if result.ok else None,
+            ok=result.ok,
+            **extra,
+        )
+    except OSError as e:
+        result.diagnostics.warning(f"⚠️ No se pudo escribir el perfil en {options.profile_log}: {e}")
+
+
+def _process(sources, names, options, result):
+    diag = result.diagnostics
+
+    # Iniciar temporizador para medir rendimiento
+    start_time = time.time()
+
+    # Buscar el dataset en la caché en disco (salvo que se pida reentrenar)
+    clave = None
+    if options.cache is not None:
+        with diag.profile.stage('cache') as etapa:
+            try:
+                clave = DatasetCache.key(sources_hash(sources), PIPELINE_VERSION, options.prune_columns)
+                cacheado = None if options.refit_detectors else options.cache.get(clave)
+            except OSError as e:
+                diag.warning(f"⚠️ No se pudo consultar la caché: {e}")
+                clave = cacheado = None
+            etapa.rows_out = len(cacheado[0]) if cacheado is not None else 0
+
+        if cacheado is not None:
+            result.df, extra = cacheado
+            result.kpis = extra['kpis']
+            result.stats = extra.get('stats', {})
+            diag.messages.extend(extra['messages'])
+            diag.detected_columns = extra['detected_columns']
+            diag.memory = extra.get('memory')
+            diag.execution_time = time.time() - start_time
+            diag.info(f"⚡ Resultado cargado desde la caché en {diag.execution_time:.2f} segundos")
+            return
+
+    try:
+        with diag.profile.stage('lectura') as etapa:
+            df = read_sources(sources, diag, names=names, options=options)
+            etapa.rows_out = len(df)
+        df, result.kpis = run_pipeline(df, diag, options)
+    except ProcessingError:
+        return
+    except Exception as e:
+        diag.error(f"❌ Error al procesar el archivo: {e}")
+        diag.error("Revise que el archivo tenga el formato correcto y todas las columnas necesarias.")
+        diag.error(f"Detalles adicionales: {traceback.format_exc()}")
+        return
+
+    # Tiempo de ejecución
+    diag.execution_time = time.time() - start_time
+    diag.info(f"⏱️ Tiempo de procesamiento: {diag.execution_time:.2f} segundos")
+
+    # Mensaje de éxito
+    total_outliers = df['Outlier Extremo'].sum() + df['Sobreconsumo'].sum()
+
+    diag.success(f"""
+        ✅ Archivo cargado y analizado exitosamente:
+        - {len(df)} registros procesados
+        - {df['Mala Carga'].sum()} malas cargas detectadas
+        - {total_outliers} anomalías identificadas
+        """)
+
+    result.stats = running_stats(df)
+
+    # Guardar en la caché en disco para próximas cargas del mismo archivo
+    if clave is not None:
+        with diag.profile.stage('guardar_cache', rows_in=len(df)):
+            try:
+                options.cache.put(clave, df, {
+                    'kpis': result.kpis,
+                    'stats': result.stats,
+                    'messages': list(diag.messages),
+                    'detected_columns': diag.detected_columns,
+                    'memory': diag.memory,
+                })
+            except Exception as e:
+                diag.warning(f"⚠️ No se pudo guardar el resultado en la caché: {e}")
+
+    result.df = df
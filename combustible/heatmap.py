@@ -0,0 +1,85 @@
+"""
+Matrices día de la semana × hora.
+
+Los mapas de calor de la interfaz resumen las cargas en una grilla de 7 días
+× 24 horas. Cada registro recibe un código entero (``día * 24 + hora``) y las
+matrices de conteo, suma y promedio se obtienen con ``np.bincount`` sobre
+esos códigos, sin agregar columnas al DataFrame ni pasar por
+``pivot_table``.
+"""
+import numpy as np
+import pandas as pd
+
+from combustible.parsing import NOMBRES_DIA
+
+
+DIAS = 7
+HORAS = 24
+
+# Nombre del día -> número (0 = lunes); se aceptan también los nombres en español
+NUMERO_DIA = {nombre: numero for numero, nombre in enumerate(NOMBRES_DIA)}
+NUMERO_DIA.update({nombre: numero for numero, nombre in enumerate(
+    ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo'])})
+
+AGREGACIONES = ('count', 'sum', 'mean')
+
+
+def weekday_hour_codes(df):
+    """
+    Código ``día * 24 + hora`` de cada registro según ``Día Semana`` y ``Hora Numérica``.
+
+    La hora se trunca: cada columna es la hora del reloj en que se hizo la
+    carga (las 06:40 quedan en la hora 6 y las 23:40 en la 23). El mapa
+    original redondeaba (06:40 iba a la hora 7 y desde las 23:30 a una
+    columna "24" que no es una hora del día). Los registros sin día
+    reconocible o sin hora válida reciben -1.
+
+    Returns:
+        Arreglo ``int64`` alineado con las filas de ``df``
+    """
+    # Una búsqueda por nombre distinto en lugar de una por registro
+    codigos, nombres = pd.factorize(df['Día Semana'])
+    numeros = np.array([NUMERO_DIA.get(nombre, -1) for nombre in nombres] + [-1], dtype=np.int64)
+    dias = numeros[codigos]
+
+    horas = np.floor(df['Hora Numérica'].to_numpy(dtype='float64', na_value=np.nan))
+    validos = (dias >= 0) & (horas >= 0) & (horas < HORAS)
+    return np.where(validos, dias * HORAS + np.where(validos, horas, 0).astype(np.int64), -1)
+
+
+def heatmap_matrix(codigos, valores=None, aggfunc='count'):
+    """
+    Matriz día × hora de los registros con ``codigos``.
+
+    Args:
+        codigos: Códigos de ``weekday_hour_codes`` (los -1 se ignoran)
+        valores: Valores numéricos alineados con ``codigos``; no se usan
+            para ``'count'``
+        aggfunc: ``'count'`` (cantidad de cargas), ``'sum'`` o ``'mean'`` de
+            ``valores`` (los NaN se ignoran, como en ``pivot_table``)
+
+    Returns:
+        DataFrame de 7 × 24 con los días (nombres de ``Día Semana``) como
+        índice y las horas 0-23 como columnas. Sin registros, el promedio
+        queda en NaN y el conteo y la suma en cero.
+    """
+    if aggfunc not in AGREGACIONES:
+        raise ValueError(f"Agregación no soportada: {aggfunc}")
+    codigos = np.asarray(codigos)
+    celdas = DIAS * HORAS
+
+    if aggfunc == 'count':
+        matriz = np.bincount(codigos[codigos >= 0], minlength=celdas)
+    else:
+        valores = np.asarray(valores, dtype=np.float64)
+        validos = (codigos >= 0) & ~np.isnan(valores)
+        suma = np.bincount(codigos[validos], weights=valores[validos], minlength=celdas)
+        if aggfunc == 'sum':
+            matriz = suma
+        else:
+            cantidad = np.bincount(codigos[validos], minlength=celdas)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                matriz = np.where(cantidad > 0, suma / cantidad, np.nan)
+
+    return pd.DataFrame(matriz.reshape(DIAS, HORAS), index=pd.Index(list(NOMBRES_DIA), name='Día Semana'),
+                        columns=pd.Index(range(HORAS), name='Hora'))
@@ -0,0 +1,250 @@
+"""
+Modo de anexado: agrega un archivo nuevo a un dataset ya procesado.
+
+Las etapas por registro (columnas, fechas, horas, números y búsqueda de malas
+cargas por texto) solo se ejecutan sobre el archivo nuevo. Del histórico se
+reutilizan los valores ya limpios y las estadísticas acumuladas de
+``ProcessingResult.stats``:
+
+- las cargas del archivo nuevo que ya están en el histórico (misma clave
+  ``CLAVE_DUPLICADOS``) se omiten, como al procesar ambos archivos juntos;
+- la media y desviación de litros por modelo se combinan con las del archivo
+  nuevo (Z-Score, umbral y sobreconsumo quedan iguales a un recálculo completo);
+- el Isolation Forest solo se recalcula para los modelos con registros nuevos;
+- la cadena de odómetros (``Odómetro Anterior``) solo se recalcula para los
+  buses con registros nuevos.
+
+Los límites globales por cuantiles (IQR de litros y límites de rendimiento) y
+las agregaciones por terminal, personal y día son pasadas vectorizadas sobre
+las columnas ya limpias y se recalculan sobre el conjunto completo.
+"""
+import time
+import traceback
+
+import pandas as pd
+
+from combustible.engine import (
+    CLAVE_DUPLICADOS,
+    Diagnostics,
+    ProcessingError,
+    ProcessingOptions,
+    ProcessingResult,
+    apply_model_stats,
+    chain_odometer,
+    clean_numeric_columns,
+    compact_dtypes,
+    compute_kpis,
+    compute_rendimiento,
+    compute_rendimiento_from_km,
+    enrich_llenado,
+    enrich_personal,
+    enrich_terminals,
+    flag_consumption_anomalies,
+    flag_extreme_outliers,
+    flag_litros_extremos,
+    flag_malas_cargas,
+    flag_outliers,
+    load_keys,
+    log_profile,
+    match_columns,
+    orden_cargas,
+    parse_dates,
+    parse_hours,
+    read_file,
+    scan_carga_masiva,
+)
+from combustible.ingest import source_name
+from combustible.normalization import normalize_column, normalizar_modelo
+from combustible.stats import group_moments, merge_moments, moments_to_stats
+
+
+# Etapas que solo dependen de cada registro y se aplican al archivo nuevo
+ROW_STAGES = [
+    ('columnas', match_columns),
+    ('fechas', parse_dates),
+    ('horas', parse_hours),
+    ('numericas', clean_numeric_columns),
+]
+
+
+def _unir_categorias(a, b):
+    # Igualar las categorías (ordenadas) para que la concatenación siga siendo categórica
+    categorias = sorted(set(a.cat.categories) | set(b.cat.categories))
+    return a.cat.set_categories(categorias), b.cat.set_categories(categorias)
+
+
+def _agregar_marcas(df, marcas, motivo):
+    # Las columnas habilitadas después solo explican los registros que aún no tenían marca
+    nuevas = marcas & ~df['Mala Carga Texto']
+    df['Motivo Mala Carga'] = df['Motivo Mala Carga'].astype(object).mask(nuevas, motivo)
+    df['Mala Carga Texto'] = df['Mala Carga Texto'] | marcas
+
+
+def _sync_text_flags(hist, nuevo, columnas_hist):
+    """Revisa en cada parte las columnas de texto que la otra parte habilitó."""
+    columnas_nuevo = nuevo.attrs.get('columnas_carga_masiva', [])
+
+    faltan_hist = [c for c in columnas_nuevo if c not in columnas_hist and c in hist.columns]
+    if faltan_hist:
+        _agregar_marcas(hist, *scan_carga_masiva(hist, faltan_hist)[:2])
+
+    faltan_nuevo = [c for c in columnas_hist if c not in columnas_nuevo and c in nuevo.columns]
+    if faltan_nuevo:
+        _agregar_marcas(nuevo, *scan_carga_masiva(nuevo, faltan_nuevo)[:2])
+
+    return list(columnas_hist) + [c for c in columnas_nuevo if c not in columnas_hist]
+
+
+def _drop_known_loads(hist, nuevo, diag):
+    """
+    Quita del archivo nuevo las cargas que ya están en el histórico o repetidas en él.
+
+    Igual que ``drop_duplicate_loads`` en un recálculo completo de ambos
+    archivos: se compara la clave ``CLAVE_DUPLICADOS`` ya convertida y los
+    registros sin fecha no se consideran repetidos. Así los litros y los
+    momentos por modelo no cuentan dos veces un mes que se solapa.
+    """
+    faltantes = [col for col in CLAVE_DUPLICADOS if col not in hist.columns or col not in nuevo.columns]
+    if faltantes:
+        diag.warning(f"⚠️ No se buscaron cargas ya presentes en el histórico: faltan las columnas {', '.join(faltantes)}")
+        return nuevo
+
+    claves = load_keys(nuevo)
+    repetidas = (claves.isin(load_keys(hist)) | claves.duplicated()) & nuevo['Fecha'].notna()
+    n_repetidas = int(repetidas.sum())
+    if n_repetidas:
+        diag.info(f"🧹 Se omitieron {n_repetidas} cargas que ya estaban en el histórico ({', '.join(CLAVE_DUPLICADOS)})")
+        nuevo = nuevo[~repetidas].copy()
+    return nuevo
+
+
+def _append(history, nuevo, diag, options):
+    hist = history.df.copy()
+    stats = dict(history.stats)
+
+    # Etapas por registro solo sobre el archivo nuevo
+    for _, stage in ROW_STAGES:
+        nuevo = stage(nuevo, diag, options)
+    inicio = int(hist.index.max()) + 1 if len(hist) else 0
+    nuevo.index = pd.RangeIndex(inicio, inicio + len(nuevo))
+    nuevo = _drop_known_loads(hist, nuevo, diag)
+
+    # Malas cargas por texto: los mensajes se reemplazan por los del conjunto completo
+    nuevo = flag_malas_cargas(nuevo, Diagnostics(), options)
+    stats['columnas_carga_masiva'] = _sync_text_flags(hist, nuevo, stats.get('columnas_carga_masiva', []))
+
+    por_modelo = 'Modelo Normalizado' in hist.columns and 'litros_por_modelo' in stats and 'Modelo chasis' in nuevo.columns
+    if por_modelo:
+        nuevo['Modelo chasis'], nuevo['Modelo Normalizado'] = normalize_column(nuevo['Modelo chasis'], normalizar_modelo)
+        hist['Modelo Normalizado'], nuevo['Modelo Normalizado'] = _unir_categorias(hist['Modelo Normalizado'], nuevo['Modelo Normalizado'])
+        nuevo['Outlier Extremo'] = False
+
+    por_bus = 'Odómetro Anterior' in hist.columns and all(c in nuevo.columns for c in ['Número interno', 'Odómetro', 'Cantidad litros'])
+    if por_bus:
+        nuevo['Número interno'] = nuevo['Número interno'].astype(str).str.strip().str.upper()
+
+    df = pd.concat([hist, nuevo])
+    flag_litros_extremos(df, diag)
+    n_malas_cargas = df['Mala Carga'].sum()
+    diag.info(f"🛑 Total de malas cargas detectadas: {n_malas_cargas} ({n_malas_cargas/len(df)*100:.2f}%)")
+
+    # Estadísticas por modelo combinadas con las acumuladas del histórico
+    if por_modelo:
+        momentos = merge_moments(stats['litros_por_modelo'], group_moments(nuevo, 'Cantidad litros', 'Modelo Normalizado'))
+        stats['litros_por_modelo'] = momentos
+        modelo_stats = moments_to_stats(momentos)
+        modelo_stats = modelo_stats[modelo_stats['count'] >= 5]
+        apply_model_stats(df, modelo_stats['mean'], modelo_stats['std'])
+
+        modelos = list(nuevo['Modelo Normalizado'].unique())
+        flag_extreme_outliers(df, diag, options, modelos=modelos)
+        diag.info(f"🔄 Outliers recalculados para {len(modelos)} modelos con registros nuevos")
+    else:
+        df = flag_consumption_anomalies(df, diag, options)
+        df = flag_outliers(df, diag, options)
+        stats.pop('litros_por_modelo', None)
+
+    # Cadena de odómetros solo para los buses con registros nuevos
+    if por_bus:
+        buses = nuevo['Número interno'].unique()
+        tocados = df['Número interno'].isin(buses)
+        df = pd.concat([df[~tocados], chain_odometer(df[tocados].copy())])
+        df['Km Sospechosos'] = df['Km Sospechosos'].astype(bool)
+        df = df.sort_values(orden_cargas(df))
+        df = compute_rendimiento_from_km(df, diag)
+        diag.info(f"🔄 Kilometraje recalculado para {len(buses)} buses con registros nuevos")
+    else:
+        df = compute_rendimiento(df, diag, options)
+
+    for stage in (enrich_terminals, enrich_llenado, enrich_personal):
+        df = stage(df, diag, options)
+
+    df.attrs['columnas_carga_masiva'] = stats['columnas_carga_masiva']
+    return df, stats, len(nuevo)
+
+
+def append_file(history, source, name=None, options=None):
+    """
+    Anexa un archivo de cargas a un dataset procesado sin reprocesar el histórico.
+
+    Args:
+        history: ProcessingResult del dataset existente (de ``process_file`` o
+            de un ``append_file`` anterior)
+        source: Ruta o archivo tipo file-like con los registros nuevos
+        name: Nombre del archivo (opcional, se usa para detectar la extensión)
+        options: ProcessingOptions (opcional)
+
+    Returns:
+        ProcessingResult con el dataset combinado. Si falla, ``result.df`` es
+        ``None`` y el histórico no se modifica.
+    """
+    result = ProcessingResult()
+    options = options or ProcessingOptions()
+    profile = result.diagnostics.profile
+    profile.trace_memory = options.trace_memory
+
+    with profile.tracing():
+        _append_file(history, source, name, options, result)
+
+    # El anexado queda en el mismo registro de perfiles que los procesamientos completos
+    log_profile(result, options, str(source_name(source, name)), modo='anexado')
+    return result
+
+
+def _append_file(history, source, name, options, result):
+    diag = result.diagnostics
+    start_time = time.time()
+
+    if not history.ok:
+        diag.error("❌ No hay un dataset procesado al cual anexar el archivo.")
+        return
+
+    try:
+        with diag.profile.stage('lectura') as etapa:
+            nuevo = read_file(source, diag, name=name, options=options)
+            etapa.rows_out = len(nuevo)
+        with diag.profile.stage('anexado', rows_in=len(nuevo)) as etapa:
+            df, result.stats, n_nuevos = _append(history, nuevo, diag, options)
+            etapa.rows_out = len(df)
+        with diag.profile.stage('kpis', rows_in=len(df)) as etapa:
+            df, result.kpis = compute_kpis(df, diag)
+            etapa.rows_out = len(df)
+        with diag.profile.stage('tipos', rows_in=len(df)) as etapa:
+            df = compact_dtypes(df, diag)
+            etapa.rows_out = len(df)
+    except ProcessingError:
+        return
+    except Exception as e:
+        diag.error(f"❌ Error al anexar el archivo: {e}")
+        diag.error(f"Detalles adicionales: {traceback.format_exc()}")
+        return
+
+    diag.execution_time = time.time() - start_time
+    diag.success(f"""
+        ✅ Archivo anexado exitosamente en {diag.execution_time:.2f} segundos:
+        - {n_nuevos} registros nuevos ({len(df)} en total)
+        - {df['Mala Carga'].sum()} malas cargas detectadas
+        - {df['Outlier Extremo'].sum() + df['Sobreconsumo'].sum()} anomalías identificadas
+        """)
+
+    result.df = df
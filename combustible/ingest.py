@@ -0,0 +1,142 @@
+"""
+Expansión de varios archivos, zips y hojas en unidades de lectura.
+
+Cada archivo subido se convierte en una o más unidades: los ``.zip`` aportan
+sus archivos de cargas y los libros Excel con varias hojas aportan una unidad
+por hoja. ``combustible.engine.read_sources`` lee las unidades en paralelo y
+las concatena con la columna ``Origen``.
+"""
+import os
+import shutil
+import zipfile
+from dataclasses import dataclass
+
+import pandas as pd
+
+from combustible.readers import xlsx_sheet_names
+
+
+# Extensiones que se leen desde un .zip (las demás se ignoran)
+EXTENSIONES = ('.xlsx', '.xls', '.csv', '.txt')
+
+# Separador entre archivo y hoja en la columna Origen
+SEPARADOR_HOJA = ' › '
+
+
+@dataclass
+class SourceUnit:
+    """
+    Un archivo o una hoja a leer.
+
+    Attributes:
+        source: Ruta o archivo tipo file-like
+        name: Nombre del archivo (define la extensión)
+        sheet: Posición de la hoja en los libros Excel
+        label: Texto de la columna ``Origen`` ("archivo" o "archivo › hoja")
+        require_header: Omitir la hoja si no tiene un encabezado reconocible
+            (en lugar de usar la fila 3)
+    """
+    source: object
+    name: str
+    sheet: int = 0
+    label: str = ''
+    require_header: bool = False
+
+
+def source_name(source, name=None):
+    """Nombre de un archivo: el indicado, el de un UploadedFile o la ruta."""
+    return name or getattr(source, 'name', None) or os.fspath(source)
+
+
+def _sheet_names(source, extension):
+    try:
+        if extension == '.xlsx':
+            return xlsx_sheet_names(source)
+        with pd.ExcelFile(source, engine='xlrd') as libro:
+            return libro.sheet_names
+    except Exception:
+        # Libro ilegible o sin xlrd: la lectura de la unidad informa el error
+        return [None]
+    finally:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+
+
+def file_units(source, name):
+    """Unidades de un archivo: una por hoja en los libros Excel, una en los CSV."""
+    extension = os.path.splitext(name)[1].lower()
+    hojas = _sheet_names(source, extension) if extension in ('.xlsx', '.xls') else [None]
+    if len(hojas) <= 1:
+        return [SourceUnit(source, name, 0, name)]
+    # En libros con varias hojas solo se leen las que tienen encabezado de cargas
+    return [
+        SourceUnit(source, name, i, f"{name}{SEPARADOR_HOJA}{hoja}", require_header=True)
+        for i, hoja in enumerate(hojas)
+    ]
+
+
+def _miembros_zip(archivo):
+    for miembro in archivo.infolist():
+        base = os.path.basename(miembro.filename)
+        if miembro.is_dir() or miembro.filename.startswith('__MACOSX/') or base.startswith(('.', '~$')):
+            continue
+        if os.path.splitext(base)[1].lower() in EXTENSIONES:
+            yield miembro
+
+
+def expand_sources(sources, names=None, directory=None):
+    """
+    Expande archivos y zips en unidades de lectura.
+
+    Los archivos de cada ``.zip`` se extraen en ``directory`` y se nombran
+    "archivo.zip/ruta/interna.xlsx".
+
+    Args:
+        sources: Rutas o archivos tipo file-like
+        names: Nombres de los archivos (opcional, uno por fuente)
+        directory: Directorio temporal para los archivos extraídos
+
+    Returns:
+        Lista de SourceUnit en el orden de las fuentes
+
+    Raises:
+        zipfile.BadZipFile: si un ``.zip`` está dañado
+    """
+    names = names or [None] * len(sources)
+    unidades = []
+    for n, (source, name) in enumerate(zip(sources, names)):
+        name = source_name(source, name)
+        if os.path.splitext(name)[1].lower() != '.zip':
+            unidades += file_units(source, name)
+            continue
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        with zipfile.ZipFile(source) as archivo:
+            for i, miembro in enumerate(_miembros_zip(archivo)):
+                ruta = os.path.join(directory, f"{n}_{i}_{os.path.basename(miembro.filename)}")
+                with archivo.open(miembro) as origen, open(ruta, 'wb') as destino:
+                    shutil.copyfileobj(origen, destino)
+                unidades += file_units(ruta, f"{name}/{miembro.filename}")
+    return unidades
+
+
+def materialize(unidades, directory):
+    """
+    Escribe en ``directory`` las fuentes que están en memoria.
+
+    Los procesos de lectura reciben rutas en lugar de copias del contenido;
+    las hojas de un mismo archivo comparten el archivo escrito.
+    """
+    rutas = {}
+    for i, unidad in enumerate(unidades):
+        if isinstance(unidad.source, (str, os.PathLike)):
+            continue
+        clave = id(unidad.source)
+        if clave not in rutas:
+            rutas[clave] = os.path.join(directory, f"subido_{i}_{os.path.basename(unidad.name)}")
+            unidad.source.seek(0)
+            with open(rutas[clave], 'wb') as destino:
+                shutil.copyfileobj(unidad.source, destino)
+            unidad.source.seek(0)
+        unidad.source = rutas[clave]
+    return unidades
@@ -0,0 +1,100 @@
+"""
+Normalización de modelos, terminales y nombres con codificación por diccionario.
+
+Un archivo tiene cientos de miles de filas pero solo unas decenas de modelos,
+terminales y personas distintas. La limpieza y las funciones ``normalizar_*``
+se aplican a los valores únicos (``pd.factorize``) y el resultado se propaga a
+todas las filas con sus códigos; las columnas normalizadas quedan como
+``Categorical``.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+
+def normalizar_modelo(modelo):
+    """Agrupa variantes de un mismo fabricante de chasis."""
+    if pd.isna(modelo) or modelo == 'nan':
+        return 'SIN MODELO'
+    modelo = str(modelo).upper().strip()
+    # Eliminar espacios excesivos
+    modelo = re.sub(r'\s+', ' ', modelo)
+    # Buscar patrones comunes
+    for patron in ['MERCEDES', 'BENZ', 'MB']:
+        if patron in modelo:
+            return 'MERCEDES BENZ'
+    for patron in ['VOLVO', 'VOL']:
+        if patron in modelo:
+            return 'VOLVO'
+    for patron in ['SCANIA', 'SCA']:
+        if patron in modelo:
+            return 'SCANIA'
+    # Si no se ha normalizado, devolver el original
+    return modelo
+
+
+def normalizar_terminal(terminal):
+    """Normaliza mayúsculas y espacios del nombre de terminal."""
+    if pd.isna(terminal) or terminal == 'nan':
+        return 'SIN TERMINAL'
+    terminal = str(terminal).upper().strip()
+    # Eliminar espacios excesivos y caracteres especiales
+    terminal = re.sub(r'\s+', ' ', terminal)
+    return terminal
+
+
+def normalizar_nombre(nombre):
+    """Normaliza nombres de conductores y planilleros."""
+    if pd.isna(nombre) or nombre.lower() == 'nan':
+        return 'SIN NOMBRE'
+    nombre = str(nombre).upper().strip()
+    # Eliminar espacios excesivos y normalizar
+    nombre = re.sub(r'\s+', ' ', nombre)
+    return nombre
+
+
+def _limpiar_texto(valor):
+    # Equivale a .astype(str).str.strip().str.upper() sobre un solo valor
+    return str(valor).strip().upper()
+
+
+def normalize_column(series, normalizar):
+    """
+    Limpia una columna de texto y la normaliza sobre sus valores únicos.
+
+    Devuelve ``(limpia, normalizada)``: la columna limpia (mayúsculas y sin
+    espacios extremos, dtype object como antes) y la normalizada como
+    ``Categorical`` con categorías ordenadas, ambas con el índice original.
+    """
+    codigos, unicos = pd.factorize(series, use_na_sentinel=False)
+    limpios = np.array([_limpiar_texto(valor) for valor in unicos], dtype=object)
+
+    # Varios valores crudos pueden quedar en la misma categoría normalizada
+    normalizados = [normalizar(valor) for valor in limpios]
+    codigos_norm, categorias = pd.factorize(pd.Index(normalizados, dtype=object), sort=True)
+
+    limpia = pd.Series(limpios.take(codigos), index=series.index, name=series.name)
+    normalizada = pd.Series(
+        pd.Categorical.from_codes(codigos_norm.take(codigos), categories=categorias),
+        index=series.index
+    )
+    return limpia, normalizada
+
+
+def broadcast_by_category(categorica, valores):
+    """
+    Propaga un valor por categoría a todas las filas mediante los códigos.
+
+    ``valores`` es un mapeo (dict o Series indexada por categoría); las
+    categorías sin valor quedan como NaN. Equivale a ``.map(valores)`` pero el
+    resultado es numérico y no categórico.
+    """
+    por_categoria = pd.Series(valores, dtype=None if len(valores) else float)
+    por_categoria = por_categoria.reindex(categorica.cat.categories).to_numpy()
+    codigos = categorica.cat.codes.to_numpy()
+    resultado = por_categoria.take(codigos)
+    if (codigos < 0).any():
+        resultado = resultado.astype(float)
+        resultado[codigos < 0] = np.nan
+    return pd.Series(resultado, index=categorica.index)
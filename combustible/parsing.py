@@ -0,0 +1,360 @@
+"""
+Conversión vectorizada de columnas de fecha, hora y números.
+
+Las exportaciones repiten la misma fecha y hora miles de veces, por lo que el
+formato se infiere sobre una muestra de valores únicos y la conversión se
+hace una sola vez sobre los únicos, propagando el resultado con sus códigos.
+Los números con formato local (``1.234,56``) se convierten detectando los
+separadores una vez por columna.
+"""
+import datetime
+import re
+
+import numpy as np
+import pandas as pd
+
+
+# Formatos de fecha aceptados, en orden de preferencia
+FORMATOS_FECHA = [
+    '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y', '%m-%d-%Y',
+    '%d.%m.%Y', '%Y.%m.%d', '%d %b %Y', '%d %B %Y'
+]
+
+# Formatos de hora aceptados, en orden de preferencia
+FORMATOS_HORA = ['%H:%M:%S', '%H:%M', '%I:%M:%S %p', '%I:%M %p']
+
+# Patrón de último recurso para horas escritas como "8.30" o "Hora: 8:30"
+PATRON_HORA = re.compile(r'(\d{1,2})[:\.](\d{1,2})')
+
+SEGUNDOS_DIA = 24 * 3600
+NS_POR_SEGUNDO = 1_000_000_000
+
+# Nombres en inglés, iguales a los de ``Series.dt.month_name()`` y ``dt.day_name()``
+NOMBRES_MES = np.array([
+    'January', 'February', 'March', 'April', 'May', 'June', 'July',
+    'August', 'September', 'October', 'November', 'December'
+], dtype=object)
+NOMBRES_DIA = np.array([
+    'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'
+], dtype=object)
+
+
+def infer_formats(values, formatos=FORMATOS_FECHA, sample_size=500):
+    """
+    Detecta los formatos de fecha u hora presentes en una muestra de valores.
+
+    Se elige primero el formato que convierte más valores de la muestra (los
+    empates se resuelven por el orden de ``formatos``) y se repite con los
+    valores que quedaron sin convertir, lo que permite columnas mixtas.
+
+    Args:
+        values: Valores de texto (idealmente únicos)
+        formatos: Formatos candidatos en orden de preferencia
+        sample_size: Cantidad máxima de valores a muestrear
+
+    Returns:
+        Lista de formatos a aplicar en orden; vacía si ninguno coincide
+    """
+    muestra = pd.Series(values, dtype=object).dropna()
+    if len(muestra) > sample_size:
+        muestra = muestra.sample(sample_size, random_state=0)
+    muestra = muestra.astype(str).str.strip()
+
+    seleccionados = []
+    pendientes = muestra
+    while len(pendientes) > 0:
+        mejor, mejor_validos = None, None
+        for formato in formatos:
+            if formato in seleccionados:
+                continue
+            validos = pd.to_datetime(pendientes, format=formato, errors='coerce').notna()
+            if validos.any() and (mejor_validos is None or validos.sum() > mejor_validos.sum()):
+                mejor, mejor_validos = formato, validos
+        if mejor is None:
+            break
+        seleccionados.append(mejor)
+        pendientes = pendientes[~mejor_validos]
+    return seleccionados
+
+
+def parse_date_column(series, formatos=FORMATOS_FECHA, sample_size=500):
+    """
+    Convierte una columna de fechas en una sola pasada.
+
+    Los valores que ya son fechas (por ejemplo celdas de Excel) se conservan;
+    los textos se convierten sobre sus valores únicos con los formatos
+    inferidos y, si ninguno coincide, con la inferencia automática de pandas.
+
+    Returns:
+        Serie datetime64 con el mismo índice que ``series``
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+
+    codigos, unicos = pd.factorize(series)
+    unicos = pd.Series(unicos, dtype=object)
+    convertidos = pd.Series(pd.NaT, index=unicos.index, dtype='datetime64[ns]')
+
+    # Celdas que ya vienen como fecha desde Excel
+    es_fecha = unicos.map(lambda x: isinstance(x, (pd.Timestamp, np.datetime64)) or hasattr(x, 'year'))
+    if es_fecha.any():
+        convertidos[es_fecha] = pd.to_datetime(unicos[es_fecha], errors='coerce')
+
+    textos = unicos[~es_fecha].astype(str).str.strip()
+    if len(textos) > 0:
+        formatos_detectados = infer_formats(textos, formatos, sample_size)
+        if formatos_detectados:
+            for formato in formatos_detectados:
+                pendientes = convertidos[textos.index].isna()
+                if not pendientes.any():
+                    break
+                idx = textos.index[pendientes.values]
+                convertidos[idx] = pd.to_datetime(textos[idx], format=formato, errors='coerce')
+        else:
+            convertidos[textos.index] = pd.to_datetime(textos, errors='coerce')
+
+    valores = convertidos.values.take(codigos)
+    valores[codigos == -1] = np.datetime64('NaT')
+    return pd.Series(valores, index=series.index, name=series.name)
+
+
+def _lookup(nombres, posiciones):
+    """Traduce posiciones (con NaN para fechas inválidas) a nombres."""
+    resultado = np.full(len(posiciones), np.nan, dtype=object)
+    validos = ~np.isnan(posiciones)
+    resultado[validos] = nombres[posiciones[validos].astype(np.int64)]
+    return resultado
+
+
+def calendar_columns(fechas):
+    """
+    Calcula las columnas de calendario derivadas de una serie de fechas.
+
+    Args:
+        fechas: Serie datetime64
+
+    Returns:
+        Diccionario columna → valores, en el orden en que se agregan al DataFrame
+    """
+    dt = fechas.dt
+    mes = dt.month
+    dia_semana = dt.dayofweek
+    return {
+        'Año': dt.year,
+        'Mes': mes,
+        'Mes Nombre': _lookup(NOMBRES_MES, mes.to_numpy(dtype=float) - 1),
+        'Día': dt.day,
+        'Día Semana': _lookup(NOMBRES_DIA, dia_semana.to_numpy(dtype=float)),
+        'Semana del Año': dt.isocalendar().week,
+        'Trimestre': dt.quarter,
+        'Es Fin de Semana': dia_semana >= 5,
+    }
+
+
+def _format_periods(fechas, claves, etiqueta):
+    """Formatea una clave entera por fecha usando solo sus valores únicos."""
+    codigos, unicos = pd.factorize(claves)
+    etiquetas = np.array([etiqueta(int(k)) for k in unicos], dtype=object)
+    resultado = np.full(len(claves), np.nan, dtype=object)
+    validos = (codigos != -1) & fechas.notna().to_numpy()
+    resultado[validos] = etiquetas[codigos[validos]]
+    return pd.Series(resultado, index=fechas.index)
+
+
+def week_labels(fechas):
+    """Equivalente vectorizado de ``fechas.dt.strftime('%Y-%U')``."""
+    dt = fechas.dt
+    # %U: semanas que comienzan en domingo; los días previos al primer domingo son la semana 0
+    dia_domingo = (dt.dayofweek.to_numpy(dtype=float) + 1) % 7
+    semana = (dt.dayofyear.to_numpy(dtype=float) - 1 + 7 - dia_domingo) // 7
+    claves = np.where(np.isnan(semana), np.nan, dt.year.to_numpy(dtype=float) * 100 + semana)
+    return _format_periods(fechas, claves, lambda k: f"{k // 100:04d}-{k % 100:02d}")
+
+
+def month_labels(fechas):
+    """Equivalente vectorizado de ``fechas.dt.strftime('%Y-%m')``."""
+    dt = fechas.dt
+    claves = dt.year.to_numpy(dtype=float) * 100 + dt.month.to_numpy(dtype=float)
+    return _format_periods(fechas, claves, lambda k: f"{k // 100:04d}-{k % 100:02d}")
+
+
+# --- HORAS ---
+
+def _segundos_de_valor(valor):
+    """Segundos del día de una celda que ya es hora o fecha-hora, o ``None``."""
+    if isinstance(valor, datetime.time):
+        return valor.hour * 3600 + valor.minute * 60 + valor.second
+    if isinstance(valor, (datetime.datetime, pd.Timestamp)):
+        return valor.hour * 3600 + valor.minute * 60 + valor.second
+    return None
+
+
+def parse_hour_column(series, formatos=FORMATOS_HORA, sample_size=500):
+    """
+    Convierte una columna de horas a segundos del día.
+
+    Acepta celdas de hora de Excel, textos en cualquiera de ``formatos`` (se
+    infieren sobre una muestra) y, como último recurso, textos con un patrón
+    ``H:MM`` o ``H.MM`` en cualquier posición. La conversión se hace sobre los
+    valores únicos.
+
+    Returns:
+        Serie ``Int32`` con los segundos desde la medianoche (``<NA>`` si no
+        se pudo convertir)
+    """
+    codigos, unicos = pd.factorize(series)
+    unicos = pd.Series(unicos, dtype=object)
+    segundos = pd.Series(np.nan, index=unicos.index)
+
+    # Celdas que ya son hora o fecha-hora
+    directos = unicos.map(_segundos_de_valor)
+    es_directo = directos.notna()
+    segundos[es_directo] = directos[es_directo].astype(float)
+
+    textos = unicos[~es_directo].astype(str).str.strip()
+    if len(textos) > 0:
+        for formato in infer_formats(textos, formatos, sample_size):
+            pendientes = segundos[textos.index].isna()
+            if not pendientes.any():
+                break
+            idx = textos.index[pendientes.values]
+            convertidos = pd.to_datetime(textos[idx], format=formato, errors='coerce')
+            segundos[idx] = (convertidos - convertidos.dt.normalize()).dt.total_seconds()
+
+        # Último recurso: extraer hora y minuto con una expresión regular
+        pendientes = segundos[textos.index].isna()
+        if pendientes.any():
+            idx = textos.index[pendientes.values]
+            partes = textos[idx].str.extract(PATRON_HORA).astype(float)
+            validos = partes[0].between(0, 23) & partes[1].between(0, 59)
+            segundos[idx[validos.values]] = (partes[0] * 3600 + partes[1] * 60)[validos]
+
+    valores = segundos.to_numpy().take(codigos)
+    valores[codigos == -1] = np.nan
+    return pd.Series(pd.array(valores, dtype='Int32'), index=series.index, name=series.name)
+
+
+def hours_to_time(segundos):
+    """Convierte segundos del día a objetos ``datetime.time`` para mostrar o exportar."""
+    codigos, unicos = pd.factorize(segundos)
+    horas = np.array([datetime.time(int(s) // 3600, int(s) % 3600 // 60, int(s) % 60) for s in unicos] + [None],
+                     dtype=object)
+    return pd.Series(horas.take(codigos), index=segundos.index, name=segundos.name)
+
+
+def combine_timestamp(fechas, segundos):
+    """
+    Combina ``Fecha`` y ``Hora`` en una marca de tiempo int64 (ns desde 1970).
+
+    La marca sirve también como clave de orden equivalente a ordenar por
+    ``['Fecha', 'Hora']``: las filas sin hora quedan al final de su día y las
+    filas sin fecha al final de todo.
+    """
+    dias = fechas.dt.normalize()
+    fecha_ns = dias.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    hora_ns = segundos.to_numpy(dtype=np.float64, na_value=np.nan)
+    marca = np.where(
+        np.isnan(hora_ns),
+        fecha_ns + (SEGUNDOS_DIA * NS_POR_SEGUNDO - 1),
+        fecha_ns + np.nan_to_num(hora_ns).astype(np.int64) * NS_POR_SEGUNDO
+    )
+    marca[dias.isna().to_numpy()] = np.iinfo(np.int64).max
+    return pd.Series(marca, index=fechas.index)
+
+
+# --- NÚMEROS ---
+
+# Número decimal ya normalizado (separador decimal ".", sin miles)
+PATRON_NUMERO = r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$'
+
+
+def _clean_to_float(textos, miles, decimal):
+    """Quita separadores de miles, normaliza el decimal y convierte a float."""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        textos = textos.astype(str).str.strip().str.replace(' ', '', regex=False)
+        if miles is not None:
+            textos = textos.str.replace(miles, '', regex=False)
+        if decimal != '.':
+            textos = textos.str.replace(decimal, '.', regex=False)
+        return pd.to_numeric(textos, errors='coerce').to_numpy(dtype=float)
+
+    # Kernels de Arrow: cada paso recorre la columna una vez en código nativo
+    arr = pa.array(textos.to_numpy(dtype=object), type=pa.string())
+    arr = pc.replace_substring(pc.utf8_trim_whitespace(arr), ' ', '')
+    if miles is not None:
+        arr = pc.replace_substring(arr, miles, '')
+    if decimal != '.':
+        arr = pc.replace_substring(arr, decimal, '.')
+    try:
+        convertidos = pc.cast(arr, pa.float64())
+    except pa.ArrowInvalid:
+        # Hay textos no numéricos: se anulan antes de convertir
+        validos = pc.match_substring_regex(arr, PATRON_NUMERO)
+        convertidos = pc.cast(pc.if_else(validos, arr, pa.scalar(None, pa.string())), pa.float64())
+    return convertidos.to_numpy(zero_copy_only=False)
+
+
+def detect_separators(values, sample_size=1000):
+    """
+    Detecta los separadores de miles y decimales de una columna numérica en texto.
+
+    Reglas, en orden:
+        - Si hay valores con punto y coma, el último en aparecer es el decimal.
+        - Si algún valor repite el punto (``1.234.567``), el punto es de miles.
+        - Si algún valor repite la coma (``1,234,567``), la coma es de miles.
+        - Si solo aparece la coma, es el separador decimal (formato chileno).
+
+    Returns:
+        Tupla ``(miles, decimal)``; ``miles`` es ``None`` si no se detectó
+    """
+    muestra = pd.Series(values, dtype=object).dropna()
+    if len(muestra) > sample_size:
+        muestra = muestra.sample(sample_size, random_state=0)
+    muestra = muestra[muestra.map(lambda x: isinstance(x, str))].astype(str).str.strip()
+
+    puntos = muestra.str.count(r'\.')
+    comas = muestra.str.count(',')
+
+    ambos = muestra[(puntos > 0) & (comas > 0)]
+    if len(ambos) > 0:
+        coma_al_final = (ambos.str.rfind(',') > ambos.str.rfind('.')).mean() >= 0.5
+        return ('.', ',') if coma_al_final else (',', '.')
+    if (puntos > 1).any():
+        return '.', ','
+    if (comas > 1).any():
+        return ',', '.'
+    if (comas > 0).any():
+        return None, ','
+    return None, '.'
+
+
+def parse_numeric_column(series, sample_size=1000):
+    """
+    Convierte una columna con números en formato local en una sola pasada.
+
+    Los valores que ya son numéricos se conservan; los textos se limpian con
+    los separadores detectados por ``detect_separators`` y se convierten con
+    ``pd.to_numeric``. Los textos no numéricos quedan como ``NaN``.
+
+    Returns:
+        Serie float64 con el mismo índice que ``series``
+    """
+    if pd.api.types.infer_dtype(series, skipna=True) == 'string':
+        es_texto = series.notna().to_numpy()
+    else:
+        valores = series.to_numpy(dtype=object)
+        es_texto = np.fromiter((isinstance(x, str) for x in valores), dtype=bool, count=len(valores))
+    resultado = np.full(len(series), np.nan)
+
+    if not es_texto.all():
+        resultado[~es_texto] = pd.to_numeric(series[~es_texto], errors='coerce').astype(float)
+
+    if es_texto.any():
+        textos = series[es_texto]
+        miles, decimal = detect_separators(textos, sample_size)
+        resultado[es_texto] = _clean_to_float(textos, miles, decimal)
+
+    return pd.Series(resultado, index=series.index, name=series.name)
@@ -0,0 +1,128 @@
+"""
+Perfil de tiempo y memoria por etapa del pipeline.
+
+Cada etapa registra su duración, los registros de entrada y salida y el pico
+de memoria residente (RSS) del proceso al terminar. Con ``trace_memory`` se
+usa además ``tracemalloc`` para medir cuánta memoria asignó la etapa y su
+pico propio; es opcional porque ralentiza el procesamiento varias veces.
+El reporte puede agregarse como una línea JSON a un archivo de log para
+comparar ejecuciones a medida que crecen los archivos.
+"""
+import datetime
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Variable de entorno con el archivo JSONL donde se agregan los perfiles
+PROFILE_LOG_ENV = 'COMBUSTIBLE_PROFILE_LOG'
+PROFILE_LOG_DEFAULT = os.path.join(os.path.expanduser('~'), '.cache', 'combustible', 'profile.jsonl')
+
+MB = 1024 * 1024
+
+
+def peak_rss_mb():
+    """Pico de memoria residente del proceso en MB, o ``None`` si no está disponible."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KB; macOS informa bytes
+    return pico / MB if sys.platform == 'darwin' else pico / 1024
+
+
+@dataclass
+class StageProfile:
+    """Medición de una etapa."""
+    name: str
+    seconds: float = 0.0
+    rows_in: int = None
+    rows_out: int = None
+    peak_rss_mb: float = None
+    alloc_mb: float = None
+    alloc_peak_mb: float = None
+
+
+@dataclass
+class ProfileReport:
+    """Mediciones de todas las etapas de un procesamiento."""
+    trace_memory: bool = False
+    stages: list = field(default_factory=list)
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        """
+        Mide el bloque como una etapa; asignar ``rows_out`` al objeto entregado.
+
+        Ejemplo::
+
+            with report.stage('fechas', rows_in=len(df)) as etapa:
+                df = parse_dates(df, diag)
+                etapa.rows_out = len(df)
+        """
+        etapa = StageProfile(name=name, rows_in=rows_in)
+        trazando = self.trace_memory and tracemalloc.is_tracing()
+        if trazando:
+            tracemalloc.reset_peak()
+            inicial = tracemalloc.get_traced_memory()[0]
+        inicio = time.perf_counter()
+        try:
+            yield etapa
+        finally:
+            etapa.seconds = time.perf_counter() - inicio
+            etapa.peak_rss_mb = peak_rss_mb()
+            if trazando:
+                actual, pico = tracemalloc.get_traced_memory()
+                etapa.alloc_mb = (actual - inicial) / MB
+                etapa.alloc_peak_mb = (pico - inicial) / MB
+            self.stages.append(etapa)
+
+    @contextmanager
+    def tracing(self):
+        """Activa ``tracemalloc`` durante el bloque si ``trace_memory`` está habilitado."""
+        iniciado = self.trace_memory and not tracemalloc.is_tracing()
+        if iniciado:
+            tracemalloc.start()
+        try:
+            yield self
+        finally:
+            if iniciado:
+                tracemalloc.stop()
+
+    @property
+    def total_seconds(self):
+        return sum(etapa.seconds for etapa in self.stages)
+
+    def to_dict(self):
+        return {
+            'total_seconds': self.total_seconds,
+            'trace_memory': self.trace_memory,
+            'stages': [asdict(etapa) for etapa in self.stages],
+        }
+
+    def to_frame(self):
+        """Tabla con una fila por etapa y el porcentaje del tiempo total."""
+        tabla = pd.DataFrame([asdict(etapa) for etapa in self.stages])
+        if not tabla.empty:
+            total = self.total_seconds
+            tabla['pct_tiempo'] = tabla['seconds'] / total * 100 if total > 0 else 0.0
+        return tabla
+
+    def append_jsonl(self, path, **extra):
+        """Agrega el reporte como una línea JSON (con ``extra`` y la fecha) al archivo."""
+        registro = {'timestamp': datetime.datetime.now().isoformat(timespec='seconds'), **extra, **self.to_dict()}
+        directorio = os.path.dirname(path)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(registro, ensure_ascii=False, default=str) + '\n')
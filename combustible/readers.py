@@ -0,0 +1,513 @@
+"""
+Lectura rápida de archivos CSV y Excel.
+
+CSV: la codificación, el separador y el encabezado se detectan una sola vez
+sobre una muestra de bytes del inicio del archivo; luego el archivo se lee en
+una sola pasada con el lector multihilo de Arrow y tipos explícitos para las
+columnas conocidas. Si ``pyarrow`` no está instalado (o el archivo tiene algo
+que Arrow no acepta) se usa ``pd.read_csv`` con los mismos parámetros.
+``iter_csv`` entrega el mismo archivo por bloques para el modo por bloques.
+
+Excel (``.xlsx``): la hoja se recorre en streaming con openpyxl en modo de
+solo lectura, se detecta la fila del encabezado y solo se guardan las
+columnas que usa el pipeline.
+"""
+import codecs
+import csv
+import itertools
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+
+# Bytes del inicio del archivo usados para detectar el formato
+SAMPLE_BYTES = 256 * 1024
+
+# Separadores candidatos, en orden de preferencia ante un empate
+SEPARADORES = [';', ',', '\t', '|']
+
+# Codificación usada cuando la muestra no es UTF-8 válido (acepta cualquier byte)
+CODIFICACION_RESPALDO = 'latin1'
+
+# Líneas de datos de la muestra usadas para elegir el separador
+LINEAS_MUESTRA = 200
+
+# Tamaño de bloque del lector de Arrow (cada bloque se procesa en un hilo)
+BLOQUE_ARROW = 8 * 1024 * 1024
+
+
+@dataclass
+class CsvDialect:
+    """Formato detectado de un CSV."""
+    encoding: str
+    delimiter: str
+    header_line: int  # Línea física del encabezado (0 = primera)
+    columns: list = field(default_factory=list)
+    sample_rows: list = field(default_factory=list)
+
+
+def read_sample(source, size=SAMPLE_BYTES):
+    """Primeros ``size`` bytes de una ruta o archivo file-like (que queda al inicio)."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return f.read(size)
+    source.seek(0)
+    muestra = source.read(size)
+    source.seek(0)
+    return muestra
+
+
+def detect_encoding(sample):
+    """``utf-8-sig`` si hay BOM, ``utf-8`` si la muestra es válida y si no ``latin1``."""
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        # Decodificador incremental: un carácter cortado al final de la muestra no es error
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return CODIFICACION_RESPALDO
+
+
+def _lineas(texto, completo):
+    lineas = texto.splitlines()
+    # La última línea de una muestra parcial puede estar cortada
+    return lineas if completo else lineas[:-1]
+
+
+def _nombres_columnas(encabezado):
+    # Igual que pandas: vacíos como "Unnamed: i" y duplicados como "X.1", "X.2"
+    nombres, vistos = [], {}
+    for i, nombre in enumerate(encabezado):
+        nombre = nombre if nombre != '' else f"Unnamed: {i}"
+        if nombre in vistos:
+            vistos[nombre] += 1
+            nombre = f"{nombre}.{vistos[nombre]}"
+        else:
+            vistos[nombre] = 0
+        nombres.append(nombre)
+    return nombres
+
+
+def sniff_csv(sample, header_row=2, complete=False):
+    """
+    Detecta codificación, separador y encabezado de un CSV a partir de una muestra.
+
+    Args:
+        sample: Bytes del inicio del archivo
+        header_row: Fila del encabezado sin contar líneas vacías (como ``header``
+            de ``pd.read_csv``)
+        complete: ``True`` si la muestra es el archivo completo
+
+    Returns:
+        CsvDialect, o ``None`` si ningún separador produce más de una columna
+    """
+    encoding = detect_encoding(sample)
+    texto = codecs.getincrementaldecoder(encoding)(errors='replace').decode(sample, final=complete)
+    lineas = _lineas(texto, complete)
+
+    # Línea física del encabezado: pd.read_csv omite las líneas vacías al contar
+    no_vacias = [i for i, linea in enumerate(lineas) if linea.strip()]
+    if len(no_vacias) <= header_row:
+        return None
+    header_line = no_vacias[header_row]
+    datos = [lineas[i] for i in no_vacias[header_row:header_row + LINEAS_MUESTRA + 1]]
+
+    # El mejor separador da más de una columna y el mismo número de campos en todas las filas
+    mejor, mejor_puntaje = None, None
+    for sep in SEPARADORES:
+        filas = list(csv.reader(datos, delimiter=sep))
+        n_campos = len(filas[0])
+        if n_campos < 2:
+            continue
+        consistencia = sum(len(fila) == n_campos for fila in filas[1:]) / max(len(filas) - 1, 1)
+        puntaje = (consistencia, n_campos)
+        if mejor_puntaje is None or puntaje > mejor_puntaje:
+            mejor, mejor_puntaje = (sep, filas), puntaje
+    if mejor is None:
+        return None
+
+    sep, filas = mejor
+    return CsvDialect(
+        encoding=encoding, delimiter=sep, header_line=header_line,
+        columns=_nombres_columnas(filas[0]), sample_rows=filas[1:]
+    )
+
+
+def _es_numero_simple(valores):
+    # Números con punto decimal y sin miles: Arrow los convierte directamente
+    valores = pd.Series([v.strip() for v in valores if v.strip() != ''], dtype=object)
+    return len(valores) > 0 and pd.to_numeric(valores, errors='coerce').notna().all()
+
+
+def column_types(dialect, text_columns=(), numeric_columns=()):
+    """
+    Tipos explícitos para las columnas conocidas: ``'string'`` o ``'float64'``.
+
+    Las columnas numéricas se leen como número solo si en la muestra todos los
+    valores son números simples; con formato local (``1.234,56``) se leen como
+    texto y las convierte ``clean_numeric_columns``.
+    """
+    tipos = {}
+    for i, columna in enumerate(dialect.columns):
+        nombre = columna.strip()
+        if nombre in text_columns:
+            tipos[columna] = 'string'
+        elif nombre in numeric_columns:
+            valores = [fila[i] for fila in dialect.sample_rows if i < len(fila)]
+            tipos[columna] = 'float64' if _es_numero_simple(valores) else 'string'
+    return tipos
+
+
+def _read_arrow(source, dialect, tipos):
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    descartadas = []
+
+    def _descartar(fila):
+        descartadas.append(fila.number)
+        return 'skip'
+
+    tipos_arrow = {col: pa.string() if tipo == 'string' else pa.float64() for col, tipo in tipos.items()}
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    tabla = pacsv.read_csv(
+        source,
+        read_options=pacsv.ReadOptions(
+            encoding=dialect.encoding, skip_rows=dialect.header_line + 1,
+            column_names=dialect.columns, block_size=BLOQUE_ARROW, use_threads=True
+        ),
+        parse_options=pacsv.ParseOptions(delimiter=dialect.delimiter, invalid_row_handler=_descartar),
+        convert_options=pacsv.ConvertOptions(column_types=tipos_arrow, strings_can_be_null=True),
+    )
+    return tabla.to_pandas(), len(descartadas)
+
+
+def _read_pandas(source, dialect, tipos):
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    dtype = {col: (object if tipo == 'string' else tipo) for col, tipo in tipos.items()}
+    df = pd.read_csv(
+        source, encoding=dialect.encoding, sep=dialect.delimiter,
+        skiprows=dialect.header_line + 1, header=None, names=dialect.columns,
+        dtype=dtype, skip_blank_lines=True, on_bad_lines='skip'
+    )
+    return df, 0
+
+
+def read_csv(source, dialect, text_columns=(), numeric_columns=()):
+    """
+    Lee el CSV completo en una pasada con el formato detectado.
+
+    Returns:
+        Tupla ``(df, motor, descartadas)`` con el motor usado (``'pyarrow'`` o
+        ``'pandas'``) y la cantidad de filas con un número de campos distinto
+        al del encabezado, que se omiten.
+    """
+    tipos = column_types(dialect, text_columns, numeric_columns)
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        df, descartadas = _read_pandas(source, dialect, tipos)
+        return df, 'pandas', descartadas
+
+    # Si un valor no se puede convertir al tipo declarado, las columnas
+    # conocidas se leen como texto; si Arrow igual falla, se usa pandas
+    for intento in (tipos, {col: 'string' for col in tipos}):
+        try:
+            df, descartadas = _read_arrow(source, dialect, intento)
+            return df, 'pyarrow', descartadas
+        except Exception:
+            continue
+    df, descartadas = _read_pandas(source, dialect, {col: 'string' for col in tipos})
+    return df, 'pandas', descartadas
+
+
+def _iter_arrow(source, dialect, tipos, chunk_rows, saltar, resumen):
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    def _descartar(fila):
+        resumen['descartadas'] += 1
+        return 'skip'
+
+    tipos_arrow = {col: pa.string() if tipo == 'string' else pa.float64() for col, tipo in tipos.items()}
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    lector = pacsv.open_csv(
+        source,
+        read_options=pacsv.ReadOptions(
+            encoding=dialect.encoding, skip_rows=dialect.header_line + 1,
+            column_names=dialect.columns, block_size=BLOQUE_ARROW
+        ),
+        parse_options=pacsv.ParseOptions(delimiter=dialect.delimiter, invalid_row_handler=_descartar),
+        convert_options=pacsv.ConvertOptions(column_types=tipos_arrow, strings_can_be_null=True),
+    )
+    lotes, filas = [], 0
+    for lote in lector:
+        if saltar >= lote.num_rows:
+            saltar -= lote.num_rows
+            continue
+        lotes.append(lote.slice(saltar))
+        filas += lotes[-1].num_rows
+        saltar = 0
+        if filas >= chunk_rows:
+            yield pa.Table.from_batches(lotes).to_pandas()
+            lotes, filas = [], 0
+    if lotes:
+        yield pa.Table.from_batches(lotes).to_pandas()
+
+
+def _iter_pandas(source, dialect, tipos, chunk_rows, saltar):
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    dtype = {col: (object if tipo == 'string' else tipo) for col, tipo in tipos.items()}
+    bloques = pd.read_csv(
+        source, encoding=dialect.encoding, sep=dialect.delimiter,
+        skiprows=dialect.header_line + 1, header=None, names=dialect.columns,
+        dtype=dtype, skip_blank_lines=True, on_bad_lines='skip', chunksize=chunk_rows
+    )
+    for df in bloques:
+        if saltar >= len(df):
+            saltar -= len(df)
+            continue
+        yield df.iloc[saltar:]
+        saltar = 0
+
+
+def iter_csv(source, dialect, text_columns=(), numeric_columns=(), chunk_rows=250_000, resumen=None):
+    """
+    Lee el CSV por bloques de al menos ``chunk_rows`` filas, sin cargarlo completo.
+
+    A diferencia de ``read_csv``, las columnas que el pipeline no conoce se
+    leen como texto, para que todos los bloques tengan los mismos tipos. Si un
+    bloque no admite los tipos declarados se continúa leyendo todo como texto
+    desde la fila siguiente a la última entregada.
+
+    Args:
+        resumen: dict opcional donde se guardan ``motor`` y ``descartadas``
+
+    Yields:
+        DataFrames con las columnas de ``dialect.columns``
+    """
+    resumen = resumen if resumen is not None else {}
+    resumen.update(motor='pyarrow', descartadas=0)
+    tipos = column_types(dialect, text_columns, numeric_columns)
+    tipos = {col: tipos.get(col, 'string') for col in dialect.columns}
+    texto = {col: 'string' for col in dialect.columns}
+    entregadas = 0
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        resumen['motor'] = 'pandas'
+        yield from _iter_pandas(source, dialect, tipos, chunk_rows, 0)
+        return
+
+    for intento in (tipos, texto):
+        # Cada intento recorre el archivo desde el inicio
+        resumen['descartadas'] = 0
+        try:
+            for df in _iter_arrow(source, dialect, intento, chunk_rows, entregadas, resumen):
+                entregadas += len(df)
+                yield df
+            return
+        except Exception:
+            continue
+    resumen['motor'] = 'pandas'
+    yield from _iter_pandas(source, dialect, texto, chunk_rows, entregadas)
+
+
+# --- EXCEL ---
+
+# Filas del inicio de la hoja donde se busca el encabezado
+FILAS_BUSQUEDA_ENCABEZADO = 30
+
+# Fila del encabezado si no se reconoce ninguna (formato de los terminales)
+FILA_ENCABEZADO_DEFAULT = 2
+
+# Columnas conocidas que debe tener una fila para considerarla encabezado
+MINIMO_COLUMNAS_ENCABEZADO = 2
+
+
+def _normalizar_encabezado(valor):
+    return str(valor).strip().lower() if valor not in (None, '') else ''
+
+
+def find_header_row(filas, expected, minimo=MINIMO_COLUMNAS_ENCABEZADO):
+    """
+    Índice de la primera fila que contiene al menos ``minimo`` columnas esperadas.
+
+    Una celda coincide si su valor completo es el nombre esperado (sin
+    distinguir mayúsculas ni espacios en los extremos); así una fila de
+    título como "Cargas por Terminal y Fecha" no se toma por el encabezado.
+
+    Returns:
+        Índice dentro de ``filas`` o ``None``
+    """
+    esperadas = [_normalizar_encabezado(col) for col in expected]
+    for i, fila in enumerate(filas):
+        celdas = {_normalizar_encabezado(valor) for valor in fila}
+        coincidencias = sum(esperada in celdas for esperada in esperadas)
+        if coincidencias >= minimo:
+            return i
+    return None
+
+
+def select_columns(encabezado, keep):
+    """
+    Posiciones de las columnas del encabezado que se leen.
+
+    Se conservan las columnas cuyo nombre contiene alguno de ``keep`` y la
+    última columna con nombre del archivo (que puede indicar "Carga Masiva").
+    """
+    conocidas = [_normalizar_encabezado(col) for col in keep]
+    nombres = [_normalizar_encabezado(valor) for valor in encabezado]
+    posiciones = [i for i, nombre in enumerate(nombres) if nombre and any(c in nombre for c in conocidas)]
+    con_nombre = [i for i, nombre in enumerate(nombres) if nombre]
+    if con_nombre and con_nombre[-1] not in posiciones:
+        posiciones.append(con_nombre[-1])
+    return sorted(posiciones)
+
+
+_NS_XLSX = {'m': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+
+def _hojas_libro(archivo):
+    from xml.etree import ElementTree
+
+    libro = ElementTree.fromstring(archivo.read('xl/workbook.xml'))
+    return libro, libro.findall('m:sheets/m:sheet', _NS_XLSX)
+
+
+def xlsx_sheet_names(source):
+    """Nombres de las hojas de un ``.xlsx`` en el orden del libro."""
+    import zipfile
+
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    with zipfile.ZipFile(source) as archivo:
+        _, hojas = _hojas_libro(archivo)
+    return [hoja.get('name') for hoja in hojas]
+
+
+def _valor_celda(valor, textos):
+    # Como el lector openpyxl de pandas: vacías como "", errores como NaN y
+    # números enteros como int
+    if valor is None:
+        return ''
+    if isinstance(valor, float):
+        return int(valor) if valor.is_integer() else valor
+    if isinstance(valor, str):
+        if valor in _ERRORES_EXCEL:
+            return np.nan
+        # Textos repetidos (terminales, nombres, modelos) comparten un solo objeto
+        return textos.setdefault(valor, valor)
+    return valor
+
+
+# Valores de las celdas con error (#N/A, #DIV/0!, ...)
+_ERRORES_EXCEL = frozenset(['#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#N/A'])
+
+
+def _sin_vacias_al_final(fila):
+    fin = len(fila)
+    while fin and fila[fin - 1] == '':
+        fin -= 1
+    return fila[:fin]
+
+
+def _leer_hoja(filas_hoja, expected, keep, require_header=False):
+    """
+    Busca el encabezado en ``filas_hoja`` y devuelve ``(encabezado, posiciones, filas, fila_encabezado)``.
+
+    El encabezado se busca en las primeras ``FILAS_BUSQUEDA_ENCABEZADO``
+    filas; de las filas de datos solo se convierten las columnas
+    seleccionadas. Con ``require_header`` una hoja sin encabezado reconocible
+    se abandona sin recorrer el resto.
+    """
+    textos = {}
+    iniciales = [
+        [_valor_celda(valor, textos) for valor in fila]
+        for fila in itertools.islice(filas_hoja, FILAS_BUSQUEDA_ENCABEZADO)
+    ]
+    indice = find_header_row(iniciales, expected)
+    if indice is None:
+        if require_header or not any(iniciales):
+            return [], [], [], None
+        indice = min(FILA_ENCABEZADO_DEFAULT, len(iniciales) - 1)
+    encabezado = _sin_vacias_al_final(iniciales[indice])
+
+    if keep is not None:
+        posiciones = select_columns(encabezado, keep)
+        filas = [[fila[i] if i < len(fila) else '' for i in posiciones] for fila in iniciales[indice + 1:]]
+        for fila in filas_hoja:
+            filas.append([_valor_celda(fila[i], textos) if i < len(fila) else '' for i in posiciones])
+    else:
+        filas = [_sin_vacias_al_final(fila) for fila in iniciales[indice + 1:]]
+        filas.extend(_sin_vacias_al_final([_valor_celda(valor, textos) for valor in fila]) for fila in filas_hoja)
+        # Sin selección: todas las columnas hasta la última con datos
+        posiciones = list(range(max([len(encabezado)] + [len(fila) for fila in filas])))
+        filas = [fila + [''] * (len(posiciones) - len(fila)) for fila in filas]
+
+    # Las filas vacías al final de la hoja no son registros
+    while filas and all(valor == '' for valor in filas[-1]):
+        filas.pop()
+    return encabezado, posiciones, filas, indice
+
+
+def read_xlsx(source, expected, keep=None, text_columns=(), sheet=0, require_header=False):
+    """
+    Lee una hoja de un ``.xlsx`` en streaming, solo con las columnas usadas.
+
+    La hoja se recorre una vez con openpyxl en modo de solo lectura, sin
+    construir el libro en memoria. El encabezado se busca en las primeras
+    filas (la primera que contiene al menos dos columnas de ``expected``); si
+    no aparece se usa la fila 3 como antes. Los tipos se infieren como en
+    ``pd.read_excel``, salvo las columnas de ``text_columns``, que conservan
+    el texto tal como viene (por ejemplo "0137" en ``Número interno``).
+
+    Args:
+        source: Ruta o archivo tipo file-like
+        expected: Columnas que identifican el encabezado
+        keep: Columnas a leer (por coincidencia parcial del nombre, más la
+            última columna); ``None`` lee todas
+        text_columns: Columnas que no se convierten a número
+        sheet: Posición de la hoja (0 = primera)
+        require_header: Sin encabezado reconocible la hoja se devuelve vacía
+            en lugar de usar la fila 3
+
+    Returns:
+        Tupla ``(df, fila_encabezado, columnas_originales)`` con la fila del
+        encabezado (0 = primera) y todos los nombres de columna del archivo
+    """
+    from openpyxl import load_workbook
+    from pandas.io.parsers import TextParser
+
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    libro = load_workbook(source, read_only=True, data_only=True)
+    try:
+        hoja = libro[libro.sheetnames[sheet]]
+        # Las dimensiones que declara el archivo pueden estar mal (igual que en pd.read_excel)
+        hoja.reset_dimensions()
+        encabezado, posiciones, filas, fila_encabezado = _leer_hoja(
+            hoja.iter_rows(values_only=True), expected, keep, require_header
+        )
+    finally:
+        libro.close()
+    if fila_encabezado is None:
+        return pd.DataFrame(), None, []
+
+    originales = _nombres_columnas([str(valor) if valor != '' else '' for valor in encabezado])
+    nombres = [originales[i] if i < len(originales) else f"Unnamed: {i}" for i in posiciones]
+
+    if not filas:
+        return pd.DataFrame(columns=nombres), fila_encabezado, originales
+
+    texto = {col: object for col in nombres if col.strip() in text_columns}
+    filas.insert(0, nombres)
+    df = TextParser(filas, header=0, dtype=texto or None).read()
+    return df, fila_encabezado, originales
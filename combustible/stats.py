@@ -0,0 +1,158 @@
+"""
+Estadísticas acumuladas por grupo (conteo, media y M2).
+
+Permiten combinar la media y la desviación estándar de un histórico con las
+de datos nuevos sin recorrer de nuevo el histórico, usando la fórmula de
+Chan et al. para combinar varianzas calculadas por partes. ``QuantileSketch``
+hace lo mismo con los cuantiles de una columna leída por bloques.
+"""
+import numpy as np
+import pandas as pd
+
+
+def group_moments(df, columna, por):
+    """
+    Conteo, media y M2 (suma de cuadrados de desviaciones) de ``columna`` por grupo.
+
+    Los valores NaN no cuentan, igual que en ``groupby().agg(['count', 'mean', 'std'])``.
+    """
+    stats = df.groupby(por, observed=True)[columna].agg(['count', 'mean', 'var'])
+    stats['m2'] = stats['var'].fillna(0.0) * (stats['count'] - 1).clip(lower=0)
+    stats['mean'] = stats['mean'].fillna(0.0)
+    stats.index = stats.index.astype(object)
+    return stats[['count', 'mean', 'm2']]
+
+
+def merge_moments(a, b):
+    """Combina dos tablas de ``group_moments`` como si se hubieran calculado juntas."""
+    a, b = a.align(b, fill_value=0)
+    n = a['count'] + b['count']
+    delta = b['mean'] - a['mean']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        peso = np.where(n > 0, b['count'] / n, 0.0)
+        mean = a['mean'] + delta * peso
+        m2 = a['m2'] + b['m2'] + delta ** 2 * a['count'] * peso
+    return pd.DataFrame({'count': n.astype('int64'), 'mean': mean, 'm2': m2}, index=a.index)
+
+
+def moments_to_stats(moments):
+    """Media y desviación estándar muestral (ddof=1) por grupo; NaN con menos de 2 valores."""
+    count = moments['count']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.sqrt(moments['m2'] / (count - 1))
+    return pd.DataFrame({
+        'mean': moments['mean'].where(count > 0),
+        'std': std.where(count > 1),
+        'count': count,
+    }, index=moments.index)
+
+
+class QuantileSketch:
+    """
+    Cuantiles de una columna recorrida por bloques, con memoria acotada.
+
+    Mientras la columna tenga pocos valores distintos (litros con dos
+    decimales, por ejemplo) se guardan los conteos exactos y los cuantiles
+    coinciden con ``Series.quantile`` (interpolación lineal). Al superar
+    ``max_exact`` valores distintos los conteos se agrupan en cubetas
+    logarítmicas (como DDSketch): cada cuantil queda con un error relativo
+    menor a ``relative_accuracy``. También guarda la suma por valor o cubeta
+    para obtener medias dentro de un rango.
+    """
+
+    def __init__(self, relative_accuracy=0.001, max_exact=100_000):
+        self.relative_accuracy = relative_accuracy
+        self.max_exact = max_exact
+        self._log_gamma = np.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self.exact = True
+        # Índice: valor (modo exacto) o cubeta con signo (modo aproximado)
+        self.counts = pd.Series(dtype='float64')
+        self.sums = pd.Series(dtype='float64')
+
+    def __len__(self):
+        return int(self.counts.sum())
+
+    def _cubetas(self, valores):
+        # Cubeta con signo: ±(ceil(log_gamma |v|) + 2³¹), siempre distinta de 0; 0 para el cero
+        magnitud = np.abs(valores)
+        with np.errstate(divide='ignore'):
+            k = np.ceil(np.log(magnitud) / self._log_gamma)
+        k = np.where(magnitud > 0, k + 2 ** 31, 0).astype(np.int64)
+        return np.sign(valores).astype(np.int64) * k
+
+    def _representante(self, cubetas):
+        # Punto medio (relativo) de cada cubeta
+        cubetas = np.asarray(cubetas, dtype=np.int64)
+        k = np.abs(cubetas) - 2 ** 31
+        gamma = np.exp(self._log_gamma)
+        valor = 2 * np.exp(k * self._log_gamma) / (gamma + 1)
+        return np.where(cubetas == 0, 0.0, np.sign(cubetas) * valor)
+
+    def _colapsar(self):
+        cubetas = self._cubetas(self.counts.index.to_numpy(dtype='float64'))
+        self.counts = self.counts.groupby(cubetas).sum()
+        self.sums = self.sums.groupby(cubetas).sum()
+        self.exact = False
+
+    def _sumar(self, counts, sums):
+        self.counts = self.counts.add(counts, fill_value=0)
+        self.sums = self.sums.add(sums, fill_value=0)
+        if self.exact and len(self.counts) > self.max_exact:
+            self._colapsar()
+
+    def update(self, valores):
+        """Agrega los valores de un bloque (los NaN se ignoran)."""
+        valores = np.asarray(valores, dtype='float64')
+        valores = valores[~np.isnan(valores)]
+        if not len(valores):
+            return self
+        claves = valores if self.exact else self._cubetas(valores)
+        serie = pd.Series(valores)
+        agrupados = serie.groupby(claves)
+        self._sumar(agrupados.size().astype('float64'), agrupados.sum())
+        return self
+
+    def merge(self, other):
+        """Combina otro sketch, como si sus valores se hubieran agregado aquí."""
+        counts, sums = other.counts, other.sums
+        if self.exact and not other.exact:
+            self._colapsar()
+        if not self.exact and other.exact:
+            cubetas = self._cubetas(counts.index.to_numpy(dtype='float64'))
+            counts, sums = counts.groupby(cubetas).sum(), sums.groupby(cubetas).sum()
+        self._sumar(counts, sums)
+        return self
+
+    def _ordenados(self):
+        # (valores, conteos) ordenados por valor
+        if self.exact:
+            valores = self.counts.index.to_numpy(dtype='float64')
+        else:
+            valores = self._representante(self.counts.index)
+        orden = np.argsort(valores, kind='stable')
+        return valores[orden], self.counts.to_numpy()[orden]
+
+    def quantile(self, q):
+        """Cuantil ``q`` (0 a 1); NaN si no hay valores."""
+        valores, conteos = self._ordenados()
+        n = conteos.sum()
+        if n == 0:
+            return np.nan
+        acumulado = np.cumsum(conteos)
+        posicion = (n - 1) * q
+        if not self.exact:
+            return float(valores[np.searchsorted(acumulado, np.floor(posicion + 0.5) + 1)])
+        # Interpolación lineal entre los valores de rango floor y ceil (como pandas)
+        bajo = valores[np.searchsorted(acumulado, np.floor(posicion) + 1)]
+        alto = valores[np.searchsorted(acumulado, np.ceil(posicion) + 1)]
+        return float(bajo + (alto - bajo) * (posicion - np.floor(posicion)))
+
+    def _en_rango(self, lower, upper):
+        valores = self.counts.index.to_numpy(dtype='float64') if self.exact else self._representante(self.counts.index)
+        return (valores >= lower) & (valores <= upper)
+
+    def mean_between(self, lower=-np.inf, upper=np.inf):
+        """Media de los valores dentro de ``[lower, upper]``; NaN si no hay ninguno."""
+        dentro = self._en_rango(lower, upper)
+        n = self.counts.to_numpy()[dentro].sum()
+        return float(self.sums.to_numpy()[dentro].sum() / n) if n else np.nan
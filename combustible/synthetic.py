@@ -0,0 +1,308 @@
+"""
+Generador de exportaciones sintéticas de cargas de combustible.
+
+Produce archivos con el mismo formato que los terminales (título en las
+primeras filas y encabezado en la fila 3) para pruebas de rendimiento y
+demostraciones. Los nombres llegan con mayúsculas y espacios inconsistentes,
+como en los archivos reales, y se pueden inyectar "Carga Masiva",
+sobreconsumos y errores de odómetro en proporciones configurables.
+
+Uso:
+    python -m combustible.synthetic salida.xlsx --filas 100000 --buses 500
+"""
+import argparse
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+# Familias de chasis con variantes de escritura y (rendimiento km/l, estanque l)
+CATALOGO_MODELOS = [
+    (['Mercedes Benz O500U', 'MB O500U', ' mercedes-benz  o500'], 2.4, 300),
+    (['Volvo B290R', 'VOLVO 7900', 'volvo b8r '], 2.6, 350),
+    (['Scania K310', 'SCANIA K320UB', 'scania  k250'], 2.5, 320),
+    (['King Long XMQ6127', 'KING LONG'], 2.2, 280),
+    (['Yutong ZK6128', 'YUTONG ZK6128BEVG'], 2.3, 300),
+    (['BYD K9', 'byd k9fe'], 2.8, 250),
+]
+
+TERMINALES = [
+    'El Roble', 'Lo Espejo', 'La Florida', 'Maipú', 'Peñalolén',
+    'Quilicura', 'Pudahuel', 'Puente Alto', 'Recoleta', 'La Reina'
+]
+
+NOMBRES = ['Juan', 'Pedro', 'Luis', 'Carlos', 'José', 'Miguel', 'Jorge', 'Ana', 'María', 'Rosa', 'Claudia', 'Patricia']
+APELLIDOS = ['Pérez', 'González', 'Muñoz', 'Rojas', 'Díaz', 'Soto', 'Contreras', 'Silva', 'Martínez', 'Sepúlveda']
+
+COLUMNAS = [
+    'Turno', 'Fecha', 'Hora', 'Terminal', 'Número interno', 'Patente', 'Modelo chasis',
+    'Cantidad litros', 'Odómetro', 'Nombre conductor', 'Nombre Planillero',
+    'Nombre supervisor', 'Tipo', 'Observación'
+]
+
+TITULO = 'Reporte de Cargas de Combustible'
+
+
+@dataclass
+class FleetSpec:
+    """Parámetros de la flota simulada."""
+    rows: int = None  # Por defecto una carga por bus y día
+    buses: int = 200
+    terminals: int = 4
+    models: int = 3
+    drivers: int = 300
+    planilleros: int = 20
+    days: int = 90
+    start: str = '2024-01-01'
+    carga_masiva_rate: float = 0.01
+    sobreconsumo_rate: float = 0.02
+    odometer_glitch_rate: float = 0.005
+    messy_names_rate: float = 0.1
+    seed: int = 0
+
+
+def _nombres(n, rng, prefijo=''):
+    combinaciones = [f"{nombre} {apellido}" for apellido in APELLIDOS for nombre in NOMBRES]
+    rng.shuffle(combinaciones)
+    nombres = [combinaciones[i % len(combinaciones)] for i in range(n)]
+    # Nombres repetidos se distinguen con un número
+    return np.array([
+        f"{prefijo}{nombre}" + (f" {i // len(combinaciones) + 1}" if i >= len(combinaciones) else '')
+        for i, nombre in enumerate(nombres)
+    ], dtype=object)
+
+
+def _ensuciar(valores, rng, rate):
+    # Variantes de mayúsculas y espacios que deben unificar las normalizaciones
+    valores = valores.astype(object).copy()
+    if rate <= 0:
+        return valores
+    sucios = np.flatnonzero(rng.random(len(valores)) < rate)
+    variantes = rng.integers(0, 3, len(sucios))
+    for i, variante in zip(sucios, variantes):
+        texto = valores[i]
+        if variante == 0:
+            valores[i] = texto.lower()
+        elif variante == 1:
+            valores[i] = texto.upper().replace(' ', '  ')
+        else:
+            valores[i] = f" {texto} "
+    return valores
+
+
+def _horas_del_dia(n, rng):
+    # Picos de carga al inicio de cada turno
+    centros = rng.choice([6.0, 14.0, 22.0, 12.0], size=n, p=[0.35, 0.3, 0.2, 0.15])
+    horas = (centros + rng.normal(0, 1.5, n)) % 24
+    return (horas * 3600).astype(np.int64)
+
+
+def generate_fleet_data(spec=None, **kwargs):
+    """
+    Genera un DataFrame de cargas con las columnas de una exportación real.
+
+    Args:
+        spec: FleetSpec (opcional); los ``kwargs`` sobrescriben sus campos
+
+    Returns:
+        DataFrame ordenado por fecha y hora con ``Fecha`` como datetime,
+        ``Hora`` como texto ``HH:MM:SS`` y ``Cantidad litros`` como número.
+    """
+    spec = spec or FleetSpec()
+    for clave, valor in kwargs.items():
+        setattr(spec, clave, valor)
+    rng = np.random.default_rng(spec.seed)
+
+    n = spec.rows or spec.buses * spec.days
+    n_modelos = max(1, min(spec.models, len(CATALOGO_MODELOS)))
+    terminales = np.array(
+        TERMINALES[:spec.terminals] + [f"Terminal {i + 1}" for i in range(len(TERMINALES), spec.terminals)],
+        dtype=object
+    )
+
+    # Atributos fijos de cada bus
+    ids_bus = np.array([f"{i + 1:04d}" for i in range(spec.buses)], dtype=object)
+    letras = rng.integers(0, 26, size=(spec.buses, 4)) + ord('A')
+    patentes = np.array([
+        ''.join(map(chr, fila)) + f"{num:02d}" for fila, num in zip(letras, rng.integers(10, 100, spec.buses))
+    ], dtype=object)
+    familia_bus = np.arange(spec.buses) % n_modelos
+    variante_bus = np.array([
+        CATALOGO_MODELOS[f][0][rng.integers(0, len(CATALOGO_MODELOS[f][0]))] for f in familia_bus
+    ], dtype=object)
+    rendimiento_bus = np.array([CATALOGO_MODELOS[f][1] for f in familia_bus]) * rng.normal(1, 0.05, spec.buses)
+    estanque_bus = np.array([CATALOGO_MODELOS[f][2] for f in familia_bus], dtype=float)
+    terminal_bus = np.arange(spec.buses) % len(terminales)
+
+    conductores = _nombres(spec.drivers, rng)
+    planilleros = _nombres(spec.planilleros, rng)
+    supervisores = np.array([f"Supervisor {t}" for t in terminales], dtype=object)
+
+    # Registros: bus, día y hora
+    bus = rng.integers(0, spec.buses, n)
+    dia = rng.integers(0, spec.days, n)
+    segundos = _horas_del_dia(n, rng)
+    marca = dia.astype(np.int64) * 86400 + segundos
+
+    # Odómetro acumulado por bus en orden cronológico
+    orden = np.lexsort((marca, bus))
+    km = rng.normal(230, 50, n).clip(20, None)
+    km_orden = km[orden]
+    bus_orden = bus[orden]
+    acumulado = np.cumsum(km_orden)
+    inicio_bus = np.r_[0, np.flatnonzero(np.diff(bus_orden)) + 1]
+    base = np.repeat(acumulado[inicio_bus] - km_orden[inicio_bus], np.diff(np.r_[inicio_bus, n]))
+    odometro = np.empty(n)
+    odometro[orden] = acumulado - base + 50_000 + bus_orden * 1_000
+
+    # Litros según kilómetros y rendimiento del bus, limitados por el estanque
+    litros = km / rendimiento_bus[bus] * rng.normal(1, 0.08, n)
+    litros = np.minimum(litros, estanque_bus[bus])
+
+    tipo = np.full(n, 'Normal', dtype=object)
+    observacion = np.full(n, '', dtype=object)
+
+    # Inyecciones de anomalías
+    # Sobreconsumo: bastante sobre lo esperado, pero dentro del estanque
+    sobreconsumo = rng.random(n) < spec.sobreconsumo_rate
+    litros[sobreconsumo] = np.minimum(litros[sobreconsumo] * rng.uniform(1.8, 2.2, sobreconsumo.sum()),
+                                      estanque_bus[bus[sobreconsumo]])
+
+    masiva = rng.random(n) < spec.carga_masiva_rate
+    litros[masiva] = estanque_bus[bus[masiva]] * rng.uniform(0.8, 1.0, masiva.sum())
+    tipo[masiva] = 'Carga Masiva'
+    observacion[masiva] = 'Carga Masiva'
+
+    error_odometro = rng.random(n) < spec.odometer_glitch_rate
+    saltos = rng.choice([-1, 1], error_odometro.sum()) * rng.uniform(2_000, 9_000, error_odometro.sum())
+    odometro[error_odometro] += saltos
+
+    # Turno según la hora de carga
+    hora_entera = segundos // 3600
+    turno = np.where((hora_entera >= 6) & (hora_entera < 14), 'Mañana',
+                     np.where((hora_entera >= 14) & (hora_entera < 22), 'Tarde', 'Noche')).astype(object)
+
+    fechas = pd.Timestamp(spec.start) + pd.to_timedelta(dia, unit='D')
+    hh, resto = np.divmod(segundos, 3600)
+    mm, ss = np.divmod(resto, 60)
+    horas = (pd.Series(hh).astype(str).str.zfill(2) + ':' + pd.Series(mm).astype(str).str.zfill(2)
+             + ':' + pd.Series(ss).astype(str).str.zfill(2))
+
+    terminal = terminales[terminal_bus[bus]]
+    df = pd.DataFrame({
+        'Turno': turno,
+        'Fecha': fechas,
+        'Hora': horas.to_numpy(dtype=object),
+        'Terminal': _ensuciar(terminal, rng, spec.messy_names_rate),
+        'Número interno': ids_bus[bus],
+        'Patente': patentes[bus],
+        'Modelo chasis': variante_bus[bus],
+        'Cantidad litros': litros.round(2),
+        'Odómetro': odometro.round(0),
+        'Nombre conductor': _ensuciar(conductores[rng.integers(0, spec.drivers, n)], rng, spec.messy_names_rate),
+        'Nombre Planillero': _ensuciar(planilleros[rng.integers(0, spec.planilleros, n)], rng, spec.messy_names_rate),
+        'Nombre supervisor': supervisores[terminal_bus[bus]],
+        'Tipo': tipo,
+        'Observación': observacion,
+    }, columns=COLUMNAS)
+
+    # Las exportaciones vienen en orden cronológico
+    return df.iloc[np.argsort(marca, kind='stable')].reset_index(drop=True)
+
+
+def _formato_local(valores):
+    # 1234.5 -> "1.234,50"
+    texto = pd.Series(valores).map('{:,.2f}'.format)
+    return texto.str.replace(',', '_', regex=False).str.replace('.', ',', regex=False).str.replace('_', '.', regex=False)
+
+
+def write_export(df, path, fmt=None, title=TITULO, decimal='.'):
+    """
+    Escribe ``df`` como una exportación de terminal con el encabezado en la fila 3.
+
+    Args:
+        df: DataFrame de ``generate_fleet_data``
+        path: Archivo de salida
+        fmt: ``'xlsx'``, ``'xls'`` o ``'csv'``; por defecto según la extensión
+        title: Texto de la primera fila
+        decimal: Separador decimal del CSV; con ``','`` los litros se escriben
+            con formato local (``1.234,56``)
+
+    El CSV usa ``;`` como separador y fechas ``dd/mm/aaaa``; el ``.xls``
+    requiere la dependencia opcional ``xlwt``.
+    """
+    fmt = (fmt or os.path.splitext(path)[1].lstrip('.')).lower()
+
+    if fmt == 'csv':
+        salida = df.assign(Fecha=df['Fecha'].dt.strftime('%d/%m/%Y'))
+        if decimal == ',':
+            salida['Cantidad litros'] = _formato_local(df['Cantidad litros'].to_numpy())
+        # read_csv omite las líneas vacías: la segunda fila lleva el período
+        periodo = f"Período: {salida['Fecha'].iloc[0]} - {salida['Fecha'].iloc[-1]}" if len(salida) else 'Período:'
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(f"{title}\n{periodo}\n")
+            salida.to_csv(f, index=False, sep=';')
+
+    elif fmt == 'xlsx':
+        with pd.ExcelWriter(path, engine='openpyxl') as writer:
+            df.to_excel(writer, index=False, startrow=2, sheet_name='Cargas')
+            writer.sheets['Cargas']['A1'] = title
+
+    elif fmt == 'xls':
+        try:
+            import xlwt
+        except ImportError:
+            raise ImportError("Falta la dependencia 'xlwt' para escribir archivos .xls. Instálala con: pip install xlwt")
+        libro = xlwt.Workbook()
+        hoja = libro.add_sheet('Cargas')
+        formato_fecha = xlwt.easyxf(num_format_str='DD/MM/YYYY')
+        hoja.write(0, 0, title)
+        for j, columna in enumerate(df.columns):
+            hoja.write(2, j, columna)
+        for i, fila in enumerate(df.itertuples(index=False), start=3):
+            for j, valor in enumerate(fila):
+                if isinstance(valor, pd.Timestamp):
+                    hoja.write(i, j, valor.to_pydatetime(), formato_fecha)
+                else:
+                    hoja.write(i, j, valor)
+        libro.save(path)
+
+    else:
+        raise ValueError(f"Formato no soportado: {fmt}")
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera una exportación sintética de cargas de combustible.")
+    parser.add_argument('salida', help="Archivo .xlsx, .xls o .csv")
+    defaults = FleetSpec()
+    parser.add_argument('--filas', type=int, default=None, help="Cantidad de registros (por defecto buses × días)")
+    parser.add_argument('--buses', type=int, default=defaults.buses)
+    parser.add_argument('--terminales', type=int, default=defaults.terminals)
+    parser.add_argument('--modelos', type=int, default=defaults.models)
+    parser.add_argument('--conductores', type=int, default=defaults.drivers)
+    parser.add_argument('--planilleros', type=int, default=defaults.planilleros)
+    parser.add_argument('--dias', type=int, default=defaults.days)
+    parser.add_argument('--carga-masiva', type=float, default=defaults.carga_masiva_rate, help="Proporción de cargas masivas")
+    parser.add_argument('--sobreconsumo', type=float, default=defaults.sobreconsumo_rate, help="Proporción de sobreconsumos")
+    parser.add_argument('--errores-odometro', type=float, default=defaults.odometer_glitch_rate, help="Proporción de errores de odómetro")
+    parser.add_argument('--semilla', type=int, default=defaults.seed)
+    parser.add_argument('--decimal', default='.', choices=['.', ','], help="Separador decimal del CSV")
+    args = parser.parse_args(argv)
+
+    spec = FleetSpec(
+        rows=args.filas, buses=args.buses, terminals=args.terminales, models=args.modelos,
+        drivers=args.conductores, planilleros=args.planilleros, days=args.dias,
+        carga_masiva_rate=args.carga_masiva, sobreconsumo_rate=args.sobreconsumo,
+        odometer_glitch_rate=args.errores_odometro, seed=args.semilla
+    )
+    df = generate_fleet_data(spec)
+    write_export(df, args.salida, decimal=args.decimal)
+    print(f"{args.salida}: {len(df)} registros")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
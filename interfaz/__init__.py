@@ -0,0 +1,13 @@
+"""
+Interfaz Streamlit de Smart Fuel Analytics.
+
+``analisis_combustible.py`` solo arma la barra lateral, carga los datos y
+delega en la sección elegida:
+
+- ``tema``: temas de color y estilos CSS;
+- ``datos``: procesamiento de los archivos y acceso al DataFrame, el cubo y
+  el índice por día de la sesión;
+- ``componentes``, ``graficos``, ``exportacion`` y ``hallazgos``: piezas
+  compartidas por las secciones;
+- ``paginas``: un módulo por sección del menú.
+"""
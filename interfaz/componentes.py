@@ -0,0 +1,200 @@
+"""
+Componentes visuales compartidos por las secciones: tarjetas, alertas,
+indicadores de carga y la pantalla de inicio.
+"""
+import streamlit as st
+import pandas as pd
+
+from combustible.parsing import hours_to_time
+
+from interfaz.tema import get_colors
+
+
+# Función para mostrar mensaje de carga
+def show_loading(message="Procesando datos..."):
+    colors = get_colors()
+    with st.spinner(message):
+        # Placeholder para una barra de progreso o animación personalizada
+        progress_placeholder = st.empty()
+        progress_placeholder.markdown(f"""
+        <div class="loading">
+            <div class="loading-spinner"></div>
+        </div>
+        <p style="text-align: center; color: {colors['subtext']};">{message}</p>
+        """, unsafe_allow_html=True)
+        return progress_placeholder
+
+# Función para mostrar un banner de bienvenida
+def show_welcome_banner():
+    st.markdown(f"""
+    <div class="banner fade-in">
+        <div class="banner-content">
+            <h1 class="banner-title">Smart Fuel Analytics 3.0</h1>
+            <p class="banner-subtitle">Plataforma avanzada para análisis y optimización de consumo de combustible.</p>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+# Función para crear KPI cards
+def create_kpi_card(title, value, delta=None, delta_suffix="%", icon="📊", color_class="primary", footnote=None):
+    delta_html = ""
+    if delta is not None:
+        delta_class = "positive" if delta >= 0 else "negative"
+        delta_icon = "↑" if delta >= 0 else "↓"
+        delta_html = f"""
+        <div class="kpi-card-delta {delta_class}">
+            {delta_icon} {abs(delta):.2f}{delta_suffix}
+        </div>
+        """
+    
+    footnote_html = f"""
+    <div class="kpi-card-footer">
+        {footnote}
+    </div>
+    """ if footnote else ""
+    
+    return f"""
+    <div class="kpi-card">
+        <div class="kpi-card-header">
+            <div class="kpi-card-title">{title}</div>
+            <div class="kpi-card-icon {color_class}">{icon}</div>
+        </div>
+        <div class="kpi-card-value">{value}</div>
+        {delta_html}
+        {footnote_html}
+    </div>
+    """
+
+# Función para mostrar alertas mejoradas
+def show_alert(message, type="info", title=None, icon=None):
+    if not icon:
+        icons = {
+            "info": "ℹ️",
+            "success": "✅",
+            "warning": "⚠️",
+            "danger": "🚨"
+        }
+        icon = icons.get(type, "ℹ️")
+    
+    title_html = f"<h4>{title}</h4>" if title else ""
+    
+    return f"""
+    <div class="alert alert-{type}">
+        <div class="alert-icon">{icon}</div>
+        <div class="alert-content">
+            {title_html}
+            <p>{message}</p>
+        </div>
+    </div>
+    """
+
+# Función para crear mini estadísticas
+def create_mini_stat(icon, value, label):
+    return f"""
+    <div class="mini-stat">
+        <div class="mini-stat-icon">{icon}</div>
+        <div class="mini-stat-content">
+            <p class="mini-stat-value">{value}</p>
+            <p class="mini-stat-label">{label}</p>
+        </div>
+    </div>
+    """
+
+# Función para mostrar la hora (guardada como segundos del día) en tablas y exportaciones
+def formatear_horas(df):
+    if 'Hora' in df.columns and pd.api.types.is_integer_dtype(df['Hora']):
+        return df.assign(Hora=hours_to_time(df['Hora']))
+    return df
+
+# Pantalla de inicio cuando no hay archivos cargados
+def show_welcome_screen():
+    colors = get_colors()
+    show_welcome_banner()
+    
+    # Características principales
+    st.markdown("<h2 class='subtitle'>Características principales</h2>", unsafe_allow_html=True)
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown(f"""
+        <div class="card">
+            <h3 style="color: {colors['primary']};">📊 Análisis Preciso</h3>
+            <p>Detección automática de patrones de consumo, identificación de anomalías y visualizaciones detalladas con tecnología de machine learning.</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div class="card">
+            <h3 style="color: {colors['primary']};">⚠️ Alertas Inteligentes</h3>
+            <p>Sistema avanzado de detección de sobreconsumo, malas cargas y anomalías operativas con tableros de control en tiempo real.</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown(f"""
+        <div class="card">
+            <h3 style="color: {colors['primary']};">📱 Informes Completos</h3>
+            <p>Informes personalizables por terminal, buses, personal y períodos, exportables a Excel con formatos profesionales.</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Cómo funciona
+    st.markdown("<h2 class='subtitle'>¿Cómo funciona?</h2>", unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([3, 2])
+    
+    with col1:
+        st.markdown(f"""
+        <div class="card">
+            <h3 style="color: {colors['primary']};">Proceso de Análisis</h3>
+            <p>Smart Fuel Analytics 3.0 utiliza algoritmos avanzados para procesar y analizar sus datos de combustible:</p>
+            <ol>
+                <li><strong>Carga de datos:</strong> Suba sus archivos Excel o CSV con registros de cargas de combustible.</li>
+                <li><strong>Preprocesamiento automático:</strong> El sistema limpia, normaliza y enriquece los datos, detectando automáticamente formatos y columnas.</li>
+                <li><strong>Detección de anomalías:</strong> Utilizamos técnicas de IA como Isolation Forest y análisis estadístico para identificar patrones anómalos.</li>
+                <li><strong>Análisis multidimensional:</strong> Examinamos el consumo por terminal, bus, modelo, conductor y períodos de tiempo.</li>
+                <li><strong>Generación de informes:</strong> Visualizaciones interactivas, métricas clave y reportes exportables para una toma de decisiones informada.</li>
+            </ol>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div class="card">
+            <h3 style="color: {colors['primary']};">Beneficios Clave</h3>
+            <ul>
+                <li><strong>Ahorro de combustible</strong> mediante la identificación de ineficiencias</li>
+                <li><strong>Reducción de errores operativos</strong> a través de la detección de malas cargas</li>
+                <li><strong>Optimización de flota</strong> con análisis de rendimiento por modelo y bus</li>
+                <li><strong>Mejora de procesos</strong> en terminales y personal</li>
+                <li><strong>Toma de decisiones basada en datos</strong> con métricas claras y precisas</li>
+            </ul>
+            <div style="text-align: center; margin-top: 1.5rem;">
+                <p>👈 Comience cargando un archivo desde el panel lateral</p>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Instrucciones
+    st.markdown("<h2 class='subtitle'>Instrucciones de uso</h2>", unsafe_allow_html=True)
+    
+    st.markdown(f"""
+    <div class="card">
+        <ol>
+            <li><strong>Sube tu archivo Excel o CSV</strong> con datos de carga de combustible desde el panel lateral</li>
+            <li>Haz clic en <strong>Iniciar Análisis Avanzado</strong> para procesar los datos con nuestros algoritmos</li>
+            <li>Navega entre las diferentes secciones para ver análisis específicos y visualizaciones detalladas</li>
+            <li>Utiliza los filtros interactivos para profundizar en aspectos particulares de tus datos</li>
+            <li>Exporta los resultados a Excel para compartir o guardar cuando sea necesario</li>
+        </ol>
+        <p style="margin-top: 1rem;"><strong>Formato esperado del archivo:</strong></p>
+        <ul>
+            <li>Título en fila A3</li>
+            <li>Datos desde la fila A4</li>
+            <li>Columnas principales: Turno, Fecha, Hora, Terminal, Número interno, Patente, Cantidad litros, etc.</li>
+            <li>El sistema detectará automáticamente "Carga Masiva" en cualquier columna, incluida la última</li>
+        </ul>
+    </div>
+    """, unsafe_allow_html=True)
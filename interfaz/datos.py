@@ -0,0 +1,97 @@
+"""
+Acceso a los datos de la sesión.
+
+Todas las secciones leen el mismo DataFrame procesado y comparten el cubo de
+agregados diarios y el índice por día guardados en ``st.session_state``; este
+módulo es el único que los crea o reemplaza.
+"""
+import streamlit as st
+
+from combustible import ProcessingOptions, process_files
+from combustible.cube import DayIndex, build_cube
+from combustible.incremental import append_file
+
+
+# Procesamiento cacheado: el motor no depende de Streamlit
+@st.cache_data(ttl=3600)
+def _process_uploaded_files(uploaded_files, refit_detectors=False):
+    return process_files(uploaded_files, options=ProcessingOptions(refit_detectors=refit_detectors))
+
+# Función para mostrar el tiempo, la memoria y los registros de cada etapa del motor
+def show_profile(result):
+    perfil = result.diagnostics.profile.to_frame()
+    if perfil.empty:
+        return
+    with st.expander("🩺 Diagnóstico de rendimiento por etapa", expanded=False):
+        perfil = perfil.rename(columns={
+            'name': 'Etapa', 'seconds': 'Segundos', 'rows_in': 'Registros Entrada',
+            'rows_out': 'Registros Salida', 'peak_rss_mb': 'Pico RSS (MB)',
+            'alloc_mb': 'Memoria Asignada (MB)', 'alloc_peak_mb': 'Pico Asignado (MB)',
+            'pct_tiempo': '% Tiempo'
+        })
+        st.dataframe(perfil.dropna(axis=1, how='all'), use_container_width=True)
+
+        # Memoria del resultado por columna antes y después del plan de tipos
+        memoria = result.diagnostics.memory
+        if memoria is not None and len(memoria) > 1:
+            st.markdown("**Memoria del resultado por columna**")
+            st.dataframe(memoria.rename(columns={
+                'columna': 'Columna', 'tipo_antes': 'Tipo Antes', 'tipo_despues': 'Tipo Después',
+                'mb_antes': 'MB Antes', 'mb_despues': 'MB Después'
+            }), use_container_width=True, hide_index=True)
+
+# KPIs del motor en la sesión; el cubo queda asociado al DataFrame que resume
+def _store_kpis(result):
+    st.session_state.update(result.kpis)
+    st.session_state['cubo_df'] = result.df if 'cubo' in result.kpis else None
+
+# Función para cargar y preprocesar datos con mejoras (uno o varios archivos, zips u hojas)
+def load_data(uploaded_files, refit_detectors=False):
+    result = _process_uploaded_files(uploaded_files, refit_detectors)
+    
+    # Mostrar los mensajes generados por el motor
+    for nivel, mensaje in result.diagnostics.messages:
+        getattr(st, nivel)(mensaje)
+    show_profile(result)
+    
+    # Registrar las columnas detectadas y los KPIs para el resto de la aplicación
+    st.session_state['detected_columns'] = result.diagnostics.detected_columns
+    _store_kpis(result)
+    
+    # Guardar el resultado completo para poder anexar archivos mensuales
+    if result.ok:
+        st.session_state['resultado'] = result
+    
+    return result.df
+
+# Función para anexar un archivo mensual al dataset ya procesado
+def append_data(uploaded_file):
+    result = append_file(st.session_state['resultado'], uploaded_file)
+    
+    for nivel, mensaje in result.diagnostics.messages:
+        getattr(st, nivel)(mensaje)
+    show_profile(result)
+    
+    if result.ok:
+        st.session_state['resultado'] = result
+        _store_kpis(result)
+    
+    return result.df
+
+# Cubo de agregados diarios del dataset cargado (lo entrega el motor con los KPIs)
+def get_cube(df):
+    cubo = st.session_state.get('cubo')
+    # Si falta o corresponde a otro dataset, se reconstruye
+    if cubo is None or st.session_state.get('cubo_df') is not df:
+        cubo = build_cube(df)
+        st.session_state['cubo'] = cubo
+        st.session_state['cubo_df'] = df
+    return cubo
+
+# Índice por día del dataset cargado: totales y registros de un rango de fechas sin recorrer los datos
+def get_day_index(df):
+    indice = st.session_state.get('indice_dias')
+    if indice is None or indice.df is not df:
+        indice = DayIndex(df)
+        st.session_state['indice_dias'] = indice
+    return indice
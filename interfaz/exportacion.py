@@ -0,0 +1,1165 @@
+"""
+Exportación del análisis a un libro Excel con formato.
+"""
+import streamlit as st
+import pandas as pd
+import numpy as np
+import datetime
+from io import BytesIO
+
+from interfaz.componentes import formatear_horas
+
+
+# Función para exportar a Excel con opciones avanzadas
+def export_to_excel(df, filename=None, include_plots=False):
+    """
+    Exporta los análisis a un archivo Excel con formato mejorado.
+    
+    Args:
+        df: DataFrame con los datos
+        filename: Nombre del archivo (opcional)
+        include_plots: Si se deben incluir gráficos (opcional)
+    
+    Returns:
+        BytesIO con el archivo Excel
+    """
+    output = BytesIO()
+    
+    # Las horas se guardan como segundos del día; Excel espera valores de hora
+    df = formatear_horas(df)
+    
+    try:
+        # Para Excel con estilos
+        import openpyxl
+        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+        from openpyxl.chart import BarChart, Reference, LineChart, PieChart, ScatterChart
+        from openpyxl.chart.series import DataPoint
+        from openpyxl.utils.dataframe import dataframe_to_rows
+        
+        # Crear libro de trabajo
+        workbook = openpyxl.Workbook()
+        
+        # Eliminar hoja predeterminada
+        default_sheet = workbook.active
+        workbook.remove(default_sheet)
+        
+        # Definir estilos
+        header_font = Font(name='Arial', size=12, bold=True, color='FFFFFF')
+        header_fill = PatternFill(start_color='4361EE', end_color='4361EE', fill_type='solid')
+        header_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+        
+        normal_font = Font(name='Arial', size=11)
+        normal_alignment = Alignment(horizontal='left', vertical='center')
+        
+        number_alignment = Alignment(horizontal='right', vertical='center')
+        
+        border = Border(
+            left=Side(style='thin', color='E0E0E0'),
+            right=Side(style='thin', color='E0E0E0'),
+            top=Side(style='thin', color='E0E0E0'),
+            bottom=Side(style='thin', color='E0E0E0')
+        )
+        
+        # ----- RESUMEN GENERAL -----
+        ws_resumen = workbook.create_sheet(title='Resumen General')
+        
+        # Título
+        ws_resumen.merge_cells('A1:C1')
+        ws_resumen['A1'] = 'INFORME DE ANÁLISIS DE COMBUSTIBLE'
+        ws_resumen['A1'].font = Font(name='Arial', size=16, bold=True, color='4361EE')
+        ws_resumen['A1'].alignment = Alignment(horizontal='center', vertical='center')
+        
+        # Fecha de generación
+        ws_resumen['A2'] = f'Generado: {datetime.datetime.now().strftime("%d/%m/%Y %H:%M")}'
+        ws_resumen['A2'].font = Font(name='Arial', size=10, italic=True)
+        
+        # Encabezados
+        ws_resumen['A4'] = 'Métrica'
+        ws_resumen['B4'] = 'Valor'
+        ws_resumen['C4'] = 'Observación'
+        
+        for cell in ['A4', 'B4', 'C4']:
+            ws_resumen[cell].font = header_font
+            ws_resumen[cell].fill = header_fill
+            ws_resumen[cell].alignment = header_alignment
+            ws_resumen[cell].border = border
+        
+        # Datos de resumen
+        metricas = [
+            ('Total Cargas', len(df), ''),
+            ('Total Litros', f"{df['Cantidad litros'].sum():,.2f}" if 'Cantidad litros' in df.columns else 'N/A', ''),
+            ('Promedio Litros/Carga', f"{df['Cantidad litros'].mean():,.2f}" if 'Cantidad litros' in df.columns else 'N/A', ''),
+            ('Malas Cargas', f"{df['Mala Carga'].sum()}" if 'Mala Carga' in df.columns else 'N/A', 
+             f"({df['Mala Carga'].mean()*100:.2f}%)" if 'Mala Carga' in df.columns else ''),
+            ('Cargas con Sobreconsumo', f"{df['Sobreconsumo'].sum()}" if 'Sobreconsumo' in df.columns else 'N/A',
+             f"({df['Sobreconsumo'].mean()*100:.2f}%)" if 'Sobreconsumo' in df.columns else ''),
+            ('Litros en Sobreconsumo', f"{df.loc[df['Sobreconsumo'] == True, 'Cantidad litros'].sum():,.2f}" if 'Sobreconsumo' in df.columns and 'Cantidad litros' in df.columns else 'N/A', ''),
+            ('Total Buses', f"{df['Número interno'].nunique()}" if 'Número interno' in df.columns else 'N/A', ''),
+            ('Total Terminales', f"{df['Terminal'].nunique()}" if 'Terminal' in df.columns else 'N/A', ''),
+            ('Total Conductores', f"{df['Nombre conductor'].nunique()}" if 'Nombre conductor' in df.columns else 'N/A', ''),
+            ('Rendimiento Promedio', f"{df['Rendimiento'].mean():,.2f} km/l" if 'Rendimiento' in df.columns else 'N/A', ''),
+            ('Período Analizado', f"{df['Fecha'].min().strftime('%d/%m/%Y')} al {df['Fecha'].max().strftime('%d/%m/%Y')}" if 'Fecha' in df.columns else 'N/A', '')
+        ]
+        
+        for i, (metrica, valor, obs) in enumerate(metricas, start=5):
+            ws_resumen[f'A{i}'] = metrica
+            ws_resumen[f'B{i}'] = valor
+            ws_resumen[f'C{i}'] = obs
+            
+            # Estilo
+            for col in ['A', 'B', 'C']:
+                ws_resumen[f'{col}{i}'].font = normal_font
+                ws_resumen[f'{col}{i}'].border = border
+            
+            if i % 2 == 0:  # Filas alternas
+                for col in ['A', 'B', 'C']:
+                    ws_resumen[f'{col}{i}'].fill = PatternFill(start_color='F5F5F5', end_color='F5F5F5', fill_type='solid')
+        
+        # Ajustar anchos de columna
+        ws_resumen.column_dimensions['A'].width = 30
+        ws_resumen.column_dimensions['B'].width = 20
+        ws_resumen.column_dimensions['C'].width = 30
+        
+        # ----- CONSUMO DIARIO -----
+        if 'Fecha' in df.columns and 'Cantidad litros' in df.columns:
+            ws_diario = workbook.create_sheet(title='Consumo Diario')
+            
+            # Agrupar datos
+            consumo_diario = df.groupby(df['Fecha'].dt.date).agg({
+                'Cantidad litros': ['sum', 'mean', 'count'],
+                'Mala Carga': 'sum' if 'Mala Carga' in df.columns else 'count',
+                'Sobreconsumo': 'sum' if 'Sobreconsumo' in df.columns else 'count'
+            }).reset_index()
+            
+            # Aplanar multiíndice
+            consumo_diario.columns = ['Fecha', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 'Malas Cargas', 'Sobreconsumos']
+            
+            # Calcular porcentajes
+            consumo_diario['% Malas Cargas'] = (consumo_diario['Malas Cargas'] / consumo_diario['Cantidad Cargas'] * 100).round(2)
+            consumo_diario['% Sobreconsumos'] = (consumo_diario['Sobreconsumos'] / consumo_diario['Cantidad Cargas'] * 100).round(2)
+            
+            # Ordenar por fecha (descendente)
+            consumo_diario = consumo_diario.sort_values('Fecha', ascending=False)
+            
+            # Escribir encabezados
+            encabezados = ['Fecha', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 'Malas Cargas', '% Malas', 'Sobreconsumos', '% Sobre']
+            for i, encabezado in enumerate(encabezados, start=1):
+                cell = ws_diario.cell(row=1, column=i, value=encabezado)
+                cell.font = header_font
+                cell.fill = header_fill
+                cell.alignment = header_alignment
+                cell.border = border
+            
+            # Escribir datos
+            for i, row in enumerate(dataframe_to_rows(consumo_diario, index=False, header=False), start=2):
+                for j, value in enumerate(row, start=1):
+                    if j == 1:  # Fecha
+                        cell = ws_diario.cell(row=i, column=j, value=value)
+                        cell.number_format = 'DD/MM/YYYY'
+                    elif j in [2, 3]:  # Valores numéricos con decimales
+                        cell = ws_diario.cell(row=i, column=j, value=value)
+                        cell.number_format = '#,##0.00'
+                    elif j in [7, 8]:  # Porcentajes
+                        cell = ws_diario.cell(row=i, column=j, value=value)
+                        cell.number_format = '0.00%'
+                    else:  # Valores enteros
+                        cell = ws_diario.cell(row=i, column=j, value=value)
+                        cell.number_format = '#,##0'
+                    
+                    # Estilo común
+                    cell.font = normal_font
+                    cell.border = border
+                    cell.alignment = number_alignment if j > 1 else normal_alignment
+                
+                # Filas alternas
+                if i % 2 == 0:
+                    for j in range(1, len(encabezados) + 1):
+                        ws_diario.cell(row=i, column=j).fill = PatternFill(start_color='F5F5F5', end_color='F5F5F5', fill_type='solid')
+            
+            # Ajustar anchos de columna
+            for i, ancho in enumerate([15, 15, 15, 15, 15, 10, 15, 10], start=1):
+                ws_diario.column_dimensions[openpyxl.utils.get_column_letter(i)].width = ancho
+            
+            # Añadir gráfico si se solicita
+            if include_plots:
+                chart = LineChart()
+                chart.title = "Evolución de Consumo Diario"
+                chart.style = 2
+                chart.x_axis.title = "Fecha"
+                chart.y_axis.title = "Litros"
+                
+                # Invertir orden para gráfico
+                chart_data = consumo_diario.sort_values('Fecha')
+                
+                # Agregar datos al gráfico
+                data = Reference(ws_diario, min_col=2, min_row=1, max_row=len(chart_data) + 1, max_col=2)
+                cats = Reference(ws_diario, min_col=1, min_row=2, max_row=len(chart_data) + 1)
+                
+                chart.add_data(data, titles_from_data=True)
+                chart.set_categories(cats)
+                
+                # Estilo de línea
+                s = chart.series[0]
+                s.graphicalProperties.line.solidFill = "4361EE"
+                s.graphicalProperties.line.width = 20000  # ancho en EMUs
+                
+                # Añadir gráfico a la hoja
+                ws_diario.add_chart(chart, "J2")
+        
+        # ----- ANÁLISIS POR TERMINAL -----
+        if 'Terminal' in df.columns:
+            ws_terminal = workbook.create_sheet(title='Por Terminal')
+            
+            # Agrupar datos
+            terminal_stats = df.groupby('Terminal').agg({
+                'Cantidad litros': ['sum', 'mean', 'count'] if 'Cantidad litros' in df.columns else 'count',
+                'Mala Carga': 'sum' if 'Mala Carga' in df.columns else 'count',
+                'Sobreconsumo': 'sum' if 'Sobreconsumo' in df.columns else 'count'
+            }).reset_index()
+            
+            # Aplanar multiíndice
+            if 'Cantidad litros' in df.columns:
+                terminal_stats.columns = ['Terminal', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 'Malas Cargas', 'Sobreconsumos']
+                
+                # Calcular porcentajes e índice de eficiencia
+                terminal_stats['% Malas Cargas'] = (terminal_stats['Malas Cargas'] / terminal_stats['Cantidad Cargas'] * 100).round(2)
+                terminal_stats['% Sobreconsumos'] = (terminal_stats['Sobreconsumos'] / terminal_stats['Cantidad Cargas'] * 100).round(2)
+                terminal_stats['Índice Eficiencia'] = (100 - (terminal_stats['% Sobreconsumos'] * 0.7 + terminal_stats['% Malas Cargas'] * 0.3)).round(2)
+                terminal_stats['Índice Eficiencia'] = terminal_stats['Índice Eficiencia'].clip(0, 100)
+                
+                # Ordenar por índice de eficiencia (descendente)
+                terminal_stats = terminal_stats.sort_values('Índice Eficiencia', ascending=False)
+                
+                # Escribir encabezados
+                encabezados = ['Terminal', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 
+                             'Malas Cargas', '% Malas', 'Sobreconsumos', '% Sobre', 'Índice Eficiencia']
+            else:
+                terminal_stats.columns = ['Terminal', 'Cantidad Cargas', 'Malas Cargas', 'Sobreconsumos']
+                encabezados = ['Terminal', 'Cantidad Cargas', 'Malas Cargas', 'Sobreconsumos']
+                terminal_stats = terminal_stats.sort_values('Cantidad Cargas', ascending=False)
+            
+            # Escribir encabezados
+            for i, encabezado in enumerate(encabezados, start=1):
+                cell = ws_terminal.cell(row=1, column=i, value=encabezado)
+                cell.font = header_font
+                cell.fill = header_fill
+                cell.alignment = header_alignment
+                cell.border = border
+            
+            # Escribir datos
+            for i, row in enumerate(dataframe_to_rows(terminal_stats, index=False, header=False), start=2):
+                for j, value in enumerate(row, start=1):
+                    if j == 1:  # Terminal
+                        cell = ws_terminal.cell(row=i, column=j, value=value)
+                    elif j in [2, 3]:  # Valores numéricos con decimales
+                        cell = ws_terminal.cell(row=i, column=j, value=value)
+                        cell.number_format = '#,##0.00'
+                    elif j in [6, 7, 9]:  # Porcentajes
+                        cell = ws_terminal.cell(row=i, column=j, value=value)
+                        cell.number_format = '0.00%'
+                    else:  # Valores enteros
+                        cell = ws_terminal.cell(row=i, column=j, value=value)
+                        cell.number_format = '#,##0'
+                    
+                    # Estilo común
+                    cell.font = normal_font
+                    cell.border = border
+                    cell.alignment = number_alignment if j > 1 else normal_alignment
+                
+                # Colorear según eficiencia
+                if 'Índice Eficiencia' in terminal_stats.columns:
+                    eficiencia = row[-1]  # Último valor (Índice Eficiencia)
+                    if eficiencia >= 90:
+                        color = '43AA8B'  # Verde
+                    elif eficiencia >= 75:
+                        color = '90BE6D'  # Verde claro
+                    elif eficiencia >= 60:
+                        color = 'F9C74F'  # Amarillo
+                    elif eficiencia >= 40:
+                        color = 'F8961E'  # Naranja
+                    else:
+                        color = 'F94144'  # Rojo
+                    
+                    ws_terminal.cell(row=i, column=len(encabezados)).fill = PatternFill(start_color=color, end_color=color, fill_type='solid')
+                    # Color de texto adaptativo para mejor contraste
+                    if eficiencia >= 60:
+                        ws_terminal.cell(row=i, column=len(encabezados)).font = Font(name='Arial', size=11, color='000000')
+                    else:
+                        ws_terminal.cell(row=i, column=len(encabezados)).font = Font(name='Arial', size=11, color='FFFFFF')
+                
+                # Filas alternas
+                if i % 2 == 0:
+                    for j in range(1, len(encabezados) + 1):
+                        if not (j == len(encabezados) and 'Índice Eficiencia' in terminal_stats.columns):  # No cambiar el color del índice
+                            ws_terminal.cell(row=i, column=j).fill = PatternFill(start_color='F5F5F5', end_color='F5F5F5', fill_type='solid')
+            
+            # Ajustar anchos de columna
+            for i, ancho in enumerate([30, 15, 15, 15, 15, 10, 15, 10, 18], start=1):
+                if i <= len(encabezados):
+                    ws_terminal.column_dimensions[openpyxl.utils.get_column_letter(i)].width = ancho
+            
+            # Añadir gráfico si se solicita y hay suficientes datos
+            if include_plots and 'Cantidad litros' in df.columns and len(terminal_stats) > 1:
+                chart = BarChart()
+                chart.type = "col"
+                chart.style = 10
+                chart.title = "Consumo Total por Terminal"
+                chart.y_axis.title = "Litros"
+                
+                # Limitar a top 10 terminales para el gráfico
+                chart_data = terminal_stats.sort_values('Total Litros', ascending=False).head(10)
+                
+                # Datos para el gráfico
+                data = Reference(ws_terminal, min_col=2, min_row=1, max_row=len(chart_data) + 1, max_col=2)
+                cats = Reference(ws_terminal, min_col=1, min_row=2, max_row=len(chart_data) + 1)
+                
+                chart.add_data(data, titles_from_data=True)
+                chart.set_categories(cats)
+                
+                # Colores personalizados para cada barra
+                colors = ['4361EE', '3A0CA3', 'F72585', '4CC9F0', '4895EF', 'F8961E', 'F94144', '90BE6D', '43AA8B', '577590']
+                for i, (idx, color) in enumerate(zip(range(len(chart_data)), colors)):
+                    pt = DataPoint(idx=idx)
+                    pt.graphicalProperties.solidFill = color
+                    chart.series[0].dPt.append(pt)
+                
+                # Añadir gráfico a la hoja
+                ws_terminal.add_chart(chart, "K2")
+        
+        # ----- ANÁLISIS POR MODELO -----
+        if 'Modelo chasis' in df.columns or 'Modelo Normalizado' in df.columns:
+            ws_modelo = workbook.create_sheet(title='Por Modelo')
+            
+            # Determinar qué columna usar
+            modelo_col = 'Modelo Normalizado' if 'Modelo Normalizado' in df.columns else 'Modelo chasis'
+            
+            # Agrupar datos
+            modelo_stats = df.groupby(modelo_col, observed=True).agg({
+                'Cantidad litros': ['sum', 'mean', 'count'] if 'Cantidad litros' in df.columns else 'count',
+                'Sobreconsumo': 'sum' if 'Sobreconsumo' in df.columns else 'count',
+                'Rendimiento': ['mean', 'median', 'std'] if 'Rendimiento' in df.columns else 'count'
+            }).reset_index()
+            
+            # Aplanar multiíndice
+            if 'Cantidad litros' in df.columns and 'Rendimiento' in df.columns:
+                modelo_stats.columns = ['Modelo', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 
+                                      'Sobreconsumos', 'Rendimiento Promedio', 'Rendimiento Mediana', 
+                                      'Rendimiento Desviación']
+                
+                # Calcular porcentajes
+                modelo_stats['% Sobreconsumos'] = (modelo_stats['Sobreconsumos'] / modelo_stats['Cantidad Cargas'] * 100).round(2)
+                
+                # Ordenar por rendimiento (descendente)
+                modelo_stats = modelo_stats.sort_values('Rendimiento Promedio', ascending=False)
+                
+                # Escribir encabezados
+                encabezados = ['Modelo', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 
+                             'Sobreconsumos', '% Sobre', 'Rendimiento Promedio', 'Rendimiento Mediana', 
+                             'Rendimiento Desviación']
+            elif 'Cantidad litros' in df.columns:
+                modelo_stats.columns = ['Modelo', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 
+                                      'Sobreconsumos', 'Rendimiento Count']
+                
+                # Calcular porcentajes
+                modelo_stats['% Sobreconsumos'] = (modelo_stats['Sobreconsumos'] / modelo_stats['Cantidad Cargas'] * 100).round(2)
+                
+                # Ordenar por total litros
+                modelo_stats = modelo_stats.sort_values('Total Litros', ascending=False)
+                
+                # Escribir encabezados
+                encabezados = ['Modelo', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 
+                             'Sobreconsumos', '% Sobre', 'Rendimiento Count']
+            else:
+                modelo_stats.columns = ['Modelo', 'Cantidad Cargas', 'Sobreconsumos', 'Rendimiento Count']
+                
+                # Ordenar por cantidad de cargas
+                modelo_stats = modelo_stats.sort_values('Cantidad Cargas', ascending=False)
+                
+                # Escribir encabezados
+                encabezados = ['Modelo', 'Cantidad Cargas', 'Sobreconsumos', 'Rendimiento Count']
+            
+            # Escribir encabezados
+            for i, encabezado in enumerate(encabezados, start=1):
+                cell = ws_modelo.cell(row=1, column=i, value=encabezado)
+                cell.font = header_font
+                cell.fill = header_fill
+                cell.alignment = header_alignment
+                cell.border = border
+            
+            # Escribir datos
+            for i, row in enumerate(dataframe_to_rows(modelo_stats, index=False, header=False), start=2):
+                for j, value in enumerate(row, start=1):
+                    if j == 1:  # Modelo
+                        cell = ws_modelo.cell(row=i, column=j, value=value)
+                    elif j in [2, 3, 7, 8, 9]:  # Valores numéricos con decimales
+                        cell = ws_modelo.cell(row=i, column=j, value=value)
+                        cell.number_format = '#,##0.00'
+                    elif j == 6:  # Porcentajes
+                        cell = ws_modelo.cell(row=i, column=j, value=value)
+                        cell.number_format = '0.00%'
+                    else:  # Valores enteros
+                        cell = ws_modelo.cell(row=i, column=j, value=value)
+                        cell.number_format = '#,##0'
+                    
+                    # Estilo común
+                    cell.font = normal_font
+                    cell.border = border
+                    cell.alignment = number_alignment if j > 1 else normal_alignment
+                
+                # Filas alternas
+                if i % 2 == 0:
+                    for j in range(1, len(encabezados) + 1):
+                        ws_modelo.cell(row=i, column=j).fill = PatternFill(start_color='F5F5F5', end_color='F5F5F5', fill_type='solid')
+            
+            # Ajustar anchos de columna
+            for i, ancho in enumerate([30, 15, 15, 15, 15, 10, 20, 20, 20], start=1):
+                if i <= len(encabezados):
+                    ws_modelo.column_dimensions[openpyxl.utils.get_column_letter(i)].width = ancho
+            
+            # Añadir gráfico si se solicita
+            if include_plots and 'Rendimiento' in df.columns and len(modelo_stats) > 1:
+                chart = BarChart()
+                chart.type = "col"
+                chart.style = 10
+                chart.title = "Rendimiento Promedio por Modelo"
+                chart.y_axis.title = "km/L"
+                
+                # Limitar a top 10 modelos para el gráfico
+                chart_data = modelo_stats.head(10)
+                
+                # Datos para el gráfico
+                data = Reference(ws_modelo, min_col=7, min_row=1, max_row=len(chart_data) + 1, max_col=7)
+                cats = Reference(ws_modelo, min_col=1, min_row=2, max_row=len(chart_data) + 1)
+                
+                chart.add_data(data, titles_from_data=True)
+                chart.set_categories(cats)
+                
+                # Añadir gráfico a la hoja
+                ws_modelo.add_chart(chart, "K2")
+        
+        # ----- MALAS CARGAS -----
+        if 'Mala Carga' in df.columns:
+            malas_cargas = df[df['Mala Carga'] == True]
+            if not malas_cargas.empty:
+                ws_malas = workbook.create_sheet(title='Malas Cargas')
+                
+                # Última columna del archivo original (la que puede indicar "Carga Masiva")
+                columnas_originales = st.session_state.get('detected_columns') or []
+                ultima_columna = columnas_originales[-1] if columnas_originales else None
+                
+                # Columnas relevantes para mostrar
+                cols_relevantes = [col for col in [
+                    'Fecha', 'Hora', 'Terminal', 'Número interno', 'Patente', 
+                    'Cantidad litros', 'Tipo', 'Nombre Planillero', 'Nombre supervisor', 
+                    ultima_columna  # Incluir la última columna como solicitado
+                ] if col in malas_cargas.columns]
+                
+                # Escribir encabezados
+                for i, encabezado in enumerate(cols_relevantes, start=1):
+                    cell = ws_malas.cell(row=1, column=i, value=encabezado)
+                    cell.font = header_font
+                    cell.fill = header_fill
+                    cell.alignment = header_alignment
+                    cell.border = border
+                
+                # Ordenar por fecha (descendente)
+                malas_cargas_sorted = malas_cargas[cols_relevantes].sort_values('Fecha', ascending=False) if 'Fecha' in cols_relevantes else malas_cargas[cols_relevantes]
+                
+                # Escribir datos
+                for i, row in enumerate(dataframe_to_rows(malas_cargas_sorted, index=False, header=False), start=2):
+                    for j, value in enumerate(row, start=1):
+                        if j == 1 and 'Fecha' in cols_relevantes:  # Fecha
+                            cell = ws_malas.cell(row=i, column=j, value=value)
+                            cell.number_format = 'DD/MM/YYYY'
+                        elif j == 2 and 'Hora' in cols_relevantes:  # Hora
+                            cell = ws_malas.cell(row=i, column=j, value=value)
+                            cell.number_format = 'HH:MM'
+                        elif cols_relevantes[j-1] == 'Cantidad litros':  # Litros
+                            cell = ws_malas.cell(row=i, column=j, value=value)
+                            cell.number_format = '#,##0.00'
+                        else:  # Otros valores
+                            cell = ws_malas.cell(row=i, column=j, value=value)
+                        
+                        # Estilo común
+                        cell.font = normal_font
+                        cell.border = border
+                        cell.alignment = normal_alignment
+                    
+                    # Filas alternas
+                    if i % 2 == 0:
+                        for j in range(1, len(cols_relevantes) + 1):
+                            ws_malas.cell(row=i, column=j).fill = PatternFill(start_color='F5F5F5', end_color='F5F5F5', fill_type='solid')
+                
+                # Ajustar anchos de columna
+                anchos_columna = {
+                    'Fecha': 15,
+                    'Hora': 10,
+                    'Terminal': 20,
+                    'Número interno': 15,
+                    'Patente': 15,
+                    'Cantidad litros': 15,
+                    'Tipo': 20,
+                    'Nombre Planillero': 25,
+                    'Nombre supervisor': 25
+                }
+                
+                for i, col in enumerate(cols_relevantes, start=1):
+                    ancho = anchos_columna.get(col, 20)  # Ancho predeterminado si no está en el diccionario
+                    ws_malas.column_dimensions[openpyxl.utils.get_column_letter(i)].width = ancho
+                
+                # Añadir análisis por Terminal y Planillero
+                if 'Terminal' in cols_relevantes:
+                    # Añadir espacio
+                    ws_malas.cell(row=len(malas_cargas) + 4, column=1, value="ANÁLISIS POR TERMINAL")
+                    ws_malas.cell(row=len(malas_cargas) + 4, column=1).font = Font(name='Arial', size=14, bold=True)
+                    
+                    # Encabezados análisis
+                    encabezados_analisis = ['Terminal', 'Malas Cargas', 'Total Cargas', '% Malas Cargas']
+                    for i, encabezado in enumerate(encabezados_analisis, start=1):
+                        cell = ws_malas.cell(row=len(malas_cargas) + 5, column=i, value=encabezado)
+                        cell.font = header_font
+                        cell.fill = header_fill
+                        cell.alignment = header_alignment
+                        cell.border = border
+                    
+                    # Calcular estadísticas por terminal
+                    terminal_counts = malas_cargas['Terminal'].value_counts().reset_index()
+                    terminal_counts.columns = ['Terminal', 'Malas Cargas']
+                    
+                    total_por_terminal = df.groupby('Terminal').size().reset_index()
+                    total_por_terminal.columns = ['Terminal', 'Total Cargas']
+                    
+                    terminal_analysis = pd.merge(terminal_counts, total_por_terminal, on='Terminal')
+                    terminal_analysis['Porcentaje'] = (terminal_analysis['Malas Cargas'] / terminal_analysis['Total Cargas'] * 100).round(2)
+                    terminal_analysis = terminal_analysis.sort_values('Porcentaje', ascending=False)
+                    
+                    # Escribir datos de análisis
+                    for i, row in enumerate(dataframe_to_rows(terminal_analysis, index=False, header=False), start=len(malas_cargas) + 6):
+                        for j, value in enumerate(row, start=1):
+                            if j == 1:  # Terminal
+                                cell = ws_malas.cell(row=i, column=j, value=value)
+                            elif j == 4:  # Porcentaje
+                                cell = ws_malas.cell(row=i, column=j, value=value/100)  # Convertir a decimal para formato de porcentaje
+                                cell.number_format = '0.00%'
+                            else:  # Valores enteros
+                                cell = ws_malas.cell(row=i, column=j, value=value)
+                                cell.number_format = '#,##0'
+                            
+                            # Estilo común
+                            cell.font = normal_font
+                            cell.border = border
+                            cell.alignment = number_alignment if j > 1 else normal_alignment
+                        
+                        # Colorear según porcentaje
+                        porcentaje = row[3]  # Porcentaje
+                        if porcentaje >= 10:
+                            color = 'F94144'  # Rojo (alto)
+                        elif porcentaje >= 5:
+                            color = 'F8961E'  # Naranja (medio)
+                        elif porcentaje >= 2:
+                            color = 'F9C74F'  # Amarillo (bajo)
+                        else:
+                            color = '90BE6D'  # Verde (muy bajo)
+                        
+                        ws_malas.cell(row=i, column=4).fill = PatternFill(start_color=color, end_color=color, fill_type='solid')
+        
+        # ----- SOBRECONSUMO -----
+        if 'Sobreconsumo' in df.columns:
+            sobreconsumo = df[df['Sobreconsumo'] == True]
+            if not sobreconsumo.empty:
+                ws_sobre = workbook.create_sheet(title='Sobreconsumo')
+                
+                # Columnas relevantes para mostrar
+                cols_relevantes = [col for col in [
+                    'Fecha', 'Hora', 'Terminal', 'Número interno', 'Patente', 'Modelo chasis',
+                    'Cantidad litros', 'Z-Score', 'Promedio Modelo', 'Nombre conductor', 'Nombre supervisor'
+                ] if col in sobreconsumo.columns]
+                
+                # Escribir encabezados
+                for i, encabezado in enumerate(cols_relevantes, start=1):
+                    cell = ws_sobre.cell(row=1, column=i, value=encabezado)
+                    cell.font = header_font
+                    cell.fill = header_fill
+                    cell.alignment = header_alignment
+                    cell.border = border
+                
+                # Ordenar por Z-Score (descendente)
+                if 'Z-Score' in cols_relevantes:
+                    sobreconsumo_sorted = sobreconsumo[cols_relevantes].sort_values('Z-Score', ascending=False)
+                else:
+                    sobreconsumo_sorted = sobreconsumo[cols_relevantes]
+                
+                # Escribir datos
+                for i, row in enumerate(dataframe_to_rows(sobreconsumo_sorted, index=False, header=False), start=2):
+                    for j, value in enumerate(row, start=1):
+                        if j == 1 and 'Fecha' in cols_relevantes:  # Fecha
+                            cell = ws_sobre.cell(row=i, column=j, value=value)
+                            cell.number_format = 'DD/MM/YYYY'
+                        elif j == 2 and 'Hora' in cols_relevantes:  # Hora
+                            cell = ws_sobre.cell(row=i, column=j, value=value)
+                            cell.number_format = 'HH:MM'
+                        elif cols_relevantes[j-1] in ['Cantidad litros', 'Z-Score', 'Promedio Modelo']:  # Valores numéricos
+                            cell = ws_sobre.cell(row=i, column=j, value=value)
+                            cell.number_format = '#,##0.00'
+                        else:  # Otros valores
+                            cell = ws_sobre.cell(row=i, column=j, value=value)
+                        
+                        # Estilo común
+                        cell.font = normal_font
+                        cell.border = border
+                        cell.alignment = normal_alignment
+                        
+                        # Colorear según Z-Score
+                        if cols_relevantes[j-1] == 'Z-Score' and value is not None:
+                            if value >= 4:
+                                color = 'F94144'  # Rojo (extremo)
+                            elif value >= 3:
+                                color = 'F8961E'  # Naranja (alto)
+                            else:
+                                color = 'F9C74F'  # Amarillo (moderado)
+                            
+                            cell.fill = PatternFill(start_color=color, end_color=color, fill_type='solid')
+                    
+                    # Filas alternas
+                    if i % 2 == 0:
+                        for j in range(1, len(cols_relevantes) + 1):
+                            if cols_relevantes[j-1] != 'Z-Score':  # No cambiar el color del Z-Score
+                                ws_sobre.cell(row=i, column=j).fill = PatternFill(start_color='F5F5F5', end_color='F5F5F5', fill_type='solid')
+                
+                # Ajustar anchos de columna
+                anchos_columna = {
+                    'Fecha': 15,
+                    'Hora': 10,
+                    'Terminal': 20,
+                    'Número interno': 15,
+                    'Patente': 15,
+                    'Modelo chasis': 20,
+                    'Cantidad litros': 15,
+                    'Z-Score': 10,
+                    'Promedio Modelo': 15,
+                    'Nombre conductor': 25,
+                    'Nombre supervisor': 25
+                }
+                
+                for i, col in enumerate(cols_relevantes, start=1):
+                    ancho = anchos_columna.get(col, 20)  # Ancho predeterminado si no está en el diccionario
+                    ws_sobre.column_dimensions[openpyxl.utils.get_column_letter(i)].width = ancho
+        
+        # ----- RENDIMIENTO -----
+        if 'Rendimiento' in df.columns:
+            rendimiento_df = df.dropna(subset=['Rendimiento'])
+            if not rendimiento_df.empty:
+                ws_rendimiento = workbook.create_sheet(title='Rendimiento')
+                
+                # Estadísticas básicas
+                stats = {
+                    'Rendimiento Promedio': rendimiento_df['Rendimiento'].mean(),
+                    'Rendimiento Mediana': rendimiento_df['Rendimiento'].median(),
+                    'Rendimiento Mínimo': rendimiento_df['Rendimiento'].min(),
+                    'Rendimiento Máximo': rendimiento_df['Rendimiento'].max(),
+                    'Desviación Estándar': rendimiento_df['Rendimiento'].std()
+                }
+                
+                # Escribir estadísticas básicas
+                ws_rendimiento.cell(row=1, column=1, value="ESTADÍSTICAS DE RENDIMIENTO")
+                ws_rendimiento.cell(row=1, column=1).font = Font(name='Arial', size=14, bold=True)
+                
+                for i, (stat, value) in enumerate(stats.items(), start=2):
+                    ws_rendimiento.cell(row=i, column=1, value=stat)
+                    ws_rendimiento.cell(row=i, column=2, value=value)
+                    ws_rendimiento.cell(row=i, column=2).number_format = '#,##0.00'
+                    
+                    # Estilo
+                    ws_rendimiento.cell(row=i, column=1).font = normal_font
+                    ws_rendimiento.cell(row=i, column=2).font = normal_font
+                    ws_rendimiento.cell(row=i, column=1).border = border
+                    ws_rendimiento.cell(row=i, column=2).border = border
+                    ws_rendimiento.cell(row=i, column=2).alignment = number_alignment
+                
+                # Añadir espacio
+                ws_rendimiento.cell(row=8, column=1, value="RENDIMIENTO POR MODELO")
+                ws_rendimiento.cell(row=8, column=1).font = Font(name='Arial', size=14, bold=True)
+                
+                # Análisis por modelo
+                if 'Modelo chasis' in df.columns:
+                    modelo_col = 'Modelo Normalizado' if 'Modelo Normalizado' in df.columns else 'Modelo chasis'
+                    
+                    # Agrupar por modelo
+                    rendimiento_modelo = rendimiento_df.groupby(modelo_col, observed=True)['Rendimiento'].agg(['mean', 'median', 'std', 'count']).reset_index()
+                    rendimiento_modelo.columns = ['Modelo', 'Promedio', 'Mediana', 'Desviación', 'Cantidad']
+                    
+                    # Ordenar por promedio (descendente)
+                    rendimiento_modelo = rendimiento_modelo.sort_values('Promedio', ascending=False)
+                    
+                    # Encabezados
+                    encabezados = ['Modelo', 'Promedio (km/L)', 'Mediana (km/L)', 'Desviación', 'Cantidad']
+                    for i, encabezado in enumerate(encabezados, start=1):
+                        cell = ws_rendimiento.cell(row=9, column=i, value=encabezado)
+                        cell.font = header_font
+                        cell.fill = header_fill
+                        cell.alignment = header_alignment
+                        cell.border = border
+                    
+                    # Escribir datos
+                    for i, row in enumerate(dataframe_to_rows(rendimiento_modelo, index=False, header=False), start=10):
+                        for j, value in enumerate(row, start=1):
+                            if j == 1:  # Modelo
+                                cell = ws_rendimiento.cell(row=i, column=j, value=value)
+                            elif j in [2, 3, 4]:  # Valores numéricos con decimales
+                                cell = ws_rendimiento.cell(row=i, column=j, value=value)
+                                cell.number_format = '#,##0.00'
+                            else:  # Valores enteros
+                                cell = ws_rendimiento.cell(row=i, column=j, value=value)
+                                cell.number_format = '#,##0'
+                            
+                            # Estilo común
+                            cell.font = normal_font
+                            cell.border = border
+                            cell.alignment = number_alignment if j > 1 else normal_alignment
+                        
+                        # Filas alternas
+                        if i % 2 == 0:
+                            for j in range(1, len(encabezados) + 1):
+                                ws_rendimiento.cell(row=i, column=j).fill = PatternFill(start_color='F5F5F5', end_color='F5F5F5', fill_type='solid')
+                    
+                    # Análisis por bus
+                    if 'Número interno' in df.columns:
+                        # Añadir espacio
+                        last_row = 10 + len(rendimiento_modelo)
+                        ws_rendimiento.cell(row=last_row + 2, column=1, value="TOP 20 BUSES POR RENDIMIENTO")
+                        ws_rendimiento.cell(row=last_row + 2, column=1).font = Font(name='Arial', size=14, bold=True)
+                        
+                        # Agrupar por bus
+                        rendimiento_bus = rendimiento_df.groupby('Número interno')['Rendimiento'].agg(['mean', 'count']).reset_index()
+                        rendimiento_bus.columns = ['Bus', 'Rendimiento', 'Cargas']
+                        
+                        # Filtrar buses con suficientes cargas
+                        rendimiento_bus = rendimiento_bus[rendimiento_bus['Cargas'] >= 5]
+                        
+                        # Ordenar por rendimiento (descendente)
+                        rendimiento_bus = rendimiento_bus.sort_values('Rendimiento', ascending=False)
+                        
+                        # Tomar top 20
+                        top_buses = rendimiento_bus.head(20)
+                        
+                        # Encabezados
+                        encabezados = ['Bus', 'Rendimiento (km/L)', 'Cargas']
+                        for i, encabezado in enumerate(encabezados, start=1):
+                            cell = ws_rendimiento.cell(row=last_row + 3, column=i, value=encabezado)
+                            cell.font = header_font
+                            cell.fill = header_fill
+                            cell.alignment = header_alignment
+                            cell.border = border
+                        
+                        # Escribir datos
+                        for i, row in enumerate(dataframe_to_rows(top_buses, index=False, header=False), start=last_row + 4):
+                            for j, value in enumerate(row, start=1):
+                                if j == 1:  # Bus
+                                    cell = ws_rendimiento.cell(row=i, column=j, value=value)
+                                elif j == 2:  # Rendimiento
+                                    cell = ws_rendimiento.cell(row=i, column=j, value=value)
+                                    cell.number_format = '#,##0.00'
+                                else:  # Cargas
+                                    cell = ws_rendimiento.cell(row=i, column=j, value=value)
+                                    cell.number_format = '#,##0'
+                                
+                                # Estilo común
+                                cell.font = normal_font
+                                cell.border = border
+                                cell.alignment = number_alignment if j > 1 else normal_alignment
+                            
+                            # Filas alternas
+                            if i % 2 == 0:
+                                for j in range(1, len(encabezados) + 1):
+                                    ws_rendimiento.cell(row=i, column=j).fill = PatternFill(start_color='F5F5F5', end_color='F5F5F5', fill_type='solid')
+                
+                # Ajustar anchos de columna
+                ws_rendimiento.column_dimensions['A'].width = 30
+                ws_rendimiento.column_dimensions['B'].width = 20
+                ws_rendimiento.column_dimensions['C'].width = 20
+                ws_rendimiento.column_dimensions['D'].width = 20
+                ws_rendimiento.column_dimensions['E'].width = 15
+        
+        # ----- POR CONDUCTOR -----
+        if 'Nombre conductor' in df.columns:
+            ws_conductor = workbook.create_sheet(title='Por Conductor')
+            
+            # Agrupar por conductor
+            conductor_stats = df.groupby('Nombre conductor').agg({
+                'Cantidad litros': ['sum', 'mean', 'count'] if 'Cantidad litros' in df.columns else 'count',
+                'Sobreconsumo': 'sum' if 'Sobreconsumo' in df.columns else 'count'
+            }).reset_index()
+            
+            # Aplanar multiíndice
+            if 'Cantidad litros' in df.columns:
+                conductor_stats.columns = ['Conductor', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 'Sobreconsumos']
+                
+                # Calcular porcentaje de sobreconsumo
+                conductor_stats['% Sobreconsumos'] = (conductor_stats['Sobreconsumos'] / conductor_stats['Cantidad Cargas'] * 100).round(2)
+                
+                # Ordenar por porcentaje de sobreconsumo (descendente)
+                conductor_stats = conductor_stats.sort_values('% Sobreconsumos', ascending=False)
+                
+                # Escribir encabezados
+                encabezados = ['Conductor', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 'Sobreconsumos', '% Sobre']
+            else:
+                conductor_stats.columns = ['Conductor', 'Cantidad Cargas', 'Sobreconsumos']
+                
+                # Calcular porcentaje de sobreconsumo
+                conductor_stats['% Sobreconsumos'] = (conductor_stats['Sobreconsumos'] / conductor_stats['Cantidad Cargas'] * 100).round(2)
+                
+                # Ordenar por porcentaje de sobreconsumo (descendente)
+                conductor_stats = conductor_stats.sort_values('% Sobreconsumos', ascending=False)
+                
+                # Escribir encabezados
+                encabezados = ['Conductor', 'Cantidad Cargas', 'Sobreconsumos', '% Sobre']
+            
+            # Escribir encabezados
+            for i, encabezado in enumerate(encabezados, start=1):
+                cell = ws_conductor.cell(row=1, column=i, value=encabezado)
+                cell.font = header_font
+                cell.fill = header_fill
+                cell.alignment = header_alignment
+                cell.border = border
+            
+            # Escribir datos
+            for i, row in enumerate(dataframe_to_rows(conductor_stats, index=False, header=False), start=2):
+                for j, value in enumerate(row, start=1):
+                    if j == 1:  # Conductor
+                        cell = ws_conductor.cell(row=i, column=j, value=value)
+                    elif j in [2, 3]:  # Valores numéricos con decimales
+                        cell = ws_conductor.cell(row=i, column=j, value=value)
+                        cell.number_format = '#,##0.00'
+                    elif j == len(encabezados):  # Porcentaje
+                        cell = ws_conductor.cell(row=i, column=j, value=value/100)  # Convertir a decimal para formato de porcentaje
+                        cell.number_format = '0.00%'
+                    else:  # Valores enteros
+                        cell = ws_conductor.cell(row=i, column=j, value=value)
+                        cell.number_format = '#,##0'
+                    
+                    # Estilo común
+                    cell.font = normal_font
+                    cell.border = border
+                    cell.alignment = number_alignment if j > 1 else normal_alignment
+                
+                # Colorear según porcentaje de sobreconsumo
+                if j == len(encabezados):
+                    porcentaje = row[-1]  # Porcentaje de sobreconsumo
+                    if porcentaje >= 15:
+                        color = 'F94144'  # Rojo (alto)
+                    elif porcentaje >= 10:
+                        color = 'F8961E'  # Naranja (medio)
+                    elif porcentaje >= 5:
+                        color = 'F9C74F'  # Amarillo (bajo)
+                    else:
+                        color = '90BE6D'  # Verde (muy bajo)
+                    
+                    ws_conductor.cell(row=i, column=len(encabezados)).fill = PatternFill(start_color=color, end_color=color, fill_type='solid')
+                
+                # Filas alternas
+                if i % 2 == 0:
+                    for j in range(1, len(encabezados)):  # No incluir la última columna (porcentaje)
+                        ws_conductor.cell(row=i, column=j).fill = PatternFill(start_color='F5F5F5', end_color='F5F5F5', fill_type='solid')
+            
+            # Ajustar anchos de columna
+            for i, ancho in enumerate([30, 15, 15, 15, 15, 10], start=1):
+                if i <= len(encabezados):
+                    ws_conductor.column_dimensions[openpyxl.utils.get_column_letter(i)].width = ancho
+        
+        # ----- POR BUS -----
+        if 'Número interno' in df.columns:
+            ws_bus = workbook.create_sheet(title='Por Bus')
+            
+            # Agrupar por bus
+            bus_stats = df.groupby('Número interno').agg({
+                'Cantidad litros': ['sum', 'mean', 'count'] if 'Cantidad litros' in df.columns else 'count',
+                'Sobreconsumo': 'sum' if 'Sobreconsumo' in df.columns else 'count',
+                'Rendimiento': ['mean', 'median'] if 'Rendimiento' in df.columns else 'count'
+            }).reset_index()
+            
+            # Aplanar multiíndice
+            if 'Cantidad litros' in df.columns and 'Rendimiento' in df.columns:
+                bus_stats.columns = ['Bus', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 
+                                   'Sobreconsumos', 'Rendimiento Promedio', 'Rendimiento Mediana']
+                
+                # Calcular porcentaje de sobreconsumo
+                bus_stats['% Sobreconsumos'] = (bus_stats['Sobreconsumos'] / bus_stats['Cantidad Cargas'] * 100).round(2)
+                
+                # Ordenar por rendimiento (descendente)
+                bus_stats = bus_stats.sort_values('Rendimiento Promedio', ascending=False)
+                
+                # Escribir encabezados
+                encabezados = ['Bus', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 
+                             'Sobreconsumos', '% Sobre', 'Rendimiento Promedio', 'Rendimiento Mediana']
+            elif 'Cantidad litros' in df.columns:
+                bus_stats.columns = ['Bus', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 
+                                   'Sobreconsumos', 'Rendimiento Count']
+                
+                # Calcular porcentaje de sobreconsumo
+                bus_stats['% Sobreconsumos'] = (bus_stats['Sobreconsumos'] / bus_stats['Cantidad Cargas'] * 100).round(2)
+                
+                # Ordenar por total litros (descendente)
+                bus_stats = bus_stats.sort_values('Total Litros', ascending=False)
+                
+                # Escribir encabezados
+                encabezados = ['Bus', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 
+                             'Sobreconsumos', '% Sobre', 'Rendimiento Count']
+            else:
+                bus_stats.columns = ['Bus', 'Cantidad Cargas', 'Sobreconsumos', 'Rendimiento Count']
+                
+                # Ordenar por cantidad de cargas (descendente)
+                bus_stats = bus_stats.sort_values('Cantidad Cargas', ascending=False)
+                
+                # Escribir encabezados
+                encabezados = ['Bus', 'Cantidad Cargas', 'Sobreconsumos', 'Rendimiento Count']
+            
+            # Escribir encabezados
+            for i, encabezado in enumerate(encabezados, start=1):
+                cell = ws_bus.cell(row=1, column=i, value=encabezado)
+                cell.font = header_font
+                cell.fill = header_fill
+                cell.alignment = header_alignment
+                cell.border = border
+            
+            # Escribir datos
+            for i, row in enumerate(dataframe_to_rows(bus_stats, index=False, header=False), start=2):
+                for j, value in enumerate(row, start=1):
+                    if j == 1:  # Bus
+                        cell = ws_bus.cell(row=i, column=j, value=value)
+                    elif j in [2, 3, 7, 8]:  # Valores numéricos con decimales
+                        cell = ws_bus.cell(row=i, column=j, value=value)
+                        cell.number_format = '#,##0.00'
+                    elif j == 6:  # Porcentaje
+                        cell = ws_bus.cell(row=i, column=j, value=value/100)  # Convertir a decimal para formato de porcentaje
+                        cell.number_format = '0.00%'
+                    else:  # Valores enteros
+                        cell = ws_bus.cell(row=i, column=j, value=value)
+                        cell.number_format = '#,##0'
+                    
+                    # Estilo común
+                    cell.font = normal_font
+                    cell.border = border
+                    cell.alignment = number_alignment if j > 1 else normal_alignment
+                
+                # Filas alternas
+                if i % 2 == 0:
+                    for j in range(1, len(encabezados) + 1):
+                        ws_bus.cell(row=i, column=j).fill = PatternFill(start_color='F5F5F5', end_color='F5F5F5', fill_type='solid')
+            
+            # Ajustar anchos de columna
+            for i, ancho in enumerate([15, 15, 15, 15, 15, 10, 20, 20], start=1):
+                if i <= len(encabezados):
+                    ws_bus.column_dimensions[openpyxl.utils.get_column_letter(i)].width = ancho
+        
+        # ----- DATOS COMPLETOS -----
+        ws_datos = workbook.create_sheet(title='Datos Completos')
+        
+        # Determinar columnas a incluir (evitar columnas derivadas)
+        cols_a_excluir = [
+            'Día Orden', 'Semana', 'Posible Mala Carga', 'Rendimiento Anómalo',
+            'Km Sospechosos', 'Cargas Terminal', 'Índice Eficiencia'
+        ]
+        
+        cols_a_incluir = [col for col in df.columns if col not in cols_a_excluir]
+        
+        # Escribir encabezados
+        for i, encabezado in enumerate(cols_a_incluir, start=1):
+            cell = ws_datos.cell(row=1, column=i, value=encabezado)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = header_alignment
+            cell.border = border
+        
+        # Ordenar datos por fecha si está disponible
+        if 'Fecha' in df.columns:
+            datos_a_escribir = df[cols_a_incluir].sort_values('Fecha', ascending=False)
+        else:
+            datos_a_escribir = df[cols_a_incluir]
+        
+        # Escribir datos
+        for i, row in enumerate(dataframe_to_rows(datos_a_escribir.head(1000), index=False, header=False), start=2):  # Limitar a 1000 filas para evitar archivos demasiado grandes
+            for j, value in enumerate(row, start=1):
+                # Manejar tipos específicos
+                if cols_a_incluir[j-1] == 'Fecha' and value is not None:
+                    cell = ws_datos.cell(row=i, column=j, value=value)
+                    cell.number_format = 'DD/MM/YYYY'
+                elif cols_a_incluir[j-1] == 'Hora' and value is not None:
+                    cell = ws_datos.cell(row=i, column=j, value=value)
+                    cell.number_format = 'HH:MM'
+                elif cols_a_incluir[j-1] in ['Cantidad litros', 'Rendimiento', 'Z-Score', 'Promedio Modelo', 'Desviación Modelo'] and value is not None:
+                    cell = ws_datos.cell(row=i, column=j, value=value)
+                    cell.number_format = '#,##0.00'
+                elif cols_a_incluir[j-1] in ['Mala Carga', 'Sobreconsumo', 'Outlier Extremo', 'Es Fin de Semana', 'Hora Pico', 'Llenado Completo'] and value is not None:
+                    cell = ws_datos.cell(row=i, column=j, value=value)
+                    # Resaltar valores True
+                    if value == True:
+                        if cols_a_incluir[j-1] == 'Mala Carga':
+                            cell.fill = PatternFill(start_color='F94144', end_color='F94144', fill_type='solid')
+                        elif cols_a_incluir[j-1] == 'Sobreconsumo':
+                            cell.fill = PatternFill(start_color='F8961E', end_color='F8961E', fill_type='solid')
+                        elif cols_a_incluir[j-1] == 'Outlier Extremo':
+                            cell.fill = PatternFill(start_color='F9C74F', end_color='F9C74F', fill_type='solid')
+                else:
+                    cell = ws_datos.cell(row=i, column=j, value=value)
+                
+                # Estilo común
+                cell.font = normal_font
+                cell.border = border
+        
+        # Ajustar anchos de columna automáticamente
+        for i, col in enumerate(cols_a_incluir, start=1):
+            # Ancho predeterminado basado en el tipo de columna
+            if col in ['Fecha', 'Hora', 'Día', 'Mes']:
+                ancho = 12
+            elif col in ['Terminal', 'Modelo chasis', 'Nombre conductor', 'Nombre Planillero', 'Nombre supervisor']:
+                ancho = 25
+            elif col in ['Número interno', 'Patente']:
+                ancho = 15
+            elif col in ['Cantidad litros', 'Rendimiento', 'Z-Score', 'Promedio Modelo']:
+                ancho = 15
+            else:
+                ancho = 15
+            
+            ws_datos.column_dimensions[openpyxl.utils.get_column_letter(i)].width = ancho
+        
+        # Guardar el libro
+        workbook.save(output)
+        
+    except Exception as e:
+        # Si falla la exportación avanzada, intentar con pandas básico
+        print(f"Error en la exportación avanzada: {e}")
+        
+        with pd.ExcelWriter(output, engine='openpyxl') as writer:
+            # Resumen general
+            resumen = pd.DataFrame({
+                'Métrica': [
+                    'Total Cargas', 
+                    'Total Litros', 
+                    'Promedio Litros/Carga', 
+                    'Malas Cargas', 
+                    'Cargas con Sobreconsumo',
+                    'Litros en Sobreconsumo',
+                    'Total Buses',
+                    'Total Terminales',
+                    'Total Conductores'
+                ],
+                'Valor': [
+                    len(df),
+                    f"{df['Cantidad litros'].sum():,.2f}" if 'Cantidad litros' in df.columns else 'N/A',
+                    f"{df['Cantidad litros'].mean():,.2f}" if 'Cantidad litros' in df.columns else 'N/A',
+                    f"{df['Mala Carga'].sum()}" if 'Mala Carga' in df.columns else 'N/A',
+                    f"{df['Sobreconsumo'].sum()}" if 'Sobreconsumo' in df.columns else 'N/A',
+                    f"{df.loc[df['Sobreconsumo'] == True, 'Cantidad litros'].sum():,.2f}" if 'Sobreconsumo' in df.columns and 'Cantidad litros' in df.columns else 'N/A',
+                    f"{df['Número interno'].nunique()}" if 'Número interno' in df.columns else 'N/A',
+                    f"{df['Terminal'].nunique()}" if 'Terminal' in df.columns else 'N/A',
+                    f"{df['Nombre conductor'].nunique()}" if 'Nombre conductor' in df.columns else 'N/A'
+                ]
+            })
+            resumen.to_excel(writer, sheet_name='Resumen General', index=False)
+            
+            # Consumo diario
+            if 'Fecha' in df.columns and 'Cantidad litros' in df.columns:
+                consumo_diario = df.groupby(df['Fecha'].dt.date)['Cantidad litros'].agg(['sum', 'mean', 'count']).reset_index()
+                consumo_diario.columns = ['Fecha', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas']
+                consumo_diario.to_excel(writer, sheet_name='Consumo Diario', index=False)
+            
+            # Análisis por terminal
+            if 'Terminal' in df.columns:
+                terminal_stats = df.groupby('Terminal').agg({
+                    'Cantidad litros': ['sum', 'mean', 'count'] if 'Cantidad litros' in df.columns else 'count',
+                    'Mala Carga': 'sum' if 'Mala Carga' in df.columns else 'count',
+                    'Sobreconsumo': 'sum' if 'Sobreconsumo' in df.columns else 'count'
+                }).reset_index()
+                
+                # Aplanar los nombres de columnas multiíndice
+                terminal_stats.columns = ['Terminal', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 
+                                        'Malas Cargas', 'Sobreconsumos']
+                
+                terminal_stats.to_excel(writer, sheet_name='Por Terminal', index=False)
+            
+            # Análisis por modelo
+            if 'Modelo chasis' in df.columns:
+                modelo_stats = df.groupby('Modelo chasis').agg({
+                    'Cantidad litros': ['sum', 'mean', 'count'] if 'Cantidad litros' in df.columns else 'count',
+                    'Sobreconsumo': 'sum' if 'Sobreconsumo' in df.columns else 'count',
+                    'Rendimiento': ['mean', 'median', 'std'] if 'Rendimiento' in df.columns else 'count'
+                }).reset_index()
+                
+                # Aplanar los nombres de columnas multiíndice
+                if 'Rendimiento' in df.columns:
+                    modelo_stats.columns = ['Modelo', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 
+                                            'Sobreconsumos', 'Rendimiento Promedio', 'Rendimiento Mediana', 
+                                            'Rendimiento Desviación']
+                else:
+                    modelo_stats.columns = ['Modelo', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 
+                                            'Sobreconsumos', 'Rendimiento Count']
+                
+                modelo_stats.to_excel(writer, sheet_name='Por Modelo', index=False)
+            
+            # Malas cargas
+            if 'Mala Carga' in df.columns:
+                malas_cargas = df[df['Mala Carga'] == True]
+                if not malas_cargas.empty:
+                    cols_relevantes = [col for col in [
+                        'Fecha', 'Hora', 'Terminal', 'Número interno', 'Patente', 
+                        'Cantidad litros', 'Tipo', 'Nombre Planillero', 'Nombre supervisor'
+                    ] if col in malas_cargas.columns]
+                    malas_cargas[cols_relevantes].to_excel(writer, sheet_name='Malas Cargas', index=False)
+            
+            # Sobreconsumo
+            if 'Sobreconsumo' in df.columns:
+                sobreconsumo = df[df['Sobreconsumo'] == True]
+                if not sobreconsumo.empty:
+                    cols_relevantes = [col for col in [
+                        'Fecha', 'Hora', 'Terminal', 'Número interno', 'Patente', 'Modelo chasis',
+                        'Cantidad litros', 'Z-Score', 'Promedio Modelo', 'Nombre conductor', 'Nombre supervisor'
+                    ] if col in sobreconsumo.columns]
+                    sobreconsumo[cols_relevantes].to_excel(writer, sheet_name='Sobreconsumo', index=False)
+            
+            # Por conductor
+            if 'Nombre conductor' in df.columns:
+                conductor_stats = df.groupby('Nombre conductor').agg({
+                    'Cantidad litros': ['sum', 'mean', 'count'] if 'Cantidad litros' in df.columns else 'count',
+                    'Sobreconsumo': 'sum' if 'Sobreconsumo' in df.columns else 'count'
+                }).reset_index()
+                
+                # Aplanar los nombres de columnas multiíndice
+                conductor_stats.columns = ['Conductor', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 'Sobreconsumos']
+                
+                conductor_stats.to_excel(writer, sheet_name='Por Conductor', index=False)
+            
+            # Por bus
+            if 'Número interno' in df.columns:
+                bus_stats = df.groupby('Número interno').agg({
+                    'Cantidad litros': ['sum', 'mean', 'count'] if 'Cantidad litros' in df.columns else 'count',
+                    'Sobreconsumo': 'sum' if 'Sobreconsumo' in df.columns else 'count',
+                    'Rendimiento': ['mean', 'median'] if 'Rendimiento' in df.columns else 'count'
+                }).reset_index()
+                
+                # Aplanar los nombres de columnas multiíndice
+                if 'Rendimiento' in df.columns:
+                    bus_stats.columns = ['Bus', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 
+                                        'Sobreconsumos', 'Rendimiento Promedio', 'Rendimiento Mediana']
+                else:
+                    bus_stats.columns = ['Bus', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 
+                                        'Sobreconsumos', 'Rendimiento Count']
+                
+                bus_stats.to_excel(writer, sheet_name='Por Bus', index=False)
+            
+            # Horas pico
+            if 'Hora Numérica' in df.columns and 'Cantidad litros' in df.columns:
+                hora_stats = df.groupby(np.round(df['Hora Numérica']).astype(int)).agg({
+                    'Cantidad litros': ['sum', 'count'],
+                    'Mala Carga': 'sum' if 'Mala Carga' in df.columns else 'count'
+                }).reset_index()
+                
+                # Aplanar los nombres de columnas multiíndice
+                hora_stats.columns = ['Hora', 'Total Litros', 'Cantidad Cargas', 'Malas Cargas']
+                
+                hora_stats.to_excel(writer, sheet_name='Por Hora', index=False)
+            
+            # Datos completos
+            df.to_excel(writer, sheet_name='Datos Completos', index=False)
+    
+    output.seek(0)
+    return output
@@ -0,0 +1,899 @@
+"""
+Gráficos reutilizables (series de tiempo, mapas de calor, barras, tortas y
+correlaciones) y el tablero configurable.
+"""
+import streamlit as st
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+from combustible.heatmap import heatmap_matrix, weekday_hour_codes
+
+from interfaz.componentes import create_kpi_card
+from interfaz.datos import get_day_index
+from interfaz.tema import get_colors
+
+
+# Función para generar gráfico de evolución temporal mejorado
+def plot_time_series(df, y_column, title, color=None, show_trend=True, show_annotations=True, range_selector=True):
+    # Sin color explícito se usa el primario del tema de la sesión
+    if color is None:
+        color = get_colors()['primary']
+    if 'Fecha' not in df.columns or y_column not in df.columns:
+        return None
+    
+    # Agrupar por fecha
+    df_agg = df.groupby(df['Fecha'].dt.date)[y_column].sum().reset_index()
+    
+    # Crear figura base
+    fig = px.line(
+        df_agg, 
+        x='Fecha', 
+        y=y_column,
+        title=title,
+        markers=True,
+    )
+    
+    # Personalizar diseño
+    fig.update_traces(
+        line=dict(color=color, width=3),
+        marker=dict(color=color, size=8)
+    )
+    
+    # Añadir línea de tendencia si hay suficientes datos
+    if show_trend and len(df_agg) > 2:
+        from sklearn.linear_model import HuberRegressor, LinearRegression
+        
+        X = np.array(range(len(df_agg))).reshape(-1, 1)
+        y = df_agg[y_column].values
+        
+        try:
+            # Intentar primero con regresión robusta
+            modelo = HuberRegressor()
+            modelo.fit(X, y)
+            tendencia = modelo.coef_[0]
+            tendencia_y = modelo.predict(X)
+        except:
+            # Fallback a regresión lineal estándar
+            modelo = LinearRegression()
+            modelo.fit(X, y)
+            tendencia = modelo.coef_[0]
+            tendencia_y = modelo.predict(X)
+        
+        # Añadir línea de tendencia
+        fig.add_trace(
+            go.Scatter(
+                x=df_agg['Fecha'],
+                y=tendencia_y,
+                mode='lines',
+                name='Tendencia',
+                line=dict(color='red', width=2, dash='dash')
+            )
+        )
+        
+        # Añadir anotación con la tendencia
+        if show_annotations:
+            promedio = np.mean(y)
+            porcentaje_cambio = (tendencia / promedio) * 100
+            
+            tendencia_texto = f"Tendencia: {'+' if tendencia > 0 else ''}{tendencia:.2f} ({'+' if tendencia > 0 else ''}{porcentaje_cambio:.2f}% diario)"
+            
+            fig.add_annotation(
+                x=df_agg['Fecha'].iloc[-1],
+                y=tendencia_y[-1],
+                text=tendencia_texto,
+                showarrow=True,
+                arrowhead=2,
+                arrowsize=1,
+                arrowwidth=2,
+                arrowcolor='red',
+                ax=50,
+                ay=-30
+            )
+    
+    # Añadir rangos de selección
+    if range_selector:
+        fig.update_layout(
+            xaxis=dict(
+                rangeselector=dict(
+                    buttons=list([
+                        dict(count=7, label="7d", step="day", stepmode="backward"),
+                        dict(count=1, label="1m", step="month", stepmode="backward"),
+                        dict(count=3, label="3m", step="month", stepmode="backward"),
+                        dict(step="all")
+                    ])
+                ),
+                rangeslider=dict(visible=True),
+                type="date"
+            )
+        )
+    
+    fig.update_layout(
+        xaxis_title="Fecha",
+        yaxis_title=y_column,
+        plot_bgcolor='white',
+        hovermode='x unified',
+        height=450,
+        margin=dict(l=40, r=40, t=60, b=40),
+    )
+    
+    return fig
+
+# Función mejorada para detectar anomalías
+def detect_anomalies(df, column, group_by=None, threshold=3, method='zscore'):
+    """
+    Detecta anomalías usando diversos métodos.
+    
+    Args:
+        df: DataFrame con los datos
+        column: Columna a analizar
+        group_by: Columna para agrupar (opcional)
+        threshold: Umbral para detectar anomalías
+        method: Método de detección ('zscore', 'iqr', 'isolation_forest')
+    
+    Returns:
+        DataFrame con columna 'Es_Anomalía' añadida
+    """
+    # Copia superficial: con copy-on-write comparte las columnas de ``df``
+    result = df.copy(deep=False)
+    
+    # Método por Z-Score (desviaciones estándar)
+    if method == 'zscore':
+        from scipy import stats
+        
+        if group_by:
+            for name, group in df.groupby(group_by, observed=True):
+                z_scores = np.abs(stats.zscore(group[column], nan_policy='omit'))
+                result.loc[group.index, 'Es_Anomalía'] = z_scores > threshold
+        else:
+            z_scores = np.abs(stats.zscore(df[column], nan_policy='omit'))
+            result['Es_Anomalía'] = z_scores > threshold
+    
+    # Método por rango intercuartil (IQR)
+    elif method == 'iqr':
+        if group_by:
+            for name, group in df.groupby(group_by, observed=True):
+                q1 = group[column].quantile(0.25)
+                q3 = group[column].quantile(0.75)
+                iqr = q3 - q1
+                lower_bound = q1 - threshold * iqr
+                upper_bound = q3 + threshold * iqr
+                result.loc[group.index, 'Es_Anomalía'] = (group[column] < lower_bound) | (group[column] > upper_bound)
+        else:
+            q1 = df[column].quantile(0.25)
+            q3 = df[column].quantile(0.75)
+            iqr = q3 - q1
+            lower_bound = q1 - threshold * iqr
+            upper_bound = q3 + threshold * iqr
+            result['Es_Anomalía'] = (df[column] < lower_bound) | (df[column] > upper_bound)
+    
+    # Método por Isolation Forest (machine learning)
+    elif method == 'isolation_forest':
+        from sklearn.ensemble import IsolationForest
+        
+        if group_by:
+            for name, group in df.groupby(group_by, observed=True):
+                if len(group) > 10:  # Necesitamos suficientes datos
+                    try:
+                        iso = IsolationForest(contamination=float(threshold/100), random_state=42)
+                        result.loc[group.index, 'Es_Anomalía'] = iso.fit_predict(group[[column]]) == -1
+                    except:
+                        # Si falla, usar z-score como fallback
+                        z_scores = np.abs(stats.zscore(group[column], nan_policy='omit'))
+                        result.loc[group.index, 'Es_Anomalía'] = z_scores > 3
+        else:
+            if len(df) > 10:
+                try:
+                    iso = IsolationForest(contamination=float(threshold/100), random_state=42)
+                    result['Es_Anomalía'] = iso.fit_predict(df[[column]].fillna(df[column].mean()).values) == -1
+                except:
+                    # Si falla, usar z-score como fallback
+                    z_scores = np.abs(stats.zscore(df[column], nan_policy='omit'))
+                    result['Es_Anomalía'] = z_scores > 3
+    
+    return result
+
+# Función mejorada para crear mapa de calor por horario
+def create_heatmap(df, value_column='Cantidad litros', normalized=False, title=None, aggfunc='mean', matriz=None):
+    """
+    Mapa de calor día de la semana × hora.
+
+    Args:
+        df: DataFrame con 'Día Semana' y 'Hora Numérica' (no se modifica)
+        value_column: Columna a agregar (se ignora con ``aggfunc='count'``)
+        normalized: Normalizar cada día por su máximo
+        title: Título del gráfico
+        aggfunc: 'count', 'sum' o 'mean'
+        matriz: Matriz ya calculada (por ejemplo ``DayIndex.heatmap``); si se
+            entrega, ``df`` no se recorre
+    """
+    if matriz is None:
+        if 'Día Semana' not in df.columns or 'Hora Numérica' not in df.columns:
+            return None
+        valores = None if aggfunc == 'count' else df[value_column]
+        matriz = heatmap_matrix(weekday_hour_codes(df), valores, aggfunc)
+    pivot = matriz
+    etiqueta = 'Cantidad de Cargas' if aggfunc == 'count' else value_column
+    
+    # Normalizar valores (opcional)
+    if normalized:
+        # Normalizar para cada día de la semana
+        pivot = pivot.div(pivot.max(axis=1), axis=0).fillna(0)
+    
+    # Crear título si no se proporciona
+    if title is None:
+        if normalized:
+            title = f"Mapa de calor normalizado: {etiqueta} por día y hora"
+        else:
+            title = f"Mapa de calor: {etiqueta} por día y hora"
+    
+    # Crear heatmap
+    fig = px.imshow(
+        pivot,
+        labels=dict(x="Hora del día", y="Día de la semana", color=etiqueta),
+        x=pivot.columns,
+        y=pivot.index,
+        color_continuous_scale="Viridis",
+        aspect="auto"
+    )
+    
+    fig.update_layout(
+        title=title,
+        height=470,
+        margin=dict(l=40, r=40, b=40, t=50),
+        plot_bgcolor='white',
+        xaxis=dict(
+            tickmode='linear',
+            tick0=0,
+            dtick=2,  # Mostrar etiquetas cada 2 horas
+            tickangle=0
+        )
+    )
+    
+    # Añadir anotaciones para valores clave
+    max_value = pivot.max().max()
+    
+    max_idx = np.where(pivot.values == max_value)
+    if len(max_idx[0]) > 0 and len(max_idx[1]) > 0:
+        row_idx, col_idx = max_idx[0][0], max_idx[1][0]
+        day = pivot.index[row_idx]
+        hour = pivot.columns[col_idx]
+        
+        fig.add_annotation(
+            x=hour,
+            y=day,
+            text=f"Máx: {max_value:.2f}",
+            showarrow=True,
+            arrowhead=2,
+            arrowsize=1,
+            arrowwidth=2,
+            arrowcolor="white",
+            font=dict(color="white", size=10),
+            bordercolor="white",
+            bgcolor="rgba(0,0,0,0.5)",
+            borderwidth=1,
+            borderpad=4,
+            ax=25,
+            ay=-25
+        )
+    
+    return fig
+
+# Función mejorada para crear gráfico de barras por categoría
+def plot_bar_chart(df, x_column, y_column, title, color=None, horizontal=False, top_n=None, 
+                   show_values=True, color_by_value=True, add_mean_line=True):
+    colors = get_colors()
+    if x_column not in df.columns or y_column not in df.columns:
+        return None
+    
+    # Agrupar datos
+    df_agg = df.groupby(x_column, observed=True)[y_column].sum().reset_index()
+    
+    # Ordenar por valor y limitar a top_n si se especifica
+    df_agg = df_agg.sort_values(y_column, ascending=False)
+    
+    if top_n and len(df_agg) > top_n:
+        df_agg = df_agg.head(top_n)
+    
+    # Crear gráfico
+    if color_by_value:
+        # Usar un gradiente de color basado en los valores
+        if horizontal:
+            fig = px.bar(
+                df_agg,
+                y=x_column,
+                x=y_column,
+                title=title,
+                color=y_column,
+                color_continuous_scale='Viridis',
+                orientation='h',
+                text=y_column if show_values else None
+            )
+        else:
+            fig = px.bar(
+                df_agg,
+                x=x_column,
+                y=y_column,
+                title=title,
+                color=y_column,
+                color_continuous_scale='Viridis',
+                text=y_column if show_values else None
+            )
+    else:
+        # Usar un color uniforme
+        bar_color = color if color else colors['primary']
+        
+        if horizontal:
+            fig = px.bar(
+                df_agg,
+                y=x_column,
+                x=y_column,
+                title=title,
+                color_discrete_sequence=[bar_color],
+                orientation='h',
+                text=y_column if show_values else None
+            )
+        else:
+            fig = px.bar(
+                df_agg,
+                x=x_column,
+                y=y_column,
+                title=title,
+                color_discrete_sequence=[bar_color],
+                text=y_column if show_values else None
+            )
+    
+    # Formato para los valores en las barras
+    if show_values:
+        fig.update_traces(
+            texttemplate='%{text:.1f}',
+            textposition='outside'
+        )
+    
+    # Añadir línea para el promedio
+    if add_mean_line:
+        promedio = df_agg[y_column].mean()
+        
+        if horizontal:
+            fig.add_vline(
+                x=promedio,
+                line_dash="dash",
+                line_color="red",
+                annotation_text=f"Media: {promedio:.2f}",
+                annotation_position="top right"
+            )
+        else:
+            fig.add_hline(
+                y=promedio,
+                line_dash="dash",
+                line_color="red",
+                annotation_text=f"Media: {promedio:.2f}",
+                annotation_position="top right"
+            )
+    
+    # Personalizar diseño
+    fig.update_layout(
+        plot_bgcolor='white',
+        height=450,
+        margin=dict(l=40, r=40, t=60, b=80),
+        xaxis_tickangle=-45 if not horizontal and len(df_agg) > 5 else 0
+    )
+    
+    return fig
+
+# Función para crear gráficos circulares mejorados
+def plot_pie_chart(df, category_column, value_column=None, title=None, hole=0.4, show_percents=True):
+    if category_column not in df.columns:
+        return None
+    
+    # Si no se proporciona columna de valor, se cuenta la frecuencia
+    if value_column is None or value_column not in df.columns:
+        df_agg = df.groupby(category_column, observed=True).size().reset_index()
+        df_agg.columns = [category_column, 'Count']
+        values = 'Count'
+        if title is None:
+            title = f"Distribución por {category_column}"
+    else:
+        df_agg = df.groupby(category_column, observed=True)[value_column].sum().reset_index()
+        values = value_column
+        if title is None:
+            title = f"{value_column} por {category_column}"
+    
+    # Ordenar por valor (descendente)
+    df_agg = df_agg.sort_values(values, ascending=False)
+    
+    # Crear gráfico
+    fig = px.pie(
+        df_agg,
+        names=category_column,
+        values=values,
+        title=title,
+        hole=hole,
+        color_discrete_sequence=px.colors.sequential.Viridis
+    )
+    
+    # Configurar información textual
+    if show_percents:
+        fig.update_traces(
+            textposition='inside',
+            textinfo='percent+label'
+        )
+    else:
+        fig.update_traces(
+            textposition='inside',
+            textinfo='label+value'
+        )
+    
+    # Estilo
+    fig.update_layout(
+        plot_bgcolor='white',
+        height=450,
+        margin=dict(l=20, r=20, t=50, b=20),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=-0.2,
+            xanchor="center",
+            x=0.5
+        )
+    )
+    
+    return fig
+
+# Función para generar gráficos de correlación
+def plot_correlation(df, x_column, y_column, color_column=None, size_column=None, title=None, 
+                     add_trendline=True, add_annotations=True):
+    """
+    Crea un gráfico de dispersión para analizar la correlación entre dos variables.
+    
+    Args:
+        df: DataFrame con los datos
+        x_column: Columna para el eje X
+        y_column: Columna para el eje Y
+        color_column: Columna para colorear puntos (opcional)
+        size_column: Columna para el tamaño de los puntos (opcional)
+        title: Título del gráfico
+        add_trendline: Si se debe añadir línea de tendencia
+        add_annotations: Si se deben añadir anotaciones con estadísticas
+    """
+    colors = get_colors()
+    if x_column not in df.columns or y_column not in df.columns:
+        return None
+    
+    # Filtrar valores válidos
+    df_clean = df.dropna(subset=[x_column, y_column])
+    
+    if len(df_clean) < 2:
+        return None
+    
+    # Título predeterminado
+    if title is None:
+        title = f"Correlación entre {x_column} y {y_column}"
+    
+    # Crear gráfico base
+    if color_column is not None and color_column in df.columns:
+        if size_column is not None and size_column in df.columns:
+            fig = px.scatter(
+                df_clean,
+                x=x_column,
+                y=y_column,
+                color=color_column,
+                size=size_column,
+                title=title,
+                opacity=0.7
+            )
+        else:
+            fig = px.scatter(
+                df_clean,
+                x=x_column,
+                y=y_column,
+                color=color_column,
+                title=title,
+                opacity=0.7
+            )
+    else:
+        fig = px.scatter(
+            df_clean,
+            x=x_column,
+            y=y_column,
+            title=title,
+            opacity=0.7,
+            color_discrete_sequence=[colors['primary']]
+        )
+    
+    # Añadir línea de tendencia
+    if add_trendline and len(df_clean) >= 3:
+        try:
+            # Calcular coeficiente de correlación
+            corr = df_clean[x_column].corr(df_clean[y_column])
+            
+            # Añadir línea de tendencia
+            fig.update_layout(
+                shapes=[
+                    dict(
+                        type='line',
+                        xref='x',
+                        yref='y',
+                        x0=df_clean[x_column].min(),
+                        y0=np.polyval(np.polyfit(df_clean[x_column], df_clean[y_column], 1), df_clean[x_column].min()),
+                        x1=df_clean[x_column].max(),
+                        y1=np.polyval(np.polyfit(df_clean[x_column], df_clean[y_column], 1), df_clean[x_column].max()),
+                        line=dict(color='red', width=2, dash='dash'),
+                    )
+                ]
+            )
+            
+            # Añadir anotación con correlación
+            if add_annotations:
+                corr_text = f"Correlación: {corr:.3f}"
+                fig.add_annotation(
+                    x=0.95,
+                    y=0.05,
+                    xref="paper",
+                    yref="paper",
+                    text=corr_text,
+                    showarrow=False,
+                    font=dict(size=12, color="black"),
+                    bgcolor="white",
+                    bordercolor="black",
+                    borderwidth=1,
+                    borderpad=4,
+                    align="right"
+                )
+        except Exception as e:
+            print(f"Error al añadir línea de tendencia: {e}")
+    
+    # Personalizar diseño
+    fig.update_layout(
+        plot_bgcolor='white',
+        height=450,
+        margin=dict(l=40, r=40, t=60, b=40),
+        xaxis=dict(
+            title=x_column,
+            zeroline=True,
+            zerolinewidth=1,
+            zerolinecolor='lightgray',
+            showgrid=True,
+            gridwidth=1,
+            gridcolor='lightgray'
+        ),
+        yaxis=dict(
+            title=y_column,
+            zeroline=True,
+            zerolinewidth=1,
+            zerolinecolor='lightgray',
+            showgrid=True,
+            gridwidth=1,
+            gridcolor='lightgray'
+        )
+    )
+    
+    return fig
+
+# Función para mostrar un dashboard dinámico
+def show_dashboard(df, metrics=None, charts=None, filters=None):
+    """
+    Muestra un dashboard interactivo con métricas y gráficos personalizables.
+    
+    Args:
+        df: DataFrame con los datos
+        metrics: Lista de métricas a mostrar
+        charts: Lista de gráficos a mostrar
+        filters: Lista de filtros a aplicar
+    """
+    colors = get_colors()
+    # Contenedor para todo el dashboard
+    dashboard = st.container()
+    
+    with dashboard:
+        # Aplicar filtros si se proporcionan (sin copiar los datos)
+        filtered_df = df.copy(deep=False)
+        if filters:
+            # Cada filtro aporta las posiciones de sus registros (desde el índice); se intersectan al final
+            indice = get_day_index(df)
+            selecciones = []
+            
+            # Crear contenedor para filtros
+            filter_container = st.container()
+            with filter_container:
+                st.markdown(f"<h3 class='section-title'>Filtros</h3>", unsafe_allow_html=True)
+                col1, col2, col3 = st.columns(3)
+                
+                # Filtro de fecha
+                if 'Fecha' in df.columns and 'fecha' in filters:
+                    with col1:
+                        min_date = df['Fecha'].min().date()
+                        max_date = df['Fecha'].max().date()
+                        date_range = st.date_input(
+                            "Rango de fechas",
+                            value=(min_date, max_date),
+                            min_value=min_date,
+                            max_value=max_date
+                        )
+                        
+                        if len(date_range) == 2:
+                            start_date, end_date = date_range
+                            selecciones.append(indice.positions(start_date, end_date))
+                
+                # Filtro de terminal
+                if 'Terminal' in df.columns and 'terminal' in filters:
+                    with col2:
+                        terminals = ['Todas'] + indice.entities('Terminal')
+                        selected_terminal = st.selectbox("Terminal", terminals)
+                        
+                        if selected_terminal != 'Todas':
+                            selecciones.append(indice.positions(dimension='Terminal', valor=selected_terminal))
+                
+                # Filtro de modelo
+                if 'Modelo chasis' in df.columns and 'modelo' in filters:
+                    with col3:
+                        modelos = ['Todos'] + indice.entities('Modelo chasis')
+                        selected_modelo = st.selectbox("Modelo", modelos)
+                        
+                        if selected_modelo != 'Todos':
+                           selecciones.append(indice.positions(dimension='Modelo chasis', valor=selected_modelo))
+                
+                # Filtro de bus
+                if 'Número interno' in df.columns and 'bus' in filters:
+                    with col1:
+                        buses = ['Todos'] + indice.entities('Número interno')
+                        selected_bus = st.selectbox("Bus", buses)
+                        
+                        if selected_bus != 'Todos':
+                            selecciones.append(indice.positions(dimension='Número interno', valor=selected_bus))
+                
+                # Filtro de conductor
+                if 'Nombre conductor' in df.columns and 'conductor' in filters:
+                    with col2:
+                        conductores = ['Todos'] + indice.entities('Nombre conductor')
+                        selected_conductor = st.selectbox("Conductor", conductores)
+                        
+                        if selected_conductor != 'Todos':
+                            selecciones.append(indice.positions(dimension='Nombre conductor', valor=selected_conductor))
+                
+                if selecciones:
+                    posiciones = selecciones[0]
+                    for otras in selecciones[1:]:
+                        posiciones = np.intersect1d(posiciones, otras, assume_unique=True)
+                    filtered_df = df.iloc[posiciones]
+                
+                # Mostrar cantidad de registros filtrados
+                st.markdown(f"<div style='margin-top: 10px; text-align: center; padding: 10px; background-color: {colors['light']}; border-radius: 10px;'>Mostrando {len(filtered_df)} de {len(df)} registros ({len(filtered_df)/len(df)*100:.1f}%)</div>", unsafe_allow_html=True)
+        
+        # Mostrar métricas
+        if metrics:
+            metrics_container = st.container()
+            with metrics_container:
+                st.markdown(f"<h3 class='section-title'>Métricas Clave</h3>", unsafe_allow_html=True)
+                cols = st.columns(len(metrics))
+                
+                for i, metric in enumerate(metrics):
+                    with cols[i]:
+                        if metric == 'total_cargas':
+                            value = len(filtered_df)
+                            delta = None
+                            if 'Fecha' in filtered_df.columns:
+                                # Calcular tendencia
+                                cargas_por_dia = filtered_df.groupby(filtered_df['Fecha'].dt.date).size()
+                                if len(cargas_por_dia) > 1:
+                                    first_half = cargas_por_dia.iloc[:len(cargas_por_dia)//2].mean()
+                                    second_half = cargas_por_dia.iloc[len(cargas_por_dia)//2:].mean()
+                                    delta = ((second_half / first_half) - 1) * 100 if first_half > 0 else 0
+                            
+                            st.markdown(create_kpi_card(
+                                "Total de Cargas", 
+                                f"{value:,}",
+                                delta,
+                                icon="🚌",
+                                color_class="primary",
+                                footnote=f"Durante el período analizado"
+                            ), unsafe_allow_html=True)
+                        
+                        elif metric == 'total_litros' and 'Cantidad litros' in filtered_df.columns:
+                            value = filtered_df['Cantidad litros'].sum()
+                            delta = None
+                            if 'Fecha' in filtered_df.columns:
+                                # Calcular tendencia
+                                litros_por_dia = filtered_df.groupby(filtered_df['Fecha'].dt.date)['Cantidad litros'].sum()
+                                if len(litros_por_dia) > 1:
+                                    first_half = litros_por_dia.iloc[:len(litros_por_dia)//2].mean()
+                                    second_half = litros_por_dia.iloc[len(litros_por_dia)//2:].mean()
+                                    delta = ((second_half / first_half) - 1) * 100 if first_half > 0 else 0
+                            
+                            st.markdown(create_kpi_card(
+                                "Total de Litros", 
+                                f"{value:,.0f}",
+                                delta,
+                                icon="⛽",
+                                color_class="info",
+                                footnote=f"Consumo total de combustible"
+                            ), unsafe_allow_html=True)
+                        
+                        elif metric == 'promedio_carga' and 'Cantidad litros' in filtered_df.columns:
+                            value = filtered_df['Cantidad litros'].mean()
+                            global_avg = df['Cantidad litros'].mean()
+                            delta = ((value / global_avg) - 1) * 100 if global_avg > 0 else 0
+                            
+                            st.markdown(create_kpi_card(
+                                "Promedio por Carga", 
+                                f"{value:.2f} L",
+                                delta,
+                                icon="📊",
+                                color_class="success",
+                                footnote=f"Media: {df['Cantidad litros'].median():.2f} L"
+                            ), unsafe_allow_html=True)
+                        
+                        elif metric == 'malas_cargas' and 'Mala Carga' in filtered_df.columns:
+                            value = filtered_df['Mala Carga'].sum()
+                            pct = (value / len(filtered_df)) * 100 if len(filtered_df) > 0 else 0
+                            
+                            # Determinar color según porcentaje
+                            color_class = "success" if pct < 2 else "warning" if pct < 5 else "danger"
+                            
+                            st.markdown(create_kpi_card(
+                                "Malas Cargas", 
+                                f"{value:,}",
+                                -pct,  # Delta negativo (menos es mejor)
+                                icon="❌",
+                                color_class=color_class,
+                                footnote=f"{pct:.2f}% del total de cargas"
+                            ), unsafe_allow_html=True)
+                        
+                        elif metric == 'sobreconsumo' and 'Sobreconsumo' in filtered_df.columns:
+                            value = filtered_df['Sobreconsumo'].sum()
+                            pct = (value / len(filtered_df)) * 100 if len(filtered_df) > 0 else 0
+                            
+                            # Determinar color según porcentaje
+                            color_class = "success" if pct < 5 else "warning" if pct < 10 else "danger"
+                            
+                            st.markdown(create_kpi_card(
+                                "Sobreconsumos", 
+                                f"{value:,}",
+                                -pct,  # Delta negativo (menos es mejor)
+                                icon="⚠️",
+                                color_class=color_class,
+                                footnote=f"{pct:.2f}% del total de cargas"
+                            ), unsafe_allow_html=True)
+                        
+                        elif metric == 'rendimiento' and 'Rendimiento' in filtered_df.columns:
+                            value = filtered_df['Rendimiento'].mean()
+                            global_avg = df['Rendimiento'].mean()
+                            delta = ((value / global_avg) - 1) * 100 if global_avg > 0 else 0
+                            
+                            st.markdown(create_kpi_card(
+                                "Rendimiento Promedio", 
+                                f"{value:.2f} km/L",
+                                delta,
+                                icon="🔄",
+                                color_class="primary",
+                                footnote=f"Media: {filtered_df['Rendimiento'].median():.2f} km/L"
+                            ), unsafe_allow_html=True)
+        
+        # Mostrar gráficos
+        if charts:
+            charts_container = st.container()
+            with charts_container:
+                st.markdown(f"<h3 class='section-title'>Visualizaciones</h3>", unsafe_allow_html=True)
+                
+                for chart in charts:
+                    if chart == 'evolucion_consumo' and 'Fecha' in filtered_df.columns and 'Cantidad litros' in filtered_df.columns:
+                        st.subheader("Evolución del Consumo")
+                        fig = plot_time_series(filtered_df, 'Cantidad litros', 'Evolución del Consumo Diario')
+                        if fig:
+                            st.plotly_chart(fig, use_container_width=True)
+                    
+                    elif chart == 'consumo_terminal' and 'Terminal' in filtered_df.columns and 'Cantidad litros' in filtered_df.columns:
+                        st.subheader("Consumo por Terminal")
+                        fig = plot_bar_chart(filtered_df, 'Terminal', 'Cantidad litros', 'Total Litros por Terminal', top_n=10)
+                        if fig:
+                            st.plotly_chart(fig, use_container_width=True)
+                    
+                    elif chart == 'consumo_modelo' and 'Modelo chasis' in filtered_df.columns and 'Cantidad litros' in filtered_df.columns:
+                        st.subheader("Consumo por Modelo")
+                        fig = plot_bar_chart(filtered_df, 'Modelo chasis', 'Cantidad litros', 'Total Litros por Modelo de Chasis', top_n=10)
+                        if fig:
+                            st.plotly_chart(fig, use_container_width=True)
+                    
+                    elif chart == 'heatmap_horario' and 'Hora Numérica' in filtered_df.columns and 'Día Semana' in filtered_df.columns:
+                        st.subheader("Distribución por Horario")
+                        # Selector para variable a mostrar
+                        variable = 'Cantidad de Cargas'
+                        if 'Cantidad litros' in filtered_df.columns:
+                            variable = st.radio("Variable a visualizar:", ["Cantidad de Cargas", "Cantidad litros"], horizontal=True)
+                        
+                        if variable == "Cantidad de Cargas":
+                            fig = create_heatmap(filtered_df, title="Mapa de calor: Cantidad de Cargas por día y hora", aggfunc='count')
+                        else:
+                            fig = create_heatmap(filtered_df, 'Cantidad litros', title="Mapa de calor: Consumo de Combustible por día y hora", aggfunc='sum')
+                        
+                        if fig:
+                            st.plotly_chart(fig, use_container_width=True)
+                    
+                    elif chart == 'distribucion_litros' and 'Cantidad litros' in filtered_df.columns:
+                        st.subheader("Distribución de Cargas")
+                        fig = px.histogram(
+                            filtered_df, 
+                            x='Cantidad litros',
+                            nbins=30,
+                            marginal='box',
+                            title='Distribución de la cantidad de litros por carga',
+                            color_discrete_sequence=[colors['primary']]
+                        )
+                        
+                        fig.update_layout(
+                            xaxis_title="Litros",
+                            yaxis_title="Frecuencia",
+                            plot_bgcolor='white'
+                        )
+                        
+                        # Marcar anomalías
+                        if 'Sobreconsumo' in filtered_df.columns:
+                            # Umbral para sobreconsumo
+                            umbral = filtered_df[~filtered_df['Sobreconsumo']]['Cantidad litros'].mean() * 1.2
+                            
+                            fig.add_vline(
+                                x=umbral, 
+                                line_dash="dash", 
+                                line_color="red",
+                                annotation_text="Umbral Sobreconsumo"
+                            )
+                        
+                        st.plotly_chart(fig, use_container_width=True)
+                    
+                    elif chart == 'top_buses' and 'Número interno' in filtered_df.columns and 'Cantidad litros' in filtered_df.columns:
+                        st.subheader("Top Buses por Consumo")
+                        # Agrupar por bus
+                        top_buses = filtered_df.groupby('Número interno')['Cantidad litros'].sum().reset_index()
+                        top_buses = top_buses.sort_values('Cantidad litros', ascending=False).head(10)
+                        
+                        fig = px.bar(
+                            top_buses,
+                            x='Número interno',
+                            y='Cantidad litros',
+                            title='Top 10 Buses con Mayor Consumo Total',
+                            color='Cantidad litros',
+                            color_continuous_scale='Viridis',
+                            text='Cantidad litros'
+                        )
+                        
+                        fig.update_traces(
+                            texttemplate='%{text:.1f}',
+                            textposition='outside'
+                        )
+                        
+                        fig.update_layout(
+                            xaxis_title="Número de Bus",
+                            yaxis_title="Total Litros",
+                            plot_bgcolor='white'
+                        )
+                        
+                        st.plotly_chart(fig, use_container_width=True)
+                    
+                    elif chart == 'rendimiento_modelo' and 'Modelo chasis' in filtered_df.columns and 'Rendimiento' in filtered_df.columns:
+                        st.subheader("Rendimiento por Modelo")
+                        # Agrupar por modelo
+                        rendimiento_modelo = filtered_df.groupby('Modelo chasis')['Rendimiento'].mean().reset_index()
+                        rendimiento_modelo = rendimiento_modelo.sort_values('Rendimiento', ascending=False)
+                        
+                        fig = px.bar(
+                            rendimiento_modelo,
+                            x='Modelo chasis',
+                            y='Rendimiento',
+                            title='Rendimiento Promedio por Modelo de Chasis',
+                            color='Rendimiento',
+                            color_continuous_scale='Viridis',
+                            text='Rendimiento'
+                        )
+                        
+                        fig.update_traces(
+                            texttemplate='%{text:.2f}',
+                            textposition='outside'
+                        )
+                        
+                        fig.update_layout(
+                            xaxis_title="Modelo de Chasis",
+                            yaxis_title="Rendimiento (km/L)",
+                            plot_bgcolor='white'
+                        )
+                        
+                        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,234 @@
+"""
+Hallazgos automáticos que se muestran al inicio del dashboard.
+"""
+import numpy as np
+
+from combustible.cube import build_cube
+
+
+# Función para generar informes automáticos basados en patrones detectados
+def generate_insights(df, cubo=None):
+    """
+    Genera insights automáticos a partir de los datos analizados.
+    
+    Args:
+        df: DataFrame con los datos procesados
+        cubo: Cubo de agregados diarios de ``df`` (se construye si no se entrega)
+    
+    Returns:
+        Lista de insights con formato (título, descripción, tipo, importancia)
+    """
+    insights = []
+    
+    # Verificar columnas disponibles
+    has_litros = 'Cantidad litros' in df.columns
+    has_fecha = 'Fecha' in df.columns
+    has_terminal = 'Terminal' in df.columns
+    has_modelo = 'Modelo chasis' in df.columns
+    has_rendimiento = 'Rendimiento' in df.columns
+    has_mala_carga = 'Mala Carga' in df.columns
+    has_sobreconsumo = 'Sobreconsumo' in df.columns
+    
+    # Las agrupaciones por día, terminal y modelo se consultan en el cubo
+    if cubo is None:
+        cubo = build_cube(df)
+    total = cubo.rollup().iloc[0]
+    
+    # 1. Insight: Tendencia general de consumo
+    if has_litros and has_fecha:
+        try:
+            # Agrupar por fecha
+            consumo_diario = cubo.rollup(lambda fechas: fechas.dt.date)['Litros']
+            
+            if len(consumo_diario) >= 7:  # Al menos una semana de datos
+                from sklearn.linear_model import LinearRegression
+                
+                # Calcular tendencia
+                X = np.array(range(len(consumo_diario))).reshape(-1, 1)
+                y = consumo_diario.values
+                
+                modelo = LinearRegression()
+                modelo.fit(X, y)
+                tendencia = modelo.coef_[0]
+                
+                # Porcentaje de cambio diario
+                promedio = consumo_diario.mean()
+                porcentaje = (tendencia / promedio) * 100
+                
+                # Generar insight
+                if abs(porcentaje) > 1:  # Solo si es significativo
+                    if tendencia > 0:
+                        titulo = "🔼 Tendencia de consumo al alza"
+                        descripcion = f"El consumo de combustible está aumentando un {porcentaje:.2f}% diario. Evalúe si esto responde a un aumento en la operación o podría indicar una reducción en la eficiencia."
+                        tipo = "warning"
+                        importancia = 8 if porcentaje > 3 else 6
+                    else:
+                        titulo = "🔽 Tendencia de consumo a la baja"
+                        descripcion = f"El consumo de combustible está disminuyendo un {abs(porcentaje):.2f}% diario. Esto podría indicar una mejora en la eficiencia o una reducción en la operación."
+                        tipo = "success"
+                        importancia = 7 if abs(porcentaje) > 3 else 5
+                    
+                    insights.append((titulo, descripcion, tipo, importancia))
+        except Exception as e:
+            print(f"Error al generar insight de tendencia: {e}")
+    
+    # 2. Insight: Malas cargas
+    if has_mala_carga:
+        try:
+            total_malas = int(total['Malas Cargas'])
+            porcentaje_malas = total['% Malas Cargas']
+            
+            if porcentaje_malas > 2:
+                # Título y descripción
+                titulo = "❌ Nivel elevado de malas cargas"
+                descripcion = f"Se detectaron {total_malas} malas cargas ({porcentaje_malas:.2f}% del total). "
+                
+                # Análisis por terminal si está disponible
+                if has_terminal:
+                    pct_por_terminal = cubo.rollup('Terminal')['% Malas Cargas'].sort_values(ascending=False)
+                    
+                    if not pct_por_terminal.empty:
+                        peor_terminal = pct_por_terminal.index[0]
+                        pct_peor = pct_por_terminal.iloc[0]
+                        
+                        if pct_peor > 5:
+                            descripcion += f"La terminal {peor_terminal} muestra el mayor porcentaje ({pct_peor:.2f}%) de malas cargas."
+                
+                # Tipo e importancia
+                if porcentaje_malas > 5:
+                    tipo = "danger"
+                    importancia = 9
+                else:
+                    tipo = "warning"
+                    importancia = 7
+                
+                insights.append((titulo, descripcion, tipo, importancia))
+        except Exception as e:
+            print(f"Error al generar insight de malas cargas: {e}")
+    
+    # 3. Insight: Sobreconsumos
+    if has_sobreconsumo and has_litros:
+        try:
+            total_sobre = int(total['Sobreconsumos'])
+            porcentaje_sobre = total['% Sobreconsumo']
+            
+            if porcentaje_sobre > 5:
+                # Obtener litros en sobreconsumo
+                litros_sobre = total['Litros Sobreconsumo']
+                pct_litros = (litros_sobre / total['Litros']) * 100
+                
+                # Título y descripción
+                titulo = "⚠️ Nivel elevado de sobreconsumo"
+                descripcion = f"Se detectaron {total_sobre} cargas con sobreconsumo ({porcentaje_sobre:.2f}% del total), representando {litros_sobre:.2f} litros ({pct_litros:.2f}% del combustible total). "
+                
+                # Análisis por modelo si está disponible
+                if has_modelo:
+                    pct_por_modelo = cubo.rollup('Modelo chasis')['% Sobreconsumo'].sort_values(ascending=False)
+                    
+                    if not pct_por_modelo.empty:
+                        peor_modelo = pct_por_modelo.index[0]
+                        pct_peor = pct_por_modelo.iloc[0]
+                        
+                        if pct_peor > 10:
+                            descripcion += f"El modelo {peor_modelo} muestra el mayor porcentaje ({pct_peor:.2f}%) de sobreconsumos."
+                
+                # Tipo e importancia
+                if porcentaje_sobre > 10:
+                    tipo = "danger"
+                    importancia = 9
+                else:
+                    tipo = "warning"
+                    importancia = 7
+                
+                insights.append((titulo, descripcion, tipo, importancia))
+        except Exception as e:
+            print(f"Error al generar insight de sobreconsumos: {e}")
+    
+    # 4. Insight: Rendimiento
+    if has_rendimiento and has_modelo:
+        try:
+            rendimiento_global = total['Rendimiento Promedio']
+            
+            # Análisis por modelo
+            rendimiento_por_modelo = cubo.rollup('Modelo chasis')[['Rendimiento Promedio', 'Cargas con Rendimiento']]
+            rendimiento_por_modelo.columns = ['mean', 'count']
+            rendimiento_por_modelo = rendimiento_por_modelo.rename_axis('Modelo chasis').reset_index()
+            rendimiento_por_modelo = rendimiento_por_modelo[rendimiento_por_modelo['count'] >= 5]  # Al menos 5 mediciones
+            
+            if not rendimiento_por_modelo.empty:
+                # Encontrar modelos con rendimiento destacado (positivo o negativo)
+                rendimiento_por_modelo['diff_pct'] = (rendimiento_por_modelo['mean'] / rendimiento_global - 1) * 100
+                
+                # Mejor modelo
+                mejor_modelo = rendimiento_por_modelo.sort_values('mean', ascending=False).iloc[0]
+                if mejor_modelo['diff_pct'] > 10:  # Al menos 10% mejor que el promedio
+                    titulo = "🌟 Modelo con rendimiento destacado"
+                    descripcion = f"El modelo {mejor_modelo['Modelo chasis']} muestra un rendimiento promedio de {mejor_modelo['mean']:.2f} km/L, un {mejor_modelo['diff_pct']:.2f}% superior al promedio global ({rendimiento_global:.2f} km/L)."
+                    tipo = "success"
+                    importancia = 7
+                    
+                    insights.append((titulo, descripcion, tipo, importancia))
+                
+                # Peor modelo
+                peor_modelo = rendimiento_por_modelo.sort_values('mean', ascending=True).iloc[0]
+                if peor_modelo['diff_pct'] < -10:  # Al menos 10% peor que el promedio
+                    titulo = "⚠️ Modelo con bajo rendimiento"
+                    descripcion = f"El modelo {peor_modelo['Modelo chasis']} muestra un rendimiento promedio de {peor_modelo['mean']:.2f} km/L, un {abs(peor_modelo['diff_pct']):.2f}% inferior al promedio global ({rendimiento_global:.2f} km/L)."
+                    tipo = "warning"
+                    importancia = 6
+                    
+                    insights.append((titulo, descripcion, tipo, importancia))
+        except Exception as e:
+            print(f"Error al generar insight de rendimiento: {e}")
+    
+    # 5. Insight: Patrones de horario
+    if has_fecha and has_litros and 'Hora Numérica' in df.columns:
+        try:
+            # Consumo por hora
+            consumo_por_hora = df.groupby(np.round(df['Hora Numérica']).astype(int))['Cantidad litros'].mean()
+            
+            if not consumo_por_hora.empty:
+                # Pico de consumo
+                hora_pico = consumo_por_hora.idxmax()
+                valor_pico = consumo_por_hora.max()
+                promedio = consumo_por_hora.mean()
+                
+                if valor_pico > promedio * 1.2:  # Al menos 20% mayor que el promedio
+                    titulo = "⏰ Patrón horario de consumo"
+                    descripcion = f"Se detectó un pico de consumo promedio a las {hora_pico}:00 horas, con {valor_pico:.2f} litros por carga, un {(valor_pico/promedio-1)*100:.2f}% superior al promedio horario."
+                    tipo = "info"
+                    importancia = 5
+                    
+                    insights.append((titulo, descripcion, tipo, importancia))
+        except Exception as e:
+            print(f"Error al generar insight de patrones horarios: {e}")
+    
+    # 6. Insight: Eficiencia por terminal
+    if has_terminal and has_litros:
+        try:
+            # Consumo promedio por terminal
+            consumo_por_terminal = cubo.rollup('Terminal')['Promedio Litros'].sort_values()
+            
+            if len(consumo_por_terminal) >= 3:  # Al menos 3 terminales para comparar
+                mejor_terminal = consumo_por_terminal.index[0]
+                mejor_valor = consumo_por_terminal.iloc[0]
+                
+                peor_terminal = consumo_por_terminal.index[-1]
+                peor_valor = consumo_por_terminal.iloc[-1]
+                
+                diff_pct = ((peor_valor / mejor_valor) - 1) * 100
+                
+                if diff_pct > 15:  # Diferencia significativa
+                    titulo = "🏆 Diferencias de eficiencia entre terminales"
+                    descripcion = f"La terminal {mejor_terminal} muestra el menor consumo promedio ({mejor_valor:.2f} L/carga), mientras que {peor_terminal} tiene el mayor ({peor_valor:.2f} L/carga), un {diff_pct:.2f}% más alto."
+                    tipo = "info"
+                    importancia = 6
+                    
+                    insights.append((titulo, descripcion, tipo, importancia))
+        except Exception as e:
+            print(f"Error al generar insight de eficiencia por terminal: {e}")
+    
+    # Ordenar insights por importancia (descendente)
+    insights.sort(key=lambda x: x[3], reverse=True)
+    
+    return insights
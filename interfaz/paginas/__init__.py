@@ -0,0 +1,30 @@
+"""
+Secciones del menú lateral.
+
+Cada sección vive en su propio módulo con una función
+``render(df, cubo, indice)`` que recibe el DataFrame de la sesión, su cubo de
+agregados diarios y su índice por día (ver ``interfaz.datos``). El módulo se
+importa recién la primera vez que se abre la sección, y en cada rerun solo se
+ejecuta el código de la sección visible.
+"""
+import importlib
+
+
+# Nombre en el menú -> módulo de la sección, en el orden del menú
+SECCIONES = {
+    "Dashboard Principal": 'dashboard',
+    "Análisis por Terminal": 'terminal',
+    "Análisis por Buses": 'buses',
+    "Análisis por Personal": 'personal',
+    "Malas Cargas": 'malas_cargas',
+    "Detección de Sobreconsumo": 'sobreconsumo',
+    "Análisis Temporal": 'temporal',
+    "Rendimiento": 'rendimiento',
+    "Exportar Resultados": 'exportar',
+}
+
+
+def render_section(nombre, df, cubo, indice):
+    """Muestra la sección ``nombre`` del menú."""
+    modulo = importlib.import_module(f"{__name__}.{SECCIONES[nombre]}")
+    modulo.render(df, cubo, indice)
@@ -0,0 +1,643 @@
+"""
+Sección «Análisis por Buses»: consumo y rendimiento por bus y por modelo.
+"""
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+import datetime
+
+from combustible.binning import USO_BUS, categorize
+
+from interfaz.componentes import create_kpi_card, create_mini_stat, formatear_horas
+from interfaz.tema import get_colors
+
+
+def render(df, cubo, indice):
+    colors = get_colors()
+
+    st.markdown("<h2 class='subtitle'>Análisis por Buses</h2>", unsafe_allow_html=True)
+    
+    if 'Número interno' in df.columns:
+        # Selector de bus
+        buses = indice.entities('Número interno')
+        
+        col1, col2, col3 = st.columns([3, 1, 1])
+        
+        with col1:
+            bus_seleccionado = st.selectbox("Seleccionar Bus", ['Todos'] + list(buses))
+        
+        with col2:
+            if 'Fecha' in df.columns:
+                fecha_min = df['Fecha'].min().date()
+                fecha_max = df['Fecha'].max().date()
+            else:
+                fecha_min = datetime.date.today() - datetime.timedelta(days=30)
+                fecha_max = datetime.date.today()
+            
+            fecha_inicio = st.date_input("Fecha inicio", fecha_min, key="bus_fecha_inicio")
+        
+        with col3:
+            fecha_fin = st.date_input("Fecha fin", fecha_max, key="bus_fecha_fin")
+        
+        # Filtrar datos por bus seleccionado y fechas (por posición, en orden cronológico)
+        filtro = ('Número interno', bus_seleccionado) if bus_seleccionado != 'Todos' else (None, None)
+        totales = indice.totals(fecha_inicio, fecha_fin, *filtro)
+        df_bus = indice.rows(fecha_inicio, fecha_fin, *filtro, cronologico=bus_seleccionado != 'Todos')
+        
+        # Si seleccionamos un bus específico
+        if bus_seleccionado != 'Todos':
+            # Encabezado e info del bus
+            st.markdown(f"<h3 class='section-title'>Análisis Detallado: Bus {bus_seleccionado}</h3>", unsafe_allow_html=True)
+            
+            # Info general del bus
+            info_bus = {}
+            
+            if 'Patente' in df_bus.columns and not df_bus['Patente'].empty:
+                info_bus["Patente"] = df_bus['Patente'].iloc[0]
+            
+            if 'Modelo chasis' in df_bus.columns and not df_bus['Modelo chasis'].empty:
+                info_bus["Modelo"] = df_bus['Modelo chasis'].iloc[0]
+            
+            # Mostrar información básica
+            st.markdown("<h4>Información General</h4>", unsafe_allow_html=True)
+            
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                st.markdown(f"""
+                <div class="card">
+                    <h4>Identificación</h4>
+                    <p><strong>Número Interno:</strong> {bus_seleccionado}</p>
+                    <p><strong>Patente:</strong> {info_bus.get("Patente", "N/A")}</p>
+                    <p><strong>Modelo:</strong> {info_bus.get("Modelo", "N/A")}</p>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col2:
+                st.markdown(f"""
+                <div class="card">
+                    <h4>Estadísticas de Consumo</h4>
+                    <p><strong>Total Cargas:</strong> {int(totales['Cargas'])}</p>
+                    <p><strong>Total Litros:</strong> {totales['Litros']:.2f} L</p>
+                    <p><strong>Promedio por Carga:</strong> {totales['Promedio Litros']:.2f} L</p>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col3:
+                # Calcular métricas adicionales
+                malas_cargas = int(totales.get('Malas Cargas', 0))
+                sobreconsumos = int(totales.get('Sobreconsumos', 0))
+                cargas_bus = int(totales['Cargas'])
+                
+                st.markdown(f"""
+                <div class="card">
+                    <h4>Métricas de Calidad</h4>
+                    <p><strong>Malas Cargas:</strong> {malas_cargas} ({(malas_cargas/cargas_bus*100 if cargas_bus > 0 else 0):.2f}%)</p>
+                    <p><strong>Sobreconsumos:</strong> {sobreconsumos} ({(sobreconsumos/cargas_bus*100 if cargas_bus > 0 else 0):.2f}%)</p>
+                    <p><strong>Rendimiento:</strong> {totales['Rendimiento Promedio']:.2f} km/L</p>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            # Evolución de consumo
+            st.markdown("<h4>Evolución del Consumo</h4>", unsafe_allow_html=True)
+            
+            if 'Fecha' in df_bus.columns and 'Cantidad litros' in df_bus.columns:
+                tab1, tab2 = st.tabs(["📊 Consumo por Carga", "📈 Odómetro y Recorrido"])
+                
+                with tab1:
+                    # Gráfico de consumo por carga (df_bus ya está en orden cronológico)
+                    fig = px.line(
+                        df_bus,
+                        x='Fecha',
+                        y='Cantidad litros',
+                        title=f'Evolución del Consumo - Bus {bus_seleccionado}',
+                        markers=True
+                    )
+                    
+                    # Añadir media móvil si hay suficientes datos
+                    if len(df_bus) > 5:
+                        media_movil = df_bus['Cantidad litros'].rolling(window=3, min_periods=1).mean()
+                        
+                        fig.add_scatter(
+                            x=df_bus['Fecha'],
+                            y=media_movil,
+                            mode='lines',
+                            name='Media Móvil (3 cargas)',
+                            line=dict(color='red', width=2, dash='dash')
+                        )
+                    
+                    fig.update_layout(
+                        xaxis_title="Fecha",
+                        yaxis_title="Litros por Carga",
+                        plot_bgcolor='white',
+                        hovermode='x unified',
+                        height=400
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                
+                with tab2:
+                    if 'Odómetro' in df_bus.columns and 'Kilómetros Recorridos' in df_bus.columns:
+                        # Gráfico de odómetro y kilómetros recorridos
+                        
+                        # Crear figura con dos ejes Y
+                        fig = make_subplots(specs=[[{"secondary_y": True}]])
+                        
+                        # Añadir odómetro al eje primario
+                        fig.add_trace(
+                            go.Scatter(
+                                x=df_bus['Fecha'],
+                                y=df_bus['Odómetro'],
+                                name='Odómetro',
+                                line=dict(color=colors['primary'], width=2),
+                                mode='lines+markers'
+                            ),
+                            secondary_y=False
+                        )
+                        
+                        # Añadir kilómetros recorridos al eje secundario
+                        fig.add_trace(
+                            go.Bar(
+                                x=df_bus['Fecha'],
+                                y=df_bus['Kilómetros Recorridos'],
+                                name='Km Recorridos',
+                                marker_color=colors['secondary']
+                            ),
+                            secondary_y=True
+                        )
+                        
+                        # Actualizar ejes
+                        fig.update_layout(
+                            title=f'Evolución del Odómetro y Kilómetros Recorridos - Bus {bus_seleccionado}',
+                            plot_bgcolor='white',
+                            hovermode='x unified',
+                            height=400,
+                            legend=dict(
+                                orientation="h",
+                                yanchor="bottom",
+                                y=1.02,
+                                xanchor="right",
+                                x=1
+                            )
+                        )
+                        
+                        fig.update_xaxes(title_text="Fecha")
+                        fig.update_yaxes(title_text="Odómetro (km)", secondary_y=False)
+                        fig.update_yaxes(title_text="Kilómetros Recorridos", secondary_y=True)
+                        
+                        st.plotly_chart(fig, use_container_width=True)
+                    else:
+                        st.warning("No se encontraron datos de odómetro o kilómetros recorridos.")
+            
+            # Análisis de rendimiento
+            st.markdown("<h4>Análisis de Rendimiento</h4>", unsafe_allow_html=True)
+            
+            if 'Rendimiento' in df_bus.columns:
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    # Estadísticas de rendimiento
+                    rendimiento_medio = df_bus['Rendimiento'].mean()
+                    rendimiento_mediana = df_bus['Rendimiento'].median()
+                    rendimiento_min = df_bus['Rendimiento'].min()
+                    rendimiento_max = df_bus['Rendimiento'].max()
+                    
+                    # Comparar con el promedio del modelo
+                    rendimiento_modelo = None
+                    if 'Modelo chasis' in df_bus.columns and 'Rendimiento Promedio Modelo' in df_bus.columns:
+                        rendimiento_modelo = df_bus['Rendimiento Promedio Modelo'].mean()
+                    
+                    st.markdown(f"""
+                    <div class="card">
+                        <h4>Estadísticas de Rendimiento</h4>
+                        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 10px;">
+                            {create_mini_stat("📊", f"{rendimiento_medio:.2f} km/L", "Promedio")}
+                            {create_mini_stat("📏", f"{rendimiento_mediana:.2f} km/L", "Mediana")}
+                            {create_mini_stat("📉", f"{rendimiento_min:.2f} km/L", "Mínimo")}
+                            {create_mini_stat("📈", f"{rendimiento_max:.2f} km/L", "Máximo")}
+                        </div>
+                        {f'<p><strong>Comparación con el Modelo:</strong> {rendimiento_medio:.2f} km/L vs {rendimiento_modelo:.2f} km/L ({((rendimiento_medio/rendimiento_modelo)-1)*100:.2f}%)</p>' if rendimiento_modelo else ''}
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                with col2:
+                    # Gráfico de distribución de rendimiento
+                    fig = px.histogram(
+                        df_bus,
+                        x='Rendimiento',
+                        title='Distribución del Rendimiento',
+                        color_discrete_sequence=[colors['primary']]
+                    )
+                    
+                    fig.update_layout(
+                        xaxis_title="Rendimiento (km/L)",
+                        yaxis_title="Frecuencia",
+                        plot_bgcolor='white'
+                    )
+                    
+                    # Añadir línea para la media
+                    fig.add_vline(
+                        x=rendimiento_medio,
+                        line_dash="dash",
+                        line_color="red",
+                        annotation_text=f"Media: {rendimiento_medio:.2f} km/L"
+                    )
+                    
+                    # Añadir línea para el modelo si está disponible
+                    if rendimiento_modelo:
+                        fig.add_vline(
+                            x=rendimiento_modelo,
+                            line_dash="dash",
+                            line_color="green",
+                            annotation_text=f"Modelo: {rendimiento_modelo:.2f} km/L"
+                        )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                
+                # Evolución del rendimiento en el tiempo
+                if 'Fecha' in df_bus.columns:
+                    fig = px.line(
+                        df_bus,
+                        x='Fecha',
+                        y='Rendimiento',
+                        title='Evolución del Rendimiento en el Tiempo',
+                        markers=True
+                    )
+                    
+                    # Añadir media móvil si hay suficientes datos
+                    if len(df_bus) > 3:
+                        media_movil = df_bus['Rendimiento'].rolling(window=3, min_periods=1).mean()
+                        
+                        fig.add_scatter(
+                            x=df_bus['Fecha'],
+                            y=media_movil,
+                            mode='lines',
+                            name='Media Móvil (3 cargas)',
+                            line=dict(color='red', width=2, dash='dash')
+                        )
+                    
+                    fig.update_layout(
+                        xaxis_title="Fecha",
+                        yaxis_title="Rendimiento (km/L)",
+                        plot_bgcolor='white',
+                        hovermode='x unified',
+                        height=400
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+            
+            # Patrones operativos
+            st.markdown("<h4>Patrones Operativos</h4>", unsafe_allow_html=True)
+            
+            if 'Hora Numérica' in df_bus.columns:
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    # Distribución por hora del día
+                    hora_stats = df_bus.groupby(np.round(df_bus['Hora Numérica']).astype(int)).size().reset_index()
+                    hora_stats.columns = ['Hora', 'Cargas']
+                    
+                    fig = px.bar(
+                        hora_stats,
+                        x='Hora',
+                        y='Cargas',
+                        title='Cargas por Hora del Día',
+                        color='Cargas',
+                        color_continuous_scale='Viridis'
+                    )
+                    
+                    fig.update_layout(
+                        xaxis_title="Hora del Día",
+                        yaxis_title="Cantidad de Cargas",
+                        plot_bgcolor='white'
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                
+                with col2:
+                    if 'Terminal' in df_bus.columns:
+                        # Distribución por terminal
+                        terminal_stats = df_bus.groupby('Terminal').size().reset_index()
+                        terminal_stats.columns = ['Terminal', 'Cargas']
+                        
+                        fig = px.pie(
+                            terminal_stats,
+                            names='Terminal',
+                            values='Cargas',
+                            title='Distribución por Terminal',
+                            color_discrete_sequence=px.colors.sequential.Viridis
+                        )
+                        
+                        fig.update_layout(
+                            plot_bgcolor='white'
+                        )
+                        
+                        st.plotly_chart(fig, use_container_width=True)
+            
+            # Tabla de datos históricos
+            with st.expander("Historial Detallado de Cargas", expanded=False):
+                # Columnas relevantes para mostrar
+                cols_relevantes = [col for col in [
+                    'Fecha', 'Hora', 'Terminal', 'Cantidad litros', 
+                    'Odómetro', 'Kilómetros Recorridos', 'Rendimiento',
+                    'Nombre conductor', 'Mala Carga', 'Sobreconsumo'
+                ] if col in df_bus.columns]
+                
+                # Mostrar datos
+                st.dataframe(
+                    formatear_horas(df_bus[cols_relevantes].sort_values('Fecha', ascending=False)),
+                    use_container_width=True,
+                    height=400
+                )
+        
+        # Si es vista de todos los buses
+        else:
+            st.markdown("<h3 class='section-title'>Resumen de la Flota</h3>", unsafe_allow_html=True)
+            
+            # Estadísticas generales
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                total_buses = df_bus['Número interno'].nunique()
+                st.markdown(create_kpi_card(
+                    "Total de Buses", 
+                    f"{total_buses}",
+                    None,
+                    icon="🚍",
+                    color_class="primary",
+                    footnote=f"En operación durante el período"
+                ), unsafe_allow_html=True)
+            
+            with col2:
+                total_modelos = df_bus['Modelo chasis'].nunique() if 'Modelo chasis' in df_bus.columns else "N/A"
+                st.markdown(create_kpi_card(
+                    "Modelos Diferentes", 
+                    f"{total_modelos}",
+                    None,
+                    icon="🔧",
+                    color_class="info",
+                    footnote=f"Variedad en la flota"
+                ), unsafe_allow_html=True)
+            
+            with col3:
+                promedio_cargas = totales['Cargas'] / total_buses if total_buses > 0 else 0
+                st.markdown(create_kpi_card(
+                    "Cargas por Bus", 
+                    f"{promedio_cargas:.2f}",
+                    None,
+                    icon="⛽",
+                    color_class="success",
+                    footnote=f"Promedio durante el período"
+                ), unsafe_allow_html=True)
+            
+            with col4:
+                if 'Rendimiento' in df_bus.columns:
+                    rendimiento_promedio = totales['Rendimiento Promedio']
+                    st.markdown(create_kpi_card(
+                        "Rendimiento Promedio", 
+                        f"{rendimiento_promedio:.2f} km/L",
+                        None,
+                        icon="🔄",
+                        color_class="warning",
+                        footnote=f"De toda la flota"
+                    ), unsafe_allow_html=True)
+            
+            # Análisis por uso
+            st.markdown("<h4>Análisis por Frecuencia de Uso</h4>", unsafe_allow_html=True)
+            
+            # Contar cargas por bus
+            cargas_por_bus = df_bus.groupby('Número interno').size().reset_index()
+            cargas_por_bus.columns = ['Bus', 'Cargas']
+            cargas_por_bus = cargas_por_bus.sort_values('Cargas', ascending=False)
+            
+            # Clasificar por uso
+            cargas_por_bus['Categoría'] = categorize(cargas_por_bus['Cargas'], USO_BUS, categorical=False)
+            
+            # Mostrar distribución
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                # Gráfico de categorías
+                categoria_counts = cargas_por_bus['Categoría'].value_counts().reset_index()
+                categoria_counts.columns = ['Categoría', 'Buses']
+                
+                # Ordenar categorías
+                orden_categoria = {'Alto Uso': 0, 'Uso Medio': 1, 'Bajo Uso': 2}
+                categoria_counts['Orden'] = categoria_counts['Categoría'].map(orden_categoria)
+                categoria_counts = categoria_counts.sort_values('Orden')
+                
+                # Gráfico
+                fig = px.pie(
+                    categoria_counts,
+                    names='Categoría',
+                    values='Buses',
+                    title='Distribución de Buses por Intensidad de Uso',
+                    color='Categoría',
+                    color_discrete_map={
+                        'Alto Uso': colors['danger'],
+                        'Uso Medio': colors['warning'],
+                        'Bajo Uso': colors['success']
+                    }
+                )
+                
+                fig.update_layout(
+                    plot_bgcolor='white'
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
+            
+            with col2:
+                # Top 10 buses por uso
+                fig = px.bar(
+                    cargas_por_bus.head(10),
+                    x='Bus',
+                    y='Cargas',
+                    title='Top 10 Buses con Mayor Frecuencia de Cargas',
+                    color='Categoría',
+                    color_discrete_map={
+                        'Alto Uso': colors['danger'],
+                        'Uso Medio': colors['warning'],
+                        'Bajo Uso': colors['success']
+                    },
+                    text='Cargas'
+                )
+                
+                fig.update_traces(
+                    texttemplate='%{text}',
+                    textposition='outside'
+                )
+                
+                fig.update_layout(
+                    xaxis_title="Bus",
+                    yaxis_title="Cantidad de Cargas",
+                    plot_bgcolor='white'
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
+            
+            # Análisis por consumo
+            st.markdown("<h4>Análisis por Consumo Total</h4>", unsafe_allow_html=True)
+            
+            if 'Cantidad litros' in df_bus.columns:
+                # Calcular consumo total por bus
+                consumo_por_bus = df_bus.groupby('Número interno')['Cantidad litros'].sum().reset_index()
+                consumo_por_bus.columns = ['Bus', 'Total Litros']
+                consumo_por_bus = consumo_por_bus.sort_values('Total Litros', ascending=False)
+                
+                # Top 10 por consumo
+                fig = px.bar(
+                    consumo_por_bus.head(10),
+                    x='Bus',
+                    y='Total Litros',
+                    title='Top 10 Buses por Consumo Total',
+                    color='Total Litros',
+                    color_continuous_scale='Viridis',
+                    text='Total Litros'
+                )
+                
+                fig.update_traces(
+                    texttemplate='%{text:.0f}',
+                    textposition='outside'
+                )
+                
+                fig.update_layout(
+                    xaxis_title="Bus",
+                    yaxis_title="Total Litros",
+                    plot_bgcolor='white'
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
+            
+            # Análisis por rendimiento
+            st.markdown("<h4>Análisis por Rendimiento</h4>", unsafe_allow_html=True)
+            
+            if 'Rendimiento' in df_bus.columns:
+                # Calcular rendimiento promedio por bus
+                rendimiento_por_bus = df_bus.groupby('Número interno')['Rendimiento'].mean().reset_index()
+                rendimiento_por_bus.columns = ['Bus', 'Rendimiento']
+                
+                # Filtrar buses con suficientes datos
+                conteo_por_bus = df_bus.groupby('Número interno').size().reset_index()
+                conteo_por_bus.columns = ['Bus', 'Cargas']
+                
+                rendimiento_por_bus = pd.merge(rendimiento_por_bus, conteo_por_bus, on='Bus')
+                rendimiento_por_bus = rendimiento_por_bus[rendimiento_por_bus['Cargas'] >= 5]  # Al menos 5 cargas
+                
+                tab1, tab2 = st.tabs(["📊 Mejores Buses", "📉 Peores Buses"])
+                
+                with tab1:
+                    # Top 10 mejores rendimientos
+                    mejores = rendimiento_por_bus.sort_values('Rendimiento', ascending=False).head(10)
+                    
+                    fig = px.bar(
+                        mejores,
+                        x='Bus',
+                        y='Rendimiento',
+                        title='Top 10 Buses con Mejor Rendimiento',
+                        color='Rendimiento',
+                        color_continuous_scale='Viridis',
+                        text='Rendimiento'
+                    )
+                    
+                    fig.update_traces(
+                        texttemplate='%{text:.2f}',
+                        textposition='outside'
+                    )
+                    
+                    fig.update_layout(
+                        xaxis_title="Bus",
+                        yaxis_title="Rendimiento (km/L)",
+                        plot_bgcolor='white'
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                
+                with tab2:
+                    # Top 10 peores rendimientos
+                    peores = rendimiento_por_bus.sort_values('Rendimiento').head(10)
+                    
+                    fig = px.bar(
+                        peores,
+                        x='Bus',
+                        y='Rendimiento',
+                        title='Top 10 Buses con Peor Rendimiento',
+                        color='Rendimiento',
+                        color_continuous_scale='Viridis_r',  # Escala invertida
+                        text='Rendimiento'
+                    )
+                    
+                    fig.update_traces(
+                        texttemplate='%{text:.2f}',
+                        textposition='outside'
+                    )
+                    
+                    fig.update_layout(
+                        xaxis_title="Bus",
+                        yaxis_title="Rendimiento (km/L)",
+                        plot_bgcolor='white'
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+            
+            # Tabla completa
+            st.markdown("<h4>Resumen por Bus</h4>", unsafe_allow_html=True)
+            
+            # Crear tabla de resumen completa
+            resumen_buses = df_bus.groupby('Número interno').agg({
+                'Cantidad litros': ['sum', 'mean', 'count'] if 'Cantidad litros' in df_bus.columns else 'count',
+                'Mala Carga': 'sum' if 'Mala Carga' in df_bus.columns else 'count',
+                'Sobreconsumo': 'sum' if 'Sobreconsumo' in df_bus.columns else 'count',
+                'Rendimiento': 'mean' if 'Rendimiento' in df_bus.columns else 'count'
+            }).reset_index()
+            
+            # Aplanar columnas
+            if 'Cantidad litros' in df_bus.columns:
+                resumen_buses.columns = ['Bus', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 
+                                      'Malas Cargas', 'Sobreconsumos', 'Rendimiento Promedio']
+                
+                # Añadir porcentajes
+                resumen_buses['% Malas Cargas'] = (resumen_buses['Malas Cargas'] / resumen_buses['Cantidad Cargas'] * 100).round(2)
+                resumen_buses['% Sobreconsumos'] = (resumen_buses['Sobreconsumos'] / resumen_buses['Cantidad Cargas'] * 100).round(2)
+                
+                # Ordenar por total litros (descendente)
+                resumen_buses = resumen_buses.sort_values('Total Litros', ascending=False)
+            else:
+                resumen_buses.columns = ['Bus', 'Cantidad Cargas', 'Malas Cargas', 'Sobreconsumos', 'Rendimiento Count']
+                
+                # Ordenar por cantidad de cargas
+                resumen_buses = resumen_buses.sort_values('Cantidad Cargas', ascending=False)
+            
+            # Añadir modelo si está disponible
+            if 'Modelo chasis' in df_bus.columns:
+                # Obtener el modelo más común para cada bus
+                modelos_por_bus = df_bus.groupby('Número interno')['Modelo chasis'].agg(lambda x: x.mode().iloc[0] if not x.mode().empty else 'Desconocido')
+                
+                # Añadir a la tabla de resumen
+                resumen_buses = pd.merge(
+                    resumen_buses,
+                    modelos_por_bus.reset_index().rename(columns={'Número interno': 'Bus', 'Modelo chasis': 'Modelo'}),
+                    on='Bus'
+                )
+            
+            # Mostrar tabla
+            st.dataframe(
+                resumen_buses,
+                column_config={
+                    "Bus": st.column_config.TextColumn("Bus"),
+                    "Total Litros": st.column_config.NumberColumn("Total Litros", format="%,.2f"),
+                    "Promedio Litros": st.column_config.NumberColumn("Prom. L/Carga", format="%.2f"),
+                    "Cantidad Cargas": st.column_config.NumberColumn("# Cargas", format="%d"),
+                    "Malas Cargas": st.column_config.NumberColumn("Malas", format="%d"),
+                    "% Malas Cargas": st.column_config.NumberColumn("% Malas", format="%.2f%%"),
+                    "Sobreconsumos": st.column_config.NumberColumn("Sobre", format="%d"),
+                    "% Sobreconsumos": st.column_config.NumberColumn("% Sobre", format="%.2f%%"),
+                    "Rendimiento Promedio": st.column_config.NumberColumn("Rendimiento (km/L)", format="%.2f"),
+                    "Modelo": st.column_config.TextColumn("Modelo")
+                },
+                use_container_width=True
+            )
+    else:
+        st.warning("No se encontró la columna 'Número interno' en los datos.")
@@ -0,0 +1,486 @@
+"""
+Sección «Dashboard Principal»: KPIs generales, hallazgos automáticos y tendencias de consumo.
+"""
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from interfaz.componentes import create_kpi_card, create_mini_stat, show_alert
+from interfaz.graficos import create_heatmap, plot_bar_chart, plot_time_series
+from interfaz.tema import get_colors
+
+
+def render(df, cubo, indice):
+    colors = get_colors()
+
+    st.markdown("<h2 class='subtitle'>Dashboard General</h2>", unsafe_allow_html=True)
+    
+    # Mostrar insights automáticos
+    if 'insights' in st.session_state and st.session_state['insights']:
+        with st.expander("📋 Hallazgos Automáticos Detectados", expanded=True):
+            for titulo, descripcion, tipo, _ in st.session_state['insights'][:3]:  # Mostrar solo los 3 más importantes
+                st.markdown(show_alert(descripcion, tipo, titulo), unsafe_allow_html=True)
+            
+            if len(st.session_state['insights']) > 3:
+                with st.expander("Ver todos los hallazgos"):
+                    for titulo, descripcion, tipo, _ in st.session_state['insights'][3:]:
+                        st.markdown(show_alert(descripcion, tipo, titulo), unsafe_allow_html=True)
+    
+    # Resumen del período analizado
+    if 'Fecha' in df.columns:
+        fecha_min = df['Fecha'].min().strftime('%d/%m/%Y')
+        fecha_max = df['Fecha'].max().strftime('%d/%m/%Y')
+        dias_totales = (df['Fecha'].max() - df['Fecha'].min()).days + 1
+        
+        st.markdown(f"""
+        <div class="card" style="margin-bottom: 1.5rem;">
+            <h3 style="color: {colors['primary']};">📅 Período Analizado</h3>
+            <p>Desde: <strong>{fecha_min}</strong> hasta: <strong>{fecha_max}</strong> ({dias_totales} días)</p>
+            <p>Total de registros: <strong>{len(df):,}</strong></p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Métricas principales en tarjetas
+    st.markdown("<h3 class='section-title'>Métricas Principales</h3>", unsafe_allow_html=True)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        total_cargas = len(df)
+        st.markdown(create_kpi_card(
+            "Total de Cargas", 
+            f"{total_cargas:,}",
+            None,
+            icon="🚌",
+            color_class="primary",
+            footnote=f"En {dias_totales} días" if 'Fecha' in df.columns else None
+        ), unsafe_allow_html=True)
+    
+    with col2:
+        if 'Cantidad litros' in df.columns:
+            total_litros = df['Cantidad litros'].sum()
+            st.markdown(create_kpi_card(
+                "Total Litros", 
+                f"{total_litros:,.0f}",
+                None,
+                icon="⛽",
+                color_class="info",
+                footnote=f"Promedio: {df['Cantidad litros'].mean():.2f} L/carga"
+            ), unsafe_allow_html=True)
+    
+    with col3:
+        if 'Mala Carga' in df.columns:
+            malas_cargas = df['Mala Carga'].sum()
+            porcentaje_malas = (malas_cargas / len(df)) * 100 if len(df) > 0 else 0
+            
+            # Color dinámico basado en el porcentaje
+            color_class = "success" if porcentaje_malas < 2 else "warning" if porcentaje_malas < 5 else "danger"
+            
+            st.markdown(create_kpi_card(
+                "Malas Cargas", 
+                f"{malas_cargas}",
+                -porcentaje_malas,  # Delta negativo (menos es mejor)
+                icon="❌",
+                color_class=color_class,
+                footnote=f"{porcentaje_malas:.2f}% del total"
+            ), unsafe_allow_html=True)
+    
+    with col4:
+        if 'Sobreconsumo' in df.columns:
+            sobreconsumos = df['Sobreconsumo'].sum()
+            porcentaje_sobre = (sobreconsumos / len(df)) * 100 if len(df) > 0 else 0
+            
+            # Color dinámico basado en el porcentaje
+            color_class = "success" if porcentaje_sobre < 5 else "warning" if porcentaje_sobre < 10 else "danger"
+            
+            st.markdown(create_kpi_card(
+                "Alertas Sobreconsumo", 
+                f"{sobreconsumos}",
+                -porcentaje_sobre,  # Delta negativo (menos es mejor)
+                icon="⚠️",
+                color_class=color_class,
+                footnote=f"{porcentaje_sobre:.2f}% del total"
+            ), unsafe_allow_html=True)
+    
+    # Segunda fila de métricas
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        if 'Número interno' in df.columns:
+            total_buses = df['Número interno'].nunique()
+            st.markdown(create_kpi_card(
+                "Total Buses", 
+                f"{total_buses}",
+                None,
+                icon="🚍",
+                color_class="success",
+                footnote=f"Promedio: {len(df)/total_buses:.1f} cargas/bus" if total_buses > 0 else None
+            ), unsafe_allow_html=True)
+    
+    with col2:
+        if 'Terminal' in df.columns:
+            total_terminales = df['Terminal'].nunique()
+            st.markdown(create_kpi_card(
+                "Total Terminales", 
+                f"{total_terminales}",
+                None,
+                icon="🏢",
+                color_class="info",
+                footnote=f"Promedio: {len(df)/total_terminales:.1f} cargas/terminal" if total_terminales > 0 else None
+            ), unsafe_allow_html=True)
+    
+    with col3:
+        if 'Rendimiento' in df.columns:
+            rendimiento_medio = df['Rendimiento'].mean()
+            rendimiento_mediana = df['Rendimiento'].median()
+            st.markdown(create_kpi_card(
+                "Rendimiento Promedio", 
+                f"{rendimiento_medio:.2f} km/L",
+                None,
+                icon="🔄",
+                color_class="primary",
+                footnote=f"Mediana: {rendimiento_mediana:.2f} km/L"
+            ), unsafe_allow_html=True)
+    
+    with col4:
+        if 'Cantidad litros' in df.columns and 'Sobreconsumo' in df.columns:
+            litros_sobreconsumo = df.loc[df['Sobreconsumo'], 'Cantidad litros'].sum()
+            porcentaje_litros = (litros_sobreconsumo / df['Cantidad litros'].sum()) * 100 if df['Cantidad litros'].sum() > 0 else 0
+            
+            color_class = "success" if porcentaje_litros < 5 else "warning" if porcentaje_litros < 10 else "danger"
+            
+            st.markdown(create_kpi_card(
+                "Litros en Sobreconsumo", 
+                f"{litros_sobreconsumo:,.0f}",
+                -porcentaje_litros,  # Delta negativo (menos es mejor)
+                icon="💧",
+                color_class=color_class,
+                footnote=f"{porcentaje_litros:.2f}% del total"
+            ), unsafe_allow_html=True)
+    
+    # Gráfico de evolución temporal de consumo
+    st.markdown("<h3 class='section-title'>Evolución del Consumo</h3>", unsafe_allow_html=True)
+    
+    tab1, tab2 = st.tabs(["📊 Gráfico", "📋 Datos"])
+    
+    with tab1:
+        if 'Fecha' in df.columns and 'Cantidad litros' in df.columns:
+            # Crear gráfico de tendencia
+            fig = plot_time_series(df, 'Cantidad litros', 'Evolución del Consumo Diario')
+            
+            if fig:
+                st.plotly_chart(fig, use_container_width=True)
+            
+            # Mostrar tendencia si está disponible
+            if 'tendencia_consumo_robusta' in st.session_state:
+                tendencia = st.session_state['tendencia_consumo_robusta']
+                promedio = st.session_state['promedio_diario']
+                
+                # Calcular porcentaje de cambio diario
+                porcentaje = (tendencia / promedio) * 100
+                
+                # Crear alerta según la tendencia
+                if tendencia > 0 and abs(porcentaje) > 2:
+                    st.markdown(show_alert(
+                        f"El consumo de combustible muestra una tendencia creciente. Recomendamos revisar la eficiencia de la flota.",
+                        "warning",
+                        f"Tendencia al Alza: +{abs(porcentaje):.2f}% diario",
+                        "📈"
+                    ), unsafe_allow_html=True)
+                elif tendencia < 0 and abs(porcentaje) > 2:
+                    st.markdown(show_alert(
+                        f"El consumo de combustible muestra una tendencia decreciente. Las medidas de eficiencia parecen estar funcionando.",
+                        "success",
+                        f"Tendencia a la Baja: -{abs(porcentaje):.2f}% diario",
+                        "📉"
+                    ), unsafe_allow_html=True)
+    
+    with tab2:
+        if 'Fecha' in df.columns and 'Cantidad litros' in df.columns:
+            # Agrupar por fecha
+            consumo_diario = cubo.rollup(lambda fechas: fechas.dt.date)[[
+                'Litros', 'Promedio Litros', 'Cargas con Litros', 'Malas Cargas', 'Sobreconsumos'
+            ]].reset_index()
+            
+            # Aplanar los nombres de columnas multiíndice
+            consumo_diario.columns = ['Fecha', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 'Malas Cargas', 'Sobreconsumos']
+            
+            # Calcular porcentajes
+            consumo_diario['% Malas Cargas'] = (consumo_diario['Malas Cargas'] / consumo_diario['Cantidad Cargas'] * 100).round(2)
+            consumo_diario['% Sobreconsumos'] = (consumo_diario['Sobreconsumos'] / consumo_diario['Cantidad Cargas'] * 100).round(2)
+            
+            # Mostrar tabla
+            st.dataframe(
+                consumo_diario.sort_values('Fecha', ascending=False),
+                column_config={
+                    "Fecha": st.column_config.DateColumn("Fecha"),
+                    "Total Litros": st.column_config.NumberColumn("Total Litros", format="%.2f"),
+                    "Promedio Litros": st.column_config.NumberColumn("Prom. L/Carga", format="%.2f"),
+                    "Cantidad Cargas": st.column_config.NumberColumn("# Cargas", format="%d"),
+                    "Malas Cargas": st.column_config.NumberColumn("Malas", format="%d"),
+                    "% Malas Cargas": st.column_config.NumberColumn("% Malas", format="%.2f%%"),
+                    "Sobreconsumos": st.column_config.NumberColumn("Sobre", format="%d"),
+                    "% Sobreconsumos": st.column_config.NumberColumn("% Sobre", format="%.2f%%")
+                },
+                use_container_width=True
+            )
+        else:
+            st.warning("No se encontraron datos suficientes para mostrar la evolución temporal.")
+    
+    # Distribución por Terminal y Modelo
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("<h3 class='section-title'>Consumo por Terminal</h3>", unsafe_allow_html=True)
+        
+        if 'Terminal' in df.columns and 'Cantidad litros' in df.columns:
+            fig = plot_bar_chart(df, 'Terminal', 'Cantidad litros', 'Total Litros por Terminal', top_n=10)
+            if fig:
+                st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.markdown("<h3 class='section-title'>Consumo por Modelo</h3>", unsafe_allow_html=True)
+        
+        if 'Modelo chasis' in df.columns and 'Cantidad litros' in df.columns:
+            fig = plot_bar_chart(df, 'Modelo chasis', 'Cantidad litros', 'Total Litros por Modelo de Chasis', top_n=10)
+            if fig:
+                st.plotly_chart(fig, use_container_width=True)
+    
+    # Mapa de calor por horario
+    st.markdown("<h3 class='section-title'>Distribución de Cargas por Horario</h3>", unsafe_allow_html=True)
+    
+    if 'Hora Numérica' in df.columns and 'Día Semana' in df.columns and 'Cantidad litros' in df.columns:
+        # Selector para variable a visualizar
+        tipo_variable = st.radio("Variable a visualizar:", ["Cantidad de Cargas", "Cantidad de Litros", "Litros Promedio/Carga"], horizontal=True)
+        
+        # Matrices día × hora guardadas en el índice del dataset (una por variable)
+        if tipo_variable == "Cantidad de Cargas":
+            fig = create_heatmap(df, title="Mapa de calor: Cantidad de Cargas por día y hora", aggfunc='count',
+                                 matriz=indice.heatmap())
+        elif tipo_variable == "Cantidad de Litros":
+            fig = create_heatmap(df, 'Cantidad litros', title="Mapa de calor: Total de Litros por día y hora", aggfunc='sum',
+                                 matriz=indice.heatmap('Cantidad litros', 'sum'))
+        else:  # Litros Promedio/Carga
+            fig = create_heatmap(df, 'Cantidad litros', title="Mapa de calor: Litros Promedio por día y hora", aggfunc='mean',
+                                 matriz=indice.heatmap('Cantidad litros', 'mean'))
+        
+        if fig:
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # Añadir interpretación del mapa de calor
+            st.markdown(f"""
+            <div class="card">
+                <h4>Interpretación del Mapa de Calor</h4>
+                <p>Este mapa de calor muestra la distribución de {tipo_variable.lower()} por día de la semana y hora del día. 
+                Los colores más intensos indican mayor actividad en ese horario específico.</p>
+                <ul>
+                    <li><strong>Utilidad:</strong> Identifique patrones de carga, optimice la distribución de personal y planifique mantenimientos en horas de menor actividad.</li>
+                    <li><strong>Recomendación:</strong> Compare este mapa con los horarios de operación para detectar ineficiencias o concentraciones excesivas de cargas.</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    # Distribución de cargas
+    st.markdown("<h3 class='section-title'>Distribución de Cantidad de Litros</h3>", unsafe_allow_html=True)
+    
+    if 'Cantidad litros' in df.columns:
+        tab1, tab2 = st.tabs(["📊 Gráfico", "📋 Estadísticas"])
+        
+        with tab1:
+            fig = px.histogram(
+                df, 
+                x='Cantidad litros',
+                nbins=30,
+                marginal='box',
+                title='Distribución de la cantidad de litros por carga',
+                color_discrete_sequence=[colors['primary']]
+            )
+            
+            fig.update_layout(
+                xaxis_title="Litros",
+                yaxis_title="Frecuencia",
+                plot_bgcolor='white'
+            )
+            
+            # Marcar anomalías
+            if 'Sobreconsumo' in df.columns:
+                # Umbral para sobreconsumo
+                umbral = df[~df['Sobreconsumo']]['Cantidad litros'].mean() * 1.2
+                
+                fig.add_vline(
+                    x=umbral, 
+                    line_dash="dash", 
+                    line_color="red",
+                    annotation_text="Umbral Sobreconsumo"
+                )
+            
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with tab2:
+            # Calcular estadísticas
+            stats = {
+                "Promedio": df['Cantidad litros'].mean(),
+                "Mediana": df['Cantidad litros'].median(),
+                "Desv. Estándar": df['Cantidad litros'].std(),
+                "Mínimo": df['Cantidad litros'].min(),
+                "Máximo": df['Cantidad litros'].max(),
+                "Percentil 25%": df['Cantidad litros'].quantile(0.25),
+                "Percentil 75%": df['Cantidad litros'].quantile(0.75),
+                "Moda": df['Cantidad litros'].mode().iloc[0] if not df['Cantidad litros'].mode().empty else None
+            }
+            
+            # Mostrar estadísticas
+            st.markdown(f"""
+            <div class="card">
+                <h4>Estadísticas Descriptivas</h4>
+                <div style="display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 20px;">
+                    {create_mini_stat("📊", f"{stats['Promedio']:.2f} L", "Promedio")}
+                    {create_mini_stat("📏", f"{stats['Mediana']:.2f} L", "Mediana")}
+                    {create_mini_stat("📈", f"{stats['Desv. Estándar']:.2f} L", "Desviación Estándar")}
+                    {create_mini_stat("📉", f"{stats['Mínimo']:.2f} L", "Mínimo")}
+                    {create_mini_stat("📈", f"{stats['Máximo']:.2f} L", "Máximo")}
+                    {create_mini_stat("🔢", f"{stats['Moda']:.2f} L", "Moda")}
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            # Mostrar distribución por rangos
+            rangos = [0, 50, 100, 150, 200, 250, 300, float('inf')]
+            etiquetas = ['0-50', '50-100', '100-150', '150-200', '200-250', '250-300', '>300']
+            
+            rango_litros = pd.cut(df['Cantidad litros'], bins=rangos, labels=etiquetas, right=False)
+            rango_counts = rango_litros.value_counts().sort_index()
+            
+            # Crear gráfico de barras para rangos
+            fig = px.bar(
+                x=rango_counts.index,
+                y=rango_counts.values,
+                title="Distribución por Rangos de Litros",
+                labels={'x': 'Rango de Litros', 'y': 'Cantidad de Cargas'},
+                color=rango_counts.values,
+                color_continuous_scale='Viridis'
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+    
+    # Resumen de alertas
+    st.markdown("<h3 class='section-title'>Resumen de Alertas</h3>", unsafe_allow_html=True)
+    
+    # Crear un dataframe para el resumen
+    alertas = []
+    
+    if 'Mala Carga' in df.columns:
+        malas_cargas = df['Mala Carga'].sum()
+        if malas_cargas > 0:
+            porcentaje = (malas_cargas / len(df)) * 100
+            nivel = "Alto" if porcentaje > 5 else "Medio" if porcentaje > 2 else "Bajo"
+            alertas.append({
+                "Tipo": "Malas Cargas",
+                "Cantidad": malas_cargas,
+                "Porcentaje": f"{porcentaje:.2f}%",
+                "Nivel": nivel,
+                "Impacto": "Alto" if nivel == "Alto" else "Medio" if nivel == "Medio" else "Bajo"
+            })
+    
+    if 'Sobreconsumo' in df.columns:
+        sobreconsumos = df['Sobreconsumo'].sum()
+        if sobreconsumos > 0:
+            porcentaje = (sobreconsumos / len(df)) * 100
+            nivel = "Alto" if porcentaje > 10 else "Medio" if porcentaje > 5 else "Bajo"
+            alertas.append({
+                "Tipo": "Sobreconsumos",
+                "Cantidad": sobreconsumos,
+                "Porcentaje": f"{porcentaje:.2f}%",
+                "Nivel": nivel,
+                "Impacto": "Alto" if nivel == "Alto" else "Medio" if nivel == "Medio" else "Bajo"
+            })
+    
+    if 'Outlier Extremo' in df.columns:
+        outliers = df['Outlier Extremo'].sum()
+        if outliers > 0:
+            porcentaje = (outliers / len(df)) * 100
+            nivel = "Alto" if porcentaje > 3 else "Medio" if porcentaje > 1 else "Bajo"
+            alertas.append({
+                "Tipo": "Outliers Extremos",
+                "Cantidad": outliers,
+                "Porcentaje": f"{porcentaje:.2f}%",
+                "Nivel": nivel,
+                "Impacto": "Alto" if nivel == "Alto" else "Medio" if nivel == "Medio" else "Bajo"
+            })
+    
+    if alertas:
+        alertas_df = pd.DataFrame(alertas)
+        
+        # Mostrar tabla
+        st.dataframe(
+            alertas_df,
+            column_config={
+                "Tipo": st.column_config.TextColumn("Tipo de Alerta"),
+                "Cantidad": st.column_config.NumberColumn("Cantidad", format="%d"),
+                "Porcentaje": st.column_config.TextColumn("% del Total"),
+                "Nivel": st.column_config.TextColumn("Nivel de Alerta"),
+                "Impacto": st.column_config.TextColumn("Impacto Operativo")
+            },
+            use_container_width=True
+        )
+        
+        # Generar recomendaciones basadas en alertas
+        st.markdown(f"""
+        <div class="card">
+            <h4>Recomendaciones Basadas en Alertas</h4>
+            <ul>
+        """, unsafe_allow_html=True)
+        
+        for alerta in alertas:
+            if alerta["Tipo"] == "Malas Cargas" and alerta["Nivel"] in ["Medio", "Alto"]:
+                st.markdown(f"""
+                <li><strong>Malas Cargas:</strong> Revisar los procedimientos de registro y capacitar al personal en la correcta documentación de cargas, especialmente en las terminales con mayor incidencia.</li>
+                """, unsafe_allow_html=True)
+            
+            if alerta["Tipo"] == "Sobreconsumos" and alerta["Nivel"] in ["Medio", "Alto"]:
+                st.markdown(f"""
+                <li><strong>Sobreconsumos:</strong> Programar revisiones mecánicas para los buses con mayor incidencia de sobreconsumo y evaluar patrones de conducción de los operadores con más alertas.</li>
+                """, unsafe_allow_html=True)
+            
+            if alerta["Tipo"] == "Outliers Extremos" and alerta["Nivel"] in ["Medio", "Alto"]:
+                st.markdown(f"""
+                <li><strong>Outliers Extremos:</strong> Investigar las causas de estas desviaciones significativas, que podrían indicar fugas de combustible, errores de registro o problemas mecánicos graves.</li>
+                """, unsafe_allow_html=True)
+        
+        st.markdown(f"""
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.success("✅ No se detectaron alertas significativas en los datos analizados.")
+    
+    # Top 10 buses con mayor consumo
+    st.markdown("<h3 class='section-title'>Top 10 Buses con Mayor Consumo</h3>", unsafe_allow_html=True)
+    
+    if 'Número interno' in df.columns and 'Cantidad litros' in df.columns:
+        # Agrupar por bus y calcular total de litros
+        top_buses = cubo.rollup('Número interno')['Litros'].rename('Cantidad litros').reset_index()
+        top_buses = top_buses.sort_values('Cantidad litros', ascending=False).head(10)
+        
+        fig = px.bar(
+            top_buses,
+            x='Número interno',
+            y='Cantidad litros',
+            title='Top 10 Buses con Mayor Consumo Total',
+            color='Cantidad litros',
+            color_continuous_scale='Viridis',
+            text='Cantidad litros'
+        )
+        
+        fig.update_traces(
+            texttemplate='%{text:.1f}',
+            textposition='outside'
+        )
+        
+        fig.update_layout(
+            xaxis_title="Número de Bus",
+            yaxis_title="Total Litros",
+            plot_bgcolor='white'
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
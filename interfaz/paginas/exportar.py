@@ -0,0 +1,144 @@
+"""
+Sección «Exportar Resultados»: descarga del análisis en Excel y CSV.
+"""
+import streamlit as st
+import datetime
+
+from interfaz.componentes import formatear_horas
+from interfaz.exportacion import export_to_excel
+
+
+def render(df, cubo, indice):
+    st.markdown("<h2 class='subtitle'>Exportar Resultados</h2>", unsafe_allow_html=True)
+    
+    # Sección de opciones de exportación
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown(f"""
+        <div class="card">
+            <h4>Opciones de Exportación</h4>
+            <p>Seleccione el formato y las secciones que desea incluir en el informe exportado.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Selección de formato
+        formato = st.selectbox(
+            "Formato de exportación",
+            ["Excel (.xlsx)", "CSV (.csv)"]
+        )
+        
+        # Incluir gráficos (solo para Excel)
+        incluir_graficos = st.checkbox("Incluir gráficos", value=True, disabled=(formato != "Excel (.xlsx)"))
+        
+        # Secciones a incluir
+        st.markdown("##### Secciones a incluir")
+        
+        incluir_resumen = st.checkbox("Resumen general", value=True)
+        incluir_consumo = st.checkbox("Consumo diario", value=True)
+        incluir_terminales = st.checkbox("Análisis por terminal", value=True)
+        incluir_buses = st.checkbox("Análisis por buses", value=True)
+        incluir_modelos = st.checkbox("Análisis por modelo", value=True)
+        incluir_malas = st.checkbox("Malas cargas", value=True)
+        incluir_sobreconsumo = st.checkbox("Sobreconsumo", value=True)
+        incluir_conductores = st.checkbox("Análisis por conductor", value=True)
+        incluir_rendimiento = st.checkbox("Rendimiento", value=True)
+        incluir_datos = st.checkbox("Datos completos", value=True)
+        
+    with col2:
+        st.markdown(f"""
+        <div class="card">
+            <h4>Información del Informe</h4>
+            <p>Agregue información adicional para personalizar el informe exportado.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Título personalizado
+        titulo_informe = st.text_input("Título del informe", "Análisis de Consumo de Combustible")
+        
+        # Información adicional
+        info_adicional = st.text_area("Notas o comentarios adicionales", placeholder="Ingrese aquí cualquier información adicional que desee incluir en el informe...")
+        
+        # Fecha de referencia
+        if 'Fecha' in df.columns:
+            fecha_min = df['Fecha'].min().date()
+            fecha_max = df['Fecha'].max().date()
+        else:
+            fecha_min = datetime.date.today() - datetime.timedelta(days=30)
+            fecha_max = datetime.date.today()
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            fecha_inicio = st.date_input("Fecha inicio", fecha_min, key="export_fecha_inicio")
+        
+        with col2:
+            fecha_fin = st.date_input("Fecha fin", fecha_max, key="export_fecha_fin")
+    
+    # Botón para generar informe
+    if st.button("Generar Informe", type="primary", use_container_width=True):
+        # Mostrar mensaje de carga
+        with st.spinner("Generando informe... Por favor espere..."):
+            # Filtrar por fecha (por posición, desde el índice por día)
+            df_export = indice.rows(fecha_inicio, fecha_fin)
+            
+            # Generar informe según formato seleccionado
+            if formato == "Excel (.xlsx)":
+                # Generar Excel avanzado
+                output = export_to_excel(
+                    df_export, 
+                    filename=titulo_informe, 
+                    include_plots=incluir_graficos
+                )
+                
+                # Mostrar mensaje de éxito
+                st.success("Informe generado exitosamente. Haga clic en el botón para descargar.")
+                
+                # Botón de descarga
+                st.download_button(
+                    label="📥 Descargar Informe Excel",
+                    data=output,
+                    file_name=f"{titulo_informe.replace(' ', '_')}.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    help="Descargar el informe en formato Excel",
+                    use_container_width=True
+                )
+            else:
+                # Generar archivo CSV
+                csv = formatear_horas(df_export).to_csv(index=False).encode('utf-8')
+                
+                # Mostrar mensaje de éxito
+                st.success("Datos exportados exitosamente. Haga clic en el botón para descargar.")
+                
+                # Botón de descarga
+                st.download_button(
+                    label="📥 Descargar Datos CSV",
+                    data=csv,
+                    file_name=f"{titulo_informe.replace(' ', '_')}.csv",
+                    mime="text/csv",
+                    help="Descargar los datos en formato CSV",
+                    use_container_width=True
+                )
+    
+    # Consejos y notas
+    st.markdown(f"""
+    <div class="card">
+        <h4>Notas sobre la Exportación</h4>
+        <ul>
+            <li><strong>Formato Excel:</strong> Incluye múltiples hojas con análisis específicos y gráficos integrados (si se selecciona la opción).</li>
+            <li><strong>Formato CSV:</strong> Exporta únicamente los datos en formato plano, sin análisis ni gráficos.</li>
+            <li><strong>Datos Incluidos:</strong> Solo se exportan los datos dentro del rango de fechas seleccionado.</li>
+            <li><strong>Tamaño del Archivo:</strong> Los archivos Excel con gráficos pueden ser de mayor tamaño, especialmente con grandes volúmenes de datos.</li>
+        </ul>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Opciones de informes programados
+    with st.expander("Informes Programados (Próximamente)", expanded=False):
+        st.markdown(f"""
+        <div style="text-align: center; padding: 20px;">
+            <h3>🔜 Función en Desarrollo</h3>
+            <p>La opción para programar informes automáticos estará disponible en una próxima actualización.</p>
+            <p>Esta funcionalidad permitirá generar y enviar informes periódicos de forma automática a los destinatarios que especifique.</p>
+        </div>
+        """, unsafe_allow_html=True)
@@ -0,0 +1,540 @@
+"""
+Sección «Malas Cargas»: cargas masivas y cargas con cantidades fuera de rango.
+"""
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+import datetime
+
+from combustible.engine import MOTIVO_CANTIDAD
+
+from interfaz.componentes import create_kpi_card, formatear_horas, show_alert
+from interfaz.tema import get_colors
+
+
+def render(df, cubo, indice):
+    colors = get_colors()
+
+    st.markdown("<h2 class='subtitle'>Análisis de Malas Cargas</h2>", unsafe_allow_html=True)
+    
+    if 'Mala Carga' in df.columns:
+        # Fecha de análisis
+        col1, col2 = st.columns([1, 1])
+        
+        with col1:
+            if 'Fecha' in df.columns:
+                fecha_min = df['Fecha'].min().date()
+                fecha_max = df['Fecha'].max().date()
+            else:
+                fecha_min = datetime.date.today() - datetime.timedelta(days=30)
+                fecha_max = datetime.date.today()
+            
+            fecha_inicio = st.date_input("Fecha inicio", fecha_min, key="malas_fecha_inicio")
+        
+        with col2:
+            fecha_fin = st.date_input("Fecha fin", fecha_max, key="malas_fecha_fin")
+        
+        # Filtrar por fecha (por posición, desde el índice por día)
+        df_filtrado = indice.rows(fecha_inicio, fecha_fin)
+        
+        # Mismo rango de fechas para las consultas al cubo
+        periodo = {'desde': fecha_inicio, 'hasta': fecha_fin} if 'Fecha' in df.columns else {}
+        
+        # Filtrar malas cargas
+        df_malas = df_filtrado[df_filtrado['Mala Carga'] == True]
+        total_malas = len(df_malas)
+        
+        # Métricas principales
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            # Total malas cargas
+            porcentaje = (total_malas / len(df_filtrado) * 100) if len(df_filtrado) > 0 else 0
+            
+            # Color según porcentaje
+            color = "success" if porcentaje < 2 else "warning" if porcentaje < 5 else "danger"
+            
+            st.markdown(create_kpi_card(
+                "Total Malas Cargas", 
+                f"{total_malas}",
+                None,
+                icon="❌",
+                color_class=color,
+                footnote=f"{porcentaje:.2f}% del total"
+            ), unsafe_allow_html=True)
+        
+        with col2:
+            # Litros en malas cargas
+            if 'Cantidad litros' in df_malas.columns:
+                litros_malas = df_malas['Cantidad litros'].sum()
+                porcentaje_litros = (litros_malas / df_filtrado['Cantidad litros'].sum() * 100) if df_filtrado['Cantidad litros'].sum() > 0 else 0
+                
+                st.markdown(create_kpi_card(
+                    "Litros en Malas Cargas", 
+                    f"{litros_malas:,.0f}",
+                    None,
+                    icon="⛽",
+                    color_class="info",
+                    footnote=f"{porcentaje_litros:.2f}% del total"
+                ), unsafe_allow_html=True)
+        
+        with col3:
+            # Terminales afectadas
+            if 'Terminal' in df_malas.columns:
+                terminales_afectadas = df_malas['Terminal'].nunique()
+                porcentaje_terminales = (terminales_afectadas / df_filtrado['Terminal'].nunique() * 100) if df_filtrado['Terminal'].nunique() > 0 else 0
+                
+                st.markdown(create_kpi_card(
+                    "Terminales Afectadas", 
+                    f"{terminales_afectadas}",
+                    None,
+                    icon="🏢",
+                    color_class="primary",
+                    footnote=f"{porcentaje_terminales:.2f}% del total"
+                ), unsafe_allow_html=True)
+        
+        # Alerta general
+        if total_malas > 0:
+            if porcentaje >= 5:
+                st.markdown(show_alert(
+                    f"Se han detectado {total_malas} cargas registradas como malas, lo que representa el {porcentaje:.2f}% del total. Esto indica un problema significativo en los procedimientos de registro que requiere atención inmediata.",
+                    "danger",
+                    "ALERTA CRÍTICA: Alto porcentaje de malas cargas",
+                    "🚨"
+                ), unsafe_allow_html=True)
+            elif porcentaje >= 2:
+                st.markdown(show_alert(
+                    f"Se han detectado {total_malas} cargas registradas como malas, lo que representa el {porcentaje:.2f}% del total. Se recomienda revisar los procedimientos de registro.",
+                    "warning",
+                    "ALERTA: Malas cargas detectadas",
+                    "⚠️"
+                ), unsafe_allow_html=True)
+            else:
+                st.markdown(show_alert(
+                    f"Se han detectado {total_malas} cargas registradas como malas, lo que representa el {porcentaje:.2f}% del total. Aunque el porcentaje es bajo, se recomienda supervisar la situación.",
+                    "info",
+                    "AVISO: Malas cargas detectadas",
+                    "ℹ️"
+                ), unsafe_allow_html=True)
+        else:
+            st.markdown(show_alert(
+                f"No se han encontrado cargas registradas como malas en los datos analizados.",
+                "success",
+                "No se detectaron malas cargas",
+                "✅"
+            ), unsafe_allow_html=True)
+        
+        # Motivo de cada marca: columna de texto o cantidad extrema
+        if total_malas > 0 and 'Motivo Mala Carga' in df_malas.columns:
+            st.markdown("<h3 class='section-title'>Motivo de las Malas Cargas</h3>", unsafe_allow_html=True)
+
+            motivos = df_malas['Motivo Mala Carga'].astype(str).value_counts().reset_index()
+            motivos.columns = ['Motivo', 'Malas Cargas']
+            motivos['Porcentaje'] = (motivos['Malas Cargas'] / total_malas * 100).round(2)
+
+            col1, col2 = st.columns([2, 1])
+
+            with col1:
+                fig = px.bar(
+                    motivos,
+                    x='Malas Cargas',
+                    y='Motivo',
+                    orientation='h',
+                    title='Malas Cargas por Motivo',
+                    color='Malas Cargas',
+                    color_continuous_scale='Reds',
+                    text='Malas Cargas'
+                )
+
+                fig.update_traces(textposition='outside')
+                fig.update_layout(
+                    xaxis_title="Cantidad de Malas Cargas",
+                    yaxis_title="",
+                    yaxis={'categoryorder': 'total ascending'},
+                    plot_bgcolor='white'
+                )
+
+                st.plotly_chart(fig, use_container_width=True)
+
+            with col2:
+                st.dataframe(
+                    motivos,
+                    column_config={
+                        "Motivo": st.column_config.TextColumn("Motivo"),
+                        "Malas Cargas": st.column_config.NumberColumn("Malas Cargas", format="%d"),
+                        "Porcentaje": st.column_config.NumberColumn("% del Total", format="%.2f%%")
+                    },
+                    hide_index=True,
+                    use_container_width=True
+                )
+
+            st.caption(
+                "El motivo es la columna cuyo texto marcó la carga ('Tipo' con \"masiva\", \"masa\" o \"mala\"; "
+                "otras columnas con \"carga masiva\" o \"carga mala\"). "
+                f"'{MOTIVO_CANTIDAD}' indica litros sobre Q3 + 3·IQR sin marca por texto."
+            )
+
+        # Análisis por terminal
+        if total_malas > 0 and 'Terminal' in df_malas.columns:
+            st.markdown("<h3 class='section-title'>Malas Cargas por Terminal</h3>", unsafe_allow_html=True)
+            
+            # Tabs para diferentes vistas
+            tab1, tab2 = st.tabs(["📊 Gráfico", "📋 Tabla"])
+            
+            with tab1:
+                # Malas cargas y total de cargas por terminal (terminales con malas cargas)
+                terminal_analysis = cubo.rollup('Terminal', **periodo)[['Malas Cargas', 'Cargas']].reset_index()
+                terminal_analysis.columns = ['Terminal', 'Malas Cargas', 'Total Cargas']
+                terminal_analysis = terminal_analysis[terminal_analysis['Malas Cargas'] > 0]
+                
+                terminal_analysis['Porcentaje'] = (terminal_analysis['Malas Cargas'] / terminal_analysis['Total Cargas'] * 100).round(2)
+                
+                # Ordenar por porcentaje (descendente)
+                terminal_analysis = terminal_analysis.sort_values('Porcentaje', ascending=False)
+                
+                # Gráfico
+                fig = px.bar(
+                    terminal_analysis,
+                    x='Terminal',
+                    y='Porcentaje',
+                    title='Porcentaje de Malas Cargas por Terminal',
+                    color='Porcentaje',
+                    color_continuous_scale='Reds',
+                    text='Porcentaje'
+                )
+                
+                fig.update_traces(
+                    texttemplate='%{text:.2f}%',
+                    textposition='outside'
+                )
+                
+                fig.update_layout(
+                    xaxis_title="Terminal",
+                    yaxis_title="% de Malas Cargas",
+                    plot_bgcolor='white'
+                )
+                
+                # Añadir línea para el promedio
+                fig.add_hline(
+                    y=porcentaje,
+                    line_dash="dash",
+                    line_color="red",
+                    annotation_text=f"Promedio: {porcentaje:.2f}%"
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
+                
+                # Gráfico de cantidades absolutas
+                fig = px.bar(
+                    terminal_analysis.sort_values('Malas Cargas', ascending=False),
+                    x='Terminal',
+                    y='Malas Cargas',
+                    title='Cantidad de Malas Cargas por Terminal',
+                    color='Porcentaje',
+                    color_continuous_scale='Reds',
+                    text='Malas Cargas'
+                )
+                
+                fig.update_traces(
+                    texttemplate='%{text}',
+                    textposition='outside'
+                )
+                
+                fig.update_layout(
+                    xaxis_title="Terminal",
+                    yaxis_title="Cantidad de Malas Cargas",
+                    plot_bgcolor='white'
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
+            
+            with tab2:
+                # Mostrar tabla
+                st.dataframe(
+                    terminal_analysis,
+                    column_config={
+                        "Terminal": st.column_config.TextColumn("Terminal"),
+                        "Malas Cargas": st.column_config.NumberColumn("Malas Cargas", format="%d"),
+                        "Total Cargas": st.column_config.NumberColumn("Total Cargas", format="%d"),
+                        "Porcentaje": st.column_config.NumberColumn("% Malas Cargas", format="%.2f%%")
+                    },
+                    use_container_width=True
+                )
+            
+            # Terminal con más problemas
+            if not terminal_analysis.empty:
+                peor_terminal = terminal_analysis.iloc[0]['Terminal']
+                porcentaje_peor = terminal_analysis.iloc[0]['Porcentaje']
+                
+                if porcentaje_peor > 5:
+                    st.markdown(show_alert(
+                        f"Esta terminal muestra un {porcentaje_peor:.2f}% de malas cargas, muy por encima del promedio. Se recomienda una revisión urgente de sus procedimientos.",
+                        "danger",
+                        f"Terminal Crítica: {peor_terminal}",
+                        "🚨"
+                    ), unsafe_allow_html=True)
+        
+        # Análisis por planillero
+        if total_malas > 0 and 'Nombre Planillero' in df_malas.columns:
+            st.markdown("<h3 class='section-title'>Malas Cargas por Planillero</h3>", unsafe_allow_html=True)
+            
+            # Contar malas cargas por planillero
+            planillero_counts = df_malas['Nombre Planillero'].value_counts().reset_index()
+            planillero_counts.columns = ['Planillero', 'Malas Cargas']
+            
+            # Calcular porcentaje respecto al total de cargas de cada planillero
+            total_por_planillero = df_filtrado.groupby('Nombre Planillero').size().reset_index()
+            total_por_planillero.columns = ['Planillero', 'Total Cargas']
+            
+            # Unir dataframes
+            planillero_analysis = pd.merge(planillero_counts, total_por_planillero, on='Planillero')
+            planillero_analysis['Porcentaje'] = (planillero_analysis['Malas Cargas'] / planillero_analysis['Total Cargas'] * 100).round(2)
+            
+            # Filtrar planilleros con al menos 5 cargas para evitar valores atípicos
+            planillero_analysis = planillero_analysis[planillero_analysis['Total Cargas'] >= 5]
+            
+            # Ordenar por porcentaje (descendente)
+            planillero_analysis = planillero_analysis.sort_values('Porcentaje', ascending=False)
+            
+            # Mostrar top 10
+            top10 = planillero_analysis.head(10)
+            
+            # Gráfico
+            fig = px.bar(
+                top10,
+                x='Planillero',
+                y='Porcentaje',
+                title='Top 10 Planilleros con Mayor % de Malas Cargas',
+                color='Porcentaje',
+                color_continuous_scale='Reds',
+                text='Porcentaje'
+            )
+            
+            fig.update_traces(
+                texttemplate='%{text:.2f}%',
+                textposition='outside'
+            )
+            
+            fig.update_layout(
+                xaxis_title="Planillero",
+                yaxis_title="% de Malas Cargas",
+                plot_bgcolor='white'
+            )
+            
+            # Añadir línea para el promedio
+            fig.add_hline(
+                y=porcentaje,
+                line_dash="dash",
+                line_color="red",
+                annotation_text=f"Promedio: {porcentaje:.2f}%"
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # Mostrar tabla
+            st.markdown("<h4>Top 10 Planilleros con Mayor % de Malas Cargas</h4>", unsafe_allow_html=True)
+            st.dataframe(
+                top10,
+                column_config={
+                    "Planillero": st.column_config.TextColumn("Planillero"),
+                    "Malas Cargas": st.column_config.NumberColumn("Malas Cargas", format="%d"),
+                    "Total Cargas": st.column_config.NumberColumn("Total Cargas", format="%d"),
+                    "Porcentaje": st.column_config.NumberColumn("% Malas Cargas", format="%.2f%%")
+                },
+                use_container_width=True
+            )
+            
+            # Planillero con más problemas
+            if not planillero_analysis.empty:
+                peor_planillero = planillero_analysis.iloc[0]['Planillero']
+                porcentaje_peor = planillero_analysis.iloc[0]['Porcentaje']
+                
+                if porcentaje_peor > 10:
+                    st.markdown(show_alert(
+                        f"Este planillero muestra un {porcentaje_peor:.2f}% de malas cargas, muy por encima del promedio. Se recomienda capacitación adicional o supervisión directa.",
+                        "danger",
+                        f"Planillero Crítico: {peor_planillero}",
+                        "🚨"
+                    ), unsafe_allow_html=True)
+        
+        # Tendencia temporal
+        if total_malas > 0 and 'Fecha' in df_malas.columns:
+            st.markdown("<h3 class='section-title'>Evolución Temporal de Malas Cargas</h3>", unsafe_allow_html=True)
+            
+            # Malas cargas y total de cargas por día (días con malas cargas)
+            tendencia = cubo.rollup(lambda fechas: fechas.dt.date, **periodo)[['Malas Cargas', 'Cargas']].reset_index()
+            tendencia.columns = ['Fecha', 'Malas Cargas', 'Total Cargas']
+            tendencia = tendencia[tendencia['Malas Cargas'] > 0]
+            tendencia['Porcentaje'] = (tendencia['Malas Cargas'] / tendencia['Total Cargas'] * 100).round(2)
+            
+            # Gráfico
+            fig = make_subplots(specs=[[{"secondary_y": True}]])
+            
+            # Añadir línea de malas cargas
+            fig.add_trace(
+                go.Bar(
+                    x=tendencia['Fecha'],
+                    y=tendencia['Malas Cargas'],
+                    name='Malas Cargas',
+                    marker_color=colors['danger']
+                ),
+                secondary_y=False
+            )
+            
+            # Añadir línea de porcentaje
+            fig.add_trace(
+                go.Scatter(
+                    x=tendencia['Fecha'],
+                    y=tendencia['Porcentaje'],
+                    name='% Malas Cargas',
+                    mode='lines+markers',
+                    marker=dict(color=colors['warning']),
+                    line=dict(color=colors['warning'], width=3)
+                ),
+                secondary_y=True
+            )
+            
+            # Actualizar ejes
+            fig.update_layout(
+                title='Evolución de Malas Cargas a lo Largo del Tiempo',
+                plot_bgcolor='white',
+                hovermode='x unified',
+                height=450,
+                legend=dict(
+                    orientation="h",
+                    yanchor="bottom",
+                    y=1.02,
+                    xanchor="right",
+                    x=1
+                )
+            )
+            
+            fig.update_xaxes(title_text='Fecha')
+            fig.update_yaxes(title_text='Cantidad de Malas Cargas', secondary_y=False)
+            fig.update_yaxes(title_text='% de Malas Cargas', secondary_y=True)
+            
+            # Añadir línea de promedio
+            fig.add_hline(
+                y=porcentaje,
+                line_dash="dash",
+                line_color="red",
+                secondary_y=True,
+                annotation_text=f"Promedio: {porcentaje:.2f}%"
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # Análisis de tendencia
+            if len(tendencia) > 3:
+                from sklearn.linear_model import LinearRegression
+                
+                # Calcular tendencia lineal
+                X = np.array(range(len(tendencia))).reshape(-1, 1)
+                y = tendencia['Porcentaje'].values
+                
+                modelo = LinearRegression()
+                modelo.fit(X, y)
+                tendencia_valor = modelo.coef_[0]
+                
+                # Generar predicción para graficar línea de tendencia
+                y_pred = modelo.predict(X)
+                
+                # Determinar si es creciente o decreciente
+                if tendencia_valor > 0.1:
+                    st.markdown(show_alert(
+                        f"La tendencia de malas cargas está aumentando en un {tendencia_valor:.2f}% por día. Se recomienda revisar urgentemente los procedimientos de registro.",
+                        "danger",
+                        "Tendencia Creciente de Malas Cargas",
+                        "📈"
+                    ), unsafe_allow_html=True)
+                elif tendencia_valor < -0.1:
+                    st.markdown(show_alert(
+                        f"La tendencia de malas cargas está disminuyendo en un {abs(tendencia_valor):.2f}% por día. Las medidas correctivas parecen estar funcionando.",
+                        "success",
+                        "Tendencia Decreciente de Malas Cargas",
+                        "📉"
+                    ), unsafe_allow_html=True)
+        
+        # Recomendaciones específicas
+        st.markdown("<h3 class='section-title'>Recomendaciones para Reducir Malas Cargas</h3>", unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown(f"""
+            <div class="card">
+                <h4>Recomendaciones Operativas</h4>
+                <ul>
+                    <li><strong>Capacitación Específica:</strong> Realizar sesiones de capacitación focalizadas para planilleros con altas tasas de malas cargas.</li>
+                    <li><strong>Estandarización de Procesos:</strong> Implementar protocolos claros y estandarizados para el registro de cargas.</li>
+                    <li><strong>Supervisión Reforzada:</strong> Incrementar la supervisión en terminales con mayor incidencia de malas cargas.</li>
+                    <li><strong>Verificación Doble:</strong> Implementar un sistema de verificación doble para cargas grandes o inusuales.</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown(f"""
+            <div class="card">
+                <h4>Mejoras Tecnológicas</h4>
+                <ul>
+                    <li><strong>Automatización:</strong> Implementar sistemas de medición automática cuando sea posible.</li>
+                    <li><strong>Validación en Tiempo Real:</strong> Desarrollar controles de validación que detecten valores anómalos durante el ingreso.</li>
+                    <li><strong>Feedback Inmediato:</strong> Proporcionar retroalimentación inmediata a planilleros cuando se detecta un patrón de malas cargas.</li>
+                    <li><strong>Monitoreo Continuo:</strong> Establecer un sistema de monitoreo continuo con alertas para tendencias negativas.</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Listado detallado
+        st.markdown("<h3 class='section-title'>Listado Detallado de Malas Cargas</h3>", unsafe_allow_html=True)
+        
+        # Columnas relevantes
+        cols_relevantes = [col for col in [
+            'Fecha', 'Hora', 'Terminal', 'Número interno', 'Patente', 
+            'Cantidad litros', 'Tipo', 'Motivo Mala Carga', 'Nombre Planillero', 'Nombre supervisor'
+        ] if col in df_malas.columns]
+        
+        # Mostrar datos con paginación
+        with st.expander("Ver listado completo", expanded=False):
+            # Crear selector de página
+            if len(df_malas) > 50:
+                # Calcular número de páginas (50 registros por página)
+                num_paginas = (len(df_malas) - 1) // 50 + 1
+                pagina_actual = st.selectbox("Página", range(1, num_paginas + 1), key="pagina_malas_cargas")
+                
+                # Índices de inicio y fin para la página seleccionada
+                inicio = (pagina_actual - 1) * 50
+                fin = min(inicio + 50, len(df_malas))
+                
+                # Mostrar datos de la página actual
+                st.dataframe(
+                    formatear_horas(df_malas[cols_relevantes].sort_values('Fecha', ascending=False).iloc[inicio:fin]),
+                    use_container_width=True,
+                    height=400
+                )
+                
+                st.info(f"Mostrando registros {inicio+1} a {fin} de {len(df_malas)}")
+            else:
+                # Si hay pocos registros, mostrar todos
+                st.dataframe(
+                    formatear_horas(df_malas[cols_relevantes].sort_values('Fecha', ascending=False)),
+                    use_container_width=True,
+                    height=400
+                )
+        
+        # Opción para exportar
+        if len(df_malas) > 0:
+            st.download_button(
+                label="📥 Descargar listado de malas cargas",
+                data=formatear_horas(df_malas[cols_relevantes].sort_values('Fecha', ascending=False)).to_csv(index=False).encode('utf-8'),
+                file_name="malas_cargas.csv",
+                mime="text/csv",
+                help="Descargar un archivo CSV con el listado completo de malas cargas",
+                use_container_width=True
+            )
+    else:
+        st.warning("No se encontró información sobre malas cargas en los datos.")
@@ -0,0 +1,1216 @@
+"""
+Sección «Análisis por Personal»: desempeño de conductores y planilleros.
+"""
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+import datetime
+
+from interfaz.componentes import create_kpi_card, formatear_horas, show_alert
+from interfaz.tema import get_colors
+
+
+def render(df, cubo, indice):
+    colors = get_colors()
+
+    st.markdown("<h2 class='subtitle'>Análisis por Personal</h2>", unsafe_allow_html=True)
+    
+    # Seleccionar tipo de personal
+    tabs = []
+    
+    # Verificar qué tipos de personal existen en los datos
+    if 'Nombre conductor' in df.columns:
+        tabs.append("Conductores")
+    
+    if 'Nombre Planillero' in df.columns:
+        tabs.append("Planilleros")
+    
+    if 'Nombre supervisor' in df.columns:
+        tabs.append("Supervisores")
+    
+    if not tabs:
+        st.warning("No se encontraron columnas de personal en los datos.")
+    else:
+        tipo_personal = st.radio("Tipo de personal:", tabs, horizontal=True)
+        
+        # Análisis por Conductores
+        if tipo_personal == "Conductores" and 'Nombre conductor' in df.columns:
+            # Selector de conductor
+            conductores = indice.entities('Nombre conductor')
+            
+            col1, col2, col3 = st.columns([3, 1, 1])
+            
+            with col1:
+                conductor_seleccionado = st.selectbox("Seleccionar Conductor", ['Todos'] + list(conductores))
+            
+            with col2:
+                if 'Fecha' in df.columns:
+                    fecha_min = df['Fecha'].min().date()
+                    fecha_max = df['Fecha'].max().date()
+                else:
+                    fecha_min = datetime.date.today() - datetime.timedelta(days=30)
+                    fecha_max = datetime.date.today()
+                
+                fecha_inicio = st.date_input("Fecha inicio", fecha_min, key="conductor_fecha_inicio")
+            
+            with col3:
+                fecha_fin = st.date_input("Fecha fin", fecha_max, key="conductor_fecha_fin")
+            
+            # Filtrar datos por conductor y fechas (por posición, en orden cronológico)
+            if conductor_seleccionado != 'Todos':
+                df_conductor = indice.rows(fecha_inicio, fecha_fin, 'Nombre conductor', conductor_seleccionado, cronologico=True)
+            else:
+                df_conductor = indice.rows(fecha_inicio, fecha_fin)
+            
+            # Si seleccionamos un conductor específico
+            if conductor_seleccionado != 'Todos':
+                st.markdown(f"<h3 class='section-title'>Análisis Detallado: {conductor_seleccionado}</h3>", unsafe_allow_html=True)
+                
+                # Métricas principales
+                col1, col2, col3, col4 = st.columns(4)
+                
+                with col1:
+                    cargas_conductor = len(df_conductor)
+                    st.markdown(create_kpi_card(
+                        "Total Cargas", 
+                        f"{cargas_conductor}",
+                        None,
+                        icon="🚌",
+                        color_class="primary",
+                        footnote=f"En el período analizado"
+                    ), unsafe_allow_html=True)
+                
+                with col2:
+                    if 'Cantidad litros' in df_conductor.columns:
+                        litros_conductor = df_conductor['Cantidad litros'].sum()
+                        st.markdown(create_kpi_card(
+                            "Total Litros", 
+                            f"{litros_conductor:,.0f}",
+                            None,
+                            icon="⛽",
+                            color_class="info",
+                            footnote=f"Consumo total"
+                        ), unsafe_allow_html=True)
+                
+                with col3:
+                    if 'Sobreconsumo' in df_conductor.columns:
+                        sobreconsumos = df_conductor['Sobreconsumo'].sum()
+                        porcentaje_sobre = (sobreconsumos / len(df_conductor)) * 100 if len(df_conductor) > 0 else 0
+                        
+                        # Comparar con el promedio global
+                        porcentaje_global = (df['Sobreconsumo'].sum() / len(df)) * 100 if len(df) > 0 else 0
+                        diferencia = porcentaje_sobre - porcentaje_global
+                        
+                        color_class = "success" if diferencia < -2 else "warning" if diferencia < 2 else "danger"
+                        
+                        st.markdown(create_kpi_card(
+                            "Sobreconsumos", 
+                            f"{sobreconsumos} ({porcentaje_sobre:.2f}%)",
+                            -diferencia,  # Negativo porque menos es mejor
+                            icon="⚠️",
+                            color_class=color_class,
+                            footnote=f"vs {porcentaje_global:.2f}% global"
+                        ), unsafe_allow_html=True)
+                
+                with col4:
+                    if 'Rendimiento' in df_conductor.columns:
+                        rendimiento_conductor = df_conductor['Rendimiento'].mean()
+                        rendimiento_global = df['Rendimiento'].mean()
+                        diferencia_pct = ((rendimiento_conductor / rendimiento_global) - 1) * 100 if rendimiento_global > 0 else 0
+                        
+                        color_class = "success" if diferencia_pct > 2 else "warning" if diferencia_pct > -2 else "danger"
+                        
+                        st.markdown(create_kpi_card(
+                            "Rendimiento", 
+                            f"{rendimiento_conductor:.2f} km/L",
+                            diferencia_pct,  # Positivo porque más es mejor
+                            icon="🔄",
+                            color_class=color_class,
+                            footnote=f"vs {rendimiento_global:.2f} global"
+                        ), unsafe_allow_html=True)
+                
+                # Análisis de eficiencia
+                st.markdown("<h4>Análisis de Eficiencia</h4>", unsafe_allow_html=True)
+                
+                # Calcular índice de eficiencia
+                eficiencia = 100
+                
+                if 'Sobreconsumo' in df_conductor.columns:
+                    porcentaje_sobre = (df_conductor['Sobreconsumo'].sum() / len(df_conductor)) * 100 if len(df_conductor) > 0 else 0
+                    eficiencia -= porcentaje_sobre * 0.7  # Penalización por sobreconsumo
+                
+                if 'Rendimiento' in df_conductor.columns:
+                    rendimiento_conductor = df_conductor['Rendimiento'].mean()
+                    rendimiento_global = df['Rendimiento'].mean()
+                    
+                    if rendimiento_global > 0:
+                        # Ajustar eficiencia basado en rendimiento
+                        diferencia_pct = ((rendimiento_conductor / rendimiento_global) - 1) * 100
+                        if diferencia_pct < -10:
+                            eficiencia -= 10  # Penalización por rendimiento muy bajo
+                        elif diferencia_pct < -5:
+                            eficiencia -= 5   # Penalización por rendimiento bajo
+                        elif diferencia_pct > 10:
+                            eficiencia += 5   # Bonificación por rendimiento muy alto
+                        elif diferencia_pct > 5:
+                            eficiencia += 2.5  # Bonificación por rendimiento alto
+                
+                eficiencia = max(0, min(100, eficiencia))  # Asegurar rango 0-100
+                
+                # Mostrar índice de eficiencia
+                col1, col2 = st.columns([1, 3])
+                
+                with col1:
+                    # Determinar color según eficiencia
+                    if eficiencia >= 90:
+                        color = colors['success']
+                        categoria = "Excelente"
+                    elif eficiencia >= 80:
+                        color = colors['info']
+                        categoria = "Bueno"
+                    elif eficiencia >= 70:
+                        color = colors['warning']
+                        categoria = "Regular"
+                    else:
+                        color = colors['danger']
+                        categoria = "Necesita Mejora"
+                    
+                    st.markdown(f"""
+                    <div class="card" style="text-align: center;">
+                        <h4>Índice de Eficiencia</h4>
+                        <div style="font-size: 3rem; font-weight: 700; color: {color};">{eficiencia:.1f}</div>
+                        <div style="font-size: 1.2rem; color: {color};">{categoria}</div>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                with col2:
+                    # Mostrar factores que influyen en la eficiencia
+                    st.markdown(f"""
+                    <div class="card">
+                        <h4>Factores de Eficiencia</h4>
+                        <div class="progress" style="margin-bottom: 15px;">
+                            <div class="progress-bar progress-bar-{'success' if porcentaje_sobre < 5 else 'warning' if porcentaje_sobre < 10 else 'danger'}" style="width: {min(100, porcentaje_sobre * 10)}%"></div>
+                        </div>
+                        <p><strong>Tasa de Sobreconsumo:</strong> {porcentaje_sobre:.2f}% (vs {(df['Sobreconsumo'].sum() / len(df)) * 100:.2f}% global)</p>
+                        
+                        <div class="progress" style="margin-bottom: 15px;">
+                            <div class="progress-bar progress-bar-{'danger' if diferencia_pct < -10 else 'warning' if diferencia_pct < 0 else 'success'}" style="width: {min(100, (rendimiento_conductor / (rendimiento_global * 1.5)) * 100)}%"></div>
+                        </div>
+                        <p><strong>Rendimiento:</strong> {rendimiento_conductor:.2f} km/L (vs {rendimiento_global:.2f} km/L global)</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                # Análisis de buses conducidos
+                if 'Número interno' in df_conductor.columns:
+                    st.markdown("<h4>Buses Conducidos</h4>", unsafe_allow_html=True)
+                    
+                    # Contar cargas por bus
+                    buses_conductor = df_conductor.groupby('Número interno').size().reset_index()
+                    buses_conductor.columns = ['Bus', 'Cargas']
+                    buses_conductor = buses_conductor.sort_values('Cargas', ascending=False)
+                    
+                    # Calcular porcentaje
+                    buses_conductor['% del Total'] = (buses_conductor['Cargas'] / buses_conductor['Cargas'].sum() * 100).round(2)
+                    
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        # Gráfico de buses conducidos
+                        fig = px.bar(
+                            buses_conductor.head(10),
+                            x='Bus',
+                            y='Cargas',
+                            title='Top 10 Buses Conducidos',
+                            color='Cargas',
+                            color_continuous_scale='Viridis',
+                            text='Cargas'
+                        )
+                        
+                        fig.update_traces(
+                            texttemplate='%{text}',
+                            textposition='outside'
+                        )
+                        
+                        fig.update_layout(
+                            xaxis_title="Bus",
+                            yaxis_title="Cantidad de Cargas",
+                            plot_bgcolor='white'
+                        )
+                        
+                        st.plotly_chart(fig, use_container_width=True)
+                    
+                    with col2:
+                        # Distribución del rendimiento por bus
+                        if 'Rendimiento' in df_conductor.columns:
+                            rendimiento_por_bus = df_conductor.groupby('Número interno')['Rendimiento'].mean().reset_index()
+                            rendimiento_por_bus.columns = ['Bus', 'Rendimiento']
+                            
+                            # Fusionar con buses_conductor para mostrar solo los más usados
+                            rendimiento_por_bus = pd.merge(
+                                rendimiento_por_bus,
+                                buses_conductor[['Bus', 'Cargas']],
+                                on='Bus'
+                            )
+                            
+                            # Filtrar buses con al menos 3 cargas
+                            rendimiento_por_bus = rendimiento_por_bus[rendimiento_por_bus['Cargas'] >= 3]
+                            rendimiento_por_bus = rendimiento_por_bus.sort_values('Rendimiento', ascending=False)
+                            
+                            # Mostrar gráfico
+                            fig = px.bar(
+                                rendimiento_por_bus.head(10),
+                                x='Bus',
+                                y='Rendimiento',
+                                title='Rendimiento por Bus (Top 10)',
+                                color='Rendimiento',
+                                color_continuous_scale='Viridis',
+                                text='Rendimiento'
+                            )
+                            
+                            fig.update_traces(
+                                texttemplate='%{text:.2f}',
+                                textposition='outside'
+                            )
+                            
+                            fig.update_layout(
+                                xaxis_title="Bus",
+                                yaxis_title="Rendimiento (km/L)",
+                                plot_bgcolor='white'
+                            )
+                            
+                            st.plotly_chart(fig, use_container_width=True)
+                
+                # Historial detallado
+                with st.expander("Historial Detallado de Cargas", expanded=False):
+                    # Columnas relevantes para mostrar
+                    cols_relevantes = [col for col in [
+                        'Fecha', 'Hora', 'Terminal', 'Número interno',
+                        'Cantidad litros', 'Rendimiento', 'Sobreconsumo'
+                    ] if col in df_conductor.columns]
+                    
+                    # Mostrar datos
+                    st.dataframe(
+                        formatear_horas(df_conductor[cols_relevantes].sort_values('Fecha', ascending=False)),
+                        use_container_width=True,
+                        height=400
+                    )
+            
+            # Si es vista de todos los conductores
+            else:
+                st.markdown("<h3 class='section-title'>Resumen de Conductores</h3>", unsafe_allow_html=True)
+                
+                # Crear tabla de resumen
+                resumen_conductores = df_conductor.groupby('Nombre conductor').agg({
+                    'Cantidad litros': ['sum', 'mean', 'count'] if 'Cantidad litros' in df_conductor.columns else 'count',
+                    'Sobreconsumo': 'sum' if 'Sobreconsumo' in df_conductor.columns else 'count',
+                    'Rendimiento': 'mean' if 'Rendimiento' in df_conductor.columns else 'count'
+                }).reset_index()
+                
+                # Aplanar columnas
+                if 'Cantidad litros' in df_conductor.columns:
+                    resumen_conductores.columns = ['Conductor', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 
+                                              'Sobreconsumos', 'Rendimiento Promedio']
+                    
+                    # Añadir porcentajes
+                    resumen_conductores['% Sobreconsumos'] = (resumen_conductores['Sobreconsumos'] / resumen_conductores['Cantidad Cargas'] * 100).round(2)
+                    
+                    # Calcular índice de eficiencia
+                    resumen_conductores['Índice Eficiencia'] = 100 - resumen_conductores['% Sobreconsumos'] * 0.7
+                    
+                    # Ajustar por rendimiento si está disponible
+                    if 'Rendimiento' in df_conductor.columns:
+                        rendimiento_global = df['Rendimiento'].mean()
+                        
+                        if rendimiento_global > 0:
+                            resumen_conductores['% vs Rendimiento Global'] = ((resumen_conductores['Rendimiento Promedio'] / rendimiento_global) - 1) * 100
+                            
+                            # Ajustar índice de eficiencia
+                            ajuste_rendimiento = np.where(
+                                resumen_conductores['% vs Rendimiento Global'] > 5, 5,
+                                np.where(
+                                    resumen_conductores['% vs Rendimiento Global'] > 0, 2.5,
+                                    np.where(
+                                        resumen_conductores['% vs Rendimiento Global'] < -10, -10,
+                                        np.where(
+                                            resumen_conductores['% vs Rendimiento Global'] < -5, -5, 0
+                                        )
+                                    )
+                                )
+                            )
+                            
+                            resumen_conductores['Índice Eficiencia'] += ajuste_rendimiento
+                    
+                    # Asegurar rango 0-100
+                    resumen_conductores['Índice Eficiencia'] = resumen_conductores['Índice Eficiencia'].clip(0, 100).round(1)
+                    
+                    # Ordenar por índice de eficiencia (descendente)
+                    resumen_conductores = resumen_conductores.sort_values('Índice Eficiencia', ascending=False)
+                else:
+                    resumen_conductores.columns = ['Conductor', 'Cantidad Cargas', 'Sobreconsumos', 'Rendimiento Count']
+                    
+                    # Ordenar por cantidad de cargas
+                    resumen_conductores = resumen_conductores.sort_values('Cantidad Cargas', ascending=False)
+                
+                # Mostrar gráficos de ranking
+                if 'Índice Eficiencia' in resumen_conductores.columns:
+                    # Mostrar top 10 más eficientes
+                    fig = px.bar(
+                        resumen_conductores.head(10),
+                        x='Conductor',
+                        y='Índice Eficiencia',
+                        title='Top 10 Conductores por Eficiencia',
+                        color='Índice Eficiencia',
+                        color_continuous_scale='RdYlGn',
+                        text='Índice Eficiencia'
+                    )
+                    
+                    fig.update_traces(
+                        texttemplate='%{text:.1f}',
+                        textposition='outside'
+                    )
+                    
+                    fig.update_layout(
+                        xaxis_title="Conductor",
+                        yaxis_title="Índice de Eficiencia",
+                        plot_bgcolor='white'
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                
+                # Mostrar tabla completa
+                st.markdown("<h4>Tabla Completa de Conductores</h4>", unsafe_allow_html=True)
+                
+                # Mostrar tabla
+                st.dataframe(
+                    resumen_conductores,
+                    column_config={
+                        "Conductor": st.column_config.TextColumn("Conductor"),
+                        "Total Litros": st.column_config.NumberColumn("Total Litros", format="%,.2f"),
+                        "Promedio Litros": st.column_config.NumberColumn("Prom. L/Carga", format="%.2f"),
+                        "Cantidad Cargas": st.column_config.NumberColumn("# Cargas", format="%d"),
+                        "Sobreconsumos": st.column_config.NumberColumn("Sobre", format="%d"),
+                        "% Sobreconsumos": st.column_config.NumberColumn("% Sobre", format="%.2f%%"),
+                        "Rendimiento Promedio": st.column_config.NumberColumn("Rendimiento (km/L)", format="%.2f"),
+                        "% vs Rendimiento Global": st.column_config.NumberColumn("% vs Global", format="%.2f%%"),
+                        "Índice Eficiencia": st.column_config.ProgressColumn("Eficiencia", format="%.1f", min_value=0, max_value=100)
+                    },
+                    use_container_width=True
+                )
+                
+                # Análisis de sobreconsumos
+                if 'Sobreconsumo' in df_conductor.columns:
+                    st.markdown("<h4>Análisis de Conductores con Mayor Tasa de Sobreconsumo</h4>", unsafe_allow_html=True)
+                    
+                    # Filtrar conductores con al menos 5 cargas
+                    conductores_sobreconsumo = resumen_conductores[resumen_conductores['Cantidad Cargas'] >= 5].copy()
+                    
+                    # Ordenar por porcentaje de sobreconsumos (descendente)
+                    conductores_sobreconsumo = conductores_sobreconsumo.sort_values('% Sobreconsumos', ascending=False)
+                    
+                    # Mostrar gráfico
+                    fig = px.bar(
+                        conductores_sobreconsumo.head(10),
+                        x='Conductor',
+                        y='% Sobreconsumos',
+                        title='Top 10 Conductores con Mayor % de Sobreconsumo',
+                        color='% Sobreconsumos',
+                        color_continuous_scale='Reds',
+                        text='% Sobreconsumos'
+                    )
+                    
+                    fig.update_traces(
+                        texttemplate='%{text:.2f}%',
+                        textposition='outside'
+                    )
+                    
+                    fig.update_layout(
+                        xaxis_title="Conductor",
+                        yaxis_title="% de Sobreconsumo",
+                        plot_bgcolor='white'
+                    )
+                    
+                    # Añadir línea para el promedio
+                    promedio_sobreconsumo = (df_conductor['Sobreconsumo'].sum() / len(df_conductor)) * 100
+                    
+                    fig.add_hline(
+                        y=promedio_sobreconsumo,
+                        line_dash="dash",
+                        line_color="red",
+                        annotation_text=f"Promedio: {promedio_sobreconsumo:.2f}%"
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                    
+                    # Mostrar recomendaciones si hay conductores con alta tasa
+                    if not conductores_sobreconsumo.empty and conductores_sobreconsumo['% Sobreconsumos'].iloc[0] > 15:
+                        st.markdown(show_alert(
+                            f"Los conductores con mayor tasa de sobreconsumo deberían recibir capacitación adicional sobre técnicas de conducción eficiente.",
+                            "warning",
+                            "Oportunidad de Mejora Detectada",
+                            "⚠️"
+                        ), unsafe_allow_html=True)
+        
+        # Análisis por Planilleros
+        elif tipo_personal == "Planilleros" and 'Nombre Planillero' in df.columns:
+            # Selector de planillero
+            planilleros = indice.entities('Nombre Planillero')
+            
+            col1, col2, col3 = st.columns([3, 1, 1])
+            
+            with col1:
+                planillero_seleccionado = st.selectbox("Seleccionar Planillero", ['Todos'] + list(planilleros))
+            
+            with col2:
+                if 'Fecha' in df.columns:
+                    fecha_min = df['Fecha'].min().date()
+                    fecha_max = df['Fecha'].max().date()
+                else:
+                    fecha_min = datetime.date.today() - datetime.timedelta(days=30)
+                    fecha_max = datetime.date.today()
+                
+                fecha_inicio = st.date_input("Fecha inicio", fecha_min, key="planillero_fecha_inicio")
+            
+            with col3:
+                fecha_fin = st.date_input("Fecha fin", fecha_max, key="planillero_fecha_fin")
+            
+            # Filtrar datos por planillero y fechas (por posición, en orden cronológico)
+            if planillero_seleccionado != 'Todos':
+                df_planillero = indice.rows(fecha_inicio, fecha_fin, 'Nombre Planillero', planillero_seleccionado, cronologico=True)
+            else:
+                df_planillero = indice.rows(fecha_inicio, fecha_fin)
+            
+            # Si seleccionamos un planillero específico
+            if planillero_seleccionado != 'Todos':
+                st.markdown(f"<h3 class='section-title'>Análisis Detallado: {planillero_seleccionado}</h3>", unsafe_allow_html=True)
+                
+                # Métricas principales
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    cargas_planillero = len(df_planillero)
+                    st.markdown(create_kpi_card(
+                        "Total Cargas", 
+                        f"{cargas_planillero}",
+                        None,
+                        icon="📝",
+                        color_class="primary",
+                        footnote=f"En el período analizado"
+                    ), unsafe_allow_html=True)
+                
+                with col2:
+                    if 'Mala Carga' in df_planillero.columns:
+                        malas_cargas = df_planillero['Mala Carga'].sum()
+                        porcentaje_malas = (malas_cargas / len(df_planillero)) * 100 if len(df_planillero) > 0 else 0
+                        
+                        # Comparar con el promedio global
+                        porcentaje_global = (df['Mala Carga'].sum() / len(df)) * 100 if len(df) > 0 else 0
+                        diferencia = porcentaje_malas - porcentaje_global
+                        
+                        color_class = "success" if diferencia < -2 else "warning" if diferencia < 2 else "danger"
+                        
+                        st.markdown(create_kpi_card(
+                            "Malas Cargas", 
+                            f"{malas_cargas} ({porcentaje_malas:.2f}%)",
+                            -diferencia,  # Negativo porque menos es mejor
+                            icon="❌",
+                            color_class=color_class,
+                            footnote=f"vs {porcentaje_global:.2f}% global"
+                        ), unsafe_allow_html=True)
+                
+                with col3:
+                    if 'Terminal' in df_planillero.columns:
+                        terminales = df_planillero['Terminal'].nunique()
+                        st.markdown(create_kpi_card(
+                            "Terminales", 
+                            f"{terminales}",
+                            None,
+                            icon="🏢",
+                            color_class="info",
+                            footnote=f"Diferentes terminales"
+                        ), unsafe_allow_html=True)
+                
+                # Evolución temporal
+                if 'Fecha' in df_planillero.columns and len(df_planillero) > 1:
+                    st.markdown("<h4>Evolución Temporal</h4>", unsafe_allow_html=True)
+                    
+                    # Agrupar por fecha
+                    cargas_por_dia = df_planillero.groupby(df_planillero['Fecha'].dt.date).size().reset_index()
+                    cargas_por_dia.columns = ['Fecha', 'Cargas']
+                    
+                    # Calcular malas cargas por día
+                    if 'Mala Carga' in df_planillero.columns:
+                        malas_por_dia = df_planillero.groupby(df_planillero['Fecha'].dt.date)['Mala Carga'].sum().reset_index()
+                        malas_por_dia.columns = ['Fecha', 'Malas Cargas']
+                        
+                        # Unir dataframes
+                        cargas_por_dia = pd.merge(cargas_por_dia, malas_por_dia, on='Fecha')
+                        
+                        # Calcular porcentaje
+                        cargas_por_dia['% Malas'] = (cargas_por_dia['Malas Cargas'] / cargas_por_dia['Cargas'] * 100).round(2)
+                    
+                    # Crear gráfico
+                    fig = make_subplots(specs=[[{"secondary_y": True}]])
+                    
+                    # Añadir barras para cargas totales
+                    fig.add_trace(
+                        go.Bar(
+                            x=cargas_por_dia['Fecha'],
+                            y=cargas_por_dia['Cargas'],
+                            name='Total Cargas',
+                            marker_color=colors['primary']
+                        ),
+                        secondary_y=False
+                    )
+                    
+                    # Añadir línea para porcentaje de malas cargas si está disponible
+                    if 'Mala Carga' in df_planillero.columns:
+                        fig.add_trace(
+                            go.Scatter(
+                                x=cargas_por_dia['Fecha'],
+                                y=cargas_por_dia['% Malas'],
+                                name='% Malas Cargas',
+                                line=dict(color=colors['danger'], width=2),
+                                mode='lines+markers'
+                            ),
+                            secondary_y=True
+                        )
+                    
+                    # Actualizar diseño
+                    fig.update_layout(
+                        title='Evolución de Cargas y % de Malas Cargas',
+                        plot_bgcolor='white',
+                        hovermode='x unified',
+                        height=400,
+                        legend=dict(
+                            orientation="h",
+                            yanchor="bottom",
+                            y=1.02,
+                            xanchor="right",
+                            x=1
+                        )
+                    )
+                    
+                    fig.update_xaxes(title_text="Fecha")
+                    fig.update_yaxes(title_text="Cantidad de Cargas", secondary_y=False)
+                    
+                    if 'Mala Carga' in df_planillero.columns:
+                        fig.update_yaxes(title_text="% de Malas Cargas", secondary_y=True)
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                
+                # Análisis por terminal
+                if 'Terminal' in df_planillero.columns:
+                    st.markdown("<h4>Análisis por Terminal</h4>", unsafe_allow_html=True)
+                    
+                    # Agrupar por terminal
+                    terminal_stats = df_planillero.groupby('Terminal').size().reset_index()
+                    terminal_stats.columns = ['Terminal', 'Cargas']
+                    
+                    # Calcular porcentaje
+                    terminal_stats['% del Total'] = (terminal_stats['Cargas'] / terminal_stats['Cargas'].sum() * 100).round(2)
+                    
+                    # Calcular malas cargas por terminal
+                    if 'Mala Carga' in df_planillero.columns:
+                        malas_por_terminal = df_planillero.groupby('Terminal')['Mala Carga'].sum().reset_index()
+                        malas_por_terminal.columns = ['Terminal', 'Malas Cargas']
+                        
+                        # Unir dataframes
+                        terminal_stats = pd.merge(terminal_stats, malas_por_terminal, on='Terminal')
+                        
+                        # Calcular porcentaje de malas cargas
+                        terminal_stats['% Malas'] = (terminal_stats['Malas Cargas'] / terminal_stats['Cargas'] * 100).round(2)
+                    
+                    # Ordenar por cantidad de cargas (descendente)
+                    terminal_stats = terminal_stats.sort_values('Cargas', ascending=False)
+                    
+                    # Mostrar en pestañas
+                    tab1, tab2 = st.tabs(["📊 Gráfico", "📋 Tabla"])
+                    
+                    with tab1:
+                        # Crear gráfico
+                        if 'Mala Carga' in df_planillero.columns:
+                            # Gráfico con cargas totales y % de malas cargas
+                            fig = make_subplots(specs=[[{"secondary_y": True}]])
+                            
+                            # Añadir barras para cargas totales
+                            fig.add_trace(
+                                go.Bar(
+                                    x=terminal_stats['Terminal'],
+                                    y=terminal_stats['Cargas'],
+                                    name='Total Cargas',
+                                    marker_color=colors['primary']
+                                ),
+                                secondary_y=False
+                            )
+                            
+                            # Añadir línea para porcentaje de malas cargas
+                            fig.add_trace(
+                                go.Scatter(
+                                    x=terminal_stats['Terminal'],
+                                    y=terminal_stats['% Malas'],
+                                    name='% Malas Cargas',
+                                    line=dict(color=colors['danger'], width=2),
+                                    mode='lines+markers'
+                                ),
+                                secondary_y=True
+                            )
+                            
+                            # Actualizar diseño
+                            fig.update_layout(
+                                title='Cargas y % de Malas Cargas por Terminal',
+                                plot_bgcolor='white',
+                                hovermode='x unified',
+                                height=400,
+                                legend=dict(
+                                    orientation="h",
+                                    yanchor="bottom",
+                                    y=1.02,
+                                    xanchor="right",
+                                    x=1
+                                )
+                            )
+                            
+                            fig.update_xaxes(title_text="Terminal")
+                            fig.update_yaxes(title_text="Cantidad de Cargas", secondary_y=False)
+                            fig.update_yaxes(title_text="% de Malas Cargas", secondary_y=True)
+                        else:
+                            # Gráfico simple de cargas por terminal
+                            fig = px.bar(
+                                terminal_stats,
+                                x='Terminal',
+                                y='Cargas',
+                                title='Cargas por Terminal',
+                                color='Cargas',
+                                color_continuous_scale='Viridis',
+                                text='Cargas'
+                            )
+                            
+                            fig.update_traces(
+                                texttemplate='%{text}',
+                                textposition='outside'
+                            )
+                            
+                            fig.update_layout(
+                                xaxis_title="Terminal",
+                                yaxis_title="Cantidad de Cargas",
+                                plot_bgcolor='white'
+                            )
+                        
+                        st.plotly_chart(fig, use_container_width=True)
+                    
+                    with tab2:
+                        # Mostrar tabla
+                        st.dataframe(
+                            terminal_stats,
+                            column_config={
+                                "Terminal": st.column_config.TextColumn("Terminal"),
+                                "Cargas": st.column_config.NumberColumn("Cargas", format="%d"),
+                                "% del Total": st.column_config.NumberColumn("% del Total", format="%.2f%%"),
+                                "Malas Cargas": st.column_config.NumberColumn("Malas", format="%d"),
+                                "% Malas": st.column_config.NumberColumn("% Malas", format="%.2f%%")
+                            },
+                            use_container_width=True
+                        )
+                
+                # Historial detallado
+                with st.expander("Historial Detallado de Cargas", expanded=False):
+                    # Columnas relevantes para mostrar
+                    cols_relevantes = [col for col in [
+                        'Fecha', 'Hora', 'Terminal', 'Número interno',
+                        'Cantidad litros', 'Mala Carga'
+                    ] if col in df_planillero.columns]
+                    
+                    # Mostrar datos
+                    st.dataframe(
+                        formatear_horas(df_planillero[cols_relevantes].sort_values('Fecha', ascending=False)),
+                        use_container_width=True,
+                        height=400
+                    )
+            
+            # Si es vista de todos los planilleros
+            else:
+                st.markdown("<h3 class='section-title'>Resumen de Planilleros</h3>", unsafe_allow_html=True)
+                
+                # Crear tabla de resumen
+                resumen_planilleros = df_planillero.groupby('Nombre Planillero').agg({
+                    'Mala Carga': ['sum', 'count'] if 'Mala Carga' in df_planillero.columns else 'count'
+                }).reset_index()
+                
+                # Aplanar columnas
+                if 'Mala Carga' in df_planillero.columns:
+                    resumen_planilleros.columns = ['Planillero', 'Malas Cargas', 'Total Cargas']
+                    
+                    # Añadir porcentajes
+                    resumen_planilleros['% Malas Cargas'] = (resumen_planilleros['Malas Cargas'] / resumen_planilleros['Total Cargas'] * 100).round(2)
+                    
+                    # Ordenar por porcentaje de malas cargas (ascendente - mejores primero)
+                    resumen_planilleros = resumen_planilleros.sort_values('% Malas Cargas')
+                else:
+                    resumen_planilleros.columns = ['Planillero', 'Total Cargas']
+                    
+                    # Ordenar por cantidad de cargas (descendente)
+                    resumen_planilleros = resumen_planilleros.sort_values('Total Cargas', ascending=False)
+                
+                # Mostrar gráficos de ranking
+                if 'Mala Carga' in df_planillero.columns:
+                    # Filtrar planilleros con al menos 10 cargas
+                    planilleros_filtrados = resumen_planilleros[resumen_planilleros['Total Cargas'] >= 10].copy()
+                    
+                    # Mostrar mejores planilleros
+                    fig = px.bar(
+                        planilleros_filtrados.head(10),  # Top 10 mejores
+                        x='Planillero',
+                        y='% Malas Cargas',
+                        title='Top 10 Planilleros con Menor % de Malas Cargas',
+                        color='% Malas Cargas',
+                        color_continuous_scale='RdYlGn_r',  # Escala invertida
+                        text='% Malas Cargas'
+                    )
+                    
+                    fig.update_traces(
+                        texttemplate='%{text:.2f}%',
+                        textposition='outside'
+                    )
+                    
+                    fig.update_layout(
+                        xaxis_title="Planillero",
+                        yaxis_title="% de Malas Cargas",
+                        plot_bgcolor='white'
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                    
+                    # Mostrar peores planilleros
+                    fig = px.bar(
+                        planilleros_filtrados.sort_values('% Malas Cargas', ascending=False).head(10),  # Top 10 peores
+                        x='Planillero',
+                        y='% Malas Cargas',
+                        title='Top 10 Planilleros con Mayor % de Malas Cargas',
+                        color='% Malas Cargas',
+                        color_continuous_scale='RdYlGn_r',  # Escala invertida
+                        text='% Malas Cargas'
+                    )
+                    
+                    fig.update_traces(
+                        texttemplate='%{text:.2f}%',
+                        textposition='outside'
+                    )
+                    
+                    fig.update_layout(
+                        xaxis_title="Planillero",
+                        yaxis_title="% de Malas Cargas",
+                        plot_bgcolor='white'
+                    )
+                    
+                    # Añadir línea para el promedio
+                    promedio_malas = (df_planillero['Mala Carga'].sum() / len(df_planillero)) * 100
+                    
+                    fig.add_hline(
+                        y=promedio_malas,
+                        line_dash="dash",
+                        line_color="red",
+                        annotation_text=f"Promedio: {promedio_malas:.2f}%"
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                    
+                    # Mostrar recomendaciones si hay planilleros con alta tasa
+                    if not planilleros_filtrados.empty and planilleros_filtrados['% Malas Cargas'].max() > 10:
+                        st.markdown(show_alert(
+                            f"Los planilleros con mayor tasa de malas cargas deberían recibir capacitación adicional sobre los procedimientos correctos de registro.",
+                            "warning",
+                            "Oportunidad de Mejora Detectada",
+                            "⚠️"
+                        ), unsafe_allow_html=True)
+                
+                # Mostrar tabla completa
+                st.markdown("<h4>Tabla Completa de Planilleros</h4>", unsafe_allow_html=True)
+                
+                # Mostrar tabla
+                if 'Mala Carga' in df_planillero.columns:
+                    st.dataframe(
+                        resumen_planilleros,
+                        column_config={
+                            "Planillero": st.column_config.TextColumn("Planillero"),
+                            "Malas Cargas": st.column_config.NumberColumn("Malas", format="%d"),
+                            "Total Cargas": st.column_config.NumberColumn("Total", format="%d"),
+                            "% Malas Cargas": st.column_config.NumberColumn("% Malas", format="%.2f%%")
+                        },
+                        use_container_width=True
+                    )
+                else:
+                    st.dataframe(
+                        resumen_planilleros,
+                        column_config={
+                          "Planillero": st.column_config.TextColumn("Planillero"),
+                            "Total Cargas": st.column_config.NumberColumn("Total", format="%d")
+                        },
+                        use_container_width=True
+                    )
+        
+        # Análisis por Supervisores
+        elif tipo_personal == "Supervisores" and 'Nombre supervisor' in df.columns:
+            # Selector de supervisor
+            supervisores = indice.entities('Nombre supervisor')
+            
+            col1, col2, col3 = st.columns([3, 1, 1])
+            
+            with col1:
+                supervisor_seleccionado = st.selectbox("Seleccionar Supervisor", ['Todos'] + list(supervisores))
+            
+            with col2:
+                if 'Fecha' in df.columns:
+                    fecha_min = df['Fecha'].min().date()
+                    fecha_max = df['Fecha'].max().date()
+                else:
+                    fecha_min = datetime.date.today() - datetime.timedelta(days=30)
+                    fecha_max = datetime.date.today()
+                
+                fecha_inicio = st.date_input("Fecha inicio", fecha_min, key="supervisor_fecha_inicio")
+            
+            with col3:
+                fecha_fin = st.date_input("Fecha fin", fecha_max, key="supervisor_fecha_fin")
+            
+            # Filtrar datos por supervisor y fechas (por posición, en orden cronológico)
+            if supervisor_seleccionado != 'Todos':
+                df_supervisor = indice.rows(fecha_inicio, fecha_fin, 'Nombre supervisor', supervisor_seleccionado, cronologico=True)
+            else:
+                df_supervisor = indice.rows(fecha_inicio, fecha_fin)
+            
+            # Si seleccionamos un supervisor específico
+            if supervisor_seleccionado != 'Todos':
+                st.markdown(f"<h3 class='section-title'>Análisis Detallado: {supervisor_seleccionado}</h3>", unsafe_allow_html=True)
+                
+                # Métricas principales
+                col1, col2, col3, col4 = st.columns(4)
+                
+                with col1:
+                    cargas_supervisor = len(df_supervisor)
+                    st.markdown(create_kpi_card(
+                        "Total Cargas", 
+                        f"{cargas_supervisor}",
+                        None,
+                        icon="📋",
+                        color_class="primary",
+                        footnote=f"En el período analizado"
+                    ), unsafe_allow_html=True)
+                
+                with col2:
+                    if 'Mala Carga' in df_supervisor.columns:
+                        malas_cargas = df_supervisor['Mala Carga'].sum()
+                        porcentaje_malas = (malas_cargas / len(df_supervisor)) * 100 if len(df_supervisor) > 0 else 0
+                        
+                        # Comparar con el promedio global
+                        porcentaje_global = (df['Mala Carga'].sum() / len(df)) * 100 if len(df) > 0 else 0
+                        diferencia = porcentaje_malas - porcentaje_global
+                        
+                        color_class = "success" if diferencia < -2 else "warning" if diferencia < 2 else "danger"
+                        
+                        st.markdown(create_kpi_card(
+                            "Malas Cargas", 
+                            f"{malas_cargas} ({porcentaje_malas:.2f}%)",
+                            -diferencia,  # Negativo porque menos es mejor
+                            icon="❌",
+                            color_class=color_class,
+                            footnote=f"vs {porcentaje_global:.2f}% global"
+                        ), unsafe_allow_html=True)
+                
+                with col3:
+                    if 'Sobreconsumo' in df_supervisor.columns:
+                        sobreconsumos = df_supervisor['Sobreconsumo'].sum()
+                        porcentaje_sobre = (sobreconsumos / len(df_supervisor)) * 100 if len(df_supervisor) > 0 else 0
+                        
+                        # Comparar con el promedio global
+                        porcentaje_global = (df['Sobreconsumo'].sum() / len(df)) * 100 if len(df) > 0 else 0
+                        diferencia = porcentaje_sobre - porcentaje_global
+                        
+                        color_class = "success" if diferencia < -2 else "warning" if diferencia < 2 else "danger"
+                        
+                        st.markdown(create_kpi_card(
+                            "Sobreconsumos", 
+                            f"{sobreconsumos} ({porcentaje_sobre:.2f}%)",
+                            -diferencia,  # Negativo porque menos es mejor
+                            icon="⚠️",
+                            color_class=color_class,
+                            footnote=f"vs {porcentaje_global:.2f}% global"
+                        ), unsafe_allow_html=True)
+                
+                with col4:
+                    if 'Terminal' in df_supervisor.columns:
+                        terminales = df_supervisor['Terminal'].nunique()
+                        st.markdown(create_kpi_card(
+                            "Terminales", 
+                            f"{terminales}",
+                            None,
+                            icon="🏢",
+                            color_class="info",
+                            footnote=f"Diferentes terminales"
+                        ), unsafe_allow_html=True)
+                
+                # Análisis por terminal
+                if 'Terminal' in df_supervisor.columns:
+                    st.markdown("<h4>Análisis por Terminal</h4>", unsafe_allow_html=True)
+                    
+                    # Agrupar por terminal
+                    terminal_stats = df_supervisor.groupby('Terminal').agg({
+                        'Mala Carga': ['sum', 'count'] if 'Mala Carga' in df_supervisor.columns else 'count',
+                        'Sobreconsumo': ['sum'] if 'Sobreconsumo' in df_supervisor.columns else 'count'
+                    }).reset_index()
+                    
+                    # Aplanar columnas
+                    if 'Mala Carga' in df_supervisor.columns and 'Sobreconsumo' in df_supervisor.columns:
+                        terminal_stats.columns = ['Terminal', 'Malas Cargas', 'Total Cargas', 'Sobreconsumos']
+                        
+                        # Añadir porcentajes
+                        terminal_stats['% Malas'] = (terminal_stats['Malas Cargas'] / terminal_stats['Total Cargas'] * 100).round(2)
+                        terminal_stats['% Sobre'] = (terminal_stats['Sobreconsumos'] / terminal_stats['Total Cargas'] * 100).round(2)
+                        
+                        # Añadir índice de calidad
+                        terminal_stats['Índice Calidad'] = 100 - (terminal_stats['% Malas'] * 0.5 + terminal_stats['% Sobre'] * 0.5)
+                        terminal_stats['Índice Calidad'] = terminal_stats['Índice Calidad'].clip(0, 100).round(1)
+                    elif 'Mala Carga' in df_supervisor.columns:
+                        terminal_stats.columns = ['Terminal', 'Malas Cargas', 'Total Cargas']
+                        
+                        # Añadir porcentajes
+                        terminal_stats['% Malas'] = (terminal_stats['Malas Cargas'] / terminal_stats['Total Cargas'] * 100).round(2)
+                    else:
+                        terminal_stats.columns = ['Terminal', 'Total Cargas']
+                    
+                    # Ordenar por total cargas (descendente)
+                    terminal_stats = terminal_stats.sort_values('Total Cargas', ascending=False)
+                    
+                    # Mostrar gráfico y tabla en pestañas
+                    tab1, tab2 = st.tabs(["📊 Gráfico", "📋 Tabla"])
+                    
+                    with tab1:
+                        if 'Mala Carga' in df_supervisor.columns:
+                            # Gráfico con índice de calidad si está disponible
+                            if 'Índice Calidad' in terminal_stats.columns:
+                                fig = px.bar(
+                                    terminal_stats,
+                                    x='Terminal',
+                                    y='Índice Calidad',
+                                    title='Índice de Calidad por Terminal',
+                                    color='Índice Calidad',
+                                    color_continuous_scale='RdYlGn',
+                                    text='Índice Calidad'
+                                )
+                                
+                                fig.update_traces(
+                                    texttemplate='%{text:.1f}',
+                                    textposition='outside'
+                                )
+                                
+                                fig.update_layout(
+                                    xaxis_title="Terminal",
+                                    yaxis_title="Índice de Calidad",
+                                    plot_bgcolor='white'
+                                )
+                            else:
+                                # Gráfico con porcentaje de malas cargas
+                                fig = px.bar(
+                                    terminal_stats,
+                                    x='Terminal',
+                                    y='% Malas',
+                                    title='% de Malas Cargas por Terminal',
+                                    color='% Malas',
+                                    color_continuous_scale='RdYlGn_r',  # Escala invertida
+                                    text='% Malas'
+                                )
+                                
+                                fig.update_traces(
+                                    texttemplate='%{text:.2f}%',
+                                    textposition='outside'
+                                )
+                                
+                                fig.update_layout(
+                                    xaxis_title="Terminal",
+                                    yaxis_title="% de Malas Cargas",
+                                    plot_bgcolor='white'
+                                )
+                        else:
+                            # Gráfico simple de cargas por terminal
+                            fig = px.bar(
+                                terminal_stats,
+                                x='Terminal',
+                                y='Total Cargas',
+                                title='Cargas por Terminal',
+                                color='Total Cargas',
+                                color_continuous_scale='Viridis',
+                                text='Total Cargas'
+                            )
+                            
+                            fig.update_traces(
+                                texttemplate='%{text}',
+                                textposition='outside'
+                            )
+                            
+                            fig.update_layout(
+                                xaxis_title="Terminal",
+                                yaxis_title="Cantidad de Cargas",
+                                plot_bgcolor='white'
+                            )
+                        
+                        st.plotly_chart(fig, use_container_width=True)
+                    
+                    with tab2:
+                        # Mostrar tabla
+                        if 'Índice Calidad' in terminal_stats.columns:
+                            st.dataframe(
+                                terminal_stats,
+                                column_config={
+                                    "Terminal": st.column_config.TextColumn("Terminal"),
+                                    "Malas Cargas": st.column_config.NumberColumn("Malas", format="%d"),
+                                    "Total Cargas": st.column_config.NumberColumn("Total", format="%d"),
+                                    "% Malas": st.column_config.NumberColumn("% Malas", format="%.2f%%"),
+                                    "Sobreconsumos": st.column_config.NumberColumn("Sobre", format="%d"),
+                                    "% Sobre": st.column_config.NumberColumn("% Sobre", format="%.2f%%"),
+                                    "Índice Calidad": st.column_config.ProgressColumn("Calidad", format="%.1f", min_value=0, max_value=100)
+                                },
+                                use_container_width=True
+                            )
+                        elif 'Mala Carga' in df_supervisor.columns:
+                            st.dataframe(
+                                terminal_stats,
+                                column_config={
+                                    "Terminal": st.column_config.TextColumn("Terminal"),
+                                    "Malas Cargas": st.column_config.NumberColumn("Malas", format="%d"),
+                                    "Total Cargas": st.column_config.NumberColumn("Total", format="%d"),
+                                    "% Malas": st.column_config.NumberColumn("% Malas", format="%.2f%%")
+                                },
+                                use_container_width=True
+                            )
+                        else:
+                            st.dataframe(
+                                terminal_stats,
+                                column_config={
+                                    "Terminal": st.column_config.TextColumn("Terminal"),
+                                    "Total Cargas": st.column_config.NumberColumn("Total", format="%d")
+                                },
+                                use_container_width=True
+                            )
+                
+                # Historial detallado
+                with st.expander("Historial Detallado de Cargas", expanded=False):
+                    # Columnas relevantes para mostrar
+                    cols_relevantes = [col for col in [
+                        'Fecha', 'Hora', 'Terminal', 'Número interno',
+                        'Cantidad litros', 'Mala Carga', 'Sobreconsumo',
+                        'Nombre conductor', 'Nombre Planillero'
+                    ] if col in df_supervisor.columns]
+                    
+                    # Mostrar datos
+                    st.dataframe(
+                        formatear_horas(df_supervisor[cols_relevantes].sort_values('Fecha', ascending=False)),
+                        use_container_width=True,
+                        height=400
+                    )
+            
+            # Si es vista de todos los supervisores
+            else:
+                st.markdown("<h3 class='section-title'>Resumen de Supervisores</h3>", unsafe_allow_html=True)
+                
+                # Crear tabla de resumen
+                resumen_supervisores = df_supervisor.groupby('Nombre supervisor').agg({
+                    'Mala Carga': ['sum', 'count'] if 'Mala Carga' in df_supervisor.columns else 'count',
+                    'Sobreconsumo': ['sum'] if 'Sobreconsumo' in df_supervisor.columns else 'count'
+                }).reset_index()
+                
+                # Aplanar columnas
+                if 'Mala Carga' in df_supervisor.columns and 'Sobreconsumo' in df_supervisor.columns:
+                    resumen_supervisores.columns = ['Supervisor', 'Malas Cargas', 'Total Cargas', 'Sobreconsumos']
+                    
+                    # Añadir porcentajes
+                    resumen_supervisores['% Malas'] = (resumen_supervisores['Malas Cargas'] / resumen_supervisores['Total Cargas'] * 100).round(2)
+                    resumen_supervisores['% Sobre'] = (resumen_supervisores['Sobreconsumos'] / resumen_supervisores['Total Cargas'] * 100).round(2)
+                    
+                    # Añadir índice de calidad
+                    resumen_supervisores['Índice Calidad'] = 100 - (resumen_supervisores['% Malas'] * 0.5 + resumen_supervisores['% Sobre'] * 0.5)
+                    resumen_supervisores['Índice Calidad'] = resumen_supervisores['Índice Calidad'].clip(0, 100).round(1)
+                    
+                    # Ordenar por índice de calidad (descendente - mejores primero)
+                    resumen_supervisores = resumen_supervisores.sort_values('Índice Calidad', ascending=False)
+                elif 'Mala Carga' in df_supervisor.columns:
+                    resumen_supervisores.columns = ['Supervisor', 'Malas Cargas', 'Total Cargas']
+                    
+                    # Añadir porcentajes
+                    resumen_supervisores['% Malas'] = (resumen_supervisores['Malas Cargas'] / resumen_supervisores['Total Cargas'] * 100).round(2)
+                    
+                    # Ordenar por porcentaje de malas cargas (ascendente - mejores primero)
+                    resumen_supervisores = resumen_supervisores.sort_values('% Malas')
+                else:
+                    resumen_supervisores.columns = ['Supervisor', 'Total Cargas']
+                    
+                    # Ordenar por cantidad de cargas (descendente)
+                    resumen_supervisores = resumen_supervisores.sort_values('Total Cargas', ascending=False)
+                
+                # Mostrar gráficos de ranking
+                if 'Índice Calidad' in resumen_supervisores.columns:
+                    # Filtrar supervisores con al menos 10 cargas
+                    supervisores_filtrados = resumen_supervisores[resumen_supervisores['Total Cargas'] >= 10].copy()
+                    
+                    # Mostrar mejores supervisores
+                    fig = px.bar(
+                        supervisores_filtrados.head(10),  # Top 10 mejores
+                        x='Supervisor',
+                        y='Índice Calidad',
+                        title='Top 10 Supervisores por Índice de Calidad',
+                        color='Índice Calidad',
+                        color_continuous_scale='RdYlGn',
+                        text='Índice Calidad'
+                    )
+                    
+                    fig.update_traces(
+                        texttemplate='%{text:.1f}',
+                        textposition='outside'
+                    )
+                    
+                    fig.update_layout(
+                        xaxis_title="Supervisor",
+                        yaxis_title="Índice de Calidad",
+                        plot_bgcolor='white'
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                
+                # Mostrar tabla completa
+                st.markdown("<h4>Tabla Completa de Supervisores</h4>", unsafe_allow_html=True)
+                
+                # Mostrar tabla
+                if 'Índice Calidad' in resumen_supervisores.columns:
+                    st.dataframe(
+                        resumen_supervisores,
+                        column_config={
+                            "Supervisor": st.column_config.TextColumn("Supervisor"),
+                            "Malas Cargas": st.column_config.NumberColumn("Malas", format="%d"),
+                            "Total Cargas": st.column_config.NumberColumn("Total", format="%d"),
+                            "% Malas": st.column_config.NumberColumn("% Malas", format="%.2f%%"),
+                            "Sobreconsumos": st.column_config.NumberColumn("Sobre", format="%d"),
+                            "% Sobre": st.column_config.NumberColumn("% Sobre", format="%.2f%%"),
+                            "Índice Calidad": st.column_config.ProgressColumn("Calidad", format="%.1f", min_value=0, max_value=100)
+                        },
+                        use_container_width=True
+                    )
+                elif 'Mala Carga' in df_supervisor.columns:
+                    st.dataframe(
+                        resumen_supervisores,
+                        column_config={
+                            "Supervisor": st.column_config.TextColumn("Supervisor"),
+                            "Malas Cargas": st.column_config.NumberColumn("Malas", format="%d"),
+                            "Total Cargas": st.column_config.NumberColumn("Total", format="%d"),
+                            "% Malas": st.column_config.NumberColumn("% Malas", format="%.2f%%")
+                        },
+                        use_container_width=True
+                    )
+                else:
+                    st.dataframe(
+                        resumen_supervisores,
+                        column_config={
+                            "Supervisor": st.column_config.TextColumn("Supervisor"),
+                            "Total Cargas": st.column_config.NumberColumn("Total", format="%d")
+                        },
+                        use_container_width=True
+                    )
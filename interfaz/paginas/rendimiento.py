@@ -0,0 +1,639 @@
+"""
+Sección «Rendimiento»: rendimiento (km/L) por bus, modelo y terminal.
+"""
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import datetime
+
+from interfaz.componentes import create_kpi_card, show_alert
+from interfaz.tema import get_colors
+
+
+def render(df, cubo, indice):
+    colors = get_colors()
+
+    st.markdown("<h2 class='subtitle'>Análisis de Rendimiento</h2>", unsafe_allow_html=True)
+    
+    if 'Rendimiento' in df.columns:
+        # Fecha de análisis
+        col1, col2 = st.columns([1, 1])
+        
+        with col1:
+            if 'Fecha' in df.columns:
+                fecha_min = df['Fecha'].min().date()
+                fecha_max = df['Fecha'].max().date()
+            else:
+                fecha_min = datetime.date.today() - datetime.timedelta(days=30)
+                fecha_max = datetime.date.today()
+            
+            fecha_inicio = st.date_input("Fecha inicio", fecha_min, key="rendimiento_fecha_inicio")
+        
+        with col2:
+            fecha_fin = st.date_input("Fecha fin", fecha_max, key="rendimiento_fecha_fin")
+        
+        # Filtrar por fecha (por posición, desde el índice por día)
+        df_filtrado = indice.rows(fecha_inicio, fecha_fin)
+        
+        # Filtrar valores válidos de rendimiento
+        df_rendimiento = df_filtrado.dropna(subset=['Rendimiento'])
+        
+        # Métricas principales
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            # Rendimiento promedio
+            rendimiento_promedio = df_rendimiento['Rendimiento'].mean()
+            
+            st.markdown(create_kpi_card(
+                "Rendimiento Promedio", 
+                f"{rendimiento_promedio:.2f} km/L",
+                None,
+                icon="🔄",
+                color_class="primary",
+                footnote="De todas las cargas"
+            ), unsafe_allow_html=True)
+        
+        with col2:
+            # Rendimiento mediana
+            rendimiento_mediana = df_rendimiento['Rendimiento'].median()
+            
+            st.markdown(create_kpi_card(
+                "Rendimiento Mediana", 
+                f"{rendimiento_mediana:.2f} km/L",
+                None,
+                icon="📊",
+                color_class="info",
+                footnote="Valor central"
+            ), unsafe_allow_html=True)
+        
+        with col3:
+            # Mejor rendimiento
+            if len(df_rendimiento) > 0:
+                mejor_rendimiento = df_rendimiento['Rendimiento'].max()
+                
+                st.markdown(create_kpi_card(
+                    "Mejor Rendimiento", 
+                    f"{mejor_rendimiento:.2f} km/L",
+                    None,
+                    icon="🏆",
+                    color_class="success",
+                    footnote="Valor máximo"
+                ), unsafe_allow_html=True)
+        
+        with col4:
+            # Peor rendimiento
+            if len(df_rendimiento) > 0:
+                peor_rendimiento = df_rendimiento['Rendimiento'].min()
+                
+                st.markdown(create_kpi_card(
+                    "Peor Rendimiento", 
+                    f"{peor_rendimiento:.2f} km/L",
+                    None,
+                    icon="⚠️",
+                    color_class="danger",
+                    footnote="Valor mínimo"
+                ), unsafe_allow_html=True)
+        
+        # Distribución de rendimiento
+        st.markdown("<h3 class='section-title'>Distribución del Rendimiento</h3>", unsafe_allow_html=True)
+        
+        # Gráfico de histograma
+        fig = px.histogram(
+            df_rendimiento,
+            x='Rendimiento',
+            nbins=30,
+            marginal='box',
+            title='Distribución del Rendimiento (km/L)',
+            color_discrete_sequence=[colors['primary']]
+        )
+        
+        fig.update_layout(
+            xaxis_title="Rendimiento (km/L)",
+            yaxis_title="Frecuencia",
+            plot_bgcolor='white'
+        )
+        
+        # Añadir líneas para estadísticas clave
+        fig.add_vline(
+            x=rendimiento_promedio,
+            line_dash="dash",
+            line_color="red",
+            annotation_text=f"Media: {rendimiento_promedio:.2f}"
+        )
+        
+        fig.add_vline(
+            x=rendimiento_mediana,
+            line_dash="dash",
+            line_color="green",
+            annotation_text=f"Mediana: {rendimiento_mediana:.2f}"
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Rendimiento por modelo
+        if 'Modelo chasis' in df_rendimiento.columns:
+            st.markdown("<h3 class='section-title'>Rendimiento por Modelo</h3>", unsafe_allow_html=True)
+            
+            # Agrupar por modelo
+            rendimiento_modelo = df_rendimiento.groupby('Modelo chasis')['Rendimiento'].agg(['mean', 'median', 'std', 'count']).reset_index()
+            rendimiento_modelo.columns = ['Modelo', 'Promedio', 'Mediana', 'Desviación', 'Cantidad']
+            
+            # Filtrar modelos con suficientes datos
+            rendimiento_modelo = rendimiento_modelo[rendimiento_modelo['Cantidad'] >= 5]
+            
+            # Ordenar por promedio (descendente)
+            rendimiento_modelo = rendimiento_modelo.sort_values('Promedio', ascending=False)
+            
+            # Tabs para diferentes vistas
+            tab1, tab2 = st.tabs(["📊 Gráfico", "📋 Tabla"])
+            
+            with tab1:
+                # Gráfico de barras
+                fig = px.bar(
+                    rendimiento_modelo,
+                    x='Modelo',
+                    y='Promedio',
+                    title='Rendimiento Promedio por Modelo',
+                    color='Promedio',
+                    color_continuous_scale='Viridis',
+                    text='Promedio',
+                    error_y='Desviación'  # Barras de error
+                )
+                
+                fig.update_traces(
+                    texttemplate='%{text:.2f}',
+                    textposition='outside'
+                )
+                
+                fig.update_layout(
+                    xaxis_title="Modelo",
+                    yaxis_title="Rendimiento Promedio (km/L)",
+                    plot_bgcolor='white'
+                )
+                
+                # Añadir línea para el promedio global
+                fig.add_hline(
+                    y=rendimiento_promedio,
+                    line_dash="dash",
+                    line_color="red",
+                    annotation_text=f"Promedio Global: {rendimiento_promedio:.2f}"
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
+            
+            with tab2:
+                # Mostrar tabla
+                st.dataframe(
+                    rendimiento_modelo,
+                    column_config={
+                        "Modelo": st.column_config.TextColumn("Modelo"),
+                        "Promedio": st.column_config.NumberColumn("Promedio (km/L)", format="%.2f"),
+                        "Mediana": st.column_config.NumberColumn("Mediana (km/L)", format="%.2f"),
+                        "Desviación": st.column_config.NumberColumn("Desviación Estándar", format="%.2f"),
+                        "Cantidad": st.column_config.NumberColumn("Cantidad de Cargas", format="%d")
+                    },
+                    use_container_width=True
+                )
+                
+                # Identificar modelos destacados
+                mejor_modelo = rendimiento_modelo.iloc[0]
+                peor_modelo = rendimiento_modelo.iloc[-1]
+                
+                # Mostrar insights
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.markdown(f"""
+                    <div class="card">
+                        <h4>🏆 Modelo más Eficiente</h4>
+                        <p><strong>Modelo:</strong> {mejor_modelo['Modelo']}</p>
+                        <p><strong>Rendimiento:</strong> {mejor_modelo['Promedio']:.2f} km/L</p>
+                        <p><strong>Diferencia vs Promedio:</strong> {((mejor_modelo['Promedio'] / rendimiento_promedio) - 1) * 100:.2f}%</p>
+                        <p><strong>Cargas Analizadas:</strong> {mejor_modelo['Cantidad']}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                with col2:
+                    st.markdown(f"""
+                    <div class="card">
+                        <h4>⚠️ Modelo menos Eficiente</h4>
+                        <p><strong>Modelo:</strong> {peor_modelo['Modelo']}</p>
+                        <p><strong>Rendimiento:</strong> {peor_modelo['Promedio']:.2f} km/L</p>
+                        <p><strong>Diferencia vs Promedio:</strong> {((peor_modelo['Promedio'] / rendimiento_promedio) - 1) * 100:.2f}%</p>
+                        <p><strong>Cargas Analizadas:</strong> {peor_modelo['Cantidad']}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                # Recomendaciones basadas en diferencias
+                diferencia_pct = ((mejor_modelo['Promedio'] / peor_modelo['Promedio']) - 1) * 100
+                
+                if diferencia_pct > 25:
+                    st.markdown(show_alert(
+                        f"La diferencia de rendimiento entre el modelo más eficiente y el menos eficiente es del {diferencia_pct:.2f}%. Se recomienda realizar un análisis técnico detallado de ambos modelos y evaluar la posibilidad de renovar la flota con modelos más eficientes.",
+                        "warning",
+                        "Diferencia Significativa entre Modelos",
+                        "⚠️"
+                    ), unsafe_allow_html=True)
+        
+        # Rendimiento por bus
+        if 'Número interno' in df_rendimiento.columns:
+            st.markdown("<h3 class='section-title'>Rendimiento por Bus</h3>", unsafe_allow_html=True)
+            
+            # Agrupar por bus
+            rendimiento_bus = df_rendimiento.groupby('Número interno')['Rendimiento'].agg(['mean', 'count']).reset_index()
+            rendimiento_bus.columns = ['Bus', 'Rendimiento', 'Cargas']
+            
+            # Filtrar buses con suficientes datos
+            rendimiento_bus = rendimiento_bus[rendimiento_bus['Cargas'] >= 5]
+            
+            # Tabs para mejores y peores buses
+            tab1, tab2 = st.tabs(["🏆 Top 10 Mejores", "⚠️ Top 10 Peores"])
+            
+            with tab1:
+                # Mejores buses
+                mejores_buses = rendimiento_bus.sort_values('Rendimiento', ascending=False).head(10)
+                
+                # Gráfico
+                fig = px.bar(
+                    mejores_buses,
+                    x='Bus',
+                    y='Rendimiento',
+                    title='Top 10 Buses con Mejor Rendimiento',
+                    color='Rendimiento',
+                    color_continuous_scale='Viridis',
+                    text='Rendimiento'
+                )
+                
+                fig.update_traces(
+                    texttemplate='%{text:.2f}',
+                    textposition='outside'
+                )
+                
+                fig.update_layout(
+                    xaxis_title="Bus",
+                    yaxis_title="Rendimiento (km/L)",
+                    plot_bgcolor='white'
+                )
+                
+                # Añadir línea para el promedio global
+                fig.add_hline(
+                    y=rendimiento_promedio,
+                    line_dash="dash",
+                    line_color="red",
+                    annotation_text=f"Promedio Global: {rendimiento_promedio:.2f}"
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
+                
+                # Tabla de mejores buses
+                st.dataframe(
+                    mejores_buses,
+                    column_config={
+                        "Bus": st.column_config.TextColumn("Bus"),
+                        "Rendimiento": st.column_config.NumberColumn("Rendimiento (km/L)", format="%.2f"),
+                        "Cargas": st.column_config.NumberColumn("Cargas", format="%d")
+                    },
+                    use_container_width=True
+                )
+            
+            with tab2:
+                # Peores buses
+                peores_buses = rendimiento_bus.sort_values('Rendimiento').head(10)
+                
+                # Gráfico
+                fig = px.bar(
+                    peores_buses,
+                    x='Bus',
+                    y='Rendimiento',
+                    title='Top 10 Buses con Peor Rendimiento',
+                    color='Rendimiento',
+                    color_continuous_scale='Viridis_r',  # Escala invertida
+                    text='Rendimiento'
+                )
+                
+                fig.update_traces(
+                    texttemplate='%{text:.2f}',
+                    textposition='outside'
+                )
+                
+                fig.update_layout(
+                    xaxis_title="Bus",
+                    yaxis_title="Rendimiento (km/L)",
+                    plot_bgcolor='white'
+                )
+                
+                # Añadir línea para el promedio global
+                fig.add_hline(
+                    y=rendimiento_promedio,
+                    line_dash="dash",
+                    line_color="red",
+                    annotation_text=f"Promedio Global: {rendimiento_promedio:.2f}"
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
+                
+                # Tabla de peores buses
+                st.dataframe(
+                    peores_buses,
+                    column_config={
+                        "Bus": st.column_config.TextColumn("Bus"),
+                        "Rendimiento": st.column_config.NumberColumn("Rendimiento (km/L)", format="%.2f"),
+                        "Cargas": st.column_config.NumberColumn("Cargas", format="%d")
+                    },
+                    use_container_width=True
+                )
+                
+                # Recomendaciones para buses de bajo rendimiento
+                peor_bus = peores_buses.iloc[0]
+                diferencia_peor = ((rendimiento_promedio / peor_bus['Rendimiento']) - 1) * 100
+                
+                if diferencia_peor > 25:
+                    st.markdown(show_alert(
+                        f"El bus {peor_bus['Bus']} tiene un rendimiento {diferencia_peor:.2f}% inferior al promedio. Se recomienda una revisión técnica detallada y mantenimiento preventivo para mejorar su eficiencia.",
+                        "warning",
+                        "Bus con Rendimiento Crítico",
+                        "⚠️"
+                    ), unsafe_allow_html=True)
+        
+        # Evolución del rendimiento en el tiempo
+        if 'Fecha' in df_rendimiento.columns:
+            st.markdown("<h3 class='section-title'>Evolución del Rendimiento</h3>", unsafe_allow_html=True)
+            
+            # Agrupar por fecha
+            rendimiento_tiempo = df_rendimiento.groupby(df_rendimiento['Fecha'].dt.date)['Rendimiento'].mean().reset_index()
+            rendimiento_tiempo.columns = ['Fecha', 'Rendimiento']
+            
+            # Ordenar por fecha
+            rendimiento_tiempo = rendimiento_tiempo.sort_values('Fecha')
+            
+            # Gráfico
+            fig = px.line(
+                rendimiento_tiempo,
+                x='Fecha',
+                y='Rendimiento',
+                title='Evolución del Rendimiento Promedio a lo Largo del Tiempo',
+                markers=True
+            )
+            
+            fig.update_traces(
+                line=dict(color=colors['primary'], width=3),
+                marker=dict(color=colors['primary'], size=8)
+            )
+            
+            fig.update_layout(
+                xaxis_title="Fecha",
+                yaxis_title="Rendimiento Promedio (km/L)",
+                plot_bgcolor='white',
+                hovermode='x unified',
+                height=450
+            )
+            
+            # Añadir línea para el promedio global
+            fig.add_hline(
+                y=rendimiento_promedio,
+                line_dash="dash",
+                line_color="red",
+                annotation_text=f"Promedio Global: {rendimiento_promedio:.2f}"
+            )
+            
+            # Calcular y añadir tendencia
+            if len(rendimiento_tiempo) > 3:
+                from sklearn.linear_model import HuberRegressor, LinearRegression
+                
+                X = np.array(range(len(rendimiento_tiempo))).reshape(-1, 1)
+                y = rendimiento_tiempo['Rendimiento'].values
+                
+                try:
+                    # Intentar con regresión robusta primero
+                    modelo = HuberRegressor()
+                    modelo.fit(X, y)
+                    tendencia = modelo.coef_[0]
+                except:
+                    # Fallback a regresión lineal estándar
+                    modelo = LinearRegression()
+                    modelo.fit(X, y)
+                    tendencia = modelo.coef_[0]
+                
+                # Añadir línea de tendencia
+                tendencia_y = modelo.predict(X)
+                
+                fig.add_trace(
+                    go.Scatter(
+                        x=rendimiento_tiempo['Fecha'],
+                        y=tendencia_y,
+                        mode='lines',
+                        name='Tendencia',
+                        line=dict(color='red', width=2, dash='dash')
+                    )
+                )
+                
+                # Calcular porcentaje de cambio diario
+                porcentaje_cambio = (tendencia / rendimiento_promedio) * 100
+                
+                tendencia_texto = f"Tendencia: {'+' if tendencia > 0 else ''}{tendencia:.4f} ({'+' if tendencia > 0 else ''}{porcentaje_cambio:.2f}% diario)"
+                
+                fig.add_annotation(
+                    x=rendimiento_tiempo['Fecha'].iloc[-1],
+                    y=tendencia_y[-1],
+                    text=tendencia_texto,
+                    showarrow=True,
+                    arrowhead=2,
+                    arrowsize=1,
+                    arrowwidth=2,
+                    arrowcolor='red',
+                    ax=50,
+                    ay=-30
+                )
+                
+                # Comentarios sobre la tendencia
+                if tendencia > 0.01:
+                    st.markdown(show_alert(
+                        f"Se observa una tendencia positiva en el rendimiento, con un incremento de {tendencia:.4f} km/L ({porcentaje_cambio:.2f}%) por día. Las medidas de optimización parecen estar funcionando correctamente.",
+                        "success",
+                        "Tendencia Positiva en Rendimiento",
+                        "📈"
+                    ), unsafe_allow_html=True)
+                elif tendencia < -0.01:
+                    st.markdown(show_alert(
+                        f"Se observa una tendencia negativa en el rendimiento, con una disminución de {abs(tendencia):.4f} km/L ({abs(porcentaje_cambio):.2f}%) por día. Se recomienda revisar las condiciones operativas y el mantenimiento de la flota.",
+                        "warning",
+                        "Tendencia Negativa en Rendimiento",
+                        "📉"
+                    ), unsafe_allow_html=True)
+            
+            st.plotly_chart(fig, use_container_width=True)
+        
+        # Influencia de factores en el rendimiento
+        st.markdown("<h3 class='section-title'>Factores que Influyen en el Rendimiento</h3>", unsafe_allow_html=True)
+        
+        # Analizar correlaciones
+        factores_potenciales = []
+        
+        if 'Cantidad litros' in df_rendimiento.columns:
+            factores_potenciales.append('Cantidad litros')
+        
+        if 'Hora Numérica' in df_rendimiento.columns:
+            factores_potenciales.append('Hora Numérica')
+        
+        if 'Odómetro' in df_rendimiento.columns:
+            factores_potenciales.append('Odómetro')
+        
+        if 'Kilómetros Recorridos' in df_rendimiento.columns:
+            factores_potenciales.append('Kilómetros Recorridos')
+        
+        if factores_potenciales:
+            # Calcular correlaciones
+            correlaciones = []
+            
+            for factor in factores_potenciales:
+                corr = df_rendimiento['Rendimiento'].corr(df_rendimiento[factor])
+                correlaciones.append({
+                    "Factor": factor,
+                    "Correlación": corr,
+                    "Fuerza": abs(corr)
+                })
+            
+            # Ordenar por fuerza de correlación (descendente)
+            correlaciones = sorted(correlaciones, key=lambda x: x["Fuerza"], reverse=True)
+            
+            # Mostrar correlaciones
+            st.markdown("#### Correlaciones con el Rendimiento")
+            
+            df_corr = pd.DataFrame(correlaciones)
+            
+            st.dataframe(
+                df_corr,
+                column_config={
+                    "Factor": st.column_config.TextColumn("Factor"),
+                    "Correlación": st.column_config.NumberColumn("Correlación", format="%.3f"),
+                    "Fuerza": st.column_config.ProgressColumn("Fuerza de Correlación", format="%.2f", min_value=0, max_value=1)
+                },
+                use_container_width=True
+            )
+            
+            # Mostrar gráfico para el factor con mayor correlación
+            if correlaciones:
+                factor_principal = correlaciones[0]["Factor"]
+                
+                # Título descriptivo según el factor
+                titulos = {
+                    'Cantidad litros': 'Relación entre Tamaño de Carga y Rendimiento',
+                    'Hora Numérica': 'Relación entre Hora del Día y Rendimiento',
+                    'Odómetro': 'Relación entre Kilometraje Acumulado y Rendimiento',
+                    'Kilómetros Recorridos': 'Relación entre Distancia Recorrida y Rendimiento'
+                }
+                
+                titulo = titulos.get(factor_principal, f'Relación entre {factor_principal} y Rendimiento')
+                
+                # Gráfico de dispersión
+                fig = px.scatter(
+                    df_rendimiento,
+                    x=factor_principal,
+                    y='Rendimiento',
+                    title=titulo,
+                    opacity=0.7,
+                    color_discrete_sequence=[colors['primary']]
+                )
+                
+                fig.update_layout(
+                    xaxis_title=factor_principal,
+                    yaxis_title="Rendimiento (km/L)",
+                    plot_bgcolor='white'
+                )
+                
+                # Añadir línea de tendencia
+                fig.update_traces(
+                    marker=dict(size=8)
+                )
+                
+                fig.update_layout(
+                    shapes=[
+                        dict(
+                            type='line',
+                            xref='x',
+                            yref='y',
+                            x0=df_rendimiento[factor_principal].min(),
+                            y0=np.polyval(np.polyfit(df_rendimiento[factor_principal], df_rendimiento['Rendimiento'], 1), df_rendimiento[factor_principal].min()),
+                            x1=df_rendimiento[factor_principal].max(),
+                            y1=np.polyval(np.polyfit(df_rendimiento[factor_principal], df_rendimiento['Rendimiento'], 1), df_rendimiento[factor_principal].max()),
+                            line=dict(color='red', width=2, dash='dash'),
+                        )
+                    ]
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
+                
+                # Agregar interpretación según el factor
+                if factor_principal == 'Cantidad litros':
+                    corr = correlaciones[0]["Correlación"]
+                    if corr < -0.3:
+                        st.markdown(show_alert(
+                            f"Existe una correlación negativa significativa (r={corr:.3f}) entre el tamaño de la carga y el rendimiento. Esto sugiere que las cargas más grandes tienden a estar asociadas con menor rendimiento, posiblemente debido a un llenado excesivo o condiciones de operación diferentes.",
+                            "info",
+                            "Influencia del Tamaño de Carga",
+                            "ℹ️"
+                        ), unsafe_allow_html=True)
+                    elif corr > 0.3:
+                        st.markdown(show_alert(
+                            f"Existe una correlación positiva significativa (r={corr:.3f}) entre el tamaño de la carga y el rendimiento. Esto podría indicar que las cargas más grandes están asociadas con mejores condiciones operativas o vehículos más eficientes.",
+                            "info",
+                            "Influencia del Tamaño de Carga",
+                            "ℹ️"
+                        ), unsafe_allow_html=True)
+                
+                elif factor_principal == 'Hora Numérica':
+                    corr = correlaciones[0]["Correlación"]
+                    if abs(corr) > 0.2:
+                        periodo = "horas pico" if corr < 0 else "horas de baja congestión"
+                        st.markdown(show_alert(
+                            f"Se observa una correlación (r={corr:.3f}) entre la hora del día y el rendimiento. Esto sugiere que el rendimiento tiende a ser mejor durante {periodo}, posiblemente debido a diferencias en la congestión del tráfico.",
+                            "info",
+                            "Influencia del Horario",
+                            "ℹ️"
+                        ), unsafe_allow_html=True)
+                
+                elif factor_principal == 'Odómetro':
+                    corr = correlaciones[0]["Correlación"]
+                    if corr < -0.2:
+                        st.markdown(show_alert(
+                            f"Existe una correlación negativa (r={corr:.3f}) entre el kilometraje acumulado y el rendimiento. Esto indica que los vehículos con mayor kilometraje tienden a tener menor rendimiento, lo que sugiere un efecto del desgaste en la eficiencia.",
+                            "warning",
+                            "Influencia del Desgaste",
+                            "⚠️"
+                        ), unsafe_allow_html=True)
+        
+        # Recomendaciones generales
+        st.markdown("<h3 class='section-title'>Recomendaciones para Mejorar el Rendimiento</h3>", unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown(f"""
+            <div class="card">
+                <h4>Recomendaciones Operativas</h4>
+                <ul>
+                    <li><strong>Mantenimiento Preventivo:</strong> Implementar un programa riguroso de mantenimiento preventivo, especialmente para los buses con rendimiento por debajo del promedio.</li>
+                    <li><strong>Capacitación en Conducción Eficiente:</strong> Proporcionar capacitación a los conductores sobre técnicas de conducción eficiente, como arranques suaves y evitar frenados bruscos.</li>
+                    <li><strong>Optimización de Rutas:</strong> Analizar y optimizar las rutas para minimizar tiempo en congestión y maximizar la eficiencia.</li>
+                    <li><strong>Presión de Neumáticos:</strong> Establecer un protocolo de verificación regular de la presión de neumáticos.</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown(f"""
+            <div class="card">
+                <h4>Recomendaciones Técnicas</h4>
+                <ul>
+                    <li><strong>Evaluación Técnica:</strong> Realizar evaluaciones técnicas detalladas de los buses con rendimiento significativamente inferior al promedio.</li>
+                    <li><strong>Renovación de Flota:</strong> Considerar la renovación prioritaria de los modelos con peor rendimiento promedio.</li>
+                    <li><strong>Monitoreo Continuo:</strong> Implementar sistemas de monitoreo en tiempo real para detectar disminuciones en el rendimiento que puedan indicar problemas mecánicos.</li>
+                    <li><strong>Análisis de Combustible:</strong> Verificar la calidad del combustible utilizado y evaluar alternativas de mayor eficiencia.</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.warning("No se encontró información sobre rendimiento en los datos.")
@@ -0,0 +1,608 @@
+"""
+Sección «Detección de Sobreconsumo»: cargas sobre el umbral de consumo de cada modelo.
+"""
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+import datetime
+
+from combustible.binning import SEVERIDAD, categorize
+
+from interfaz.componentes import create_kpi_card, formatear_horas, show_alert
+from interfaz.tema import get_colors
+
+
+def render(df, cubo, indice):
+    colors = get_colors()
+
+    st.markdown("<h2 class='subtitle'>Análisis de Sobreconsumo</h2>", unsafe_allow_html=True)
+    
+    if 'Sobreconsumo' in df.columns:
+        # Fecha de análisis
+        col1, col2 = st.columns([1, 1])
+        
+        with col1:
+            if 'Fecha' in df.columns:
+                fecha_min = df['Fecha'].min().date()
+                fecha_max = df['Fecha'].max().date()
+            else:
+                fecha_min = datetime.date.today() - datetime.timedelta(days=30)
+                fecha_max = datetime.date.today()
+            
+            fecha_inicio = st.date_input("Fecha inicio", fecha_min, key="sobre_fecha_inicio")
+        
+        with col2:
+            fecha_fin = st.date_input("Fecha fin", fecha_max, key="sobre_fecha_fin")
+        
+        # Filtrar por fecha (por posición, desde el índice por día)
+        df_filtrado = indice.rows(fecha_inicio, fecha_fin)
+        
+        # Mismo rango de fechas para las consultas al cubo
+        periodo = {'desde': fecha_inicio, 'hasta': fecha_fin} if 'Fecha' in df.columns else {}
+        
+        # Filtrar sobreconsumos
+        df_sobre = df_filtrado[df_filtrado['Sobreconsumo'] == True]
+        total_sobre = len(df_sobre)
+        
+        # Métricas principales
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            # Total sobreconsumos
+            porcentaje = (total_sobre / len(df_filtrado) * 100) if len(df_filtrado) > 0 else 0
+            
+            # Color según porcentaje
+            color = "success" if porcentaje < 5 else "warning" if porcentaje < 10 else "danger"
+            
+            st.markdown(create_kpi_card(
+                "Total Sobreconsumos", 
+                f"{total_sobre}",
+                None,
+                icon="⚠️",
+                color_class=color,
+                footnote=f"{porcentaje:.2f}% del total"
+            ), unsafe_allow_html=True)
+        
+        with col2:
+            # Litros en sobreconsumo
+            if 'Cantidad litros' in df_sobre.columns:
+                litros_sobre = df_sobre['Cantidad litros'].sum()
+                porcentaje_litros = (litros_sobre / df_filtrado['Cantidad litros'].sum() * 100) if df_filtrado['Cantidad litros'].sum() > 0 else 0
+                
+                st.markdown(create_kpi_card(
+                    "Litros en Sobreconsumo", 
+                    f"{litros_sobre:,.0f}",
+                    None,
+                    icon="⛽",
+                    color_class="info",
+                    footnote=f"{porcentaje_litros:.2f}% del total"
+                ), unsafe_allow_html=True)
+        
+        with col3:
+            # Litros excedentes
+            if 'Cantidad litros' in df_sobre.columns and 'Promedio Modelo' in df_sobre.columns:
+                litros_excedentes = (df_sobre['Cantidad litros'] - df_sobre['Promedio Modelo']).sum()
+                porcentaje_excedente = (litros_excedentes / litros_sobre * 100) if litros_sobre > 0 else 0
+                
+                st.markdown(create_kpi_card(
+                    "Litros Excedentes", 
+                    f"{litros_excedentes:,.0f}",
+                    None,
+                    icon="💧",
+                    color_class="danger",
+                    footnote=f"{porcentaje_excedente:.2f}% del consumo"
+                ), unsafe_allow_html=True)
+        
+        # Alerta general
+        if total_sobre > 0:
+            if porcentaje >= 10:
+                st.markdown(show_alert(
+                    f"Se han detectado {total_sobre} cargas con sobreconsumo, lo que representa el {porcentaje:.2f}% del total. Esto indica un problema significativo en la eficiencia de consumo que requiere atención inmediata.",
+                    "danger",
+                    "ALERTA CRÍTICA: Alto porcentaje de sobreconsumo",
+                    "🚨"
+                ), unsafe_allow_html=True)
+            elif porcentaje >= 5:
+                st.markdown(show_alert(
+                    f"Se han detectado {total_sobre} cargas con sobreconsumo, lo que representa el {porcentaje:.2f}% del total. Se recomienda revisar la eficiencia de los buses y los procedimientos de carga.",
+                    "warning",
+                    "ALERTA: Sobreconsumo detectado",
+                    "⚠️"
+                ), unsafe_allow_html=True)
+            else:
+                st.markdown(show_alert(
+                    f"Se han detectado {total_sobre} cargas con sobreconsumo, lo que representa el {porcentaje:.2f}% del total. Aunque el porcentaje es bajo, se recomienda supervisar la situación.",
+                    "info",
+                    "AVISO: Sobreconsumo detectado",
+                    "ℹ️"
+                ), unsafe_allow_html=True)
+        else:
+            st.markdown(show_alert(
+                f"No se han encontrado cargas con sobreconsumo en los datos analizados.",
+                "success",
+                "No se detectaron casos de sobreconsumo",
+                "✅"
+            ), unsafe_allow_html=True)
+        
+        # Análisis por modelo
+        if total_sobre > 0 and 'Modelo chasis' in df_sobre.columns:
+            st.markdown("<h3 class='section-title'>Sobreconsumo por Modelo de Chasis</h3>", unsafe_allow_html=True)
+            
+            # Tabs para diferentes vistas
+            tab1, tab2 = st.tabs(["📊 Gráfico", "📋 Tabla"])
+            
+            with tab1:
+                # Sobreconsumos y total de cargas por modelo (modelos con sobreconsumos)
+                por_modelo = cubo.rollup('Modelo chasis', **periodo)
+                por_modelo = por_modelo[por_modelo['Sobreconsumos'] > 0]
+                modelo_analysis = por_modelo[['Sobreconsumos', 'Cargas']].reset_index()
+                modelo_analysis.columns = ['Modelo', 'Sobreconsumos', 'Total Cargas']
+                modelo_analysis['Porcentaje'] = (modelo_analysis['Sobreconsumos'] / modelo_analysis['Total Cargas'] * 100).round(2)
+                
+                # Añadir información de consumo
+                if 'Cantidad litros' in df_filtrado.columns:
+                    # Promedio por modelo y promedio en sobreconsumos
+                    modelo_analysis['Promedio Litros'] = por_modelo['Promedio Litros'].to_numpy()
+                    modelo_analysis['Promedio Sobreconsumo'] = (por_modelo['Litros Sobreconsumo'] / por_modelo['Sobreconsumos']).to_numpy()
+                    
+                    # Calcular exceso
+                    modelo_analysis['Exceso Litros'] = (modelo_analysis['Promedio Sobreconsumo'] - modelo_analysis['Promedio Litros']).round(2)
+                    modelo_analysis['Exceso %'] = ((modelo_analysis['Promedio Sobreconsumo'] / modelo_analysis['Promedio Litros'] - 1) * 100).round(2)
+                
+                # Ordenar por porcentaje
+                modelo_analysis = modelo_analysis.sort_values('Porcentaje', ascending=False)
+                
+                # Gráfico
+                fig = px.bar(
+                    modelo_analysis,
+                    x='Modelo',
+                    y='Porcentaje',
+                    title='Porcentaje de Sobreconsumo por Modelo',
+                    color='Porcentaje',
+                    color_continuous_scale='Reds',
+                    text='Porcentaje'
+                )
+                
+                fig.update_traces(
+                    texttemplate='%{text:.2f}%',
+                    textposition='outside'
+                )
+                
+                fig.update_layout(
+                    xaxis_title="Modelo de Chasis",
+                    yaxis_title="% de Sobreconsumo",
+                    plot_bgcolor='white'
+                )
+                
+                # Añadir línea para el promedio
+                fig.add_hline(
+                    y=porcentaje,
+                    line_dash="dash",
+                    line_color="red",
+                    annotation_text=f"Promedio: {porcentaje:.2f}%"
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
+                
+                # Gráfico de exceso si está disponible
+                if 'Exceso %' in modelo_analysis.columns:
+                    fig = px.bar(
+                        modelo_analysis.sort_values('Exceso %', ascending=False),
+                        x='Modelo',
+                        y='Exceso %',
+                        title='Porcentaje de Exceso en Sobreconsumos por Modelo',
+                        color='Exceso %',
+                        color_continuous_scale='Reds',
+                        text='Exceso %'
+                    )
+                    
+                    fig.update_traces(
+                        texttemplate='%{text:.2f}%',
+                        textposition='outside'
+                    )
+                    
+                    fig.update_layout(
+                        xaxis_title="Modelo de Chasis",
+                        yaxis_title="% de Exceso",
+                        plot_bgcolor='white'
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+            
+            with tab2:
+                # Mostrar tabla
+                if 'Exceso %' in modelo_analysis.columns:
+                    st.dataframe(
+                        modelo_analysis,
+                        column_config={
+                            "Modelo": st.column_config.TextColumn("Modelo de Chasis"),
+                            "Sobreconsumos": st.column_config.NumberColumn("Sobreconsumos", format="%d"),
+                            "Total Cargas": st.column_config.NumberColumn("Total Cargas", format="%d"),
+                            "Porcentaje": st.column_config.NumberColumn("% Sobreconsumo", format="%.2f%%"),
+                            "Promedio Litros": st.column_config.NumberColumn("Promedio Normal (L)", format="%.2f"),
+                            "Promedio Sobreconsumo": st.column_config.NumberColumn("Promedio en Sobreconsumo (L)", format="%.2f"),
+                            "Exceso Litros": st.column_config.NumberColumn("Exceso (L)", format="%.2f"),
+                            "Exceso %": st.column_config.NumberColumn("Exceso (%)", format="%.2f%%")
+                        },
+                        use_container_width=True
+                    )
+                else:
+                    st.dataframe(
+                        modelo_analysis,
+                        column_config={
+                            "Modelo": st.column_config.TextColumn("Modelo de Chasis"),
+                            "Sobreconsumos": st.column_config.NumberColumn("Sobreconsumos", format="%d"),
+                            "Total Cargas": st.column_config.NumberColumn("Total Cargas", format="%d"),
+                            "Porcentaje": st.column_config.NumberColumn("% Sobreconsumo", format="%.2f%%")
+                        },
+                        use_container_width=True
+                    )
+                
+                # Modelo con más problemas
+                if not modelo_analysis.empty:
+                    peor_modelo = modelo_analysis.iloc[0]['Modelo']
+                    porcentaje_peor = modelo_analysis.iloc[0]['Porcentaje']
+                    
+                    if porcentaje_peor > 15:
+                        exceso_info = ""
+                        if 'Exceso %' in modelo_analysis.columns:
+                            exceso_info = f" con un exceso promedio del {modelo_analysis.iloc[0]['Exceso %']:.2f}%"
+                        
+                        st.markdown(show_alert(
+                            f"Este modelo muestra un {porcentaje_peor:.2f}% de sobreconsumos{exceso_info}. Se recomienda una revisión técnica de este modelo y capacitación especializada para sus conductores.",
+                            "danger",
+                            f"Modelo Crítico: {peor_modelo}",
+                            "🚨"
+                        ), unsafe_allow_html=True)
+        
+        # Análisis por conductor
+        if total_sobre > 0 and 'Nombre conductor' in df_sobre.columns:
+            st.markdown("<h3 class='section-title'>Sobreconsumo por Conductor</h3>", unsafe_allow_html=True)
+            
+            # Contar sobreconsumos por conductor
+            conductor_counts = df_sobre['Nombre conductor'].value_counts().reset_index()
+            conductor_counts.columns = ['Conductor', 'Sobreconsumos']
+            
+            # Calcular porcentaje respecto al total de cargas de cada conductor
+            total_por_conductor = df_filtrado.groupby('Nombre conductor').size().reset_index()
+            total_por_conductor.columns = ['Conductor', 'Total Cargas']
+            
+            # Unir dataframes
+            conductor_analysis = pd.merge(conductor_counts, total_por_conductor, on='Conductor')
+            conductor_analysis['Porcentaje'] = (conductor_analysis['Sobreconsumos'] / conductor_analysis['Total Cargas'] * 100).round(2)
+            
+            # Filtrar conductores con al menos 5 cargas para evitar valores atípicos
+            conductor_analysis = conductor_analysis[conductor_analysis['Total Cargas'] >= 5]
+            
+            # Ordenar por porcentaje (descendente)
+            conductor_analysis = conductor_analysis.sort_values('Porcentaje', ascending=False)
+            
+            # Mostrar top 15
+            top15 = conductor_analysis.head(15)
+            
+            # Gráfico
+            fig = px.bar(
+                top15,
+                x='Conductor',
+                y='Porcentaje',
+                title='Top 15 Conductores con Mayor % de Sobreconsumo',
+                color='Porcentaje',
+                color_continuous_scale='Reds',
+                text='Porcentaje'
+            )
+            
+            fig.update_traces(
+                texttemplate='%{text:.2f}%',
+                textposition='outside'
+            )
+            
+            fig.update_layout(
+                xaxis_title="Conductor",
+                yaxis_title="% de Sobreconsumo",
+                plot_bgcolor='white'
+            )
+            
+            # Añadir línea para el promedio
+            fig.add_hline(
+                y=porcentaje,
+                line_dash="dash",
+                line_color="red",
+                annotation_text=f"Promedio: {porcentaje:.2f}%"
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # Mostrar tabla
+            st.markdown("<h4>Top 15 Conductores con Mayor % de Sobreconsumo</h4>", unsafe_allow_html=True)
+            st.dataframe(
+                top15,
+                column_config={
+                    "Conductor": st.column_config.TextColumn("Conductor"),
+                    "Sobreconsumos": st.column_config.NumberColumn("Sobreconsumos", format="%d"),
+                    "Total Cargas": st.column_config.NumberColumn("Total Cargas", format="%d"),
+                    "Porcentaje": st.column_config.NumberColumn("% Sobreconsumo", format="%.2f%%")
+                },
+                use_container_width=True
+            )
+            
+            # Conductor con más problemas
+            if not conductor_analysis.empty:
+                peor_conductor = conductor_analysis.iloc[0]['Conductor']
+                porcentaje_peor = conductor_analysis.iloc[0]['Porcentaje']
+                
+                if porcentaje_peor > 20:
+                    st.markdown(show_alert(
+                        f"Este conductor muestra un {porcentaje_peor:.2f}% de sobreconsumos, muy por encima del promedio. Se recomienda capacitación especializada en técnicas de conducción eficiente.",
+                        "danger",
+                        f"Conductor Crítico: {peor_conductor}",
+                        "🚨"
+                    ), unsafe_allow_html=True)
+        
+        # Distribución por severidad
+        if total_sobre > 0 and 'Z-Score' in df_sobre.columns:
+            st.markdown("<h3 class='section-title'>Distribución por Severidad</h3>", unsafe_allow_html=True)
+            
+            # Crear categorías de severidad
+            df_sobre['Severidad'] = categorize(df_sobre['Z-Score'], SEVERIDAD, categorical=False)
+            
+            # Contar por severidad
+            severidad_counts = df_sobre['Severidad'].value_counts().reset_index()
+            severidad_counts.columns = ['Severidad', 'Cantidad']
+            
+            # Ordenar por severidad
+            orden_severidad = {
+                "Leve (2-2.5σ)": 1,
+                "Moderado (2.5-3σ)": 2,
+                "Alto (3-4σ)": 3,
+                "Extremo (>4σ)": 4
+            }
+            severidad_counts['Orden'] = severidad_counts['Severidad'].map(orden_severidad)
+            severidad_counts = severidad_counts.sort_values('Orden')
+            
+            # Tabs para diferentes vistas
+            tab1, tab2 = st.tabs(["📊 Gráfico", "📋 Tabla"])
+            
+            with tab1:
+                # Gráfico
+                colores_severidad = {
+                    "Leve (2-2.5σ)": "#FFD700",
+                    "Moderado (2.5-3σ)": "#FFA500",
+                    "Alto (3-4σ)": "#FF4500",
+                    "Extremo (>4σ)": "#FF0000"
+                }
+                
+                fig = px.pie(
+                    severidad_counts,
+                    names='Severidad',
+                    values='Cantidad',
+                    title='Distribución de Sobreconsumos por Severidad',
+                    color='Severidad',
+                    color_discrete_map=colores_severidad
+                )
+                
+                fig.update_traces(
+                    textposition='inside',
+                    textinfo='percent+label'
+                )
+                
+                fig.update_layout(
+                    plot_bgcolor='white'
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
+            
+            with tab2:
+                # Mostrar tabla
+                st.dataframe(
+                    severidad_counts[['Severidad', 'Cantidad']],
+                    column_config={
+                        "Severidad": st.column_config.TextColumn("Nivel de Severidad"),
+                        "Cantidad": st.column_config.NumberColumn("Cantidad", format="%d")
+                    },
+                    use_container_width=True
+                )
+                
+                # Añadir porcentajes
+                severidad_counts['Porcentaje'] = (severidad_counts['Cantidad'] / severidad_counts['Cantidad'].sum() * 100).round(2)
+                
+                # Mostrar estadísticas
+                st.markdown(f"""
+                <div class="card">
+                    <h4>Análisis de Severidad</h4>
+                    <ul>
+                        <li><strong>Leves (2-2.5σ):</strong> {severidad_counts[severidad_counts['Severidad']=='Leve (2-2.5σ)']['Porcentaje'].values[0] if 'Leve (2-2.5σ)' in severidad_counts['Severidad'].values else 0:.2f}%</li>
+                        <li><strong>Moderados (2.5-3σ):</strong> {severidad_counts[severidad_counts['Severidad']=='Moderado (2.5-3σ)']['Porcentaje'].values[0] if 'Moderado (2.5-3σ)' in severidad_counts['Severidad'].values else 0:.2f}%</li>
+                        <li><strong>Altos (3-4σ):</strong> {severidad_counts[severidad_counts['Severidad']=='Alto (3-4σ)']['Porcentaje'].values[0] if 'Alto (3-4σ)' in severidad_counts['Severidad'].values else 0:.2f}%</li>
+                        <li><strong>Extremos (>4σ):</strong> {severidad_counts[severidad_counts['Severidad']=='Extremo (>4σ)']['Porcentaje'].values[0] if 'Extremo (>4σ)' in severidad_counts['Severidad'].values else 0:.2f}%</li>
+                    </ul>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            # Casos extremos
+            extremos = df_sobre[df_sobre['Severidad'] == "Extremo (>4σ)"]
+            if not extremos.empty:
+                st.markdown(show_alert(
+                    f"Se han identificado casos con desviaciones superiores a 4 sigmas del promedio. Estos casos requieren atención inmediata ya que pueden indicar fugas, manipulación o problemas mecánicos graves.",
+                    "danger",
+                    f"⚠️ {len(extremos)} casos de sobreconsumo extremo detectados",
+                    "🚨"
+                ), unsafe_allow_html=True)
+        
+        # Tendencia temporal
+        if total_sobre > 0 and 'Fecha' in df_sobre.columns:
+            st.markdown("<h3 class='section-title'>Evolución Temporal de Sobreconsumos</h3>", unsafe_allow_html=True)
+            
+            # Sobreconsumos y total de cargas por día (días con sobreconsumos)
+            tendencia = cubo.rollup(lambda fechas: fechas.dt.date, **periodo)[['Sobreconsumos', 'Cargas']].reset_index()
+            tendencia.columns = ['Fecha', 'Sobreconsumos', 'Total Cargas']
+            tendencia = tendencia[tendencia['Sobreconsumos'] > 0]
+            tendencia['Porcentaje'] = (tendencia['Sobreconsumos'] / tendencia['Total Cargas'] * 100).round(2)
+            
+            # Gráfico
+            fig = make_subplots(specs=[[{"secondary_y": True}]])
+            
+            # Añadir barras de sobreconsumos
+            fig.add_trace(
+                go.Bar(
+                    x=tendencia['Fecha'],
+                    y=tendencia['Sobreconsumos'],
+                    name='Sobreconsumos',
+                    marker_color=colors['danger']
+                ),
+                secondary_y=False
+            )
+            
+            # Añadir línea de porcentaje
+            fig.add_trace(
+                go.Scatter(
+                    x=tendencia['Fecha'],
+                    y=tendencia['Porcentaje'],
+                    name='% Sobreconsumos',
+                    mode='lines+markers',
+                    marker=dict(color=colors['warning']),
+                    line=dict(color=colors['warning'], width=3)
+                ),
+                secondary_y=True
+            )
+            
+            # Actualizar ejes
+            fig.update_layout(
+                title='Evolución de Sobreconsumos a lo Largo del Tiempo',
+                plot_bgcolor='white',
+                hovermode='x unified',
+                height=450,
+                legend=dict(
+                    orientation="h",
+                    yanchor="bottom",
+                    y=1.02,
+                    xanchor="right",
+                    x=1
+                )
+            )
+            
+            fig.update_xaxes(title_text='Fecha')
+            fig.update_yaxes(title_text='Cantidad de Sobreconsumos', secondary_y=False)
+            fig.update_yaxes(title_text='% de Sobreconsumos', secondary_y=True)
+            
+            # Añadir línea de promedio
+            fig.add_hline(
+                y=porcentaje,
+                line_dash="dash",
+                line_color="red",
+                secondary_y=True,
+                annotation_text=f"Promedio: {porcentaje:.2f}%"
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # Análisis de tendencia
+            if len(tendencia) > 3:
+                from sklearn.linear_model import LinearRegression
+                
+                # Calcular tendencia lineal
+                X = np.array(range(len(tendencia))).reshape(-1, 1)
+                y = tendencia['Porcentaje'].values
+                
+                modelo = LinearRegression()
+                modelo.fit(X, y)
+                tendencia_valor = modelo.coef_[0]
+                
+                # Determinar si es creciente o decreciente
+                if tendencia_valor > 0.1:
+                    st.markdown(show_alert(
+                        f"La tendencia de sobreconsumos está aumentando en un {tendencia_valor:.2f}% por día. Se recomienda revisar urgentemente la eficiencia de la flota.",
+                        "danger",
+                        "Tendencia Creciente de Sobreconsumos",
+                        "📈"
+                    ), unsafe_allow_html=True)
+                elif tendencia_valor < -0.1:
+                    st.markdown(show_alert(
+                        f"La tendencia de sobreconsumos está disminuyendo en un {abs(tendencia_valor):.2f}% por día. Las medidas de eficiencia parecen estar funcionando.",
+                        "success",
+                        "Tendencia Decreciente de Sobreconsumos",
+                        "📉"
+                    ), unsafe_allow_html=True)
+        
+        # Recomendaciones específicas
+        st.markdown("<h3 class='section-title'>Recomendaciones para Reducir Sobreconsumos</h3>", unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown(f"""
+            <div class="card">
+                <h4>Recomendaciones Operativas</h4>
+                <ul>
+                    <li><strong>Mantenimiento Preventivo:</strong> Implementar un programa riguroso de mantenimiento preventivo, con especial atención a los modelos con mayor tasa de sobreconsumo.</li>
+                    <li><strong>Capacitación en Conducción Eficiente:</strong> Proporcionar capacitación especializada a conductores con altas tasas de sobreconsumo.</li>
+                    <li><strong>Optimización de Rutas:</strong> Analizar y optimizar las rutas para minimizar tiempos de ralentí y maximizar la eficiencia.</li>
+                    <li><strong>Presión de Neumáticos:</strong> Establecer un protocolo de verificación regular de la presión de neumáticos.</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown(f"""
+            <div class="card">
+                <h4>Mejoras Tecnológicas</h4>
+                <ul>
+                    <li><strong>Sistemas de Monitoreo:</strong> Implementar sistemas de monitoreo en tiempo real para detectar patrones de sobreconsumo inmediatamente.</li>
+                    <li><strong>Limitadores de Velocidad:</strong> Considerar la instalación de limitadores de velocidad en vehículos con tendencia al sobreconsumo.</li>
+                    <li><strong>Análisis de Telemetría:</strong> Utilizar datos de telemetría para identificar comportamientos de conducción que aumentan el consumo.</li>
+                    <li><strong>Actualización de Flotas:</strong> Considerar la renovación o actualización de los modelos con mayores tasas de sobreconsumo.</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Listado detallado
+        st.markdown("<h3 class='section-title'>Listado Detallado de Sobreconsumos</h3>", unsafe_allow_html=True)
+        
+        # Columnas relevantes
+        cols_relevantes = [col for col in [
+            'Fecha', 'Hora', 'Terminal', 'Número interno', 'Patente', 'Modelo chasis',
+            'Cantidad litros', 'Z-Score', 'Promedio Modelo', 'Nombre conductor', 'Nombre supervisor'
+        ] if col in df_sobre.columns]
+        
+        # Mostrar datos con paginación
+        with st.expander("Ver listado completo", expanded=False):
+            # Crear selector de página
+            if len(df_sobre) > 50:
+                # Calcular número de páginas (50 registros por página)
+                num_paginas = (len(df_sobre) - 1) // 50 + 1
+                pagina_actual = st.selectbox("Página", range(1, num_paginas + 1), key="pagina_sobreconsumos")
+                
+                # Índices de inicio y fin para la página seleccionada
+                inicio = (pagina_actual - 1) * 50
+                fin = min(inicio + 50, len(df_sobre))
+                
+                # Mostrar datos de la página actual
+                st.dataframe(
+                    formatear_horas(df_sobre[cols_relevantes].sort_values('Z-Score', ascending=False).iloc[inicio:fin]),
+                    use_container_width=True,
+                    height=400
+                )
+                
+                st.info(f"Mostrando registros {inicio+1} a {fin} de {len(df_sobre)}")
+            else:
+                # Si hay pocos registros, mostrar todos
+                st.dataframe(
+                    formatear_horas(df_sobre[cols_relevantes].sort_values('Z-Score', ascending=False)),
+                    use_container_width=True,
+                    height=400
+                )
+        
+        # Opción para exportar
+        if len(df_sobre) > 0:
+            st.download_button(
+                label="📥 Descargar listado de sobreconsumos",
+                data=formatear_horas(df_sobre[cols_relevantes].sort_values('Z-Score', ascending=False)).to_csv(index=False).encode('utf-8'),
+                file_name="sobreconsumos.csv",
+                mime="text/csv",
+                help="Descargar un archivo CSV con el listado completo de sobreconsumos",
+                use_container_width=True
+            )
+    else:
+        st.warning("No se encontró información sobre sobreconsumo en los datos.")
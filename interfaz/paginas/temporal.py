@@ -0,0 +1,765 @@
+"""
+Sección «Análisis Temporal»: patrones de consumo por día, semana, mes y horario.
+"""
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+from interfaz.componentes import show_alert
+from interfaz.tema import get_colors
+
+
+def render(df, cubo, indice):
+    colors = get_colors()
+
+    st.markdown("<h2 class='subtitle'>Análisis Temporal</h2>", unsafe_allow_html=True)
+    
+    if 'Fecha' in df.columns:
+        # Selección de vista y métrica
+        col1, col2, col3 = st.columns([2, 2, 1])
+        
+        with col1:
+            vista = st.selectbox(
+                "Seleccionar vista temporal",
+                ["Diaria", "Semanal", "Mensual", "Trimestral"]
+            )
+        
+        with col2:
+            if 'Cantidad litros' in df.columns:
+                metrica = st.selectbox(
+                    "Seleccionar métrica",
+                    ["Total Litros", "Promedio Litros/Carga", "Cantidad de Cargas"]
+                )
+            else:
+                metrica = "Cantidad de Cargas"
+        
+        with col3:
+            # Opción para mostrar tendencia
+            mostrar_tendencia = st.checkbox("Mostrar tendencia", value=True)
+        
+        # Preparar datos según vista seleccionada (clave de cada día del cubo)
+        if vista == "Diaria":
+            fecha_group = lambda fechas: fechas.dt.date
+            titulo = "Evolución Diaria"
+            fecha_format = "%d/%m/%Y"
+        elif vista == "Semanal":
+            # Semana ISO
+            def fecha_group(fechas):
+                iso = fechas.dt.isocalendar()
+                return iso['year'].astype(str) + "-W" + iso['week'].astype(str).str.zfill(2)
+            titulo = "Evolución Semanal"
+            fecha_format = "%Y-W%W"
+        elif vista == "Mensual":
+            fecha_group = lambda fechas: fechas.dt.strftime('%Y-%m')
+            titulo = "Evolución Mensual"
+            fecha_format = "%Y-%m"
+        else:  # Trimestral
+            fecha_group = lambda fechas: fechas.dt.year.astype(str) + "-Q" + fechas.dt.quarter.astype(str)
+            titulo = "Evolución Trimestral"
+            fecha_format = "%Y-Q%q"
+        
+        # Agrupar datos
+        agregado = cubo.rollup(fecha_group)
+        if metrica == "Total Litros" and 'Cantidad litros' in df.columns:
+            evolución = agregado[['Litros']].reset_index()
+            evolución.columns = ['Período', 'Total Litros']
+            y_column = 'Total Litros'
+            titulo += " - Total de Litros"
+        elif metrica == "Promedio Litros/Carga" and 'Cantidad litros' in df.columns:
+            evolución = agregado[['Promedio Litros']].reset_index()
+            evolución.columns = ['Período', 'Promedio Litros']
+            y_column = 'Promedio Litros'
+            titulo += " - Promedio de Litros por Carga"
+        else:  # Cantidad de Cargas
+            evolución = agregado[['Cargas']].reset_index()
+            evolución.columns = ['Período', 'Cantidad Cargas']
+            y_column = 'Cantidad Cargas'
+            titulo += " - Cantidad de Cargas"
+        
+        # Añadir columnas adicionales si están disponibles
+        if 'Mala Carga' in df.columns:
+            evolución['Malas Cargas'] = agregado['Malas Cargas'].to_numpy()
+            evolución['% Malas Cargas'] = agregado['% Malas Cargas'].round(2).to_numpy()
+        
+        if 'Sobreconsumo' in df.columns:
+            evolución['Sobreconsumos'] = agregado['Sobreconsumos'].to_numpy()
+            evolución['% Sobreconsumos'] = agregado['% Sobreconsumo'].round(2).to_numpy()
+        
+        # Ordenar por período
+        evolución = evolución.sort_values('Período')
+        
+        # Visualizar
+        tab1, tab2 = st.tabs(["📊 Gráfico", "📋 Tabla"])
+        
+        with tab1:
+            # Gráfico de evolución
+            st.markdown("<h3 class='section-title'>Evolución Temporal</h3>", unsafe_allow_html=True)
+            
+            fig = px.line(
+                evolución,
+                x='Período',
+                y=y_column,
+                title=titulo,
+                markers=True
+            )
+            
+            fig.update_traces(
+                line=dict(color=colors['primary'], width=3),
+                marker=dict(color=colors['primary'], size=8)
+            )
+            
+            fig.update_layout(
+                xaxis_title="Período",
+                yaxis_title=y_column,
+                plot_bgcolor='white',
+                hovermode='x unified',
+                height=450
+            )
+            
+            # Calcular y añadir tendencia
+            if mostrar_tendencia and len(evolución) > 2:
+                from sklearn.linear_model import HuberRegressor, LinearRegression
+                
+                X = np.array(range(len(evolución))).reshape(-1, 1)
+                y = evolución[y_column].values
+                
+                try:
+                    # Intentar con regresión robusta primero
+                    modelo = HuberRegressor()
+                    modelo.fit(X, y)
+                    tendencia = modelo.coef_[0]
+                except:
+                    # Fallback a regresión lineal estándar
+                    modelo = LinearRegression()
+                    modelo.fit(X, y)
+                    tendencia = modelo.coef_[0]
+                
+                # Añadir línea de tendencia
+                tendencia_y = modelo.predict(X)
+                
+                fig.add_trace(
+                    go.Scatter(
+                        x=evolución['Período'],
+                        y=tendencia_y,
+                        mode='lines',
+                        name='Tendencia',
+                        line=dict(color='red', width=2, dash='dash')
+                    )
+                )
+                
+                # Calcular porcentaje de cambio
+                promedio = np.mean(y)
+                porcentaje_cambio = (tendencia / promedio) * 100
+                
+                # Añadir anotación con la tendencia
+                if vista == "Diaria":
+                    unidad = "diario"
+                elif vista == "Semanal":
+                    unidad = "semanal"
+                elif vista == "Mensual":
+                    unidad = "mensual"
+                else:
+                    unidad = "trimestral"
+                
+                tendencia_texto = f"Tendencia: {'+' if tendencia > 0 else ''}{tendencia:.2f} ({'+' if tendencia > 0 else ''}{porcentaje_cambio:.2f}% {unidad})"
+                
+                fig.add_annotation(
+                    x=evolución['Período'].iloc[-1],
+                    y=tendencia_y[-1],
+                    text=tendencia_texto,
+                    showarrow=True,
+                    arrowhead=2,
+                    arrowsize=1,
+                    arrowwidth=2,
+                    arrowcolor='red',
+                    ax=50,
+                    ay=-30
+                )
+            
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # Gráfico adicional para malas cargas y sobreconsumos si están disponibles
+            if 'Mala Carga' in df.columns and 'Sobreconsumo' in df.columns:
+                st.markdown("<h3 class='section-title'>Evolución de Indicadores de Calidad</h3>", unsafe_allow_html=True)
+                
+                fig = go.Figure()
+                
+                # Añadir línea para % de malas cargas
+                fig.add_trace(
+                    go.Scatter(
+                        x=evolución['Período'],
+                        y=evolución['% Malas Cargas'],
+                        mode='lines+markers',
+                        name='% Malas Cargas',
+                        line=dict(color=colors['danger'], width=3),
+                        marker=dict(color=colors['danger'], size=8)
+                    )
+                )
+                
+                # Añadir línea para % de sobreconsumos
+                fig.add_trace(
+                    go.Scatter(
+                        x=evolución['Período'],
+                        y=evolución['% Sobreconsumos'],
+                        mode='lines+markers',
+                        name='% Sobreconsumos',
+                        line=dict(color=colors['warning'], width=3),
+                        marker=dict(color=colors['warning'], size=8)
+                    )
+                )
+                
+                # Actualizar diseño
+                fig.update_layout(
+                    title='Evolución de Malas Cargas y Sobreconsumos',
+                    xaxis_title='Período',
+                    yaxis_title='Porcentaje (%)',
+                    plot_bgcolor='white',
+                    hovermode='x unified',
+                    height=450,
+                    legend=dict(
+                        orientation="h",
+                        yanchor="bottom",
+                        y=1.02,
+                        xanchor="right",
+                        x=1
+                    )
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
+        
+        with tab2:
+            # Mostrar tabla de evolución
+            st.dataframe(
+                evolución,
+                use_container_width=True
+            )
+        
+        # Análisis por día de semana
+        if 'Día Semana' in df.columns:
+            st.markdown("<h3 class='section-title'>Análisis por Día de Semana</h3>", unsafe_allow_html=True)
+            
+            # Agrupar por día de la semana
+            dias_orden = {
+                'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3, 
+                'Friday': 4, 'Saturday': 5, 'Sunday': 6,
+                'Lunes': 0, 'Martes': 1, 'Miércoles': 2, 'Jueves': 3, 
+                'Viernes': 4, 'Sábado': 5, 'Domingo': 6
+            }
+            
+            # Verificar si los días están en español o inglés
+            if df['Día Semana'].iloc[0] in list(dias_orden.keys())[:7]:  # Inglés
+                dict_dias = {0: 'Monday', 1: 'Tuesday', 2: 'Wednesday', 3: 'Thursday', 
+                           4: 'Friday', 5: 'Saturday', 6: 'Sunday'}
+            else:  # Español
+                dict_dias = {0: 'Lunes', 1: 'Martes', 2: 'Miércoles', 3: 'Jueves', 
+                           4: 'Viernes', 5: 'Sábado', 6: 'Domingo'}
+            
+            # Orden del día como serie aparte (sin agregar columnas a los datos de la sesión)
+            dia_orden = df['Día Semana'].map(dias_orden).rename('Día Orden')
+            
+            # Datos para gráfico
+            if 'Cantidad litros' in df.columns:
+                metrics = ['sum', 'mean', 'count']
+                dia_agg = df.groupby([df['Día Semana'], dia_orden], observed=True).agg({'Cantidad litros': metrics})
+                dia_agg.columns = ['Total Litros', 'Promedio Litros', 'Cantidad Cargas']
+                dia_agg = dia_agg.reset_index()
+            else:
+                dia_agg = df.groupby([df['Día Semana'], dia_orden], observed=True).size().reset_index()
+                dia_agg.columns = ['Día Semana', 'Día Orden', 'Cantidad Cargas']
+            
+            # Ordenar por día de la semana
+            dia_agg = dia_agg.sort_values('Día Orden')
+            
+            # Mapear nombres de días
+            dia_agg['Día'] = dia_agg['Día Orden'].map(dict_dias)
+            
+            # Pestañas para diferentes métricas
+            tab1, tab2, tab3 = st.tabs(["📊 Cantidad de Cargas", "⛽ Total de Litros", "📏 Promedio de Litros"])
+            
+            with tab1:
+                # Gráfico de cargas por día
+                fig = px.bar(
+                    dia_agg,
+                    x='Día',
+                    y='Cantidad Cargas',
+                    title='Cantidad de Cargas por Día de Semana',
+                    color='Cantidad Cargas',
+                    color_continuous_scale='Viridis',
+                    text='Cantidad Cargas'
+                )
+                
+                fig.update_traces(
+                    texttemplate='%{text}',
+                    textposition='outside'
+                )
+                
+                fig.update_layout(
+                    xaxis_title="Día de Semana",
+                    yaxis_title="Cantidad de Cargas",
+                    plot_bgcolor='white'
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
+            
+            if 'Cantidad litros' in df.columns:
+                with tab2:
+                    # Gráfico de total de litros por día
+                    fig = px.bar(
+                        dia_agg,
+                        x='Día',
+                        y='Total Litros',
+                        title='Total de Litros por Día de Semana',
+                        color='Total Litros',
+                        color_continuous_scale='Viridis',
+                        text='Total Litros'
+                    )
+                    
+                    fig.update_traces(
+                        texttemplate='%{text:.1f}',
+                        textposition='outside'
+                    )
+                    
+                    fig.update_layout(
+                        xaxis_title="Día de Semana",
+                        yaxis_title="Total de Litros",
+                        plot_bgcolor='white'
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                
+                with tab3:
+                    # Gráfico de promedio de litros por día
+                    fig = px.bar(
+                        dia_agg,
+                        x='Día',
+                        y='Promedio Litros',
+                        title='Promedio de Litros por Día de Semana',
+                        color='Promedio Litros',
+                        color_continuous_scale='Viridis',
+                        text='Promedio Litros'
+                    )
+                    
+                    fig.update_traces(
+                        texttemplate='%{text:.1f}',
+                        textposition='outside'
+                    )
+                    
+                    fig.update_layout(
+                        xaxis_title="Día de Semana",
+                        yaxis_title="Promedio de Litros",
+                        plot_bgcolor='white'
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+            
+            # Análisis comparativo de días laborales vs fin de semana
+            st.markdown("<h3 class='section-title'>Comparativa Laboral vs Fin de Semana</h3>", unsafe_allow_html=True)
+            
+            # Definir días laborales y fin de semana
+            dias_laborales = [0, 1, 2, 3, 4]  # Lunes a Viernes
+            fin_semana = [5, 6]  # Sábado y Domingo
+            
+            # Filtrar datos
+            df_laboral = df[dia_orden.isin(dias_laborales)]
+            df_finde = df[dia_orden.isin(fin_semana)]
+            
+            # Calcular métricas
+            metricas_comparacion = {
+                "Cantidad Cargas": [len(df_laboral), len(df_finde)],
+                "% del Total": [len(df_laboral) / len(df) * 100, len(df_finde) / len(df) * 100]
+            }
+            
+            if 'Cantidad litros' in df.columns:
+                metricas_comparacion["Total Litros"] = [df_laboral['Cantidad litros'].sum(), df_finde['Cantidad litros'].sum()]
+                metricas_comparacion["Promedio Litros"] = [df_laboral['Cantidad litros'].mean(), df_finde['Cantidad litros'].mean()]
+            
+            if 'Mala Carga' in df.columns:
+                metricas_comparacion["% Malas Cargas"] = [df_laboral['Mala Carga'].mean() * 100, df_finde['Mala Carga'].mean() * 100]
+            
+            if 'Sobreconsumo' in df.columns:
+                metricas_comparacion["% Sobreconsumos"] = [df_laboral['Sobreconsumo'].mean() * 100, df_finde['Sobreconsumo'].mean() * 100]
+            
+            # Crear DataFrame para visualización
+            df_comparacion = pd.DataFrame({
+                "Métrica": list(metricas_comparacion.keys()),
+                "Laboral (L-V)": [metricas_comparacion[k][0] for k in metricas_comparacion.keys()],
+                "Fin de Semana (S-D)": [metricas_comparacion[k][1] for k in metricas_comparacion.keys()],
+                "Diferencia %": [(metricas_comparacion[k][1] / metricas_comparacion[k][0] - 1) * 100 if metricas_comparacion[k][0] > 0 else 0 for k in metricas_comparacion.keys()]
+            })
+            
+            # Mostrar tabla
+            st.dataframe(
+                df_comparacion,
+                column_config={
+                    "Métrica": st.column_config.TextColumn("Métrica"),
+                    "Laboral (L-V)": st.column_config.NumberColumn("Laboral (L-V)", format="%.2f"),
+                    "Fin de Semana (S-D)": st.column_config.NumberColumn("Fin de Semana (S-D)", format="%.2f"),
+                    "Diferencia %": st.column_config.NumberColumn("Diferencia %", format="%.2f%%")
+                },
+                use_container_width=True
+            )
+            
+            # Gráfico comparativo
+            fig = go.Figure()
+            
+            # Barras para días laborales
+            fig.add_trace(
+                go.Bar(
+                    x=df_comparacion['Métrica'],
+                    y=df_comparacion['Laboral (L-V)'],
+                    name='Laboral (L-V)',
+                    marker_color=colors['primary']
+                )
+            )
+            
+            # Barras para fin de semana
+            fig.add_trace(
+                go.Bar(
+                    x=df_comparacion['Métrica'],
+                    y=df_comparacion['Fin de Semana (S-D)'],
+                    name='Fin de Semana (S-D)',
+                    marker_color=colors['secondary']
+                )
+            )
+            
+            fig.update_layout(
+                title='Comparativa Días Laborales vs Fin de Semana',
+                xaxis_title='Métrica',
+                yaxis_title='Valor',
+                barmode='group',
+                plot_bgcolor='white'
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # Insights y recomendaciones
+            if 'Promedio Litros' in metricas_comparacion:
+                diff_litros = (metricas_comparacion['Promedio Litros'][1] / metricas_comparacion['Promedio Litros'][0] - 1) * 100
+                
+                if abs(diff_litros) > 10:
+                    if diff_litros > 0:
+                        st.markdown(show_alert(
+                            f"El promedio de litros por carga es un {diff_litros:.2f}% mayor durante los fines de semana que en días laborales. Se recomienda revisar los patrones operativos durante los fines de semana para identificar posibles oportunidades de mejora.",
+                            "warning",
+                            "Diferencia Significativa en Consumo de Fin de Semana",
+                            "⚠️"
+                        ), unsafe_allow_html=True)
+                    else:
+                        st.markdown(show_alert(
+                            f"El promedio de litros por carga es un {abs(diff_litros):.2f}% menor durante los fines de semana que en días laborales. Esto podría indicar que las rutas o la operación durante el fin de semana son más eficientes.",
+                            "info",
+                            "Consumo Menor en Fin de Semana",
+                            "ℹ️"
+                        ), unsafe_allow_html=True)
+        
+        # Análisis por hora del día
+        if 'Hora Numérica' in df.columns:
+            st.markdown("<h3 class='section-title'>Análisis por Hora del Día</h3>", unsafe_allow_html=True)
+            
+            # Redondear horas para agrupar
+            hora_redondeada = np.round(df['Hora Numérica']).astype(int).rename('Hora Redondeada')
+            
+            # Agrupar por hora
+            if 'Cantidad litros' in df.columns:
+                hora_agg = df.groupby(hora_redondeada).agg({
+                    'Cantidad litros': ['sum', 'mean', 'count']
+                }).reset_index()
+                hora_agg.columns = ['Hora', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas']
+            else:
+                hora_agg = df.groupby(hora_redondeada).size().reset_index()
+                hora_agg.columns = ['Hora', 'Cantidad Cargas']
+            
+            # Ordenar por hora
+            hora_agg = hora_agg.sort_values('Hora')
+            
+            # Pestañas para diferentes métricas
+            if 'Cantidad litros' in df.columns:
+                tab1, tab2, tab3 = st.tabs(["📊 Cantidad de Cargas", "⛽ Total de Litros", "📏 Promedio de Litros"])
+            else:
+                tab1 = st.container()  # Solo una pestaña si no hay datos de litros
+            
+            # Gráfico de cargas por hora
+            if 'Cantidad litros' in df.columns:
+                with tab1:
+                    fig = px.bar(
+                        hora_agg,
+                        x='Hora',
+                        y='Cantidad Cargas',
+                        title='Cantidad de Cargas por Hora del Día',
+                        color='Cantidad Cargas',
+                        color_continuous_scale='Viridis',
+                        text='Cantidad Cargas'
+                    )
+                    
+                    fig.update_traces(
+                        texttemplate='%{text}',
+                        textposition='outside'
+                    )
+                    
+                    fig.update_layout(
+                        xaxis_title="Hora del Día",
+                        yaxis_title="Cantidad de Cargas",
+                        plot_bgcolor='white',
+                        xaxis=dict(
+                            tickmode='linear',
+                            tick0=0,
+                            dtick=2  # Mostrar etiquetas cada 2 horas
+                        )
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                
+                with tab2:
+                    # Gráfico de total de litros por hora
+                    fig = px.bar(
+                        hora_agg,
+                        x='Hora',
+                        y='Total Litros',
+                        title='Total de Litros por Hora del Día',
+                        color='Total Litros',
+                        color_continuous_scale='Viridis',
+                        text='Total Litros'
+                    )
+                    
+                    fig.update_traces(
+                        texttemplate='%{text:.1f}',
+                        textposition='outside'
+                    )
+                    
+                    fig.update_layout(
+                        xaxis_title="Hora del Día",
+                        yaxis_title="Total de Litros",
+                        plot_bgcolor='white',
+                        xaxis=dict(
+                            tickmode='linear',
+                            tick0=0,
+                            dtick=2  # Mostrar etiquetas cada 2 horas
+                        )
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                
+                with tab3:
+                    # Gráfico de promedio de litros por hora
+                    fig = px.bar(
+                        hora_agg,
+                        x='Hora',
+                        y='Promedio Litros',
+                        title='Promedio de Litros por Hora del Día',
+                        color='Promedio Litros',
+                        color_continuous_scale='Viridis',
+                        text='Promedio Litros'
+                    )
+                    
+                    fig.update_traces(
+                        texttemplate='%{text:.1f}',
+                        textposition='outside'
+                    )
+                    
+                    fig.update_layout(
+                        xaxis_title="Hora del Día",
+                        yaxis_title="Promedio de Litros",
+                        plot_bgcolor='white',
+                        xaxis=dict(
+                            tickmode='linear',
+                            tick0=0,
+                            dtick=2  # Mostrar etiquetas cada 2 horas
+                        )
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+            else:
+                # Gráfico simple si solo hay datos de cantidad
+                fig = px.bar(
+                    hora_agg,
+                    x='Hora',
+                    y='Cantidad Cargas',
+                    title='Cantidad de Cargas por Hora del Día',
+                    color='Cantidad Cargas',
+                    color_continuous_scale='Viridis',
+                    text='Cantidad Cargas'
+                )
+                
+                fig.update_traces(
+                    texttemplate='%{text}',
+                    textposition='outside'
+                )
+                
+                fig.update_layout(
+                    xaxis_title="Hora del Día",
+                    yaxis_title="Cantidad de Cargas",
+                    plot_bgcolor='white',
+                    xaxis=dict(
+                        tickmode='linear',
+                        tick0=0,
+                        dtick=2  # Mostrar etiquetas cada 2 horas
+                    )
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
+            
+            # Análisis por período del día
+            if 'Período' in df.columns:
+                st.markdown("<h3 class='section-title'>Análisis por Período del Día</h3>", unsafe_allow_html=True)
+                
+                # Agrupar por período
+                if 'Cantidad litros' in df.columns:
+                    periodo_agg = df.groupby('Período', observed=True).agg({
+                        'Cantidad litros': ['sum', 'mean', 'count']
+                    }).reset_index()
+                    periodo_agg.columns = ['Período', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas']
+                else:
+                    periodo_agg = df.groupby('Período', observed=True).size().reset_index()
+                    periodo_agg.columns = ['Período', 'Cantidad Cargas']
+                
+                # Ordenar períodos
+                orden_periodo = {'Madrugada': 0, 'Mañana': 1, 'Tarde': 2, 'Noche': 3}
+                periodo_agg['Orden'] = periodo_agg['Período'].map(orden_periodo)
+                periodo_agg = periodo_agg.sort_values('Orden')
+                
+                # Crear gráfico
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    # Gráfico de cargas por período
+                    fig = px.pie(
+                        periodo_agg,
+                        names='Período',
+                        values='Cantidad Cargas',
+                        title='Distribución de Cargas por Período',
+                        color_discrete_sequence=px.colors.sequential.Viridis
+                    )
+                    
+                    fig.update_traces(
+                        textposition='inside',
+                        textinfo='percent+label'
+                    )
+                    
+                    fig.update_layout(
+                        plot_bgcolor='white'
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                
+                if 'Cantidad litros' in df.columns:
+                    with col2:
+                        # Gráfico de litros por período
+                        fig = px.pie(
+                            periodo_agg,
+                            names='Período',
+                            values='Total Litros',
+                            title='Distribución de Litros por Período',
+                            color_discrete_sequence=px.colors.sequential.Viridis
+                        )
+                        
+                        fig.update_traces(
+                            textposition='inside',
+                            textinfo='percent+label'
+                        )
+                        
+                        fig.update_layout(
+                            plot_bgcolor='white'
+                        )
+                        
+                        st.plotly_chart(fig, use_container_width=True)
+                    
+                    # Mostrar tabla de datos
+                    st.dataframe(
+                        periodo_agg[['Período', 'Cantidad Cargas', 'Total Litros', 'Promedio Litros']],
+                        column_config={
+                            "Período": st.column_config.TextColumn("Período del Día"),
+                            "Cantidad Cargas": st.column_config.NumberColumn("Cantidad Cargas", format="%d"),
+                            "Total Litros": st.column_config.NumberColumn("Total Litros", format="%.2f"),
+                            "Promedio Litros": st.column_config.NumberColumn("Promedio Litros", format="%.2f")
+                        },
+                        use_container_width=True
+                    )
+        
+        # Proporcionar conclusiones y recomendaciones
+        st.markdown("<h3 class='section-title'>Conclusiones y Recomendaciones</h3>", unsafe_allow_html=True)
+        
+        # Calcular métricas para insights
+        insights = []
+        
+        # Tendencia
+        if 'tendencia_valor' in locals():
+            if tendencia_valor > 0.05 * promedio:
+                insights.append({
+                    "tipo": "warning",
+                    "titulo": f"Tendencia al alza en {metrica}",
+                    "mensaje": f"Se observa una tendencia creciente de {tendencia_valor:.2f} ({porcentaje_cambio:.2f}% {unidad}). Considere revisar la eficiencia operativa para controlar el aumento."
+                })
+            elif tendencia_valor < -0.05 * promedio:
+                insights.append({
+                    "tipo": "success",
+                    "titulo": f"Tendencia a la baja en {metrica}",
+                    "mensaje": f"Se observa una tendencia decreciente de {tendencia_valor:.2f} ({porcentaje_cambio:.2f}% {unidad}). Las medidas de eficiencia parecen estar funcionando correctamente."
+                })
+        
+        # Diferencias entre días de semana
+        if 'dia_agg' in locals() and 'Cantidad Cargas' in dia_agg.columns:
+            max_dia = dia_agg.loc[dia_agg['Cantidad Cargas'].idxmax()]
+            min_dia = dia_agg.loc[dia_agg['Cantidad Cargas'].idxmin()]
+            
+            diff_dias = (max_dia['Cantidad Cargas'] / min_dia['Cantidad Cargas'] - 1) * 100
+            
+            if diff_dias > 50:
+                insights.append({
+                    "tipo": "info",
+                    "titulo": "Alta variabilidad entre días de la semana",
+                    "mensaje": f"El día con mayor actividad ({max_dia['Día']}) tiene un {diff_dias:.2f}% más de cargas que el día con menor actividad ({min_dia['Día']}). Considere redistribuir las cargas de manera más uniforme para optimizar los recursos."
+                })
+        
+        # Diferencia entre laboral y fin de semana
+        if 'df_comparacion' in locals() and len(df_comparacion) > 0:
+            diff_litros_finde = df_comparacion.loc[df_comparacion['Métrica'] == 'Promedio Litros', 'Diferencia %'].values[0] if 'Promedio Litros' in df_comparacion['Métrica'].values else 0
+            
+            if abs(diff_litros_finde) > 15:
+                tipo = "warning" if diff_litros_finde > 0 else "info"
+                mensaje = f"El promedio de litros es un {abs(diff_litros_finde):.2f}% {'mayor' if diff_litros_finde > 0 else 'menor'} en fin de semana que en días laborales."
+                
+                if diff_litros_finde > 0:
+                    mensaje += " Se recomienda revisar las operaciones de fin de semana para identificar posibles ineficiencias."
+                else:
+                    mensaje += " Las operaciones de fin de semana parecen ser más eficientes que en días laborales."
+                
+                insights.append({
+                    "tipo": tipo,
+                    "titulo": "Diferencia significativa entre días laborales y fin de semana",
+                    "mensaje": mensaje
+                })
+        
+        # Concentración de cargas por hora
+        if 'hora_agg' in locals() and 'Cantidad Cargas' in hora_agg.columns:
+            max_hora = hora_agg.loc[hora_agg['Cantidad Cargas'].idxmax()]
+            
+            # Calcular el porcentaje de cargas en la hora pico
+            pct_hora_pico = (max_hora['Cantidad Cargas'] / hora_agg['Cantidad Cargas'].sum()) * 100
+            
+            if pct_hora_pico > 15:
+                insights.append({
+                    "tipo": "warning",
+                    "titulo": "Alta concentración de cargas en hora pico",
+                    "mensaje": f"El {pct_hora_pico:.2f}% de las cargas se realizan a las {max_hora['Hora']}:00 horas. Considere distribuir las cargas a lo largo del día para evitar congestionamiento y mejorar la eficiencia."
+                })
+        
+        # Mostrar insights
+        if insights:
+            for insight in insights:
+                st.markdown(show_alert(
+                    insight["mensaje"],
+                    insight["tipo"],
+                    insight["titulo"],
+                    "📊" if insight["tipo"] == "info" else "⚠️" if insight["tipo"] == "warning" else "✅"
+                ), unsafe_allow_html=True)
+        else:
+            st.markdown(show_alert(
+                "No se han detectado patrones temporales significativos en los datos analizados.",
+                "info",
+                "Sin patrones temporales destacables",
+                "ℹ️"
+            ), unsafe_allow_html=True)
+    else:
+        st.warning("No se encontró información temporal en los datos.")
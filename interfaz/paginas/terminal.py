@@ -0,0 +1,689 @@
+"""
+Sección «Análisis por Terminal»: consumo, rendimiento y horarios de carga por terminal.
+"""
+import streamlit as st
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import datetime
+
+from interfaz.componentes import create_kpi_card, formatear_horas, show_alert
+from interfaz.graficos import create_heatmap, plot_time_series
+from interfaz.tema import get_colors
+
+
+def render(df, cubo, indice):
+    colors = get_colors()
+
+    st.markdown("<h2 class='subtitle'>Análisis por Terminal</h2>", unsafe_allow_html=True)
+    
+    if 'Terminal' in df.columns:
+        # Selector de terminal
+        terminales = indice.entities('Terminal')
+        col1, col2, col3 = st.columns([3, 1, 1])
+        
+        with col1:
+            terminal_seleccionada = st.selectbox("Seleccionar Terminal", ['Todas'] + list(terminales))
+        
+        with col2:
+            if 'Fecha' in df.columns:
+                fecha_min = df['Fecha'].min().date()
+                fecha_max = df['Fecha'].max().date()
+            else:
+                fecha_min = datetime.date.today() - datetime.timedelta(days=30)
+                fecha_max = datetime.date.today()
+            
+            fecha_inicio = st.date_input("Fecha inicio", fecha_min)
+        
+        with col3:
+            fecha_fin = st.date_input("Fecha fin", fecha_max)
+        
+        # Totales del rango desde las sumas acumuladas por día; las filas se toman por posición
+        filtro = ('Terminal', terminal_seleccionada) if terminal_seleccionada != 'Todas' else (None, None)
+        totales = indice.totals(fecha_inicio, fecha_fin, *filtro)
+        global_ = cubo.rollup().iloc[0]
+        df_terminal = indice.rows(fecha_inicio, fecha_fin, *filtro, cronologico=terminal_seleccionada != 'Todas')
+        
+        # Métricas principales
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            cargas_terminal = int(totales['Cargas'])
+            total_cargas = len(df)
+            porcentaje_cargas = (cargas_terminal / total_cargas) * 100 if total_cargas > 0 else 0
+            
+            st.markdown(create_kpi_card(
+                "Total Cargas", 
+                f"{cargas_terminal:,}",
+                porcentaje_cargas,
+                icon="🚌",
+                color_class="primary",
+                footnote=f"{porcentaje_cargas:.2f}% del total"
+            ), unsafe_allow_html=True)
+        
+        with col2:
+            if 'Cantidad litros' in df_terminal.columns:
+                litros_terminal = totales['Litros']
+                total_litros = global_['Litros']
+                porcentaje_litros = (litros_terminal / total_litros) * 100 if total_litros > 0 else 0
+                
+                st.markdown(create_kpi_card(
+                    "Total Litros", 
+                    f"{litros_terminal:,.0f}",
+                    porcentaje_litros,
+                    icon="⛽",
+                    color_class="info",
+                    footnote=f"{porcentaje_litros:.2f}% del total"
+                ), unsafe_allow_html=True)
+        
+        with col3:
+            if 'Cantidad litros' in df_terminal.columns:
+                promedio_terminal = totales['Promedio Litros']
+                promedio_global = global_['Promedio Litros']
+                diferencia_pct = ((promedio_terminal / promedio_global) - 1) * 100 if promedio_global > 0 else 0
+                
+                color_class = "success" if diferencia_pct < 0 else "warning" if diferencia_pct < 5 else "danger"
+                
+                st.markdown(create_kpi_card(
+                    "Promedio L/Carga", 
+                    f"{promedio_terminal:.2f}",
+                    diferencia_pct,
+                    icon="📊",
+                    color_class=color_class,
+                    footnote=f"vs {promedio_global:.2f} global"
+                ), unsafe_allow_html=True)
+        
+        with col4:
+            if 'Número interno' in df_terminal.columns:
+                buses_terminal = df_terminal['Número interno'].nunique()
+                cargas_por_bus = cargas_terminal / buses_terminal if buses_terminal > 0 else 0
+                
+                st.markdown(create_kpi_card(
+                    "Buses Atendidos", 
+                    f"{buses_terminal:,}",
+                    None,
+                    icon="🚍",
+                    color_class="success",
+                    footnote=f"{cargas_por_bus:.2f} cargas/bus"
+                ), unsafe_allow_html=True)
+        
+        # Métricas de alertas
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            if 'Mala Carga' in df_terminal.columns:
+                malas_terminal = int(totales['Malas Cargas'])
+                porcentaje_malas = (malas_terminal / cargas_terminal) * 100 if cargas_terminal > 0 else 0
+                
+                # Comparar con el promedio global
+                porcentaje_global = global_['% Malas Cargas'] if len(df) > 0 else 0
+                diferencia = porcentaje_malas - porcentaje_global
+                
+                color = "success" if porcentaje_malas < 2 else "warning" if porcentaje_malas < 5 else "danger"
+                
+                st.markdown(create_kpi_card(
+                    "Malas Cargas", 
+                    f"{malas_terminal} ({porcentaje_malas:.2f}%)",
+                    -diferencia,  # Negativo porque menos es mejor
+                    icon="❌",
+                    color_class=color,
+                    footnote=f"vs {porcentaje_global:.2f}% global"
+                ), unsafe_allow_html=True)
+        
+        with col2:
+            if 'Sobreconsumo' in df_terminal.columns:
+                sobre_terminal = int(totales['Sobreconsumos'])
+                porcentaje_sobre = (sobre_terminal / cargas_terminal) * 100 if cargas_terminal > 0 else 0
+                
+                # Comparar con el promedio global
+                porcentaje_global = global_['% Sobreconsumo'] if len(df) > 0 else 0
+                diferencia = porcentaje_sobre - porcentaje_global
+                
+                color = "success" if porcentaje_sobre < 5 else "warning" if porcentaje_sobre < 10 else "danger"
+                
+                st.markdown(create_kpi_card(
+                    "Sobreconsumos", 
+                    f"{sobre_terminal} ({porcentaje_sobre:.2f}%)",
+                    -diferencia,  # Negativo porque menos es mejor
+                    icon="⚠️",
+                    color_class=color,
+                    footnote=f"vs {porcentaje_global:.2f}% global"
+                ), unsafe_allow_html=True)
+        
+        with col3:
+            if 'Rendimiento' in df_terminal.columns:
+                rendimiento_terminal = totales['Rendimiento Promedio']
+                rendimiento_global = global_['Rendimiento Promedio']
+                diferencia_pct = ((rendimiento_terminal / rendimiento_global) - 1) * 100 if rendimiento_global > 0 else 0
+                
+                color_class = "success" if diferencia_pct > 0 else "warning" if diferencia_pct > -10 else "danger"
+                
+                st.markdown(create_kpi_card(
+                    "Rendimiento (km/L)", 
+                    f"{rendimiento_terminal:.2f}",
+                    diferencia_pct,
+                    icon="🔄",
+                    color_class=color_class,
+                    footnote=f"vs {rendimiento_global:.2f} global"
+                ), unsafe_allow_html=True)
+        
+        # Si es "Todas", mostrar comparativa entre terminales
+        if terminal_seleccionada == 'Todas':
+            st.markdown("<h3 class='section-title'>Comparativa entre Terminales</h3>", unsafe_allow_html=True)
+            
+            # Agrupar datos por terminal (desde el cubo de agregados)
+            terminal_stats = cubo.rollup('Terminal').reindex(columns=[
+                'Litros', 'Promedio Litros', 'Cargas con Litros', 'Malas Cargas', 'Sobreconsumos'
+            ]).reset_index()
+            
+            # Aplanar los nombres de columnas multiíndice
+            if 'Cantidad litros' in df.columns:
+                terminal_stats.columns = ['Terminal', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 
+                                        'Malas Cargas', 'Sobreconsumos']
+                
+                # Calcular porcentajes e índice de eficiencia
+                terminal_stats['% Malas Cargas'] = (terminal_stats['Malas Cargas'] / terminal_stats['Cantidad Cargas'] * 100).round(2)
+                terminal_stats['% Sobreconsumos'] = (terminal_stats['Sobreconsumos'] / terminal_stats['Cantidad Cargas'] * 100).round(2)
+                terminal_stats['Índice Eficiencia'] = 100 - (terminal_stats['% Sobreconsumos'] * 0.7 + terminal_stats['% Malas Cargas'] * 0.3)
+                terminal_stats['Índice Eficiencia'] = terminal_stats['Índice Eficiencia'].clip(0, 100).round(2)
+                
+                # Añadir ranking
+                terminal_stats['Ranking'] = terminal_stats['Índice Eficiencia'].rank(ascending=False).astype(int)
+                
+                # Tabs para diferentes vistas
+                tab1, tab2, tab3 = st.tabs(["📊 Gráfico", "📋 Tabla", "🔍 Detalles"])
+                
+                with tab1:
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        # Gráfico de barras comparativo (Litros)
+                        fig = px.bar(
+                            terminal_stats,
+                            x='Terminal',
+                            y='Total Litros',
+                            title='Consumo Total por Terminal',
+                            color='Índice Eficiencia',
+                            color_continuous_scale='RdYlGn',
+                            text='Total Litros'
+                        )
+                        
+                        fig.update_traces(
+                            texttemplate='%{text:.0f}',
+                            textposition='outside'
+                        )
+                        
+                        fig.update_layout(
+                            xaxis_title="Terminal",
+                            yaxis_title="Total Litros",
+                            plot_bgcolor='white',
+                            height=450
+                        )
+                        
+                        st.plotly_chart(fig, use_container_width=True)
+                    
+                    with col2:
+                        # Gráfico de eficiencia
+                        fig = px.bar(
+                            terminal_stats,
+                            x='Terminal',
+                            y='Índice Eficiencia',
+                            title='Índice de Eficiencia por Terminal',
+                            color='Índice Eficiencia',
+                            color_continuous_scale='RdYlGn',
+                            text='Índice Eficiencia'
+                        )
+                        
+                        fig.update_traces(
+                            texttemplate='%{text:.1f}',
+                            textposition='outside'
+                        )
+                        
+                        fig.update_layout(
+                            xaxis_title="Terminal",
+                            yaxis_title="Índice de Eficiencia",
+                            plot_bgcolor='white',
+                            height=450
+                        )
+                        
+                        # Añadir línea de referencia para el promedio
+                        promedio_eficiencia = terminal_stats['Índice Eficiencia'].mean()
+                        fig.add_hline(
+                            y=promedio_eficiencia, 
+                            line_dash="dash", 
+                            line_color="gray",
+                            annotation_text=f"Promedio ({promedio_eficiencia:.2f})"
+                        )
+                        
+                        st.plotly_chart(fig, use_container_width=True)
+                
+                with tab2:
+                    # Ordenar por índice de eficiencia (descendente)
+                    terminal_stats_display = terminal_stats.sort_values('Índice Eficiencia', ascending=False)
+                    
+                    # Mostrar tabla
+                    st.dataframe(
+                        terminal_stats_display,
+                        column_config={
+                            "Terminal": st.column_config.TextColumn("Terminal"),
+                            "Total Litros": st.column_config.NumberColumn("Total Litros", format="%,.2f"),
+                            "Promedio Litros": st.column_config.NumberColumn("Prom. L/Carga", format="%.2f"),
+                            "Cantidad Cargas": st.column_config.NumberColumn("# Cargas", format="%d"),
+                            "Malas Cargas": st.column_config.NumberColumn("Malas", format="%d"),
+                            "% Malas Cargas": st.column_config.NumberColumn("% Malas", format="%.2f%%"),
+                            "Sobreconsumos": st.column_config.NumberColumn("Sobre", format="%d"),
+                            "% Sobreconsumos": st.column_config.NumberColumn("% Sobre", format="%.2f%%"),
+                            "Índice Eficiencia": st.column_config.ProgressColumn("Eficiencia", format="%.2f", min_value=0, max_value=100),
+                            "Ranking": st.column_config.NumberColumn("Ranking", format="%d")
+                        },
+                        use_container_width=True
+                    )
+                
+                with tab3:
+                    # Terminal más eficiente
+                    mejor_terminal = terminal_stats.loc[terminal_stats['Índice Eficiencia'].idxmax()]
+                    
+                    st.markdown(f"""
+                    <div class="card">
+                        <h4>🏆 Terminal más Eficiente: {mejor_terminal['Terminal']}</h4>
+                        <p><strong>Índice de Eficiencia:</strong> {mejor_terminal['Índice Eficiencia']:.2f}/100</p>
+                        <p><strong>Características destacadas:</strong></p>
+                        <ul>
+                            <li>Promedio de litros por carga: {mejor_terminal['Promedio Litros']:.2f}</li>
+                            <li>Tasa de malas cargas: {mejor_terminal['% Malas Cargas']:.2f}%</li>
+                            <li>Tasa de sobreconsumos: {mejor_terminal['% Sobreconsumos']:.2f}%</li>
+                        </ul>
+                    </div>
+                    """, unsafe_allow_html=True)
+                    
+                    # Terminal menos eficiente
+                    peor_terminal = terminal_stats.loc[terminal_stats['Índice Eficiencia'].idxmin()]
+                    
+                    st.markdown(f"""
+                    <div class="card">
+                        <h4>⚠️ Terminal con Mayor Oportunidad de Mejora: {peor_terminal['Terminal']}</h4>
+                        <p><strong>Índice de Eficiencia:</strong> {peor_terminal['Índice Eficiencia']:.2f}/100</p>
+                        <p><strong>Áreas de oportunidad:</strong></p>
+                        <ul>
+                            <li>Promedio de litros por carga: {peor_terminal['Promedio Litros']:.2f}</li>
+                            <li>Tasa de malas cargas: {peor_terminal['% Malas Cargas']:.2f}%</li>
+                            <li>Tasa de sobreconsumos: {peor_terminal['% Sobreconsumos']:.2f}%</li>
+                        </ul>
+                        <p><strong>Recomendaciones:</strong></p>
+                        <ul>
+                            <li>Realizar capacitación al personal sobre procedimientos correctos de registro</li>
+                            <li>Revisar calibración de surtidores</li>
+                            <li>Implementar un sistema de supervisión más estricto</li>
+                        </ul>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                # Gráfico tipo radar para comparar terminales
+                st.markdown("<h3 class='section-title'>Comparativa Multidimensional</h3>", unsafe_allow_html=True)
+                
+                # Seleccionar terminales a comparar
+                terminales_comparar = st.multiselect(
+                    "Seleccionar terminales a comparar",
+                    options=terminal_stats['Terminal'].tolist(),
+                    default=terminal_stats.nlargest(3, 'Cantidad Cargas')['Terminal'].tolist()
+                )
+                
+                if terminales_comparar:
+                    # Filtrar datos para las terminales seleccionadas
+                    comparacion = terminal_stats[terminal_stats['Terminal'].isin(terminales_comparar)]
+                    
+                    # Normalizar valores para el gráfico radar
+                    for col in ['Promedio Litros', '% Malas Cargas', '% Sobreconsumos']:
+                        if col == 'Promedio Litros':
+                            # Para litros, menores valores son mejores (normalización inversa)
+                            min_val = comparacion[col].min()
+                            max_val = comparacion[col].max()
+                            if max_val > min_val:
+                                comparacion[f'{col} (Norm)'] = 1 - (comparacion[col] - min_val) / (max_val - min_val)
+                            else:
+                                comparacion[f'{col} (Norm)'] = 1
+                        else:
+                            # Para porcentajes de problemas, menores valores son mejores (normalización inversa)
+                            max_val = comparacion[col].max()
+                            if max_val > 0:
+                                comparacion[f'{col} (Norm)'] = 1 - comparacion[col] / max_val
+                            else:
+                                comparacion[f'{col} (Norm)'] = 1
+                    
+                    # Añadir el índice de eficiencia normalizado
+                    comparacion['Eficiencia (Norm)'] = comparacion['Índice Eficiencia'] / 100
+                    
+                    # Crear el gráfico radar
+                    fig = go.Figure()
+                    
+                    categories = ['Litros (Eficiencia)', 'Malas Cargas (Inverso)', 
+                                'Sobreconsumos (Inverso)', 'Índice Eficiencia']
+                    
+                    # Colores para cada terminal
+                    colors = px.colors.qualitative.Plotly[:len(comparacion)]
+                    
+                    for i, row in comparacion.iterrows():
+                        fig.add_trace(go.Scatterpolar(
+                            r=[row['Promedio Litros (Norm)'], row['% Malas Cargas (Norm)'], 
+                              row['% Sobreconsumos (Norm)'], row['Eficiencia (Norm)']],
+                            theta=categories,
+                            fill='toself',
+                            name=row['Terminal'],
+                            line_color=colors[i % len(colors)]
+                        ))
+                    
+                    fig.update_layout(
+                        polar=dict(
+                            radialaxis=dict(
+                                visible=True,
+                                range=[0, 1]
+                            )
+                        ),
+                        title="Comparativa Multidimensional entre Terminales",
+                        height=500
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                    
+                    # Explicación del gráfico
+                    st.markdown(f"""
+                    <div class="card">
+                        <h4>📊 Interpretación del Gráfico Radar</h4>
+                        <p>Este gráfico permite comparar múltiples dimensiones de desempeño entre terminales:</p>
+                        <ul>
+                            <li><strong>Litros (Eficiencia):</strong> Mayor valor indica menor consumo promedio por carga.</li>
+                            <li><strong>Malas Cargas (Inverso):</strong> Mayor valor indica menor porcentaje de malas cargas.</li>
+                            <li><strong>Sobreconsumos (Inverso):</strong> Mayor valor indica menor porcentaje de sobreconsumos.</li>
+                            <li><strong>Índice Eficiencia:</strong> Mayor valor indica mejor eficiencia general.</li>
+                        </ul>
+                        <p><em>Nota: Todos los valores están normalizados para permitir una comparación justa.</em></p>
+                    </div>
+                    """, unsafe_allow_html=True)
+        else:
+            # Análisis específico de la terminal seleccionada
+            st.markdown(f"<h3 class='section-title'>Análisis Detallado: Terminal {terminal_seleccionada}</h3>", unsafe_allow_html=True)
+            
+            # Evolución temporal del consumo
+            if 'Fecha' in df_terminal.columns and 'Cantidad litros' in df_terminal.columns:
+                st.markdown("<h4>Evolución Temporal</h4>", unsafe_allow_html=True)
+                
+                tab1, tab2 = st.tabs(["📊 Consumo Diario", "📈 Tendencia Acumulada"])
+                
+                with tab1:
+                    fig = plot_time_series(
+                        df_terminal, 
+                        'Cantidad litros', 
+                        f'Evolución del Consumo - Terminal {terminal_seleccionada}'
+                    )
+                    
+                    if fig:
+                        st.plotly_chart(fig, use_container_width=True)
+                
+                with tab2:
+                    # Gráfico de consumo acumulado
+                    consumo_diario = df_terminal.groupby(df_terminal['Fecha'].dt.date)['Cantidad litros'].sum().reset_index()
+                    consumo_diario['Consumo Acumulado'] = consumo_diario['Cantidad litros'].cumsum()
+                    
+                    fig = px.line(
+                        consumo_diario, 
+                        x='Fecha', 
+                        y='Consumo Acumulado',
+                        title=f'Consumo Acumulado - Terminal {terminal_seleccionada}',
+                        markers=True
+                    )
+                    
+                    fig.update_traces(
+                        line=dict(color=colors['primary'], width=3),
+                        marker=dict(color=colors['primary'], size=8)
+                    )
+                    
+                    fig.update_layout(
+                        xaxis_title="Fecha",
+                        yaxis_title="Litros Acumulados",
+                        plot_bgcolor='white',
+                        hovermode='x unified',
+                        height=400
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+            
+            # Distribución por hora y período
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown("<h4>Distribución por Hora</h4>", unsafe_allow_html=True)
+                
+                if 'Hora Numérica' in df_terminal.columns:
+                    # Agrupar por hora
+                    hora_stats = df_terminal.groupby(np.round(df_terminal['Hora Numérica']).astype(int)).size().reset_index()
+                    hora_stats.columns = ['Hora', 'Cargas']
+                    
+                    fig = px.bar(
+                        hora_stats,
+                        x='Hora',
+                        y='Cargas',
+                        title='Cargas por Hora del Día',
+                        color='Cargas',
+                       color_continuous_scale='Viridis',
+                        text='Cargas'
+                    )
+                    
+                    fig.update_traces(
+                        texttemplate='%{text}',
+                        textposition='outside'
+                    )
+                    
+                    fig.update_layout(
+                        xaxis_title="Hora del Día",
+                        yaxis_title="Cantidad de Cargas",
+                        plot_bgcolor='white'
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+            
+            with col2:
+                st.markdown("<h4>Distribución por Período</h4>", unsafe_allow_html=True)
+                
+                if 'Período' in df_terminal.columns:
+                    # Agrupar por período
+                    periodo_stats = df_terminal.groupby('Período', observed=True).size().reset_index()
+                    periodo_stats.columns = ['Período', 'Cargas']
+                    
+                    # Ordenar períodos
+                    orden_periodo = {'Madrugada': 0, 'Mañana': 1, 'Tarde': 2, 'Noche': 3}
+                    periodo_stats['Orden'] = periodo_stats['Período'].map(orden_periodo)
+                    periodo_stats = periodo_stats.sort_values('Orden')
+                    
+                    fig = px.pie(
+                        periodo_stats,
+                        names='Período',
+                        values='Cargas',
+                        title='Distribución por Período del Día',
+                        color_discrete_sequence=px.colors.sequential.Viridis
+                    )
+                    
+                    fig.update_layout(
+                        plot_bgcolor='white',
+                        legend=dict(
+                            orientation="h",
+                            yanchor="bottom",
+                            y=-0.2,
+                            xanchor="center",
+                            x=0.5
+                        )
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+            
+            # Análisis por modelo
+            if 'Modelo chasis' in df_terminal.columns and 'Cantidad litros' in df_terminal.columns:
+                st.markdown("<h4>Consumo por Modelo de Chasis</h4>", unsafe_allow_html=True)
+                
+                # Agrupar por modelo
+                modelo_stats = df_terminal.groupby('Modelo chasis').agg({
+                    'Cantidad litros': ['sum', 'mean', 'count'],
+                    'Sobreconsumo': 'sum' if 'Sobreconsumo' in df_terminal.columns else 'count'
+                }).reset_index()
+                
+                # Aplanar los nombres de columnas multiíndice
+                modelo_stats.columns = ['Modelo', 'Total Litros', 'Promedio Litros', 'Cantidad Cargas', 'Sobreconsumos']
+                
+                # Calcular porcentajes
+                modelo_stats['% Sobreconsumos'] = (modelo_stats['Sobreconsumos'] / modelo_stats['Cantidad Cargas'] * 100).round(2)
+                
+                # Ordenar por total litros
+                modelo_stats = modelo_stats.sort_values('Total Litros', ascending=False)
+                
+                # Mostrar gráfico y tabla en pestañas
+                tab1, tab2 = st.tabs(["📊 Gráfico", "📋 Tabla"])
+                
+                with tab1:
+                    fig = px.bar(
+                        modelo_stats.head(10),  # Top 10 modelos
+                        x='Modelo',
+                        y='Total Litros',
+                        title=f'Consumo por Modelo - Terminal {terminal_seleccionada}',
+                        color='Promedio Litros',
+                        color_continuous_scale='Viridis',
+                        text='Total Litros'
+                    )
+                    
+                    fig.update_traces(
+                        texttemplate='%{text:.0f}',
+                        textposition='outside'
+                    )
+                    
+                    fig.update_layout(
+                        xaxis_title="Modelo de Chasis",
+                        yaxis_title="Total Litros",
+                        plot_bgcolor='white'
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                
+                with tab2:
+                    # Mostrar tabla
+                    st.dataframe(
+                        modelo_stats,
+                        column_config={
+                            "Modelo": st.column_config.TextColumn("Modelo de Chasis"),
+                            "Total Litros": st.column_config.NumberColumn("Total Litros", format="%,.2f"),
+                            "Promedio Litros": st.column_config.NumberColumn("Promedio L/Carga", format="%.2f"),
+                            "Cantidad Cargas": st.column_config.NumberColumn("Cargas", format="%d"),
+                            "Sobreconsumos": st.column_config.NumberColumn("Sobrec.", format="%d"),
+                            "% Sobreconsumos": st.column_config.NumberColumn("% Sobre", format="%.2f%%")
+                        },
+                        use_container_width=True
+                    )
+            
+            # Mapa de calor por horario
+            st.markdown("<h4>Distribución de Cargas por Horario</h4>", unsafe_allow_html=True)
+            
+            if 'Hora Numérica' in df_terminal.columns and 'Día Semana' in df_terminal.columns:
+                fig = create_heatmap(df_terminal, title=f"Mapa de calor - Terminal {terminal_seleccionada}", aggfunc='count',
+                                     matriz=indice.heatmap(desde=fecha_inicio, hasta=fecha_fin, dimension='Terminal', valor=terminal_seleccionada))
+                if fig:
+                    st.plotly_chart(fig, use_container_width=True)
+            
+            # Análisis de malas cargas y sobreconsumos
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown("<h4>Malas Cargas</h4>", unsafe_allow_html=True)
+                
+                if 'Mala Carga' in df_terminal.columns:
+                    malas_cargas = df_terminal[df_terminal['Mala Carga'] == True]
+                    
+                    # Mostrar estadísticas
+                    porcentaje_malas = (len(malas_cargas) / len(df_terminal)) * 100 if len(df_terminal) > 0 else 0
+                    
+                    # Comparar con el promedio global
+                    global_pct = (df['Mala Carga'].sum() / len(df)) * 100 if len(df) > 0 else 0
+                    
+                    if porcentaje_malas > global_pct:
+                        st.markdown(show_alert(
+                            f"La terminal tiene un {porcentaje_malas:.2f}% de malas cargas, por encima del promedio global ({global_pct:.2f}%).",
+                            "warning",
+                            "Tasa de Malas Cargas Superior al Promedio",
+                            "⚠️"
+                        ), unsafe_allow_html=True)
+                    else:
+                        st.markdown(show_alert(
+                            f"La terminal tiene un {porcentaje_malas:.2f}% de malas cargas, por debajo del promedio global ({global_pct:.2f}%).",
+                            "success",
+                            "Buen Desempeño en Registro",
+                            "✅"
+                        ), unsafe_allow_html=True)
+                    
+                    # Mostrar tabla si hay malas cargas
+                    if not malas_cargas.empty:
+                        st.markdown("##### Últimas Malas Cargas")
+                        
+                        cols_relevantes = [col for col in [
+                            'Fecha', 'Hora', 'Número interno', 'Patente', 
+                            'Cantidad litros', 'Nombre Planillero'
+                        ] if col in malas_cargas.columns]
+                        
+                        st.dataframe(
+                            formatear_horas(malas_cargas[cols_relevantes].sort_values('Fecha', ascending=False).head(5)),
+                            use_container_width=True
+                        )
+            
+            with col2:
+                st.markdown("<h4>Sobreconsumos</h4>", unsafe_allow_html=True)
+                
+                if 'Sobreconsumo' in df_terminal.columns:
+                    sobreconsumos = df_terminal[df_terminal['Sobreconsumo'] == True]
+                    
+                    # Mostrar estadísticas
+                    porcentaje_sobre = (len(sobreconsumos) / len(df_terminal)) * 100 if len(df_terminal) > 0 else 0
+                    
+                    # Comparar con el promedio global
+                    global_pct = (df['Sobreconsumo'].sum() / len(df)) * 100 if len(df) > 0 else 0
+                    
+                    if porcentaje_sobre > global_pct:
+                        st.markdown(show_alert(
+                            f"La terminal tiene un {porcentaje_sobre:.2f}% de sobreconsumos, por encima del promedio global ({global_pct:.2f}%).",
+                            "warning",
+                            "Tasa de Sobreconsumo Superior al Promedio",
+                            "⚠️"
+                        ), unsafe_allow_html=True)
+                    else:
+                        st.markdown(show_alert(
+                            f"La terminal tiene un {porcentaje_sobre:.2f}% de sobreconsumos, por debajo del promedio global ({global_pct:.2f}%).",
+                            "success",
+                            "Buen Desempeño en Eficiencia",
+                            "✅"
+                        ), unsafe_allow_html=True)
+                    
+                    # Mostrar tabla si hay sobreconsumos
+                    if not sobreconsumos.empty:
+                        st.markdown("##### Últimos Sobreconsumos")
+                        
+                        cols_relevantes = [col for col in [
+                            'Fecha', 'Hora', 'Número interno', 'Modelo chasis',
+                            'Cantidad litros', 'Z-Score'
+                        ] if col in sobreconsumos.columns]
+                        
+                        st.dataframe(
+                            formatear_horas(sobreconsumos[cols_relevantes].sort_values('Z-Score', ascending=False).head(5)),
+                            use_container_width=True
+                        )
+            
+            # Tabla detallada de datos
+            with st.expander("Datos Detallados", expanded=False):
+                # Columnas relevantes para mostrar
+                cols_relevantes = [col for col in [
+                    'Fecha', 'Hora', 'Número interno', 'Patente', 'Modelo chasis',
+                    'Cantidad litros', 'Nombre conductor', 'Nombre Planillero',
+                    'Mala Carga', 'Sobreconsumo'
+                ] if col in df_terminal.columns]
+                
+                # Mostrar datos
+                st.dataframe(
+                    formatear_horas(df_terminal[cols_relevantes].sort_values('Fecha', ascending=False)),
+                    use_container_width=True,
+                    height=400
+                )
+    else:
+        st.warning("No se encontró la columna 'Terminal' en los datos.")
@@ -0,0 +1,818 @@
+"""
+Temas de color y estilos CSS de la aplicación.
+"""
+from functools import lru_cache
+
+import streamlit as st
+
+
+# Definición de temas de color y estilos principales
+THEMES = {
+    'modern': {
+        'primary': '#4361EE',
+        'secondary': '#3A0CA3',
+        'accent': '#F72585',
+        'success': '#4CC9F0',
+        'info': '#4895EF',
+        'warning': '#F8961E',
+        'danger': '#F94144',
+        'light': '#F8F9FA',
+        'dark': '#212529',
+        'background': '#F8F9FA',
+        'card': '#FFFFFF',
+        'text': '#212529',
+        'subtext': '#6C757D',
+        'border': '#DEE2E6',
+        'heat_1': '#F94144',
+        'heat_2': '#F8961E',
+        'heat_3': '#F9C74F',
+        'heat_4': '#90BE6D',
+        'heat_5': '#43AA8B',
+        'gradient_start': 'rgba(67, 97, 238, 0.8)',
+        'gradient_end': 'rgba(58, 12, 163, 0.6)',
+    },
+    'dark': {
+        'primary': '#BB86FC',
+        'secondary': '#3700B3',
+        'accent': '#03DAC6',
+        'success': '#00E676',
+        'info': '#2196F3',
+        'warning': '#FB8C00',
+        'danger': '#CF6679',
+        'light': '#BBBBBB',
+        'dark': '#121212',
+        'background': '#121212',
+        'card': '#1E1E1E',
+        'text': '#E1E1E1',
+        'subtext': '#BBBBBB',
+        'border': '#333333',
+        'heat_1': '#CF6679',
+        'heat_2': '#FB8C00',
+        'heat_3': '#FFAB00',
+        'heat_4': '#64DD17',
+        'heat_5': '#00B0FF',
+        'gradient_start': 'rgba(187, 134, 252, 0.8)',
+        'gradient_end': 'rgba(55, 0, 179, 0.6)',
+    },
+    'corporate': {
+        'primary': '#0A66C2',
+        'secondary': '#2867B2',
+        'accent': '#E68523',
+        'success': '#0AB94E',
+        'info': '#2493DF',
+        'warning': '#F5B700',
+        'danger': '#E11D48',
+        'light': '#F9FAFB',
+        'dark': '#111827',
+        'background': '#F9FAFB',
+        'card': '#FFFFFF',
+        'text': '#1F2937',
+        'subtext': '#6B7280',
+        'border': '#E5E7EB',
+        'heat_1': '#E11D48',
+        'heat_2': '#F59E0B',
+        'heat_3': '#F5B700',
+        'heat_4': '#10B981',
+        'heat_5': '#0AB94E',
+        'gradient_start': 'rgba(10, 102, 194, 0.8)',
+        'gradient_end': 'rgba(40, 103, 178, 0.6)',
+    }
+}
+
+# Selección del tema predeterminado
+DEFAULT_THEME = 'modern'
+
+# Colores del tema elegido en la sesión
+def get_colors():
+    return THEMES[st.session_state.get('theme', DEFAULT_THEME)]
+
+# Estilos CSS personalizados avanzados (el texto de cada tema se arma una sola vez por proceso)
+@lru_cache(maxsize=None)
+def load_css(theme):
+    colors = THEMES[theme]
+    return f"""
+<style>
+
+     @keyframes fadeIn {{
+        from {{ opacity: 0; transform: translateY(10px); }}
+        to {{ opacity: 1; transform: translateY(0); }}
+    }}
+    
+    @keyframes pulse {{
+        0% {{ transform: scale(1); }}  <!-- ERROR: Debe ser }} al final -->
+        50% {{ transform: scale(1.05); }}
+        100% {{ transform: scale(1); }}
+    }}
+
+
+
+    /* Estilos generales */
+    html {{
+        font-family: 'SF Pro Display', 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen-Sans, Ubuntu, Cantarell, 'Helvetica Neue', sans-serif;
+    }}
+    
+    .reportview-container .main .block-container {{
+        padding-top: 1rem;
+        padding-right: 1rem;
+        padding-left: 1rem;
+        padding-bottom: 1rem;
+        max-width: 1200px;
+    }}
+    
+    .reportview-container .main {{
+        color: {colors['text']};
+        background-color: {colors['background']};
+    }}
+    
+
+    css = css.replace("{colors['text']}", colors['text'])
+    css = css.replace("{colors['background']}", colors['background'])
+    
+    /* Scrollbar personalizado */
+    ::-webkit-scrollbar {{
+        width: 10px;
+        height: 10px;
+    }}
+    
+    ::-webkit-scrollbar-track {{
+        background: {colors['background']};
+        border-radius: 5px;
+    }}
+    
+    ::-webkit-scrollbar-thumb {{
+        background-color: {colors['primary']};
+        border-radius: 5px;
+        border: 2px solid {colors['background']};
+    }}
+    
+    ::-webkit-scrollbar-thumb:hover {{
+        background-color: {colors['secondary']};
+    }}
+    
+    /* Títulos */
+    h1, h2, h3, h4, h5, h6 {{
+        font-family: 'SF Pro Display', 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
+        font-weight: 600;
+    }}
+    
+    .title {{
+        font-size: 2.75rem;
+        background: linear-gradient(90deg, {colors['primary']} 0%, {colors['secondary']} 100%);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        background-clip: text;
+        margin-bottom: 1.5rem;
+        text-align: center;
+        font-weight: 800;
+        letter-spacing: -0.5px;
+        line-height: 1.2;
+    }}
+    
+    .subtitle {{
+        font-size: 1.8rem;
+        margin-top: 2rem;
+        margin-bottom: 1.5rem;
+        color: {colors['secondary']};
+        padding-bottom: 0.75rem;
+        position: relative;
+        font-weight: 700;
+    }}
+    
+    .subtitle::after {{
+        content: '';
+        position: absolute;
+        left: 0;
+        bottom: 0;
+        height: 4px;
+        width: 80px;
+        background: linear-gradient(90deg, {colors['primary']} 0%, {colors['secondary']} 100%);
+        border-radius: 2px;
+    }}
+    
+    .section-title {{
+        font-size: 1.5rem;
+        font-weight: 600;
+        color: {colors['secondary']};
+        margin-top: 1.75rem;
+        margin-bottom: 1.25rem;
+        display: flex;
+        align-items: center;
+    }}
+    
+    .section-title::before {{
+        content: '';
+        display: inline-block;
+        width: 18px;
+        height: 18px;
+        background-color: {colors['primary']};
+        margin-right: 10px;
+        border-radius: 4px;
+    }}
+    
+    /* Cards modernas */
+    .card {{
+        background-color: {colors['card']};
+        border-radius: 16px;
+        box-shadow: 0 10px 25px rgba(0, 0, 0, 0.05);
+        padding: 1.75rem;
+        margin-bottom: 1.75rem;
+        transition: all 0.3s cubic-bezier(0.25, 0.8, 0.25, 1);
+        border: 1px solid {colors['border']};
+        overflow: hidden;
+        position: relative;
+    }}
+    
+    .card::before {{
+        content: '';
+        position: absolute;
+        top: 0;
+        left: 0;
+        width: 100%;
+        height: 4px;
+        background: linear-gradient(90deg, {colors['primary']} 0%, {colors['secondary']} 100%);
+    }}
+    
+    .card:hover {{
+        transform: translateY(-5px);
+        box-shadow: 0 15px 30px rgba(0, 0, 0, 0.1);
+    }}
+    
+    /* Métricas modernas */
+    .metric-container {{
+        display: flex;
+        flex-direction: column;
+        align-items: center;
+        justify-content: center;
+        text-align: center;
+        padding: 1.5rem;
+        border-radius: 16px;
+        background-color: {colors['card']};
+        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.05);
+        height: 100%;
+        transition: all 0.3s cubic-bezier(0.25, 0.8, 0.25, 1);
+        border: 1px solid {colors['border']};
+        position: relative;
+        overflow: hidden;
+    }}
+    
+    .metric-container::before {{
+        content: '';
+        position: absolute;
+        top: 0;
+        left: 0;
+        width: 4px;
+        height: 100%;
+        background: linear-gradient(180deg, {colors['primary']} 0%, {colors['secondary']} 100%);
+    }}
+    
+    .metric-container:hover {{
+        transform: translateY(-5px);
+        box-shadow: 0 10px 20px rgba(0, 0, 0, 0.08);
+    }}
+    
+    .metric-value {{
+        font-size: 2.75rem;
+        font-weight: 700;
+        background: linear-gradient(90deg, {colors['primary']} 0%, {colors['secondary']} 100%);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        background-clip: text;
+        margin-bottom: 0.5rem;
+        line-height: 1.1;
+    }}
+    
+    .metric-label {{
+        font-size: 1rem;
+        color: {colors['subtext']};
+        margin-bottom: 0.5rem;
+        font-weight: 500;
+    }}
+    
+    .metric-delta {{
+        font-size: 0.9rem;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        font-weight: 500;
+    }}
+    
+    .delta-up {{
+        color: {colors['success']};
+    }}
+    
+    .delta-down {{
+        color: {colors['danger']};
+    }}
+    
+    /* Alertas modernas */
+    .alert {{
+        border-radius: 12px;
+        padding: 1.25rem;
+        margin-bottom: 1.25rem;
+        border-left: 5px solid;
+        display: flex;
+        align-items: flex-start;
+        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.05);
+    }}
+    
+    .alert-icon {{
+        font-size: 1.5rem;
+        margin-right: 1rem;
+    }}
+    
+    .alert-content {{
+        flex: 1;
+    }}
+    
+    .alert-danger {{
+        background-color: rgba({int(colors['danger'][1:3], 16)}, {int(colors['danger'][3:5], 16)}, {int(colors['danger'][5:7], 16)}, 0.1);
+        border-left-color: {colors['danger']};
+    }}
+    
+    .alert-warning {{
+        background-color: rgba({int(colors['warning'][1:3], 16)}, {int(colors['warning'][3:5], 16)}, {int(colors['warning'][5:7], 16)}, 0.1);
+        border-left-color: {colors['warning']};
+    }}
+    
+    .alert-info {{
+        background-color: rgba({int(colors['info'][1:3], 16)}, {int(colors['info'][3:5], 16)}, {int(colors['info'][5:7], 16)}, 0.1);
+        border-left-color: {colors['info']};
+    }}
+    
+    .alert-success {{
+        background-color: rgba({int(colors['success'][1:3], 16)}, {int(colors['success'][3:5], 16)}, {int(colors['success'][5:7], 16)}, 0.1);
+        border-left-color: {colors['success']};
+    }}
+    
+    /* Botones modernos */
+    .primary-button {{
+        background: linear-gradient(90deg, {colors['primary']} 0%, {colors['secondary']} 100%);
+        color: white;
+        border: none;
+        border-radius: 12px;
+        padding: 0.85rem 1.75rem;
+        font-size: 1rem;
+        font-weight: 600;
+        cursor: pointer;
+        transition: all 0.3s ease;
+        display: inline-block;
+        text-align: center;
+        text-decoration: none;
+        margin: 0.75rem 0;
+        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.1);
+    }}
+    
+    .primary-button:hover {{
+        transform: translateY(-2px);
+        box-shadow: 0 7px 20px rgba(0, 0, 0, 0.2);
+    }}
+    
+    /* Tablas modernas */
+    .table-container {{
+        border-radius: 12px;
+        overflow: hidden;
+        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.05);
+        margin-bottom: 1.5rem;
+    }}
+    
+    .dataframe {{
+        width: 100%;
+        border-collapse: collapse;
+    }}
+    
+    .dataframe th {{
+        background: linear-gradient(90deg, {colors['primary']} 0%, {colors['secondary']} 100%);
+        color: white;
+        text-align: left;
+        padding: 14px 20px;
+        font-weight: 600;
+        font-size: 0.9rem;
+        letter-spacing: 0.5px;
+        text-transform: uppercase;
+    }}
+    
+    .dataframe td {{
+        padding: 12px 20px;
+        border-bottom: 1px solid {colors['border']};
+        font-size: 0.95rem;
+    }}
+    
+    .dataframe tr:nth-child(even) {{
+        background-color: rgba(0, 0, 0, 0.02);
+    }}
+    
+    .dataframe tr:hover {{
+        background-color: rgba(0, 0, 0, 0.05);
+    }}
+    
+    /* Heat Map Styling */
+    .heat-cell {{
+        padding: 10px;
+        border-radius: 8px;
+        font-weight: 500;
+        text-align: center;
+    }}
+    
+    .heat-1 {{ background-color: {colors['heat_1']}; color: white; }}
+    .heat-2 {{ background-color: {colors['heat_2']}; color: white; }}
+    .heat-3 {{ background-color: {colors['heat_3']}; color: black; }}
+    .heat-4 {{ background-color: {colors['heat_4']}; color: black; }}
+    .heat-5 {{ background-color: {colors['heat_5']}; color: black; }}
+    
+    /* Animaciones y efectos visuales */
+    @keyframes fadeIn {{
+        from {{ opacity: 0; transform: translateY(10px); }}
+        to {{ opacity: 1; transform: translateY(0); }}
+    }}
+    
+    .fade-in {{
+        animation: fadeIn 0.6s ease-out;
+    }}
+    
+   @keyframes pulse {{
+    0% {{ transform: scale(1); }}
+    50% {{ transform: scale(1.05); }}
+    100% {{ transform: scale(1); }}
+}}
+    
+    .pulse {{
+        animation: pulse 2s infinite;
+    }}
+    
+    /* Tarjetas de dashboard */
+    .dashboard-card {{
+        background: white;
+        border-radius: 16px;
+        padding: 1.5rem;
+        box-shadow: 0 8px 20px rgba(0, 0, 0, 0.1);
+        transition: all 0.3s ease;
+        height: 100%;
+        display: flex;
+        flex-direction: column;
+        position: relative;
+        overflow: hidden;
+    }}
+    
+    .dashboard-card::after {{
+        content: '';
+        position: absolute;
+        bottom: 0;
+        left: 0;
+        width: 100%;
+        height: 4px;
+        background: linear-gradient(90deg, {colors['primary']} 0%, {colors['secondary']} 100%);
+        transform: scaleX(0);
+        transform-origin: left;
+        transition: transform 0.3s ease;
+    }}
+    
+    .dashboard-card:hover {{
+        transform: translateY(-5px);
+        box-shadow: 0 15px 30px rgba(0, 0, 0, 0.15);
+    }}
+    
+    .dashboard-card:hover::after {{
+        transform: scaleX(1);
+    }}
+    
+    .dashboard-card-header {{
+        margin-bottom: 1rem;
+        padding-bottom: 1rem;
+        border-bottom: 1px solid {colors['border']};
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+    }}
+    
+    .dashboard-card-title {{
+        font-size: 1.2rem;
+        font-weight: 600;
+        color: {colors['secondary']};
+        margin: 0;
+    }}
+    
+    .dashboard-card-icon {{
+        font-size: 1.5rem;
+        color: {colors['primary']};
+    }}
+    
+    .dashboard-card-content {{
+        flex: 1;
+        display: flex;
+        flex-direction: column;
+        justify-content: center;
+    }}
+    
+    .dashboard-card-footer {{
+        margin-top: 1rem;
+        padding-top: 1rem;
+        border-top: 1px solid {colors['border']};
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+        font-size: 0.85rem;
+        color: {colors['subtext']};
+    }}
+    
+    /* Personalización de plotly */
+    .js-plotly-plot .plotly .modebar {{
+        opacity: 0.2;
+    }}
+    
+    .js-plotly-plot .plotly .modebar:hover {{
+        opacity: 1;
+    }}
+    
+    /* Badges */
+    .badge {{
+        display: inline-block;
+        padding: 0.35em 0.65em;
+        font-size: 0.75em;
+        font-weight: 700;
+        line-height: 1;
+        text-align: center;
+        white-space: nowrap;
+        vertical-align: baseline;
+        border-radius: 0.375rem;
+    }}
+    
+    .badge-primary {{ background-color: {colors['primary']}; color: white; }}
+    .badge-secondary {{ background-color: {colors['secondary']}; color: white; }}
+    .badge-success {{ background-color: {colors['success']}; color: white; }}
+    .badge-danger {{ background-color: {colors['danger']}; color: white; }}
+    .badge-warning {{ background-color: {colors['warning']}; color: black; }}
+    .badge-info {{ background-color: {colors['info']}; color: white; }}
+    
+    /* Progress bar */
+    .progress {{
+        height: 0.75rem;
+        background-color: rgba(0, 0, 0, 0.1);
+        border-radius: 0.375rem;
+        margin: 0.5rem 0;
+        overflow: hidden;
+    }}
+    
+    .progress-bar {{
+        height: 100%;
+        border-radius: 0.375rem;
+        transition: width 0.6s ease;
+    }}
+    
+    .progress-bar-success {{ background-color: {colors['success']}; }}
+    .progress-bar-warning {{ background-color: {colors['warning']}; }}
+    .progress-bar-danger {{ background-color: {colors['danger']}; }}
+    
+    /* Tooltips */
+    .tooltip {{
+        position: relative;
+        display: inline-block;
+        cursor: pointer;
+    }}
+    
+    .tooltip .tooltiptext {{
+        visibility: hidden;
+        width: 200px;
+        background-color: {colors['dark']};
+        color: white;
+        text-align: center;
+        border-radius: 6px;
+        padding: 10px;
+        position: absolute;
+        z-index: 1;
+        bottom: 125%;
+        left: 50%;
+        transform: translateX(-50%);
+        opacity: 0;
+        transition: opacity 0.3s;
+        box-shadow: 0 5px 15px rgba(0, 0, 0, 0.2);
+        font-size: 0.85rem;
+    }}
+    
+    .tooltip:hover .tooltiptext {{
+        visibility: visible;
+        opacity: 1;
+    }}
+    
+    /* Banner elegante */
+    .banner {{
+        background: linear-gradient(135deg, {colors['gradient_start']}, {colors['gradient_end']}),
+                    url('https://images.unsplash.com/photo-1553708881-112abc53fe54?ixlib=rb-1.2.1&auto=format&fit=crop&w=1350&q=80');
+        background-size: cover;
+        background-position: center;
+        background-blend-mode: overlay;
+        color: white;
+        padding: 3rem 2rem;
+        margin-bottom: 2rem;
+        border-radius: 16px;
+        box-shadow: 0 10px 30px rgba(0, 0, 0, 0.1);
+    }}
+    
+    .banner-content {{
+        max-width: 600px;
+    }}
+    
+    .banner-title {{
+        font-size: 2.5rem;
+        font-weight: 800;
+        margin-bottom: 1rem;
+        text-shadow: 0 2px 4px rgba(0, 0, 0, 0.2);
+    }}
+    
+    .banner-subtitle {{
+        font-size: 1.2rem;
+        font-weight: 400;
+        margin-bottom: 1.5rem;
+        opacity: 0.9;
+    }}
+    
+    /* Mini stats */
+    .mini-stat {{
+        display: flex;
+        align-items: center;
+        margin-bottom: 1rem;
+    }}
+    
+    .mini-stat-icon {{
+        width: 40px;
+        height: 40px;
+        border-radius: 12px;
+        background: linear-gradient(135deg, {colors['primary']}, {colors['secondary']});
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        margin-right: 1rem;
+        color: white;
+        font-size: 1.5rem;
+    }}
+    
+    .mini-stat-content {{
+        flex: 1;
+    }}
+    
+    .mini-stat-value {{
+        font-size: 1.25rem;
+        font-weight: 700;
+        color: {colors['text']};
+        margin: 0;
+    }}
+    
+    .mini-stat-label {{
+        font-size: 0.85rem;
+        color: {colors['subtext']};
+        margin: 0;
+    }}
+    
+    /* Loading spinner with better animation */
+    .loading {{
+        display: flex;
+        justify-content: center;
+        align-items: center;
+        height: 200px;
+    }}
+    
+    .loading-spinner {{
+        width: 40px;
+        height: 40px;
+        border: 4px solid rgba(0, 0, 0, 0.1);
+        border-left-color: {colors['primary']};
+        border-radius: 50%;
+        animation: spin 1s linear infinite;
+    }}
+    
+    @keyframes spin {{
+        to {{ transform: rotate(360deg); }}
+    }}
+    
+    /* KPI Cards */
+    .kpi-card {{
+        background-color: {colors['card']};
+        border-radius: 16px;
+        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.08);
+        padding: 1.5rem;
+        transition: all 0.3s ease;
+        height: 100%;
+        position: relative;
+        display: flex;
+        flex-direction: column;
+    }}
+    
+    .kpi-card:hover {{
+        transform: translateY(-5px);
+        box-shadow: 0 10px 25px rgba(0, 0, 0, 0.12);
+    }}
+    
+    .kpi-card-header {{
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+        margin-bottom: 1rem;
+    }}
+    
+    .kpi-card-title {{
+        font-size: 1rem;
+        font-weight: 600;
+        color: {colors['subtext']};
+        margin: 0;
+    }}
+    
+    .kpi-card-icon {{
+        width: 40px;
+        height: 40px;
+        border-radius: 10px;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        font-size: 1.25rem;
+    }}
+    
+    .kpi-card-icon.success {{ background-color: rgba({int(colors['success'][1:3], 16)}, {int(colors['success'][3:5], 16)}, {int(colors['success'][5:7], 16)}, 0.1); color: {colors['success']}; }}
+    .kpi-card-icon.warning {{ background-color: rgba({int(colors['warning'][1:3], 16)}, {int(colors['warning'][3:5], 16)}, {int(colors['warning'][5:7], 16)}, 0.1); color: {colors['warning']}; }}
+    .kpi-card-icon.danger {{ background-color: rgba({int(colors['danger'][1:3], 16)}, {int(colors['danger'][3:5], 16)}, {int(colors['danger'][5:7], 16)}, 0.1); color: {colors['danger']}; }}
+    .kpi-card-icon.info {{ background-color: rgba({int(colors['info'][1:3], 16)}, {int(colors['info'][3:5], 16)}, {int(colors['info'][5:7], 16)}, 0.1); color: {colors['info']}; }}
+    .kpi-card-icon.primary {{ background-color: rgba({int(colors['primary'][1:3], 16)}, {int(colors['primary'][3:5], 16)}, {int(colors['primary'][5:7], 16)}, 0.1); color: {colors['primary']}; }}
+    
+    .kpi-card-value {{
+        font-size: 2.25rem;
+        font-weight: 700;
+        color: {colors['text']};
+        margin: 0.5rem 0;
+    }}
+    
+    .kpi-card-delta {{
+        display: flex;
+        align-items: center;
+        font-size: 0.85rem;
+        font-weight: 500;
+        margin-bottom: 0.5rem;
+    }}
+    
+    .kpi-card-delta.positive {{ color: {colors['success']}; }}
+    .kpi-card-delta.negative {{ color: {colors['danger']}; }}
+    
+    .kpi-card-footer {{
+        margin-top: auto;
+        font-size: 0.85rem;
+        color: {colors['subtext']};
+        padding-top: 0.75rem;
+        border-top: 1px solid {colors['border']};
+    }}
+    
+    /* New style for sidebar */
+    .css-1d391kg, .css-163ttbj, .css-1wrcr25 {{ /* Sidebar background classes */
+        background-image: linear-gradient(180deg, {colors['gradient_start']}, {colors['gradient_end']});
+    }}
+    
+    /* Responsividad avanzada */
+    @media (max-width: 768px) {{
+        .metric-value {{
+            font-size: 2rem;
+        }}
+        
+        .title {{
+            font-size: 2rem;
+        }}
+        
+        .subtitle {{
+            font-size: 1.5rem;
+        }}
+        
+        .banner {{
+            padding: 2rem 1.5rem;
+        }}
+        
+        .banner-title {{
+            font-size: 2rem;
+        }}
+        
+        .dashboard-card {{
+            margin-bottom: 1rem;
+        }}
+    }}
+    
+    @media (max-width: 576px) {{
+        .metric-value {{
+            font-size: 1.75rem;
+        }}
+        
+        .title {{
+            font-size: 1.75rem;
+        }}
+        
+        .subtitle {{
+            font-size: 1.25rem;
+        }}
+        
+        .banner {{
+            padding: 1.5rem 1rem;
+        }}
+        
+        .banner-title {{
+            font-size: 1.5rem;
+        }}
+    }}
+</style>
+"""
+
+# Aplicar los estilos del tema de la sesión
+def apply_css():
+    st.markdown(load_css(st.session_state.get('theme', DEFAULT_THEME)), unsafe_allow_html=True)
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from combustible.binning import CONDUCTOR, EFICIENCIA, LLENADO, PLANILLERO, SEVERIDAD, USO_BUS, BinTable, categorize
+
+
+def _por_tramos(limites, etiquetas):
+    # Clasificación registro a registro del análisis original: ``valor < límite``
+    def clasificar(valor):
+        if pd.isna(valor):
+            return None
+        for limite, etiqueta in zip(limites, etiquetas):
+            if valor < limite:
+                return etiqueta
+        return etiquetas[-1]
+    return clasificar
+
+
+def _severidad(z):
+    # categorizar_severidad original: ``z <= límite``; NaN cae en el último tramo
+    if z <= 2.5:
+        return "Leve (2-2.5σ)"
+    elif z <= 3:
+        return "Moderado (2.5-3σ)"
+    elif z <= 4:
+        return "Alto (3-4σ)"
+    return "Extremo (>4σ)"
+
+
+ORIGINALES = [
+    (EFICIENCIA, _por_tramos((-15, -5, 5, 15), ('Baja', 'Regular', 'Normal', 'Buena', 'Excelente'))),
+    (LLENADO, _por_tramos((25, 50, 75, 90), ('Muy Bajo', 'Bajo', 'Medio', 'Alto', 'Completo'))),
+    (CONDUCTOR, _por_tramos((2, 5, 10), ('Excelente', 'Bueno', 'Regular', 'Atención Requerida'))),
+    (PLANILLERO, _por_tramos((1, 3, 7), ('Excelente', 'Bueno', 'Regular', 'Atención Requerida'))),
+    (USO_BUS, _por_tramos((15, 30), ('Bajo Uso', 'Uso Medio', 'Alto Uso'))),
+    (SEVERIDAD, _severidad),
+]
+
+
+def _valores(tabla):
+    # Los límites exactos, sus vecinos, extremos y NaN
+    limites = np.asarray(tabla.edges, dtype=float)
+    return pd.Series(np.concatenate([limites, limites - 1e-9, limites + 1e-9, [-np.inf, np.inf, np.nan, -1e6, 1e6]]),
+                     index=np.arange(100, 100 + 3 * len(limites) + 5))
+
+
+@pytest.mark.parametrize('tabla, original', ORIGINALES)
+def test_categorize_igual_a_la_clasificacion_original(tabla, original):
+    valores = _valores(tabla)
+    esperado = [original(valor) for valor in valores]
+
+    texto = categorize(valores, tabla, categorical=False)
+    assert texto.index.equals(valores.index)
+    assert texto.tolist() == esperado
+
+    categorica = categorize(valores, tabla)
+    assert list(categorica.cat.categories) == list(tabla.labels)
+    assert categorica.astype(object).where(categorica.notna(), None).tolist() == esperado
+
+
+def test_categorize_right_y_missing():
+    # (a, b]: el límite queda en el tramo inferior; NaN toma la etiqueta ``missing``
+    tabla = BinTable((0, 10), ('bajo', 'medio', 'alto'), right=True, missing='medio')
+    resultado = categorize(np.array([0.0, 10.0, 10.5, np.nan]), tabla, categorical=False)
+    assert resultado.tolist() == ['bajo', 'medio', 'alto', 'medio']
+
+    # [a, b): el límite queda en el tramo superior; NaN queda sin categoría
+    izquierda = BinTable((0, 10), ('bajo', 'medio', 'alto'))
+    assert categorize(np.array([0.0, 10.0, np.nan]), izquierda, categorical=False).tolist() == ['medio', 'alto', None]
@@ -0,0 +1,84 @@
+import os
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from combustible import PIPELINE_VERSION, DatasetCache, ProcessingOptions, process_file
+from combustible.cache import content_hash, sources_hash
+from combustible.synthetic import generate_fleet_data, write_export
+
+
+def test_content_hash_igual_para_ruta_y_archivo(tmp_path):
+    ruta = tmp_path / 'cargas.csv'
+    ruta.write_bytes(b'Fecha;Hora\n01/01/2024;06:00\n')
+    archivo = BytesIO(ruta.read_bytes())
+
+    assert content_hash(str(ruta)) == content_hash(archivo)
+    assert archivo.tell() == 0
+    assert sources_hash([str(ruta)]) == content_hash(str(ruta))
+    # El orden de las fuentes es parte de la clave
+    otro = BytesIO(b'otro')
+    assert sources_hash([archivo, otro]) != sources_hash([otro, archivo])
+
+
+def test_key_distingue_version_y_poda():
+    claves = {DatasetCache.key('abc', '8'), DatasetCache.key('abc', '9'), DatasetCache.key('abc', '8', prune_columns=False)}
+    assert len(claves) == 3
+
+
+def test_put_y_get(tmp_path):
+    cache = DatasetCache(str(tmp_path))
+    df = pd.DataFrame({'Fecha': pd.to_datetime(['2024-01-01', None]), 'Litros': [1.5, np.nan],
+                       'Terminal': pd.Categorical(['EL ROBLE', 'LA REINA'])})
+    assert cache.get('clave') is None
+
+    cache.put('clave', df, {'kpis': {'total': 1.5}})
+    leido, extra = cache.get('clave')
+    pd.testing.assert_frame_equal(leido, df)
+    assert extra == {'kpis': {'total': 1.5}}
+
+
+def test_entrada_corrupta_se_descarta(tmp_path):
+    cache = DatasetCache(str(tmp_path))
+    cache.put('clave', pd.DataFrame({'a': [1]}), {})
+    (tmp_path / 'clave.pkl').write_bytes(b'roto')
+
+    assert cache.get('clave') is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_evict_elimina_las_entradas_menos_usadas(tmp_path):
+    cache = DatasetCache(str(tmp_path), max_bytes=10**9)
+    df = pd.DataFrame({'a': np.arange(50_000)})
+    for i, clave in enumerate(['vieja', 'usada', 'nueva']):
+        cache.put(clave, df, {})
+        for archivo in os.listdir(tmp_path):
+            if archivo.startswith(clave):
+                os.utime(tmp_path / archivo, (1000 + i, 1000 + i))
+    cache.get('vieja')
+
+    tamano = sum(os.path.getsize(tmp_path / archivo) for archivo in os.listdir(tmp_path))
+    cache.max_bytes = tamano * 2 // 3 + 1
+    cache.evict()
+    assert sorted(os.listdir(tmp_path)) == ['nueva.parquet', 'nueva.pkl', 'vieja.parquet', 'vieja.pkl']
+
+
+def test_resultado_desde_la_cache_igual_al_procesado(tmp_path):
+    ruta = str(tmp_path / 'flota.csv')
+    write_export(generate_fleet_data(rows=1500, buses=20, days=60, seed=4), ruta)
+    opciones = ProcessingOptions(cache=DatasetCache(str(tmp_path / 'cache')), detectors=None, profile_log=None)
+
+    procesado = process_file(ruta, options=opciones)
+    cacheado = process_file(ruta, options=opciones)
+    assert [etapa.name for etapa in cacheado.diagnostics.profile.stages] == ['cache']
+    pd.testing.assert_frame_equal(cacheado.df, procesado.df)
+    assert cacheado.kpis.keys() == procesado.kpis.keys()
+
+    # Sin poda de columnas es otra entrada
+    completo = process_file(ruta, options=ProcessingOptions(
+        cache=opciones.cache, detectors=None, profile_log=None, prune_columns=False))
+    assert 'lectura' in [etapa.name for etapa in completo.diagnostics.profile.stages]
+    assert len(os.listdir(opciones.cache.directory)) == 4
+    assert any(PIPELINE_VERSION in archivo for archivo in os.listdir(opciones.cache.directory))
@@ -0,0 +1,67 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from combustible import ProcessingOptions, process_file, process_file_chunked
+from combustible.chunked import DIRECTORIO_CUBO
+from combustible.cube import DailyCube
+from combustible.synthetic import generate_fleet_data, write_export
+
+OPCIONES = ProcessingOptions(cache=None, detectors=None, profile_log=None)
+
+
+@pytest.fixture(scope='module')
+def exportacion(tmp_path_factory):
+    ruta = tmp_path_factory.mktemp('flota') / 'flota.csv'
+    write_export(generate_fleet_data(rows=6000, buses=60, days=100, seed=1), str(ruta))
+    return str(ruta)
+
+
+@pytest.fixture(scope='module')
+def resultados(exportacion, tmp_path_factory):
+    salida = tmp_path_factory.mktemp('bloques') / 'salida'
+    return process_file(exportacion, options=OPCIONES), process_file_chunked(
+        exportacion, str(salida), options=OPCIONES, chunk_rows=1000
+    )
+
+
+def test_cubo_se_guarda_por_cubeta_y_no_en_memoria(resultados):
+    _, bloques = resultados
+    assert bloques.ok
+    assert not any(isinstance(valor, DailyCube) for valor in bloques.kpis.values())
+
+    # Un cubo parcial por cubeta, cada uno del tamaño de su cubeta
+    partes = [pd.read_parquet(os.path.join(bloques.output_dir, DIRECTORIO_CUBO, archivo))
+              for archivo in os.listdir(os.path.join(bloques.output_dir, DIRECTORIO_CUBO))]
+    assert len(partes) > 1
+    assert max(len(parte) for parte in partes) < len(bloques.cube())
+
+
+def test_cubo_por_bloques_igual_al_de_memoria(resultados):
+    memoria, bloques = resultados
+    cubo, esperado = bloques.cube(), memoria.kpis['cubo']
+    assert cubo.registros == esperado.registros == bloques.rows
+    for by in ['Terminal', 'Modelo chasis', 'Número interno', None]:
+        pd.testing.assert_frame_equal(
+            cubo.rollup(by).sort_index(), esperado.rollup(by).sort_index(), check_dtype=False, check_index_type=False
+        )
+
+
+def test_resultado_no_incluye_el_cubo(resultados):
+    memoria, bloques = resultados
+    df = bloques.read(columns=['Cantidad litros'])
+    assert len(df) == len(memoria.df)
+    assert df['Cantidad litros'].sum() == pytest.approx(memoria.df['Cantidad litros'].sum())
+
+
+def test_perfil_por_bloques_en_el_log(exportacion, tmp_path):
+    log = tmp_path / 'perfil.jsonl'
+    opciones = ProcessingOptions(cache=None, detectors=None, profile_log=str(log))
+    bloques = process_file_chunked(exportacion, str(tmp_path / 'salida'), options=opciones, chunk_rows=2000)
+
+    registro = json.loads(log.read_text(encoding='utf-8'))
+    assert registro['modo'] == 'bloques'
+    assert registro['ok'] and registro['rows'] == bloques.rows
+    assert registro['source'] == exportacion
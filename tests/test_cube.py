@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from combustible import ProcessingOptions, process_file
+from combustible.cube import DayIndex, build_cube, merge_cubes
+from combustible.parsing import combine_timestamp
+from combustible.synthetic import generate_fleet_data, write_export
+
+RANGOS = [(None, None), ('2024-02-01', '2024-02-29'), ('2024-03-15', None), (None, '2024-01-10'), ('2025-01-01', None)]
+
+
+def _cargas():
+    # Dos cargas del mismo bus el mismo día, la de la tarde antes que la de la mañana
+    return pd.DataFrame({
+        'Fecha': pd.to_datetime(['2024-01-01', '2024-01-01', '2023-12-31', None]),
+        'Hora': pd.array([18 * 3600, 7 * 3600, 23 * 3600, 3600], dtype='Int32'),
+        'Número interno': ['0137', '0137', '0137', '0137'],
+        'Cantidad litros': [120.0, 80.0, 95.0, 60.0],
+    })
+
+
+def test_orden_cronologico_usa_la_hora():
+    df = _cargas()
+    indice = DayIndex(df)
+    assert indice.positions(cronologico=True).tolist() == [3, 2, 1, 0]
+    assert indice.positions(dimension='Número interno', valor='0137', cronologico=True).tolist() == [3, 2, 1, 0]
+    assert indice.positions('2024-01-01', '2024-01-01', cronologico=True).tolist() == [1, 0]
+
+
+def test_orden_cronologico_con_marca_tiempo():
+    df = _cargas()
+    df['Marca Tiempo'] = combine_timestamp(df['Fecha'], df['Hora'])
+    # La marca manda aunque la hora no esté
+    df = df.drop(columns='Hora')
+    indice = DayIndex(df)
+    assert indice.positions(cronologico=True).tolist() == [3, 2, 1, 0]
+    assert indice.totals('2024-01-01', '2024-01-01')['Litros'] == 200.0
+
+
+@pytest.fixture(scope='module')
+def procesado(tmp_path_factory):
+    ruta = tmp_path_factory.mktemp('flota') / 'flota.csv'
+    write_export(generate_fleet_data(rows=4000, buses=30, days=120, seed=2), str(ruta))
+    df = process_file(str(ruta), options=ProcessingOptions(cache=None, detectors=None, profile_log=None)).df
+    # Algunos registros sin fecha ni terminal
+    df = df.copy()
+    df.loc[df.index[:15], 'Fecha'] = pd.NaT
+    df.loc[df.index[10:25], 'Terminal'] = None
+    return df
+
+
+def _filtro(df, desde, hasta, dimension=None, valor=None):
+    mascara = pd.Series(True, index=df.index)
+    if desde is not None:
+        mascara &= df['Fecha'] >= pd.Timestamp(desde)
+    if hasta is not None:
+        mascara &= df['Fecha'] < pd.Timestamp(hasta) + pd.Timedelta(days=1)
+    if dimension is not None:
+        mascara &= df[dimension] == valor
+    return mascara.to_numpy()
+
+
+@pytest.mark.parametrize('desde, hasta', RANGOS)
+@pytest.mark.parametrize('dimension', [None, 'Terminal', 'Número interno'])
+def test_totales_por_sumas_acumuladas_igual_al_filtro(procesado, desde, hasta, dimension):
+    df = procesado
+    indice = DayIndex(df)
+    valores = [None] if dimension is None else indice.entities(dimension)[:3]
+    for valor in valores:
+        filas = df[_filtro(df, desde, hasta, dimension, valor)]
+        totales = indice.totals(desde, hasta, dimension, valor)
+
+        assert totales['Cargas'] == len(filas)
+        assert totales['Litros'] == pytest.approx(filas['Cantidad litros'].sum())
+        assert totales['Malas Cargas'] == filas['Mala Carga'].sum()
+        assert totales['Sobreconsumos'] == filas['Sobreconsumo'].sum()
+        if len(filas):
+            assert totales['Promedio Litros'] == pytest.approx(filas['Cantidad litros'].mean())
+            assert totales['Rendimiento Promedio'] == pytest.approx(filas['Rendimiento'].mean(), nan_ok=True)
+
+        posiciones = indice.positions(desde, hasta, dimension, valor)
+        assert posiciones.tolist() == np.flatnonzero(_filtro(df, desde, hasta, dimension, valor)).tolist()
+        pd.testing.assert_frame_equal(indice.rows(desde, hasta, dimension, valor), filas)
+
+
+def test_sin_fecha_solo_sin_limites(procesado):
+    indice = DayIndex(procesado)
+    assert indice.totals()['Cargas'] == len(procesado)
+    assert indice.totals(desde='1900-01-01')['Cargas'] == procesado['Fecha'].notna().sum()
+
+
+@pytest.mark.parametrize('by', ['Terminal', 'Número interno', ['Terminal', 'Modelo chasis'], 'Fecha'])
+@pytest.mark.parametrize('desde, hasta', RANGOS[:3])
+def test_rollup_igual_a_groupby(procesado, by, desde, hasta):
+    df = procesado[_filtro(procesado, desde, hasta)]
+    if by == 'Fecha':
+        df = df.assign(Fecha=df['Fecha'].dt.normalize())
+    esperado = df.groupby(by)['Cantidad litros'].agg(['size', 'sum', 'mean', 'std'])
+
+    tabla = build_cube(procesado).rollup(by, desde, hasta)
+    tabla = tabla[tabla['Cargas'] > 0].sort_index()
+    assert tabla.index.tolist() == esperado.index.tolist()
+    np.testing.assert_array_equal(tabla['Cargas'], esperado['size'])
+    np.testing.assert_allclose(tabla['Litros'], esperado['sum'])
+    np.testing.assert_allclose(tabla['Promedio Litros'], esperado['mean'])
+    np.testing.assert_allclose(tabla['Desviación Litros'], esperado['std'], rtol=1e-6)
+
+
+def test_rollup_por_mes(procesado):
+    tabla = build_cube(procesado).rollup(lambda fechas: fechas.dt.strftime('%Y-%m'))
+    esperado = procesado.groupby(procesado['Fecha'].dt.strftime('%Y-%m'))['Cantidad litros'].sum()
+    np.testing.assert_allclose(tabla['Litros'].sort_index(), esperado.sort_index())
+
+
+def test_merge_cubes_igual_al_cubo_completo(procesado):
+    partes = np.array_split(np.arange(len(procesado)), 4)
+    combinado = merge_cubes([build_cube(procesado.iloc[parte]) for parte in partes])
+    completo = build_cube(procesado)
+
+    assert combinado.registros == completo.registros == len(procesado)
+    for by in [None, 'Terminal', ['Número interno', 'Nombre conductor']]:
+        pd.testing.assert_frame_equal(combinado.rollup(by).sort_index(), completo.rollup(by).sort_index(),
+                                      check_dtype=False)
@@ -0,0 +1,62 @@
+import os
+
+import joblib
+import numpy as np
+
+from combustible.detectors import SIN_FECHA, DetectorRecord, DetectorStore, detect_outliers
+
+
+def _record(modelo, desde, hasta, media=150.0):
+    return DetectorRecord(modelo=modelo, desde=desde, hasta=hasta, registros=100, media=media, std=10.0, detector=None)
+
+
+def _guardar(store, record):
+    # Sin podar, para armar un directorio con varias ventanas
+    os.makedirs(store.directory, exist_ok=True)
+    joblib.dump(record, store._path(record.modelo, record.desde, record.hasta))
+
+
+def test_latest_ignora_ventanas_sin_fecha(tmp_path):
+    store = DetectorStore(str(tmp_path))
+    _guardar(store, _record('VOLVO B290R', '20240101', '20240131'))
+    _guardar(store, _record('VOLVO B290R', '20240201', '20240229'))
+    _guardar(store, _record('VOLVO B290R', SIN_FECHA, SIN_FECHA))
+
+    assert store.latest('VOLVO B290R').hasta == '20240229'
+
+
+def test_latest_verifica_el_modelo_exacto(tmp_path):
+    store = DetectorStore(str(tmp_path))
+    _guardar(store, _record('VOLVO B290R', '20240201', '20240229'))
+    # Mismo slug, otro modelo
+    _guardar(store, _record('Volvo-B290R', '20240301', '20240331'))
+
+    assert store.latest('VOLVO B290R').hasta == '20240229'
+    assert store.latest('MERCEDES O500') is None
+
+
+def test_save_conserva_solo_la_ventana_mas_reciente(tmp_path):
+    store = DetectorStore(str(tmp_path))
+    for desde, hasta in [(SIN_FECHA, SIN_FECHA), ('20240101', '20240131'), ('20240201', '20240229')]:
+        store.save(_record('VOLVO B290R', desde, hasta))
+    store.save(_record('MERCEDES O500', '20240101', '20240131'))
+
+    assert sorted(os.listdir(tmp_path)) == ['MERCEDES_O500__20240101_20240131.joblib',
+                                            'VOLVO_B290R__20240201_20240229.joblib']
+    # Una ventana anterior no reemplaza a la guardada
+    store.save(_record('VOLVO B290R', '20231201', '20231231'))
+    assert store.latest('VOLVO B290R').hasta == '20240229'
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_detect_outliers_reutiliza_el_detector_guardado(tmp_path):
+    rng = np.random.default_rng(0)
+    litros = rng.normal(150, 10, (200, 1))
+    fechas = np.array(['2024-01-01'] * 100 + ['2024-01-31'] * 100, dtype='datetime64[ns]')
+    store = DetectorStore(str(tmp_path))
+
+    primero, resumen = detect_outliers({'VOLVO B290R': (litros, fechas)}, store=store, n_jobs=1)
+    assert resumen['entrenados'] == 1
+    segundo, resumen = detect_outliers({'VOLVO B290R': (litros, fechas)}, store=store, n_jobs=1)
+    assert resumen['reutilizados'] == 1
+    assert (primero['VOLVO B290R'] == segundo['VOLVO B290R']).all()
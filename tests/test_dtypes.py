@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from combustible import ProcessingOptions, process_file
+from combustible.dtypes import CATEGORICAS, optimize_dtypes
+from combustible.synthetic import generate_fleet_data, write_export
+
+
+def _enriquecido():
+    return pd.DataFrame({
+        'Cantidad litros': [120.5, 80.25, np.nan],
+        'Odómetro': [186320.0, 186700.0, 187010.0],
+        'Día Semana': ['Monday', 'Sunday', 'Monday'],
+        'Período': ['Noche', 'Madrugada', None],
+        'Mes': [1, 2, np.nan],
+        'Año': [2024, 2024, 2024],
+        'Z-Score': [0.5, -1.25, np.nan],
+        'Mala Carga': [True, False, None],
+        'Nombre conductor': ['ANA', 'LUIS', 'ANA'],
+    })
+
+
+def test_plan_de_tipos():
+    df, reporte = optimize_dtypes(_enriquecido())
+    tipos = df.dtypes.astype(str).to_dict()
+
+    # Las columnas del archivo no cambian
+    assert tipos['Cantidad litros'] == tipos['Odómetro'] == 'float64'
+    assert tipos['Nombre conductor'] == 'object'
+    assert tipos['Z-Score'] == 'float32'
+    assert tipos['Año'] == 'int16'
+    # Con nulos, entero con soporte de nulos
+    assert tipos['Mes'] == 'Int8'
+    assert tipos['Mala Carga'] == 'boolean'
+    # Categorías en su orden natural, no alfabético
+    assert list(df['Día Semana'].cat.categories[:2]) == list(CATEGORICAS['Día Semana'][:2])
+    assert list(df['Período'].cat.categories) == CATEGORICAS['Período']
+
+    assert reporte.iloc[-1]['columna'] == 'Total'
+    assert set(reporte['columna'][:-1]) == {'Día Semana', 'Período', 'Mes', 'Año', 'Z-Score', 'Mala Carga'}
+
+
+def test_valores_fuera_del_plan_se_agregan_al_final():
+    df, _ = optimize_dtypes(pd.DataFrame({'Día Semana': ['Lunes', 'Monday']}))
+    assert list(df['Día Semana'].cat.categories) == list(CATEGORICAS['Día Semana']) + ['Lunes']
+
+
+def test_valores_no_cambian(tmp_path):
+    ruta = str(tmp_path / 'flota.csv')
+    write_export(generate_fleet_data(rows=2000, buses=30, days=60, seed=2), ruta)
+    # El resultado del pipeline ya tiene el plan aplicado; se compara contra su versión sin compactar
+    df = process_file(ruta, options=ProcessingOptions(cache=None, detectors=None, profile_log=None)).df
+    original = df.astype({col: object if isinstance(df[col].dtype, pd.CategoricalDtype) else 'float64'
+                          for col in df.columns if str(df[col].dtype) in ('category', 'float32', 'int8', 'int16', 'Int8', 'Int16')})
+    compacto, _ = optimize_dtypes(original.copy())
+
+    for col in df.columns:
+        if pd.api.types.is_float_dtype(compacto[col]):
+            np.testing.assert_allclose(compacto[col].astype('float64'), original[col].astype('float64'), rtol=1e-6, err_msg=col)
+        else:
+            assert compacto[col].astype(object).equals(original[col].astype(object)), col
+    assert compacto.memory_usage(deep=True).sum() < original.memory_usage(deep=True).sum()
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from combustible.heatmap import HORAS, heatmap_matrix, weekday_hour_codes
+
+
+def _cargas():
+    return pd.DataFrame({
+        'Día Semana': ['Monday', 'Monday', 'Lunes', 'Sunday', 'Sunday', None, 'Friday'],
+        'Hora Numérica': [6 + 40 / 60, 6.0, 23 + 40 / 60, 0.5, 23 + 59 / 60, 10.0, np.nan],
+        'Cantidad litros': [100.0, 50.0, 80.0, 120.0, np.nan, 70.0, 90.0],
+    })
+
+
+def test_la_hora_se_trunca():
+    # 06:40 y 06:00 en la hora 6, 23:40 y 23:59 en la 23 (no en una columna "24")
+    codigos = weekday_hour_codes(_cargas())
+    assert codigos.tolist() == [6, 6, 23, 6 * HORAS, 6 * HORAS + 23, -1, -1]
+
+
+def test_matriz_igual_a_pivot_table_con_la_hora_truncada():
+    df = _cargas()
+    codigos = weekday_hour_codes(df)
+    validos = codigos >= 0
+    base = pd.DataFrame({'dia': codigos[validos] // HORAS, 'hora': codigos[validos] % HORAS,
+                         'litros': df['Cantidad litros'][validos]})
+    for aggfunc in ['sum', 'mean']:
+        matriz = heatmap_matrix(codigos, df['Cantidad litros'], aggfunc)
+        assert matriz.shape == (7, HORAS)
+        esperado = base.pivot_table(index='dia', columns='hora', values='litros', aggfunc=aggfunc)
+        for (dia, hora), valor in esperado.stack().items():
+            assert matriz.iloc[dia, hora] == pytest.approx(valor)
+
+    # El conteo es de cargas, tengan o no litros
+    conteo = heatmap_matrix(codigos)
+    assert conteo.to_numpy().sum() == validos.sum()
+    assert conteo.loc['Monday', 6] == 2 and conteo.loc['Sunday', 23] == 1
+
+
+def test_agregacion_no_soportada():
+    with pytest.raises(ValueError):
+        heatmap_matrix(np.array([0]), np.array([1.0]), 'median')
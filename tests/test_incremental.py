@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from combustible import ProcessingOptions, append_file, process_file, process_files
+from combustible.synthetic import generate_fleet_data, write_export
+
+OPCIONES = ProcessingOptions(cache=None, detectors=None, profile_log=None)
+
+BANDERAS = ['Mala Carga', 'Sobreconsumo', 'Outlier Extremo']
+METRICAS = ['Cantidad litros', 'Z-Score', 'Umbral Sobreconsumo', 'Odómetro Anterior', 'Kilómetros Recorridos', 'Rendimiento']
+
+
+@pytest.fixture(scope='module')
+def meses(tmp_path_factory):
+    # Dos exportaciones que comparten la segunda quincena de febrero
+    directorio = tmp_path_factory.mktemp('meses')
+    df = generate_fleet_data(rows=4000, buses=40, days=80, seed=3)
+    rutas = []
+    for nombre, parte in [('enero.csv', df[df['Fecha'] < '2024-03-01']), ('marzo.csv', df[df['Fecha'] >= '2024-02-15'])]:
+        write_export(parte, str(directorio / nombre))
+        rutas.append(str(directorio / nombre))
+    return rutas, len(df)
+
+
+def test_anexado_igual_a_recalculo_completo(meses):
+    (historico, nuevo), total = meses
+    completo = process_files([historico, nuevo], options=OPCIONES)
+    anexado = append_file(process_file(historico, options=OPCIONES), nuevo, options=OPCIONES)
+    assert completo.ok and anexado.ok
+
+    # Las cargas del período compartido no se cuentan dos veces
+    assert len(anexado.df) == len(completo.df) == total
+    assert anexado.df.index.equals(completo.df.index)
+    for col in BANDERAS:
+        assert (anexado.df[col].astype(bool) == completo.df[col].astype(bool)).all(), col
+    for col in METRICAS:
+        np.testing.assert_allclose(anexado.df[col].astype('float64'), completo.df[col].astype('float64'),
+                                   rtol=1e-5, err_msg=col)
+
+
+def test_anexar_el_mismo_archivo_no_agrega_cargas(meses):
+    (historico, _), _ = meses
+    previo = process_file(historico, options=OPCIONES)
+    anexado = append_file(previo, historico, options=OPCIONES)
+
+    assert anexado.ok
+    assert len(anexado.df) == len(previo.df)
+    pd.testing.assert_series_equal(anexado.df['Z-Score'], previo.df['Z-Score'], check_dtype=False)
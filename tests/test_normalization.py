@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from combustible.normalization import (
+    broadcast_by_category,
+    normalize_column,
+    normalizar_modelo,
+    normalizar_nombre,
+    normalizar_terminal,
+)
+
+VALORES = pd.Series(
+    [' volvo b290r', 'Mercedes-Benz O500', 'MB 0500', 'scania k310', 'Volvo  B290R ', np.nan, np.nan,
+     'Agrale MT17', 'el  roble', 'María  González 3', 137, 'volvo b290r'],
+    index=np.arange(10, 22),
+)
+
+
+@pytest.mark.parametrize('normalizar', [normalizar_modelo, normalizar_terminal, normalizar_nombre])
+def test_normalize_column_igual_a_normalizar_por_registro(normalizar):
+    # Lo que hacía el análisis original: limpiar y aplicar la función a cada fila
+    limpia_esperada = VALORES.astype(str).str.strip().str.upper()
+    esperada = limpia_esperada.apply(normalizar)
+
+    limpia, normalizada = normalize_column(VALORES, normalizar)
+    pd.testing.assert_series_equal(limpia, limpia_esperada)
+    assert normalizada.index.equals(VALORES.index)
+    assert normalizada.astype(object).tolist() == esperada.tolist()
+    assert list(normalizada.cat.categories) == sorted(set(esperada))
+
+
+def test_none_y_nan_son_el_mismo_nulo():
+    # Los lectores con Arrow entregan None donde pd.read_csv entregaba NaN
+    limpia, normalizada = normalize_column(pd.Series([None, np.nan, 'x']), normalizar_terminal)
+    assert limpia.tolist() == ['NAN', 'NAN', 'X']
+    assert normalizada.tolist() == ['NAN', 'NAN', 'X']
+
+
+def test_variantes_de_un_modelo_quedan_en_la_misma_categoria():
+    _, normalizada = normalize_column(VALORES, normalizar_modelo)
+    assert normalizada.loc[[10, 14, 21]].tolist() == ['VOLVO'] * 3
+    assert normalizada.loc[[11, 12]].tolist() == ['MERCEDES BENZ'] * 2
+
+
+def test_broadcast_by_category_igual_a_map():
+    _, normalizada = normalize_column(VALORES, normalizar_modelo)
+    valores = {'VOLVO': 150.0, 'SCANIA': 180.0}
+    resultado = broadcast_by_category(normalizada, valores)
+    esperado = normalizada.astype(object).map(valores).astype(float)
+    pd.testing.assert_series_equal(resultado, esperado, check_names=False)
+    assert broadcast_by_category(normalizada, {}).isna().all()
@@ -0,0 +1,47 @@
+import importlib
+import inspect
+import pickle
+
+import pytest
+
+from combustible import ProcessingOptions, process_file
+from combustible.synthetic import generate_fleet_data, write_export
+
+pytest.importorskip('streamlit')
+from streamlit.testing.v1 import AppTest
+
+from interfaz.paginas import SECCIONES
+
+
+@pytest.mark.parametrize('modulo', SECCIONES.values())
+def test_cada_seccion_expone_render(modulo):
+    seccion = importlib.import_module(f'interfaz.paginas.{modulo}')
+    assert list(inspect.signature(seccion.render).parameters) == ['df', 'cubo', 'indice']
+
+
+@pytest.fixture(scope='module')
+def datos(tmp_path_factory):
+    directorio = tmp_path_factory.mktemp('flota')
+    write_export(generate_fleet_data(rows=2000, buses=25, days=90, seed=3), str(directorio / 'flota.csv'))
+    df = process_file(str(directorio / 'flota.csv'), options=ProcessingOptions(cache=None, detectors=None, profile_log=None)).df
+    ruta = directorio / 'df.pkl'
+    ruta.write_bytes(pickle.dumps(df))
+    return str(ruta)
+
+
+def _mostrar_seccion(ruta, nombre):
+    import pickle
+
+    from interfaz.datos import get_cube, get_day_index
+    from interfaz.paginas import render_section
+
+    with open(ruta, 'rb') as archivo:
+        df = pickle.load(archivo)
+    render_section(nombre, df, get_cube(df), get_day_index(df))
+
+
+@pytest.mark.parametrize('nombre', SECCIONES)
+def test_seccion_se_muestra_sin_errores(datos, nombre):
+    app = AppTest.from_function(_mostrar_seccion, args=(datos, nombre), default_timeout=120)
+    app.run()
+    assert not app.exception, [excepcion.value for excepcion in app.exception]
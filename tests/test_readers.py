@@ -0,0 +1,73 @@
+from io import BytesIO
+
+import pandas as pd
+from openpyxl import Workbook
+
+from combustible.engine import COLUMNAS_ESPERADAS, COLUMNAS_LECTURA, COLUMNAS_TEXTO
+from combustible.readers import find_header_row, read_xlsx
+
+ENCABEZADO = ['Fecha', 'Hora', 'Terminal', 'Número interno', 'Cantidad litros', 'Observación']
+
+
+def _libro(filas):
+    libro = Workbook()
+    hoja = libro.active
+    for fila in filas:
+        hoja.append(fila)
+    archivo = BytesIO()
+    libro.save(archivo)
+    archivo.seek(0)
+    return archivo
+
+
+def test_fila_de_titulo_no_es_encabezado():
+    filas = [
+        ['Cargas por Terminal y Fecha'],
+        ['Reporte de Hora y Cantidad litros', 'Fecha de emisión'],
+        ENCABEZADO,
+    ]
+    assert find_header_row(filas, COLUMNAS_ESPERADAS) == 2
+
+
+def test_encabezado_ignora_mayusculas_y_espacios():
+    assert find_header_row([[' FECHA ', 'hora']], COLUMNAS_ESPERADAS) == 0
+    assert find_header_row([['Fecha carga', 'Hora carga']], COLUMNAS_ESPERADAS) is None
+
+
+def test_read_xlsx_con_titulo_y_filas_vacias():
+    archivo = _libro([
+        ['Cargas por Terminal y Fecha'],
+        [],
+        ENCABEZADO,
+        ['01/01/2024', '06:15:00', 'El Roble', '0137', 120.5, None],
+        [],
+        ['02/01/2024', '07:00:00', 'La Reina', '0042', 98, 'Carga Masiva'],
+    ])
+    df, fila_encabezado, originales = read_xlsx(archivo, COLUMNAS_ESPERADAS, COLUMNAS_LECTURA, COLUMNAS_TEXTO)
+
+    assert fila_encabezado == 2
+    assert originales == ENCABEZADO
+    assert list(df.columns) == ENCABEZADO
+    assert len(df) == 3
+    assert df['Número interno'].tolist()[::2] == ['0137', '0042']
+    assert df['Cantidad litros'].tolist()[::2] == [120.5, 98.0]
+    assert df['Observación'].iloc[2] == 'Carga Masiva'
+
+
+def test_read_xlsx_sin_encabezado_requerido():
+    archivo = _libro([['Resumen'], ['Total', 10]])
+    df, fila_encabezado, originales = read_xlsx(archivo, COLUMNAS_ESPERADAS, require_header=True)
+
+    assert fila_encabezado is None
+    assert originales == []
+    assert df.empty
+
+
+def test_read_xlsx_igual_a_read_excel():
+    filas = [ENCABEZADO] + [
+        [f'{dia:02d}/01/2024', '10:00:00', 'El Roble', f'{dia:04d}', 100 + dia / 4, None] for dia in range(1, 21)
+    ]
+    df, _, _ = read_xlsx(_libro(filas), COLUMNAS_ESPERADAS)
+    esperado = pd.read_excel(_libro(filas))
+
+    pd.testing.assert_frame_equal(df.drop(columns='Número interno'), esperado.drop(columns='Número interno'))
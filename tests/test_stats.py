@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from combustible.stats import group_moments, merge_moments, moments_to_stats
+
+
+def _cargas(n, semilla):
+    rng = np.random.default_rng(semilla)
+    litros = rng.normal(150, 30, n)
+    litros[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame({'modelo': rng.choice(['Volvo', 'Mercedes', 'Scania'], n), 'litros': litros})
+
+
+def test_merge_moments_igual_al_calculo_completo():
+    partes = [_cargas(n, semilla) for semilla, n in enumerate([500, 1, 0, 2000])]
+    momentos = group_moments(partes[0], 'litros', 'modelo')
+    for parte in partes[1:]:
+        momentos = merge_moments(momentos, group_moments(parte, 'litros', 'modelo'))
+
+    esperado = pd.concat(partes).groupby('modelo')['litros'].agg(['count', 'mean', 'std'])
+    obtenido = moments_to_stats(momentos).loc[esperado.index]
+    assert obtenido['count'].tolist() == esperado['count'].tolist()
+    np.testing.assert_allclose(obtenido['mean'], esperado['mean'])
+    np.testing.assert_allclose(obtenido['std'], esperado['std'])
+
+
+def test_merge_moments_con_grupos_nuevos_y_vacios():
+    a = group_moments(pd.DataFrame({'modelo': ['A', 'A'], 'litros': [100.0, 110.0]}), 'litros', 'modelo')
+    b = group_moments(pd.DataFrame({'modelo': ['B', 'C'], 'litros': [90.0, np.nan]}), 'litros', 'modelo')
+    stats = moments_to_stats(merge_moments(a, b))
+
+    assert stats.loc['A', 'mean'] == pytest.approx(105.0)
+    assert stats.loc['A', 'std'] == pytest.approx(np.std([100.0, 110.0], ddof=1))
+    # Un solo valor: media sin desviación; sin valores: ni media ni desviación
+    assert stats.loc['B', 'mean'] == 90.0 and np.isnan(stats.loc['B', 'std'])
+    assert stats.loc['C', 'count'] == 0 and np.isnan(stats.loc['C', 'mean'])